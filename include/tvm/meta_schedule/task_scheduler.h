@@ -59,6 +59,10 @@ class TaskRecordNode : public runtime::Object {
   Optional<Array<BuilderResult>> builder_results = NullOpt;
   /*! \brief Packed functions to fetch the runner results asynchronously. */
   Optional<Array<RunnerFuture>> runner_futures = NullOpt;
+  /*! \brief The next batch of candidates, generated and built ahead in the pipelined mode. */
+  Optional<Array<MeasureCandidate>> prefetched_candidates = NullOpt;
+  /*! \brief The building results of the prefetched candidates. */
+  Optional<Array<BuilderResult>> prefetched_builder_results = NullOpt;
 
   void VisitAttrs(tvm::AttrVisitor* v) {
     v->Visit("ctx", &ctx);
@@ -71,6 +75,8 @@ class TaskRecordNode : public runtime::Object {
     v->Visit("measure_candidates", &measure_candidates);
     v->Visit("builder_results", &builder_results);
     v->Visit("runner_futures", &runner_futures);
+    v->Visit("prefetched_candidates", &prefetched_candidates);
+    v->Visit("prefetched_builder_results", &prefetched_builder_results);
   }
 
   static constexpr const char* _type_key = "meta_schedule.TaskRecord";
@@ -139,6 +145,13 @@ class TaskSchedulerNode : public runtime::Object {
   Optional<CostModel> cost_model_;
   /*! \brief The number of remaining tasks to be tuned. */
   int remaining_tasks_;
+  /*!
+   * \brief The number of candidates sent to the builder at a time in the pipelined mode.
+   * Each chunk is sent to the runner as soon as it is built, and the next batch of a task is
+   * generated and built while the current one is being measured. Non-positive values disable
+   * the pipelined mode.
+   */
+  int pipeline_chunk_size = 0;
 
   /*! \brief The default destructor. */
   virtual ~TaskSchedulerNode() = default;
@@ -150,6 +163,7 @@ class TaskSchedulerNode : public runtime::Object {
     v->Visit("database_", &database_);
     v->Visit("cost_model_", &cost_model_);
     v->Visit("remaining_tasks_", &remaining_tasks_);
+    v->Visit("pipeline_chunk_size", &pipeline_chunk_size);
   }
 
   /*!
@@ -264,19 +278,22 @@ class TaskScheduler : public runtime::ObjectRef {
   /*!
    * \brief Create a task scheduler that fetches tasks in a round-robin fashion.
    * \param logger The tuning task's logging function.
+   * \param pipeline_chunk_size The number of candidates built at a time in the pipelined mode.
    * \return The task scheduler created.
    */
-  TVM_DLL static TaskScheduler RoundRobin(PackedFunc logger);
+  TVM_DLL static TaskScheduler RoundRobin(PackedFunc logger, int pipeline_chunk_size);
   /*!
    * \brief Create a task scheduler that fetches tasks in a gradient based fashion.
    * \param logger The tuning task's logging function.
    * \param alpha The parameter alpha to control gradient computation.
    * \param window_size The parameter to control backward window size.
    * \param seed The random seed.
+   * \param pipeline_chunk_size The number of candidates built at a time in the pipelined mode.
    * \return The task scheduler created.
    */
   TVM_DLL static TaskScheduler GradientBased(PackedFunc logger, double alpha, int window_size,
-                                             support::LinearCongruentialEngine::TRandState seed);
+                                             support::LinearCongruentialEngine::TRandState seed,
+                                             int pipeline_chunk_size);
   /*!
    * \brief Create a task scheduler with customized methods on the python-side.
    * \param logger The tuning task's logging function.
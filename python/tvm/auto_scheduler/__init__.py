@@ -50,6 +50,7 @@ from .measure import (
     register_task_input_check_func,
 )
 from .measure_record import (
+    IndexedRecordStore,
     RecordReader,
     RecordToFile,
     load_best_record,
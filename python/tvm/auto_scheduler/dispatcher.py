@@ -33,7 +33,7 @@ from tvm.contrib.utils import tempdir
 from tvm.tir.expr import FloatImm
 from .cost_model import RandomModel, XGBModel
 from .measure import LocalRPCMeasureContext
-from .measure_record import RecordToFile, load_records
+from .measure_record import IndexedRecord, IndexedRecordStore, RecordToFile, load_records
 from .search_policy import PreloadMeasuredStates, SketchPolicy
 from .search_task import SearchTask, TuningOptions
 from .utils import calc_workload_dis_factor, decode_workload_key
@@ -138,8 +138,11 @@ class ApplyHistoryBest(DispatchContext):
         Each row of this file is an encoded record pair. If it is an iterator,
         it can either be a set of str filenames which will be applied jointly,
         or a set of (input, result) tuples.
+        An IndexedRecordStore can be used in place of a filename, so that only the best
+        records in its index are loaded, and their states are decoded on query.
     n_lines: Optional[int]
         if it is not None, only load the first `n_lines` lines of log.
+        It does not apply to IndexedRecordStore.
     include_compatible: bool
         When set to True, compatible records will also be considered.
     """
@@ -207,7 +210,9 @@ class ApplyHistoryBest(DispatchContext):
             if isinstance(rec, pathlib.Path):
                 rec = str(rec)
 
-            if isinstance(rec, str):
+            if isinstance(rec, IndexedRecordStore):
+                self._load_store(rec)
+            elif isinstance(rec, str):
                 rec = load_records(rec)
                 joint_records += rec
             else:
@@ -257,6 +262,20 @@ class ApplyHistoryBest(DispatchContext):
 
         logger.debug("Finish loading %d records", counter)
 
+    def _load_store(self, store):
+        """Load the best records of an IndexedRecordStore, with the states decoded lazily"""
+        store.refresh()
+        for best_records, store_records in [
+            (self.best_by_targetkey, store.best_by_targetkey),
+            (self.best_by_model, store.best_by_model),
+        ]:
+            for name, workloads in store_records.items():
+                for workload_hash, store_entry in workloads.items():
+                    entry = best_records.setdefault(name, {}).setdefault(workload_hash, {})
+                    for workload_args, (rec, cost) in store_entry.items():
+                        if workload_args not in entry or entry[workload_args][1] > cost:
+                            entry[workload_args] = (rec, cost)
+
     def _query_inside(self, target, workload_key, func_name):
         if target is None:
             raise RuntimeError(
@@ -290,6 +309,8 @@ class ApplyHistoryBest(DispatchContext):
                     if ret is None or cost < best_cost:
                         best_cost = cost
                         ret = state
+            if isinstance(ret, IndexedRecord):
+                ret = ret.state
             return ret
 
         # first try matching by model
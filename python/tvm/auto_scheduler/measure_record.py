@@ -18,13 +18,15 @@
 
 """ Serialization and other I/O support for measurement records (tuning logs). """
 import argparse
+import hashlib
+import json
 import logging
 import os
-import itertools
 
 import numpy as np
 
 import tvm._ffi
+from tvm.contrib.utils import filelock, tempdir
 from tvm.runtime import Object
 from .measure import MeasureErrorNo, MeasureCallback
 from .utils import calc_workload_dis_factor, decode_workload_key
@@ -213,14 +215,308 @@ def save_records(filename, inputs, results):
     _ffi_api.SaveRecords(filename, inputs, results)
 
 
+class IndexedRecord(object):
+    """A record in an IndexedRecordStore, which is decoded on first access.
+
+    Parameters
+    ----------
+    store : IndexedRecordStore
+        The store of the record.
+    offset : int
+        The byte offset of the record in the log file.
+    length : int
+        The byte length of the record.
+    """
+
+    __slots__ = ["store", "offset", "length", "_record"]
+
+    def __init__(self, store, offset, length):
+        self.store = store
+        self.offset = offset
+        self.length = length
+        self._record = None
+
+    def read_line(self):
+        """Read the serialized record from the log file."""
+        with open(self.store.filename, "rb") as f:
+            f.seek(self.offset)
+            return f.read(self.length).decode("utf-8")
+
+    def load(self):
+        """Decode the record.
+
+        Returns
+        -------
+        ret: Tuple[MeasureInput, MeasureResult]
+            A tuple of MeasureInput, MeasureResult.
+        """
+        if self._record is None:
+            self._record = load_record_from_string(self.read_line())
+        return self._record
+
+    @property
+    def state(self):
+        """The state of the record."""
+        return self.load()[0].state
+
+
+class IndexedRecordStore(object):
+    """
+    A record log file with a sidecar index of its best records, so that the best record of a
+    workload is found by a dict lookup, and only the records actually queried are decoded.
+
+    The index keeps the best record of each (target key, workload), (target model, workload)
+    and (target kind, workload), in the same nested maps as ApplyHistoryBest. It is built once
+    by scanning the log without decoding the states, and saved next to the log. Only the
+    records that improve the best ones are saved, along with the size of the log indexed so
+    far, so that records appended later, e.g. by RecordToFile, are indexed incrementally
+    by `refresh`. The index is rebuilt if the log is truncated or replaced.
+
+    Parameters
+    ----------
+    filename : str
+        File name of the log.
+    index_file : Optional[str]
+        File name of the index. Defaults to `filename` + ".index".
+    """
+
+    INDEX_VERSION = 1
+
+    def __init__(self, filename, index_file=None):
+        self.filename = str(filename)
+        self.index_file = str(index_file) if index_file else self.filename + ".index"
+        self._reset()
+        self._load_index()
+        self.refresh()
+
+    def _reset(self):
+        # Dict[str (target key, model or kind),
+        #   Dict[str (workload hash),
+        #     Dict[tuple (workload args), tuple (IndexedRecord, cost)]]]
+        self.best_by_targetkey = {}
+        self.best_by_model = {}
+        self.best_by_kind = {}
+        self._best_maps = {
+            "key": self.best_by_targetkey,
+            "model": self.best_by_model,
+            "kind": self.best_by_kind,
+        }
+        self._indexed_size = 0
+        self._head = None
+        self._targets = {}
+        self._workloads = {}
+
+    def _log_head(self, size):
+        """A digest of the beginning of the log, to detect a replaced log."""
+        with open(self.filename, "rb") as f:
+            return [size, hashlib.sha1(f.read(size)).hexdigest()]
+
+    def _update(self, kind, name, workload_key, cost, offset, length):
+        """Update the best record. Return whether it is improved."""
+        if workload_key not in self._workloads:
+            self._workloads[workload_key] = decode_workload_key(workload_key)
+        workload_hash, workload_args = self._workloads[workload_key]
+        entry = self._best_maps[kind].setdefault(name, {}).setdefault(workload_hash, {})
+        if workload_args in entry and entry[workload_args][1] <= cost:
+            return False
+        entry[workload_args] = (IndexedRecord(self, offset, length), cost)
+        return True
+
+    def _load_index(self):
+        if not os.path.isfile(self.index_file) or not os.path.isfile(self.filename):
+            return
+        with open(self.index_file, "r") as f:
+            lines = f.readlines()
+        if not lines or json.loads(lines[0]).get("version") != self.INDEX_VERSION:
+            return
+        head = json.loads(lines[0])["head"]
+        for line in lines[1:]:
+            if not line.endswith("\n"):
+                break
+            item = json.loads(line)
+            if isinstance(item, dict):
+                self._indexed_size = item["end"]
+            else:
+                self._update(*item)
+        log_size = os.path.getsize(self.filename)
+        if log_size < self._indexed_size or head != self._log_head(head[0]):
+            logger.info("%s has changed, rebuilding its index", self.filename)
+            self._reset()
+        else:
+            self._head = head
+
+    def _target_names(self, target_str):
+        if target_str not in self._targets:
+            target = tvm.target.Target(target_str)
+            self._targets[target_str] = (list(target.keys), target.model, target.kind.name)
+        return self._targets[target_str]
+
+    def refresh(self):
+        """Index the records appended to the log since the last refresh."""
+        if not os.path.isfile(self.filename):
+            return
+        if os.path.getsize(self.filename) < self._indexed_size:
+            logger.info("%s has been truncated, rebuilding its index", self.filename)
+            self._reset()
+        if os.path.getsize(self.filename) == self._indexed_size:
+            return
+
+        items = []
+        with open(self.filename, "rb") as f:
+            f.seek(self._indexed_size)
+            offset = self._indexed_size
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # a record being written
+                    break
+                length = len(line)
+                row = line.decode("utf-8").strip()
+                if row and not row.startswith("#"):
+                    # Only the header of the record is parsed, the state is decoded on query
+                    record = json.loads(row)
+                    task, (costs, error_no, _, _) = record["i"][0], record["r"]
+                    if error_no == MeasureErrorNo.NO_ERROR:
+                        workload_key, target_str = task[0], task[1]
+                        keys, model, kind = self._target_names(target_str)
+                        cost = float(np.mean(costs))
+                        names = [("key", k) for k in keys] + [("kind", kind)]
+                        if model != "unknown":
+                            names.append(("model", model))
+                        for name in names:
+                            item = [*name, workload_key, cost, offset, length]
+                            if self._update(*item):
+                                items.append(item)
+                offset += length
+        self._indexed_size = offset
+        self._save_index(items)
+
+    def _save_index(self, items):
+        """Append the improved records to the index. Failures are only logged, since the
+        index can always be rebuilt from the log."""
+        try:
+            lock = filelock(self.index_file + ".lock")
+            try:
+                lines = []
+                if self._head is None:
+                    # (Re)create the index
+                    self._head = self._log_head(min(self._indexed_size, 4096))
+                    mode = "w"
+                    lines.append({"version": self.INDEX_VERSION, "head": self._head})
+                    items = [
+                        [
+                            kind,
+                            name,
+                            _workload_key(workload_hash, args),
+                            cost,
+                            rec.offset,
+                            rec.length,
+                        ]
+                        for kind, best_map in self._best_maps.items()
+                        for name, workloads in best_map.items()
+                        for workload_hash, entry in workloads.items()
+                        for args, (rec, cost) in entry.items()
+                    ]
+                else:
+                    mode = "a"
+                lines.extend(items)
+                lines.append({"end": self._indexed_size})
+                with open(self.index_file, mode) as f:
+                    f.write("".join(json.dumps(line) + "\n" for line in lines))
+            finally:
+                lock.release()
+        except OSError as e:
+            logger.warning("Failed to save the index of %s: %s", self.filename, e)
+
+    def append(self, inputs, results):
+        """Append measure records to the log, and index them.
+
+        Parameters
+        ----------
+        inputs: List[MeasureInputs]
+            The MeasureInputs to be written.
+        results: List[MeasureResults]
+            The MeasureResults to be written.
+        """
+        save_records(self.filename, inputs, results)
+        self.refresh()
+
+    def best_records(self):
+        """The best records for each target key and workload, without duplicates.
+
+        Returns
+        -------
+        records : List[IndexedRecord]
+            The records, in the order of the log.
+        """
+        records = {}
+        for workloads in self.best_by_targetkey.values():
+            for entry in workloads.values():
+                for rec, _ in entry.values():
+                    records[rec.offset] = rec
+        return [records[offset] for offset in sorted(records)]
+
+    def load_best(self, workload_key=None, target=None, include_compatible=False):
+        """Return the best measurement pair, the same as `load_best_record` on the log.
+
+        Parameters
+        ----------
+        workload_key : Optional[str]
+            The workload key of the compute declaration.
+            With `None`, this returns the best measure pair of all workloads.
+        target : Optional[tvm.target.Target]
+            The target device.
+            With `None`, this returns the best measure pair of all target devices.
+        include_compatible: bool
+            When set to True, all compatible records in the log file will be considered.
+
+        Returns
+        -------
+        input : auto_scheduler.measure.MeasureInput
+            The best State's MeasureInput from this log fine.
+        result : auto_scheduler.measure.MeasureResult
+            The best State's MeasureResult from this log fine.
+        """
+        self.refresh()
+        kinds = [target.kind.name] if target else list(self.best_by_kind)
+        if workload_key is not None:
+            workload_pair = decode_workload_key(workload_key)
+        best_cost, best_rec = 1e30, None
+        for kind in kinds:
+            workloads = self.best_by_kind.get(kind, {})
+            if workload_key is None:
+                candidates = [val for entry in workloads.values() for val in entry.values()]
+            elif not include_compatible:
+                val = workloads.get(workload_pair[0], {}).get(workload_pair[1])
+                candidates = [val] if val is not None else []
+            else:
+                candidates = []
+                for args, (rec, cost) in workloads.get(workload_pair[0], {}).items():
+                    dis_f = calc_workload_dis_factor(workload_pair, (workload_pair[0], args))
+                    if dis_f != float("inf"):
+                        candidates.append((rec, cost * dis_f))
+            for rec, cost in candidates:
+                if cost < best_cost:
+                    best_cost, best_rec = cost, rec
+        if best_rec is None:
+            return None, None
+        return best_rec.load()
+
+
+def _workload_key(workload_hash, args):
+    """Encode a decoded workload key again, for the index."""
+    if args is None:
+        return workload_hash
+    return json.dumps([workload_hash, *args])
+
+
 def load_best_record(filename, workload_key=None, target=None, include_compatible=False):
     """Return the best measurement pair form a log file. This may return none results if
     there is no legal measure pair with the specified workload_key/target found from the log file.
 
     Parameters
     ----------
-    filename : str
-        File name to load log from.
+    filename : str or IndexedRecordStore
+        File name to load log from, or an indexed record store to look up.
     workload_key : Optional[str]
         The workload key of the compute declaration.
         With `None`, this returns the best measure pair of all workloads.
@@ -237,6 +533,9 @@ def load_best_record(filename, workload_key=None, target=None, include_compatibl
     result : auto_scheduler.measure.MeasureResult
         The best State's MeasureResult from this log fine.
     """
+    if isinstance(filename, IndexedRecordStore):
+        return filename.load_best(workload_key, target, include_compatible)
+
     log_reader = RecordReader(filename)
     best_cost = 1e30
     best_inp = None
@@ -279,6 +578,9 @@ def distill_record_file(in_file, out_file):
     If out_file already exists, the best entries from both
     in_file and out_file will be saved.
 
+    The records are streamed through the index of an IndexedRecordStore, so only the best
+    ones are read again, and none of them is decoded.
+
     Parameters
     ----------
     in_file: str
@@ -286,59 +588,42 @@ def distill_record_file(in_file, out_file):
     out_file: str or file
         The filename of output
     """
-    # pylint: disable=import-outside-toplevel
-    from .dispatcher import ApplyHistoryBest
-
-    context = load_records(in_file)
-
     dirname = os.path.dirname(os.path.abspath(out_file))
     if not os.path.exists(dirname):
         os.makedirs(dirname)
 
+    tmp_dir = tempdir()
+    stores = [IndexedRecordStore(in_file)]
     if os.path.isfile(out_file):
-        out_context = load_records(out_file)
-        context = itertools.chain(context, out_context)
+        # out_file is to be replaced, so do not keep its index
+        stores.append(IndexedRecordStore(out_file, tmp_dir.relpath("out.index")))
 
-    def measure_input_str_key(inp):
-        return _ffi_api.SerializeMeasureInput(inp)
-
-    # Dict[target key,
-    #   Dict[workload hash,
-    #     Dict[workload args, (cost, (MeasureInput, MeasureResult))]]]
-    # Full type: Dict[str, Dict[str, Dict[Tuple, Tuple[float, Tuple[Measureinput, MeasureResult]]]]]
+    # Keep the best record for each target key and workload.
+    # Dict[target key, Dict[workload hash, Dict[workload args, (IndexedRecord, cost)]]]
     best_records = {}
-
-    for inp, res in context:
-        if res.error_no != 0:
-            continue
-
-        # Keep the best record for each target and workload.
-        costs = [x.value for x in res.costs if isinstance(x, tvm.tir.expr.FloatImm)]
-        cost = np.mean(costs)
-        for k in inp.task.target.keys:
-            entry, _, workload_args = ApplyHistoryBest.get_workload_entry(
-                best_records, k, inp.task.workload_key
-            )
-            if workload_args not in entry or cost < entry[workload_args][0]:
-                entry[workload_args] = (cost, (inp, res))
+    for store in stores:
+        for target_key, workloads in store.best_by_targetkey.items():
+            for workload_hash, workload_entry in workloads.items():
+                for workload_args, (rec, cost) in workload_entry.items():
+                    entry = best_records.setdefault(target_key, {}).setdefault(workload_hash, {})
+                    if workload_args not in entry or cost < entry[workload_args][1]:
+                        entry[workload_args] = (rec, cost)
 
     # Remove duplications by multiple target keys.
-    out_records = {}
+    out_lines = {}
     for target_entry in best_records.values():
         for workload_entry in target_entry.values():
-            for _, (inp, res) in workload_entry.values():
-                out_records[measure_input_str_key(inp)] = (inp, res)
-
-    inputs = []
-    results = []
-    for inp, res in out_records.values():
-        inputs.append(inp)
-        results.append(res)
+            for rec, _ in workload_entry.values():
+                line = rec.read_line()
+                out_lines[json.dumps(json.loads(line)["i"])] = line
 
     # create a new file and save the best records
-    open(out_file, "w")
-    save_records(out_file, inputs, results)
-    logger.info("Extract %d best records from %s to %s", len(inputs), in_file, out_file)
+    tmp_file = f"{out_file}.tmp"
+    with open(tmp_file, "w") as f:
+        for line in out_lines.values():
+            f.write(line)
+    os.replace(tmp_file, out_file)
+    logger.info("Extract %d best records from %s to %s", len(out_lines), in_file, out_file)
 
 
 def main():
@@ -23,3 +23,4 @@ from . import base_graph_tuner
 from .base_graph_tuner import BaseGraphTuner
 from .dynamic_programming_tuner import DPTuner
 from .pbqp_tuner import PBQPTuner
+from .local_search_tuner import LocalSearchTuner
@@ -17,6 +17,7 @@
 # pylint: disable=too-many-arguments,too-many-locals,too-many-statements,too-many-instance-attributes,too-many-branches,too-many-nested-blocks,invalid-name,unused-argument,unused-variable,no-member,no-value-for-parameter
 """Base class for graph tuner."""
 import logging
+import os
 from abc import abstractmethod
 
 import numpy as np
@@ -27,7 +28,8 @@ from tvm import te
 from tvm import autotvm, relay
 from tvm.autotvm.task import get_config
 from tvm.autotvm.record import encode, load_from_file
-from tvm.autotvm.measure import MeasureResult, MeasureInput
+from tvm.autotvm.env import GLOBAL_SCOPE
+from tvm.autotvm.measure import MeasureResult, MeasureInput, create_measure_batch
 from tvm.target import Target
 
 from ...target import Target
@@ -376,6 +378,7 @@ class BaseGraphTuner(object):
         target_host=None,
         infer_layout=False,
         runner=None,
+        layout_cache=None,
     ):
         """Benchmark all possible layout transformation in the graph,
         given a set of schedule candidates for each workload of target operator.
@@ -441,6 +444,11 @@ class BaseGraphTuner(object):
             This might bring performance loss comparing to benchmarking layout transformation.
         runner : Runner, optional
             Accept a user-supplied runner
+
+        layout_cache : str, optional
+            Path to a records log file shared across models and runs.
+            The layout_transform records of the current target in this file are reused,
+            and the newly benchmarked ones are appended to it.
         """
         self._logger.info("Start to benchmark layout transformation...")
         self._target, target_host = Target.canon_target_and_host(self._target, target_host)
@@ -466,6 +474,13 @@ class BaseGraphTuner(object):
                 total_time += record[1].costs[0]
         avg_time = total_time / num_flops if num_flops > 0 else 0
 
+        if layout_cache is not None and os.path.isfile(layout_cache):
+            target_str = str(self._target)
+            for record in load_from_file(layout_cache):
+                if str(record[0].target) == target_str:
+                    ltf_wkl = record[0].task.workload
+                    self._layout_transform_perf_records.setdefault(ltf_wkl, record)
+
         args_list = []
 
         def _fetch_args_callback(from_node_idx, to_node_idx, from_sch_idx, to_sch_idx, args):
@@ -476,15 +491,6 @@ class BaseGraphTuner(object):
 
         self._iterate_layout_transform(_fetch_args_callback)
 
-        def _log_to_list(record_list):
-            """Callback to log result to a list."""
-
-            def _callback(_, inputs, results):
-                """Callback implementation"""
-                record_list.append((inputs[0], results[0]))
-
-            return _callback
-
         builder = autotvm.LocalBuilder(n_parallel=n_parallel, build_func=build_func)
         if use_rpc:
             if device_key is None:
@@ -501,6 +507,8 @@ class BaseGraphTuner(object):
         elif not runner:
             runner = autotvm.LocalRunner(number=min_exec_num, repeat=1, timeout=timeout)
         measure_option = autotvm.measure_option(builder=builder, runner=runner)
+        # the layout transformations to benchmark, all measured in one batch
+        measure_inputs, measured_workloads = [], set()
         for args in args_list:
             data, in_layout, out_layout = args
             ltf_workload = autotvm.task.args_to_workload(args, "layout_transform")
@@ -531,13 +539,33 @@ class BaseGraphTuner(object):
                 self._layout_transform_perf_records[ltf_workload] = (record_input, record_output)
                 continue
 
-            records = []
+            if ltf_workload in measured_workloads:
+                continue
+            measured_workloads.add(ltf_workload)
             task = autotvm.task.create("layout_transform", args=args, target=self._target)
-            tuner = autotvm.tuner.GridSearchTuner(task)
-            tuner.tune(n_trial=1, measure_option=measure_option, callbacks=[_log_to_list(records)])
-            if not isinstance(records[0][1].costs[0], float):
-                records[0] = (records[0][0], records[0][1]._replace(costs=(INVALID_LAYOUT_TIME,)))
-            self._layout_transform_perf_records[ltf_workload] = records[0]
+            measure_inputs.append(MeasureInput(self._target, task, task.config_space.get(0)))
+
+        if measure_inputs:
+            self._logger.info("Benchmarking %d layout transformations...", len(measure_inputs))
+            # the runner is set up once, and the batch is split by n_parallel inside it
+            measure_batch = create_measure_batch(measure_inputs[0].task, measure_option)
+            GLOBAL_SCOPE.in_tuning = True
+            try:
+                results = measure_batch(measure_inputs)
+            finally:
+                GLOBAL_SCOPE.in_tuning = False
+                del measure_batch
+            new_records = []
+            for inp, res in zip(measure_inputs, results):
+                if not isinstance(res.costs[0], float):
+                    res = res._replace(costs=(INVALID_LAYOUT_TIME,))
+                else:
+                    new_records.append((inp, res))
+                self._layout_transform_perf_records[inp.task.workload] = (inp, res)
+            if layout_cache is not None and new_records:
+                with open(layout_cache, "a") as out_file:
+                    for inp, res in new_records:
+                        out_file.write(encode(inp, res) + "\n")
 
         self._iterate_layout_transform(self._create_matrix_callback)
         self._logger.info("Benchmarking layout transformation successful.")
@@ -122,11 +122,9 @@ class DPStage(object):
             input_stage = self._global_stage_dict[input_idx]
             input_dep = input_stage.dep
             input_states = input_stage.states
-            input_flatten_states = input_states.flatten()
             input_record_list = input_node_entry["record_candidates"]
             num_schedules = len(self._record_list)
             num_input_schedules = len(input_record_list)
-            num_input_states = input_flatten_states.shape[0]
 
             full_states_shape = tuple(
                 [num_schedules, num_input_schedules]
@@ -135,33 +133,26 @@ class DPStage(object):
                     for dep_idx in input_dep
                 ]
             )
-            self._full_states = np.zeros(full_states_shape).flatten().astype("float32")
             self._full_states_idx = [self._idx, input_idx] + input_dep
-            dep_multiplier = 1
-            for i in range(2, len(full_states_shape)):
-                dep_multiplier *= full_states_shape[i]
             input_node_time_counted = input_idx in self._global_counted_nodes_set
 
-            for i in range(num_schedules):
-                current_sch_time = float(self._record_list[i][1].costs[0])
-                for j in range(num_input_states):
-                    input_sch_idx = j // dep_multiplier
-                    layout_transform_time = self._global_layout_transform_interlayer_cost[
-                        (input_idx, self._idx)
-                    ][input_sch_idx][i]
-
-                    if input_node_time_counted:
-                        total_time = current_sch_time + layout_transform_time
-                    else:
-                        total_time = (
-                            current_sch_time + layout_transform_time + input_flatten_states[j]
-                        )
-                    current_state_idx = i * num_input_states + j
-                    self._full_states[current_state_idx] = total_time
+            # full_states[i, j, ...] = time of schedule i + layout transformation time from
+            # input schedule j to schedule i (+ input states[j, ...] if not counted yet)
+            dep_dims = (1,) * (len(full_states_shape) - 2)
+            current_sch_time = np.array(
+                [float(record[1].costs[0]) for record in self._record_list], dtype="float64"
+            ).reshape((num_schedules, 1) + dep_dims)
+            layout_transform_time = np.asarray(
+                self._global_layout_transform_interlayer_cost[(input_idx, self._idx)],
+                dtype="float64",
+            ).T.reshape((num_schedules, num_input_schedules) + dep_dims)
+            full_states = current_sch_time + layout_transform_time
+            if not input_node_time_counted:
+                full_states = full_states + input_states.reshape((1,) + full_states_shape[1:])
+            self._full_states = np.broadcast_to(full_states, full_states_shape).astype("float32")
 
             if not input_node_time_counted:
                 self._global_counted_nodes_set.add(input_idx)
-            self._full_states = self._full_states.reshape(full_states_shape)
 
             # If out degree of input node is 1, we can remove the dimension of input node,
             # since the states of input node will not be needed any more. Otherwise, input
@@ -222,44 +213,41 @@ class DPStage(object):
         states_list, aligned_node_list = DPStage.align_states(
             input_index_list, self._global_stage_dict, self._global_node_list
         )
-        target_node_idx, target_major_axis, target_multiplier, target_states = states_list[0]
+        target_node_idx, target_major_axis, _, target_states = states_list[0]
         aligned_shape = target_states.shape
-        self._full_states = np.zeros(aligned_shape).astype("float32").flatten()
         self._full_states_idx = list(aligned_node_list)
-        num_states = self._full_states.shape[0]
         node_time_counted = [item[0] in self._global_counted_nodes_set for item in states_list]
-        target_states = target_states.flatten()
-        src_states_list = [states_list[i][3].flatten() for i in range(1, len(states_list))]
-
-        for i in range(num_states):
-            target_sch_idx = (
-                i % (target_multiplier * aligned_shape[target_major_axis])
-            ) // target_multiplier
-            if node_time_counted[0]:
-                new_state = 0
+
+        # Each input node indexes its schedules along its major axis of the aligned states, so
+        # the layout transformation times are broadcast along the other axes.
+        if len(states_list) == 1:
+            new_states = np.zeros(aligned_shape)
+        elif node_time_counted[0]:
+            new_states = np.zeros(aligned_shape, dtype="float64")
+        else:
+            new_states = target_states.astype("float64")
+        for j in range(1, len(states_list)):
+            src_node_idx, src_major_axis, _, src_states = states_list[j]
+            layout_transform_time = np.asarray(
+                self._global_layout_transform_interlayer_cost[(src_node_idx, target_node_idx)],
+                dtype="float64",
+            )
+            if src_major_axis > target_major_axis:
+                layout_transform_time = layout_transform_time.T
+            expand_shape = [1] * len(aligned_shape)
+            expand_shape[src_major_axis] = aligned_shape[src_major_axis]
+            expand_shape[target_major_axis] = aligned_shape[target_major_axis]
+            layout_transform_time = layout_transform_time.reshape(expand_shape)
+
+            if node_time_counted[j]:
+                new_states = new_states + layout_transform_time
             else:
-                new_state = target_states[i]
-
-            for j in range(1, len(states_list)):
-                src_states = src_states_list[j - 1]
-                src_node_idx, src_major_axis, src_multiplier, _ = states_list[j]
-                src_sch_idx = (
-                    i % (src_multiplier * aligned_shape[src_major_axis])
-                ) // src_multiplier
-                layout_transform_time = self._global_layout_transform_interlayer_cost[
-                    (src_node_idx, target_node_idx)
-                ][src_sch_idx][target_sch_idx]
-
-                if node_time_counted[j]:
-                    new_state += layout_transform_time
-                else:
-                    new_state += layout_transform_time + src_states[i]
-                self._full_states[i] = new_state
+                new_states = new_states + (layout_transform_time + src_states)
+        self._full_states = np.broadcast_to(new_states, aligned_shape).astype("float32")
 
         for i, node_counted in enumerate(node_time_counted):
             if not node_counted:
                 self._global_counted_nodes_set.add(states_list[i][0])
-        self._full_states = self._full_states.reshape(aligned_shape)
 
         # Remove dependency to reduce states
         reduced_states = np.array(self._full_states)
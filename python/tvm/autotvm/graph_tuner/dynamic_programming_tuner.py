@@ -109,18 +109,13 @@ class DPTuner(BaseGraphTuner):
         num_states = states_list[0][3].size
         self._check_num_states(num_states * len(output_idx_list))
         aligned_node_shape = states_list[0][3].shape
-        min_time = 0
-        min_pos = -1
+        max_time = 0
         for states in states_list:
-            min_time += np.amax(states[3])
-        flatten_states_list = [current_states[3].flatten() for current_states in states_list]
-        for i in range(num_states):
-            current_time = 0
-            for j, current_states in enumerate(states_list):
-                current_time += flatten_states_list[j][i]
-            if min_time > current_time:
-                min_time = current_time
-                min_pos = i
+            max_time += np.amax(states[3])
+        total_time = np.sum([states[3].ravel() for states in states_list], axis=0)
+        min_pos = int(np.argmin(total_time))
+        if not total_time[min_pos] < max_time:
+            min_pos = -1
         for i, states in enumerate(states_list):
             current_major_axis = states[1]
             current_sch_idx = (
@@ -0,0 +1,219 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name, too-many-locals
+"""Time-budgeted approximate graph tuner based on local search"""
+import time
+
+import numpy as np
+
+from ._base import INVALID_LAYOUT_TIME
+from .pbqp_tuner import PBQPTuner
+
+
+class LocalSearchTuner(PBQPTuner):
+    """An approximate graph tuner for large graphs, which improves an initial solution by
+    iterated local search until a time budget runs out.
+
+    The problem is the same as PBQPTuner: a schedule cost vector for each node and a layout
+    transformation cost matrix for each edge. Each step picks the best schedule of a node
+    given the schedules of its neighbors. Nodes tied by the identity matrices of multi-input
+    nodes move together. When no step improves the solution, a random part of the best
+    solution is perturbed and improved again.
+
+    After running, `quality` reports the cost of the solution together with a lower bound
+    of the optimal cost, i.e. the sum of the minimum of every cost vector and matrix.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Create a local search graph tuner."""
+        super(LocalSearchTuner, self).__init__(*args, **kwargs)
+        self._quality = None
+
+    @property
+    def quality(self):
+        """The quality report of the last run.
+
+        Returns
+        -------
+        quality : dict of str to float
+            The "cost" of the solution, the "initial_cost" before the local search,
+            the "lower_bound" of the optimal cost, the relative "gap" between the cost and
+            the lower bound, the number of "iterations" and the "elapsed" seconds.
+        """
+        return self._quality
+
+    def _build_problem(self):
+        """Group the nodes tied by identity matrices, and collect the costs of each group."""
+        nodes = sorted(self._record_cost_dict)
+        parent = {node: node for node in nodes}
+
+        def _find(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        edges = []
+        for (x, y), ltf_matrix in self._layout_transform_interlayer_cost.items():
+            if x < y and x in parent and y in parent:
+                edges.append((x, y, ltf_matrix))
+                n = ltf_matrix.shape[0]
+                if ltf_matrix.shape[1] == n and np.array_equal(
+                    ltf_matrix, np.where(np.eye(n, dtype="bool"), 0.0, INVALID_LAYOUT_TIME)
+                ):
+                    parent[_find(x)] = _find(y)
+
+        groups = {}
+        for node in nodes:
+            groups.setdefault(_find(node), []).append(node)
+        group_list = list(groups.values())
+        group_of = {node: g for g, members in enumerate(group_list) for node in members}
+
+        # The schedule costs of each group, including the edges inside it, and the edges
+        # between groups as (other group, matrix indexed by [own schedule, other schedule])
+        group_costs = [
+            np.sum([self._record_cost_dict[node] for node in members], axis=0)
+            for members in group_list
+        ]
+        group_edges = [[] for _ in group_list]
+        for x, y, ltf_matrix in edges:
+            gx, gy = group_of[x], group_of[y]
+            if gx == gy:
+                group_costs[gx] = group_costs[gx] + np.diagonal(ltf_matrix)
+            else:
+                group_edges[gx].append((gy, ltf_matrix))
+                group_edges[gy].append((gx, ltf_matrix.T))
+
+        lower_bound = sum(float(np.min(self._record_cost_dict[node])) for node in nodes)
+        lower_bound += sum(float(np.min(ltf_matrix)) for _, _, ltf_matrix in edges)
+        return group_list, group_costs, group_edges, lower_bound
+
+    @staticmethod
+    def _local_cost(group, solution, group_costs, group_edges):
+        """The cost of each schedule of a group given the schedules of its neighbors."""
+        cost = group_costs[group].copy()
+        for other, ltf_matrix in group_edges[group]:
+            cost += ltf_matrix[:, solution[other]]
+        return cost
+
+    @staticmethod
+    def _total_cost(solution, group_costs, group_edges):
+        """The total cost of a solution."""
+        total = 0.0
+        for group, cost in enumerate(group_costs):
+            total += cost[solution[group]]
+            for other, ltf_matrix in group_edges[group]:
+                # each edge is visited from both ends
+                total += 0.5 * ltf_matrix[solution[group], solution[other]]
+        return float(total)
+
+    def _descend(self, solution, group_costs, group_edges, deadline):
+        """Move groups to their best schedules until no move improves or time is up."""
+        improved = True
+        while improved and time.time() < deadline:
+            improved = False
+            for group in range(len(group_costs)):
+                cost = self._local_cost(group, solution, group_costs, group_edges)
+                best = int(np.argmin(cost))
+                if cost[best] < cost[solution[group]]:
+                    solution[group] = best
+                    improved = True
+        return solution
+
+    def run(self, **kwargs):
+        """Run local search graph tuner.
+
+        Parameters
+        ----------
+        time_budget : float, optional
+            The time budget of the local search in seconds. Defaults to 60.
+        init : str, optional
+            The initial solution. If is 'pbqp', use the solution of PBQPTuner.
+            If is 'greedy', use the fastest schedule of each node. Defaults to 'pbqp'.
+        perturb_ratio : float, optional
+            The ratio of nodes to perturb in each iteration. Defaults to 0.1.
+        seed : int, optional
+            The random seed of perturbation.
+        """
+        tic = time.time()
+        time_budget = kwargs.get("time_budget", 60)
+        init = kwargs.get("init", "pbqp")
+        perturb_ratio = kwargs.get("perturb_ratio", 0.1)
+        rng = np.random.RandomState(kwargs.get("seed", None))
+        deadline = tic + time_budget
+
+        self._logger.info("Start to run local search algorithm...")
+        if init not in ("pbqp", "greedy"):
+            raise ValueError(f"Invalid initial solution: {init}")
+        self._prepare_cost_matrices()
+        if init == "pbqp":
+            # PBQP reduces the cost vectors and matrices in place, so keep the originals
+            record_costs = {key: val.copy() for key, val in self._record_cost_dict.items()}
+            ltf_costs = {
+                key: val.copy() for key, val in self._layout_transform_interlayer_cost.items()
+            }
+            self._forward()
+            self._backward()
+            self._record_cost_dict = record_costs
+            self._layout_transform_interlayer_cost = ltf_costs
+
+        group_list, group_costs, group_edges, lower_bound = self._build_problem()
+        if init == "pbqp":
+            solution = [self._optimal_record_dict[members[0]] for members in group_list]
+        else:
+            solution = [int(np.argmin(cost)) for cost in group_costs]
+
+        initial_cost = self._total_cost(solution, group_costs, group_edges)
+        best_solution = self._descend(list(solution), group_costs, group_edges, deadline)
+        best_cost = self._total_cost(best_solution, group_costs, group_edges)
+        num_perturb = max(1, int(len(group_list) * perturb_ratio))
+        num_iter = 0
+        while time.time() < deadline and best_cost > lower_bound:
+            num_iter += 1
+            solution = list(best_solution)
+            for group in rng.choice(len(group_list), min(num_perturb, len(group_list)), False):
+                solution[group] = rng.randint(len(group_costs[group]))
+            solution = self._descend(solution, group_costs, group_edges, deadline)
+            cost = self._total_cost(solution, group_costs, group_edges)
+            if cost < best_cost:
+                best_solution, best_cost = solution, cost
+
+        self._optimal_record_dict = {
+            node: best_solution[group]
+            for group, members in enumerate(group_list)
+            for node in members
+        }
+        self._quality = {
+            "cost": best_cost,
+            "initial_cost": initial_cost,
+            "lower_bound": lower_bound,
+            "gap": (best_cost - lower_bound) / best_cost if best_cost > 0 else 0.0,
+            "iterations": num_iter,
+            "elapsed": time.time() - tic,
+        }
+        if best_cost >= INVALID_LAYOUT_TIME:
+            self._logger.warning("Local search failed to find a valid solution.")
+        self._logger.info(
+            "Finished local search run. Cost: %.6g (initial %.6g), lower bound: %.6g, "
+            "gap: %.2f%%, iterations: %d, elapsed: %.2f s.",
+            best_cost,
+            initial_cost,
+            lower_bound,
+            100 * self._quality["gap"],
+            num_iter,
+            self._quality["elapsed"],
+        )
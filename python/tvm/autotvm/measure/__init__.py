@@ -27,7 +27,9 @@ from .measure_methods import (
     LocalBuilder,
     LocalRunner,
     RPCRunner,
+    close_session_pools,
     default_module_loader,
+    pooled_remote,
     request_remote,
 )
-from .executor import Executor
+from .executor import Executor, ThreadExecutor
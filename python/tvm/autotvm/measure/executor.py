@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 """ Abstraction for asynchronous job execution """
+import concurrent.futures
 
 
 class Executor(object):
@@ -65,6 +66,17 @@ class Future(object):
         """
         raise NotImplementedError()
 
+    def cancel(self):
+        """
+        Cancel the job if it has not started running.
+
+        Returns
+        -------
+        cancelled : bool
+            Whether the job is cancelled.
+        """
+        raise NotImplementedError()
+
     def get(self, timeout=None):
         """
         Get the result. This will block until the result is available.
@@ -100,3 +112,56 @@ class ExecutionError(FutureError):
     """
     Error raised when future execution crashes or failed.
     """
+
+
+class ThreadExecutor(Executor):
+    """
+    An executor running jobs in a pool of local threads.
+    Suitable for jobs that mostly wait on other processes or remote devices,
+    e.g. the builds and runs of measurement batches.
+
+    Parameters
+    ----------
+    max_workers : int
+        The maximum number of jobs running at the same time
+    """
+
+    def __init__(self, max_workers=1):
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(self, func, *args, **kwargs):
+        return ThreadFuture(self._pool.submit(func, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        """
+        Stop accepting new jobs and release the threads.
+
+        Parameters
+        ----------
+        wait : bool
+            Whether to block until the submitted jobs finish.
+        """
+        self._pool.shutdown(wait=wait)
+
+
+class ThreadFuture(Future):
+    """
+    The future of a job submitted to :any:`ThreadExecutor`.
+    """
+
+    def __init__(self, future):
+        self._future = future
+
+    def done(self):
+        return self._future.done()
+
+    def cancel(self):
+        return self._future.cancel()
+
+    def get(self, timeout=None):
+        try:
+            return self._future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            raise TimeoutError()
+        except Exception as exc:
+            raise ExecutionError(str(exc)) from exc
@@ -18,6 +18,7 @@
 """User facing API for specifying how to measure the generated code"""
 import enum
 import multiprocessing
+import threading
 from collections import namedtuple
 
 
@@ -139,6 +140,12 @@ class Builder(object):
         """
         raise NotImplementedError()
 
+    def release(self):
+        """Release the files of the last batch built by the calling thread.
+        It is called once the batch has been run; builders that keep no files
+        need not override it.
+        """
+
 
 class Runner(object):
     """Runner that runs and measures the time cost of a generated program in tuning
@@ -286,9 +293,17 @@ def create_measure_batch(task, option):
     build_kwargs = runner.get_build_kwargs()
     builder.set_task(task, build_kwargs)
 
+    # measure_batch may be called by several threads at the same time. Their builds
+    # overlap, but the runs are serialized, so that batches do not compete for devices.
+    run_lock = threading.Lock()
+
     def measure_batch(measure_inputs):
         build_results = builder.build(measure_inputs)
-        results = runner.run(measure_inputs, build_results)
+        try:
+            with run_lock:
+                results = runner.run(measure_inputs, build_results)
+        finally:
+            builder.release()
         return results
 
     measure_batch.n_parallel = builder.n_parallel
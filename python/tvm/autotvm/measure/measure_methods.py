@@ -26,6 +26,7 @@ import contextlib
 import logging
 import os
 import shutil
+import tarfile
 import tempfile
 import threading
 import time
@@ -123,18 +124,20 @@ class LocalBuilder(Builder):
         self.executor = PopenPoolExecutor(
             timeout=timeout, initializer=reset_global_scope, initargs=(AutotvmGlobalScope.current,)
         )
-        self.tmp_dir = tempfile.mkdtemp()
+        # every thread builds its batches in a directory of its own, so that the builds
+        # of concurrent batches do not remove the libraries of a batch being run
+        self._local = threading.local()
 
     def build(self, measure_inputs):
         results = []
 
-        shutil.rmtree(self.tmp_dir, ignore_errors=True)
-        self.tmp_dir = tempfile.mkdtemp()
+        self.release()
+        tmp_dir = self._local.tmp_dir = tempfile.mkdtemp()
 
         for i in range(0, len(measure_inputs), self.n_parallel):
             futures = []
             for inp in measure_inputs[i : i + self.n_parallel]:
-                ret = self.executor.submit(self.build_func, inp, self.tmp_dir, **self.build_kwargs)
+                ret = self.executor.submit(self.build_func, inp, tmp_dir, **self.build_kwargs)
                 futures.append(ret)
 
             for future in futures:
@@ -191,6 +194,12 @@ class LocalBuilder(Builder):
 
         return results
 
+    def release(self):
+        tmp_dir = getattr(self._local, "tmp_dir", None)
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            self._local.tmp_dir = None
+
 
 class RPCRunner(Runner):
     """Run generated code on remove devices.
@@ -235,6 +244,19 @@ class RPCRunner(Runner):
     module_loader : ModuleLoader
         If given, a context manager that loads the module to be timed into the remote runtime.
         If not given, default_module_loader is used.
+    pack_size: int, optional
+        The maximum number of candidates packed into one library. If is greater than 1,
+        the CPU candidates built in the default tar format are linked into one library, which is
+        uploaded and loaded once, and their functions are timed by name in a single session.
+        The remote arguments are reused by the candidates with the same argument info.
+        If the libraries cannot be packed, the candidates are run one by one.
+    max_session_uses: int, optional
+        The number of measurements run in one remote session. If is greater than 1, each worker
+        keeps its session in a pool and reuses it for the next measurements, instead of
+        requesting a new one from the tracker, see tvm.rpc.SessionPool. As each worker holds
+        one device meanwhile, n_parallel should not exceed the number of devices. The pools are
+        closed when the runner is shut down, see `shutdown`. Only the default module loader
+        reuses sessions, a custom module_loader gets the same remote arguments as without it.
     """
 
     def __init__(
@@ -251,6 +273,8 @@ class RPCRunner(Runner):
         cooldown_interval=0.1,
         enable_cpu_cache_flush=False,
         module_loader=None,
+        pack_size=1,
+        max_session_uses=1,
     ):
         super(RPCRunner, self).__init__(timeout, n_parallel)
 
@@ -268,12 +292,33 @@ class RPCRunner(Runner):
         self.enable_cpu_cache_flush = enable_cpu_cache_flush
         self.cooldown_interval = cooldown_interval
         self.module_loader = module_loader
+        self.pack_size = pack_size
+        self.max_session_uses = max_session_uses
 
+        # the workers close their session pools when shut down
+        finalizer = close_session_pools if max_session_uses > 1 else None
         self.executor = PopenPoolExecutor(
             timeout=timeout * (self.n_parallel + 1),
             initializer=reset_global_scope,
             initargs=(AutotvmGlobalScope.current,),
+            finalizer=finalizer,
         )
+        # a packed library is measured in one job, so the timeout grows with the pack size
+        self.pack_executor = None
+        if pack_size > 1:
+            self.pack_executor = PopenPoolExecutor(
+                timeout=timeout * (self.n_parallel + 1) * pack_size,
+                initializer=reset_global_scope,
+                initargs=(AutotvmGlobalScope.current,),
+                finalizer=finalizer,
+            )
+
+    def shutdown(self):
+        """Shut down the workers, closing their session pools.
+        The runner cannot run after it is shut down."""
+        self.executor.shutdown()
+        if self.pack_executor is not None:
+            self.pack_executor.shutdown()
 
     @property
     def ref_input(self):
@@ -328,12 +373,14 @@ class RPCRunner(Runner):
             }
         if "hexagon" in self.task.target.keys:
             kwargs["checks"]["hexagon"] = {"vtcm_capacity": self.task.target.vtcm_capacity}
+        if self.pack_size > 1:
+            # the functions of the candidates must not clash when linked into one library
+            kwargs["unique_name"] = True
 
         return kwargs
 
-    def run(self, measure_inputs, build_results):
-        results = []
-        remote_kwargs = dict(
+    def _remote_kwargs(self):
+        return dict(
             device_key=self.key,
             host=self.host,
             port=self.port,
@@ -341,16 +388,30 @@ class RPCRunner(Runner):
             timeout=self.timeout,
         )
 
+    def _module_loader(self):
+        module_loader = (
+            self.module_loader if self.module_loader is not None else default_module_loader()
+        )
+        # only the default module loader reuses the sessions, a custom one opens its own
+        if isinstance(module_loader, DefaultModuleLoader) and self.max_session_uses > 1:
+            module_loader = DefaultModuleLoader(
+                module_loader.pre_load_function, self.max_session_uses
+            )
+        return module_loader
+
+    def run(self, measure_inputs, build_results):
+        if self.pack_size > 1:
+            return self._run_packed(measure_inputs, build_results)
+
+        results = []
+        remote_kwargs = self._remote_kwargs()
+
         for i in range(0, len(measure_inputs), self.n_parallel):
             futures = []
             for measure_inp, build_res in zip(
                 measure_inputs[i : i + self.n_parallel], build_results[i : i + self.n_parallel]
             ):
-                module_loader = (
-                    self.module_loader
-                    if self.module_loader is not None
-                    else default_module_loader()
-                )
+                module_loader = self._module_loader()
                 ret = self.executor.submit(
                     run_through_rpc,
                     measure_inp,
@@ -380,6 +441,84 @@ class RPCRunner(Runner):
 
         return results
 
+    def _run_packed(self, measure_inputs, build_results):
+        """Run the candidates, packing the packable ones into libraries of pack_size"""
+        results = [None] * len(measure_inputs)
+        remote_kwargs = self._remote_kwargs()
+        module_loader = self._module_loader()
+
+        groups, packable = [], []
+        for i, build_res in enumerate(build_results):
+            if isinstance(build_res, MeasureResult):
+                results[i] = build_res
+            elif _is_packable(build_res.filename):
+                packable.append(i)
+            else:
+                groups.append([i])
+        for i in range(0, len(packable), self.pack_size):
+            groups.append(packable[i : i + self.pack_size])
+
+        for i in range(0, len(groups), self.n_parallel):
+            futures = []
+            for group in groups[i : i + self.n_parallel]:
+                inputs = [measure_inputs[j] for j in group]
+                builds = [build_results[j] for j in group]
+                args = (
+                    self.number,
+                    self.repeat,
+                    self.min_repeat_ms,
+                    self.cooldown_interval,
+                    remote_kwargs,
+                    self.ref_input,
+                    self.enable_cpu_cache_flush,
+                    module_loader,
+                )
+                if len(group) == 1 and group[0] not in packable:
+                    future = self.executor.submit(run_through_rpc, inputs[0], builds[0], *args)
+                    futures.append((group, future, None))
+                    continue
+                packed_filename = os.path.join(
+                    os.path.dirname(builds[0].filename), f"packed_{getrandbits(64):0x}.tar"
+                )
+                try:
+                    _pack_libraries([res.filename for res in builds], packed_filename)
+                except (OSError, tarfile.TarError):
+                    logger.debug(
+                        "Failed to pack libraries into %s:\n%s",
+                        packed_filename,
+                        traceback.format_exc(),
+                    )
+                    if os.path.exists(packed_filename):
+                        os.remove(packed_filename)
+                    # fall back to run the candidates one by one
+                    for j, inp, build_res in zip(group, inputs, builds):
+                        future = self.executor.submit(run_through_rpc, inp, build_res, *args)
+                        futures.append(([j], future, None))
+                    continue
+                future = self.pack_executor.submit(
+                    run_packed_through_rpc, inputs, builds, packed_filename, *args
+                )
+                futures.append((group, future, packed_filename))
+
+            for group, future, packed_filename in futures:
+                try:
+                    res = future.result()
+                    res = res if isinstance(res, list) else [res]
+                except Exception as ex:  # pylint: disable=broad-except
+                    tb = traceback.format_exc()
+                    res = [
+                        MeasureResult(
+                            (tb, ex), MeasureErrorNo.RUN_TIMEOUT, self.timeout, time.time()
+                        )
+                    ] * len(group)
+                finally:
+                    if packed_filename is not None and os.path.exists(packed_filename):
+                        os.remove(packed_filename)
+                for j, r in zip(group, res):
+                    results[j] = r
+
+        return results
+
 
 class LocalRunner(RPCRunner):
     """Run generated code on local devices.
@@ -412,6 +551,8 @@ class LocalRunner(RPCRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    pack_size: int, optional
+        The maximum number of candidates packed into one library. See RPCRunner.
     Note
     ----
     This is a "fake" local mode. We start a silent rpc tracker and rpc server
@@ -427,6 +568,7 @@ class LocalRunner(RPCRunner):
         cooldown_interval=0.1,
         enable_cpu_cache_flush=False,
         module_loader=None,
+        pack_size=1,
     ):
         super(LocalRunner, self).__init__(
             "",
@@ -441,6 +583,7 @@ class LocalRunner(RPCRunner):
             cooldown_interval=cooldown_interval,
             enable_cpu_cache_flush=enable_cpu_cache_flush,
             module_loader=module_loader,
+            pack_size=pack_size,
         )
         self.tracker = None
         self.server = None
@@ -468,7 +611,7 @@ class LocalRunner(RPCRunner):
         return server, tracker
 
 
-def _build_func_common(measure_input, runtime=None, checks=None, build_option=None):
+def _build_func_common(measure_input, runtime=None, checks=None, build_option=None, name=None):
     """Common part for building a configuration"""
     target, task, config = measure_input
     target, task.target_host = Target.canon_target_and_host(target, task.target_host)
@@ -514,7 +657,10 @@ def _build_func_common(measure_input, runtime=None, checks=None, build_option=No
                 instruments=current_pass_context.instruments,
                 config=current_config,
             ):
-                func = build(s, args, target=target, runtime=runtime)
+                if name is not None:
+                    func = build(s, args, target=target, runtime=runtime, name=name)
+                else:
+                    func = build(s, args, target=target, runtime=runtime)
     return func, tuple((get_const_tuple(x.shape), x.dtype) for x in args)
 
 
@@ -557,10 +703,13 @@ class _WrappedBuildFunc:
             The path of temporary directory to export generated library
         """
         tic = time.time()
+        # name the function after the library, so that libraries can be linked together
+        unique_name = kwargs.pop("unique_name", False)
         try:
-            filename = os.path.join(
-                tmp_dir, f"tmp_func_{getrandbits(64):0x}.{self.build_func.output_format}"
-            )
+            func_name = f"tmp_func_{getrandbits(64):0x}"
+            filename = os.path.join(tmp_dir, f"{func_name}.{self.build_func.output_format}")
+            if unique_name:
+                kwargs["name"] = func_name
             # TODO(tvm-team) consider linline _build_func_common
             func, arg_info = _build_func_common(measure_input, self.runtime, **kwargs)
             if self.build_func.output_format == ".model-library-format":
@@ -622,7 +771,7 @@ def run_through_rpc(
     cooldown_interval: float
         The cool down interval between two measurements
     remote_kwargs: dict
-        Passed to module_loader(). Ultimately, keyword args to request_remote().
+        Passed to module_loader(). Ultimately, keyword args to pooled_remote().
     ref_input: List of np.ndarray
         The reference input used for tuning. Empty for randomly filled input.
     enable_cpu_cache_flush: bool
@@ -642,83 +791,240 @@ def run_through_rpc(
     try:
         # upload built module
         with module_loader(remote_kwargs, build_result) as (remote, mod):
-            dev = remote.device(str(measure_input.target), 0)
-
-            # Limitation:
-            # We can not get PackFunction directly in the remote mode as it is wrapped
-            # under the std::function. We could lift the restriction later once we fold
-            # the PackedFunc as an object. Currently, we pass function name to work
-            # around it.
-            f_prepare = "cache_flush_cpu_non_first_arg" if enable_cpu_cache_flush else ""
-            time_f = mod.time_evaluator(
+            costs = _time_remote_func(
+                remote,
+                mod,
                 mod.entry_name,
-                dev,
-                number=number,
-                repeat=repeat,
-                min_repeat_ms=min_repeat_ms,
-                f_preproc=f_prepare,
+                measure_input,
+                build_result,
+                number,
+                repeat,
+                min_repeat_ms,
+                ref_input,
+                enable_cpu_cache_flush,
             )
-
-            if ref_input:
-                args = [nd.array(x, device=dev) for x in ref_input]
-            else:
-                try:
-                    random_fill = remote.get_function("tvm.contrib.random.random_fill")
-                except AttributeError:
-                    raise AttributeError(
-                        "Please make sure USE_RANDOM is ON in the config.cmake "
-                        "on the remote devices"
-                    )
-                args = [nd.empty(x[0], x[1], dev) for x in build_result.arg_info]
-                if "scatter" not in measure_input.task.name:
-                    # the index tensor of scatter op cannot be randomly initialized
-                    for arg in args:
-                        random_fill(arg)
-                dev.sync()
-
-            costs = time_f(*args).results
-
-        if len(costs) > 2:  # remove largest and smallest value to reduce variance
-            costs = list(costs)
-            costs.sort()
-            costs = tuple(costs[1:-1])
     except TVMError as exc:
-        msg = str(exc)
-        if "Stack trace returned" in msg:
-            msg = msg[: msg.index("Stack trace returned")]
-        if "CUDA Source" in msg:
-            msg = msg[: msg.index("CUDA Source")]
-        costs = (traceback.format_exc(), RuntimeError(msg[:1024]))
+        costs = _runtime_error_costs(exc)
         errno = MeasureErrorNo.RUNTIME_DEVICE
     tstamp = time.time()
     time.sleep(cooldown_interval)
     return MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp)
 
 
+def run_packed_through_rpc(
+    measure_inputs,
+    build_results,
+    packed_filename,
+    number,
+    repeat,
+    min_repeat_ms,
+    cooldown_interval,
+    remote_kwargs,
+    ref_input,
+    enable_cpu_cache_flush=False,
+    module_loader=None,
+):
+    """Run a library packing several generated functions through rpc
+
+    The library is uploaded and loaded once, then the function of each candidate is timed by
+    its name. The remote arguments are reused by the candidates with the same argument info.
+    If the packed library fails to load, the rest of the candidates are run one by one.
+
+    Parameters
+    ----------
+    measure_inputs: List of MeasureInput
+        The raw measure inputs
+    build_results: List of BuildResult
+        The results returned from Builder, whose libraries are packed.
+    packed_filename: str
+        The path to the packed library.
+    number, repeat, min_repeat_ms, cooldown_interval, remote_kwargs, ref_input,
+    enable_cpu_cache_flush, module_loader:
+        See run_through_rpc.
+
+    Returns
+    -------
+    results: List of MeasureResult
+        The result of each candidate
+    """
+    results = []
+    args_cache = {}
+    try:
+        tic = time.time()
+        packed = BuildResult(packed_filename, None, None, 0.0)
+        with module_loader(remote_kwargs, packed) as (remote, mod):
+            for measure_input, build_result in zip(measure_inputs, build_results):
+                errno = MeasureErrorNo.NO_ERROR
+                try:
+                    costs = _time_remote_func(
+                        remote,
+                        mod,
+                        _packed_func_name(build_result.filename),
+                        measure_input,
+                        build_result,
+                        number,
+                        repeat,
+                        min_repeat_ms,
+                        ref_input,
+                        enable_cpu_cache_flush,
+                        args_cache,
+                    )
+                except TVMError as exc:
+                    costs = _runtime_error_costs(exc)
+                    errno = MeasureErrorNo.RUNTIME_DEVICE
+                tstamp = time.time()
+                time.sleep(cooldown_interval)
+                results.append(
+                    MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp)
+                )
+                tic = time.time()
+    except TVMError:
+        logger.debug(
+            "Failed to run packed library %s:\n%s", packed_filename, traceback.format_exc()
+        )
+    # the packed library failed to load, or the session broke, fall back to one by one
+    for measure_input, build_result in list(zip(measure_inputs, build_results))[len(results) :]:
+        results.append(
+            run_through_rpc(
+                measure_input,
+                build_result,
+                number,
+                repeat,
+                min_repeat_ms,
+                cooldown_interval,
+                remote_kwargs,
+                ref_input,
+                enable_cpu_cache_flush,
+                module_loader,
+            )
+        )
+    return results
+
+
+def _time_remote_func(
+    remote,
+    mod,
+    func_name,
+    measure_input,
+    build_result,
+    number,
+    repeat,
+    min_repeat_ms,
+    ref_input,
+    enable_cpu_cache_flush,
+    args_cache=None,
+):
+    """Time a function of a loaded remote module, returning the costs"""
+    dev = remote.device(str(measure_input.target), 0)
+
+    # Limitation:
+    # We can not get PackFunction directly in the remote mode as it is wrapped
+    # under the std::function. We could lift the restriction later once we fold
+    # the PackedFunc as an object. Currently, we pass function name to work
+    # around it.
+    f_prepare = "cache_flush_cpu_non_first_arg" if enable_cpu_cache_flush else ""
+    time_f = mod.time_evaluator(
+        func_name,
+        dev,
+        number=number,
+        repeat=repeat,
+        min_repeat_ms=min_repeat_ms,
+        f_preproc=f_prepare,
+    )
+
+    args = args_cache.get(build_result.arg_info) if args_cache is not None else None
+    if args is None:
+        if ref_input:
+            args = [nd.array(x, device=dev) for x in ref_input]
+        else:
+            try:
+                random_fill = remote.get_function("tvm.contrib.random.random_fill")
+            except AttributeError:
+                raise AttributeError(
+                    "Please make sure USE_RANDOM is ON in the config.cmake " "on the remote devices"
+                )
+            args = [nd.empty(x[0], x[1], dev) for x in build_result.arg_info]
+            if "scatter" not in measure_input.task.name:
+                # the index tensor of scatter op cannot be randomly initialized
+                for arg in args:
+                    random_fill(arg)
+            dev.sync()
+        if args_cache is not None:
+            args_cache[build_result.arg_info] = args
+
+    costs = time_f(*args).results
+
+    if len(costs) > 2:  # remove largest and smallest value to reduce variance
+        costs = list(costs)
+        costs.sort()
+        costs = tuple(costs[1:-1])
+    return costs
+
+
+def _runtime_error_costs(exc):
+    """The costs field of a MeasureResult for a runtime error"""
+    msg = str(exc)
+    if "Stack trace returned" in msg:
+        msg = msg[: msg.index("Stack trace returned")]
+    if "CUDA Source" in msg:
+        msg = msg[: msg.index("CUDA Source")]
+    return (traceback.format_exc(), RuntimeError(msg[:1024]))
+
+
+def _packed_func_name(filename):
+    """The name of the function in a library built with unique names"""
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def _is_packable(filename):
+    """Whether a built library can be linked with others, i.e. a tar of a single host object"""
+    if filename is None or not filename.endswith(".tar"):
+        return False
+    try:
+        with tarfile.open(filename, "r:*") as src:
+            return src.getnames() == ["lib0.o"]
+    except (OSError, tarfile.TarError):
+        return False
+
+
+def _pack_libraries(filenames, packed_filename):
+    """Merge the objects of several tar libraries into one uncompressed tar library"""
+    with tarfile.open(packed_filename, "w") as dst:
+        for i, filename in enumerate(filenames):
+            with tarfile.open(filename, "r:*") as src:
+                for member in src.getmembers():
+                    fileobj = src.extractfile(member)
+                    member.name = f"c{i}_{member.name}"
+                    dst.addfile(member, fileobj)
+
+
 class DefaultModuleLoader:
     """See default_module_loader(). A pickleable emulation of the original function closure."""
 
-    def __init__(self, pre_load_function=None) -> None:
+    def __init__(self, pre_load_function=None, max_session_uses=1) -> None:
         self.pre_load_function = pre_load_function
+        self.max_session_uses = max_session_uses
 
     @contextlib.contextmanager
     def __call__(self, remote_kwargs, build_result):
-        remote = request_remote(**remote_kwargs)
-        if self.pre_load_function is not None:
-            self.pre_load_function(remote, build_result)
+        with pooled_remote(**remote_kwargs, max_session_uses=self.max_session_uses) as remote:
+            if self.pre_load_function is not None:
+                self.pre_load_function(remote, build_result)
 
-        remote.upload(build_result.filename)
-        try:
-            yield remote, remote.load_module(os.path.split(build_result.filename)[1])
+            remote.upload(build_result.filename)
+            try:
+                yield remote, remote.load_module(os.path.split(build_result.filename)[1])
 
-        finally:
-            # clean up remote files
-            remote.remove(build_result.filename)
-            remote.remove(os.path.splitext(build_result.filename)[0] + ".so")
-            remote.remove("")
+            finally:
+                # clean up remote files
+                remote.remove(build_result.filename)
+                remote.remove(os.path.splitext(build_result.filename)[0] + ".so")
+                # keep the work directory of a session that is reused
+                if self.max_session_uses <= 1:
+                    remote.remove("")
 
 
-def default_module_loader(pre_load_function=None):
+def default_module_loader(pre_load_function=None, max_session_uses=1):
     """Returns a default function that can be passed as module_loader to run_through_rpc.
 
     Parameters
@@ -727,6 +1033,9 @@ def default_module_loader(pre_load_function=None):
         Invoked after a session is established and before the default code-loading RPC calls are
         issued. Allows performing pre-upload actions, e.g. resetting the remote runtime environment.
 
+    max_session_uses : int, optional
+        The number of measurements run in one remote session, see pooled_remote().
+
     Returns
     -------
     DefaultModuleLoader :
@@ -735,7 +1044,7 @@ def default_module_loader(pre_load_function=None):
 
     # This was a function with a closure before but that couldn't be pickled!
     # We need pickle to work for using python's multiprocessing on some platforms.
-    return DefaultModuleLoader(pre_load_function)
+    return DefaultModuleLoader(pre_load_function, max_session_uses)
 
 
 def request_remote(device_key, host=None, port=None, priority=1, timeout=60):
@@ -769,6 +1078,48 @@ def request_remote(device_key, host=None, port=None, priority=1, timeout=60):
     return remote
 
 
+# The session pools of this process, keyed by the tracker address and the session options.
+_SESSION_POOLS = {}
+
+
+@contextlib.contextmanager
+def pooled_remote(device_key, host=None, port=None, priority=1, timeout=60, max_session_uses=1):
+    """Acquire a remote session, which is reused by the next calls in this process
+
+    Parameters
+    ----------
+    device_key, host, port, priority, timeout:
+        See request_remote.
+    max_session_uses: int, optional
+        The number of calls a session is reused for, before the device is given back
+        to the tracker. If is 1, a new session is requested for each call.
+
+    Returns
+    ------
+    session: ContextManager[RPCSession]
+    """
+    if max_session_uses <= 1:
+        yield request_remote(device_key, host, port, priority, timeout)
+        return
+    host = host or os.environ["TVM_TRACKER_HOST"]
+    port = port or int(os.environ["TVM_TRACKER_PORT"])
+    pool_key = (host, port, timeout, max_session_uses)
+    if pool_key not in _SESSION_POOLS:
+        _SESSION_POOLS[pool_key] = _rpc.SessionPool(
+            (host, port), session_timeout=timeout, max_uses=max_session_uses
+        )
+    with _SESSION_POOLS[pool_key].session(device_key, priority) as remote:
+        yield remote
+
+
+def close_session_pools():
+    """Close the session pools of this process, giving their devices back to the tracker"""
+    pools = list(_SESSION_POOLS.values())
+    _SESSION_POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
 def check_remote(target, device_key, host=None, port=None, priority=100, timeout=10):
     """
     Check the availability of a remote device
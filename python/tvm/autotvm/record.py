@@ -21,14 +21,18 @@
 import argparse
 import base64
 from io import TextIOBase
+import functools
+import hashlib
+import heapq
 import logging
+import mmap
 import pickle
 import json
+import struct
+import tempfile
 import time
-from typing import Union
+from typing import Dict, Optional, Tuple, Union
 import os
-import itertools
-from collections import OrderedDict
 import numpy as np
 
 from .. import build, lower
@@ -239,97 +243,508 @@ def load_from_file(filepath: Union[str, bytes, os.PathLike]):
                 yield ret
 
 
-def split_workload(in_file, clean=True):
+# The size of the byte ranges of the logs processed by one task
+_CHUNK_BYTES = 64 * 1024 * 1024
+# The number of partitions the rows are shuffled into, by the hash of their workload
+_NUM_PARTITIONS = 64
+# The size of the rows split_workload buffers in a partition before appending them to the files
+_SPLIT_BUFFER_BYTES = 16 * 1024 * 1024
+
+
+def _key_hash(obj):
+    return hashlib.sha1(json.dumps(obj).encode("utf-8")).hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def _target_info(target_str):
+    """The canonical string, keys and model of a target string in the log"""
+    if "-target" in target_str:
+        target_str = target_str.replace("-target", "-mtriple")
+    tgt = Target(target_str)
+    return str(tgt), tuple(tgt.keys), tgt.model
+
+
+def _scan_row(row):
+    """Extract the hashed keys of a json row, without decoding it into autotvm objects.
+
+    Returns None for rows to skip, otherwise a tuple of the hash of the workload, of
+    `measure_str_key(inp, False)`, of the config, the mean cost (nan for failed measurements),
+    and the names (target keys and model) the best records are picked by.
+    """
+    if not row or row.startswith("#"):
+        return None
+    row = json.loads(row)
+    if "v" in row and row["v"] == 0.1:
+        return None
+    tgt, task_name, task_args, task_kwargs = row["input"]
+    tgt, keys, model = _target_info(str(tgt))
+    workload_hash = _key_hash([task_name, task_args])
+    measure_hash = _key_hash([tgt, task_name, task_args, task_kwargs])
+    config_hash = _key_hash([row["config"].get("index"), row["config"].get("code_hash")])
+    costs, error_no = row["result"][0], row["result"][1]
+    cost = float(np.mean(costs)) if error_no == 0 else float("nan")
+    names = ["k:" + k for k in keys]
+    if model != "unknown":
+        names.append("m:" + model)
+    return workload_hash, measure_hash, config_hash, cost, names
+
+
+def _scan_chunk(path, base, start, end, tmp_dir, chunk_id, num_partitions):
+    """Shuffle the rows starting in the byte range [start, end) of a log into partitions"""
+    outs = {}
+    num_rows = 0
+    try:
+        with open(path, "rb") as fin:
+            if start > 0:
+                # Skip the row started in the previous range
+                fin.seek(start - 1)
+                fin.readline()
+            pos = fin.tell()
+            while pos < end:
+                line = fin.readline()
+                if not line:
+                    break
+                offset = base + pos
+                pos += len(line)
+                row = line.decode("utf-8").strip()
+                keys = _scan_row(row)
+                if keys is None:
+                    continue
+                workload_hash, measure_hash, config_hash, cost, names = keys
+                part = int(workload_hash, 16) % num_partitions
+                if part not in outs:
+                    outs[part] = open(  # pylint: disable=consider-using-with
+                        os.path.join(tmp_dir, f"p{part:04d}.c{chunk_id:06d}"), "w"
+                    )
+                outs[part].write(
+                    f"{offset}\t{workload_hash}\t{measure_hash}\t{config_hash}\t{cost!r}\t"
+                    f"{';'.join(names)}\t{row}\n"
+                )
+                num_rows += 1
+    finally:
+        for fout in outs.values():
+            fout.close()
+    return num_rows
+
+
+def _read_partition(tmp_dir, part):
+    """Read the rows of a partition in the order of the logs"""
+    prefix = f"p{part:04d}."
+    for filename in sorted(f for f in os.listdir(tmp_dir) if f.startswith(prefix)):
+        with open(os.path.join(tmp_dir, filename)) as fin:
+            for line in fin:
+                fields = line.rstrip("\n").split("\t", 6)
+                fields[0], fields[4] = int(fields[0]), float(fields[4])
+                yield tuple(fields)
+
+
+def _write_partition(tmp_dir, part, rows):
+    with open(os.path.join(tmp_dir, f"o{part:04d}"), "w") as fout:
+        for offset, row in sorted(rows):
+            fout.write(f"{offset}\t{row}\n")
+    return len(rows)
+
+
+def _reduce_pick(tmp_dir, part, top_k):
+    """Keep the top_k best rows of each (target key or model, workload) in a partition"""
+    heaps = {}
+    for offset, workload_hash, _, _, cost, names, row in _read_partition(tmp_dir, part):
+        if np.isnan(cost):
+            continue
+        for name in names.split(";"):
+            heap = heaps.setdefault((name, workload_hash), [])
+            # Among the rows of the same cost, the first one is kept
+            item = (-cost, -offset, row)
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+    best = {}
+    for heap in heaps.values():
+        for _, neg_offset, row in heap:
+            best[-neg_offset] = row
+    return _write_partition(tmp_dir, part, list(best.items()))
+
+
+def _reduce_dedup(tmp_dir, part):
+    """Keep the first row of each (measure input, config) in a partition"""
+    seen = set()
+    rows = []
+    num_dup = 0
+    for offset, _, measure_hash, config_hash, _, _, row in _read_partition(tmp_dir, part):
+        if (measure_hash, config_hash) in seen:
+            num_dup += 1
+            continue
+        seen.add((measure_hash, config_hash))
+        rows.append((offset, row))
+    return _write_partition(tmp_dir, part, rows), num_dup
+
+
+def _reduce_split(tmp_dir, part, clean):
+    """Write the rows of each measure input without config in a partition to its own file"""
+    groups = {}
+    # The rows are buffered per group and appended to the files in batches, so that a partition
+    # with many workloads never holds one open file per workload
+    buffers = {}
+    buffered_bytes = 0
+
+    def _flush():
+        for measure_hash, rows in buffers.items():
+            with open(os.path.join(tmp_dir, f"g{measure_hash}"), "a") as fout:
+                fout.writelines(rows)
+        buffers.clear()
+
+    for offset, _, measure_hash, config_hash, _, _, row in _read_partition(tmp_dir, part):
+        if measure_hash not in groups:
+            # (first offset, the configs seen, number of rows, number of duplicates)
+            groups[measure_hash] = [offset, set(), 0, 0]
+        group = groups[measure_hash]
+        if clean:
+            if config_hash in group[1]:
+                group[3] += 1
+                continue
+            group[1].add(config_hash)
+        group[2] += 1
+        buffers.setdefault(measure_hash, []).append(row + "\n")
+        buffered_bytes += len(row) + 1
+        if buffered_bytes >= _SPLIT_BUFFER_BYTES:
+            _flush()
+            buffered_bytes = 0
+    _flush()
+    return [(group[0], key, group[2], group[3]) for key, group in groups.items()]
+
+
+def _merge_partitions(tmp_dir, num_partitions, fout):
+    """Write the rows kept in all the partitions in the order of the logs"""
+
+    def _rows(part):
+        with open(os.path.join(tmp_dir, f"o{part:04d}")) as fin:
+            for line in fin:
+                offset, row = line.rstrip("\n").split("\t", 1)
+                yield int(offset), row
+
+    for _, row in heapq.merge(*[_rows(part) for part in range(num_partitions)]):
+        fout.write(row + "\n")
+
+
+def _process_logs(in_files, tmp_dir, num_workers, reduce_func, *reduce_args, skip_invalid=False):
+    """Shuffle the rows of the logs into partitions by workload in parallel chunks, then
+    reduce each partition in parallel. Returns the results of the reduce function.
+    If skip_invalid, the logs that cannot be read or parsed are left out with a warning."""
+    tasks = []
+    base = 0
+    invalid = {}
+    for path in in_files:
+        try:
+            size = os.path.getsize(path)
+        except OSError as err:
+            if not skip_invalid:
+                raise
+            invalid[path] = err
+            continue
+        for start in range(0, size, _CHUNK_BYTES):
+            end = min(start + _CHUNK_BYTES, size)
+            tasks.append((path, base, start, end, tmp_dir, len(tasks), _NUM_PARTITIONS))
+        # Leave a gap so that the offsets of different files never overlap
+        base += size + 1
+
+    def _result(scan):
+        try:
+            return scan()
+        except Exception as err:  # pylint: disable=broad-except
+            if not skip_invalid:
+                raise
+            return err
+
+    pool = None
+    if num_workers == 1 or len(tasks) <= 1:
+        # Not worth spawning processes
+        scanned = [_result(functools.partial(_scan_chunk, *args)) for args in tasks]
+    else:
+        pool = popen_pool.PopenPoolExecutor(max_workers=num_workers)
+        futures = [pool.submit(_scan_chunk, *args) for args in tasks]
+        scanned = [_result(future.result) for future in futures]
+    for args, result in zip(tasks, scanned):
+        if isinstance(result, Exception):
+            invalid.setdefault(args[0], result)
+    num_rows = sum(n for args, n in zip(tasks, scanned) if args[0] not in invalid)
+    if invalid:
+        # Drop the rows already shuffled from the chunks of the invalid logs
+        chunk_ids = {args[5] for args in tasks if args[0] in invalid}
+        for filename in os.listdir(tmp_dir):
+            if filename.startswith("p") and int(filename.rsplit(".c", 1)[1]) in chunk_ids:
+                os.remove(os.path.join(tmp_dir, filename))
+        for path, err in invalid.items():
+            logger.warning("Ignore invalid file %s: %s", path, err)
+
+    if pool is None:
+        results = [reduce_func(tmp_dir, part, *reduce_args) for part in range(_NUM_PARTITIONS)]
+    else:
+        futures = [
+            pool.submit(reduce_func, tmp_dir, part, *reduce_args) for part in range(_NUM_PARTITIONS)
+        ]
+        results = [future.result() for future in futures]
+    logger.info("Scanned %d records in %d chunks", num_rows, len(tasks))
+    return results
+
+
+def _as_file_list(in_file):
+    if isinstance(in_file, (str, bytes, os.PathLike)):
+        return [in_file]
+    return list(in_file)
+
+
+def split_workload(in_file, clean=True, num_workers=None):
     """Split a log file into separate files, each of which contains only a single workload
     This function can also delete duplicated records in log file
 
+    The log is processed in parallel chunks without decoding the records into
+    `MeasureInput`/`MeasureResult`, with memory bounded by the size of a partition of the log.
+    The output files are named `{in_file}.{i:03d}.wkl`, numbered in the order the workloads first
+    appear in the log.
+
     Parameters
     ----------
     in_file: str
         input filename
     clean: bool
         whether delete duplicated items
+    num_workers: Optional[int]
+        The number of processes, defaults to the number of CPUs
     """
     tic = time.time()
-    lines = list(open(in_file).readlines())
-
-    logger.info("start converting...")
-    pool = popen_pool.PopenPoolExecutor()
-    lines = [rec for rec in pool.map(decode, lines) if rec is not None]
-    logger.info("map done %.2f", time.time() - tic)
-
-    wkl_dict = OrderedDict()
-    for inp, res in lines:
-        wkl = measure_str_key(inp, False)
-        if wkl not in wkl_dict:
-            wkl_dict[wkl] = []
-        wkl_dict[wkl].append([inp, res])
-
-    if clean:
-        for i, (k, v) in enumerate(wkl_dict.items()):
-            # clean duplicated items
-            added = set()
-            cleaned = []
-            for inp, res in v:
-                str_key = measure_str_key(inp)
-                if str_key in added:
-                    continue
-                added.add(str_key)
-                cleaned.append([inp, res])
-
-            # write to file
-            logger.info("Key: %s\tValid: %d\tDup: %d\t", k, len(cleaned), len(v) - len(cleaned))
-            with open(args.i + f".{i:03d}.wkl", "w") as fout:
-                for inp, res in cleaned:
-                    fout.write(encode(inp, res) + "\n")
-    else:
-        for i, (k, v) in enumerate(wkl_dict.items()):
-            logger.info("Key: %s\tNum: %d", k, len(v))
-            with open(args.i + f".{i:03d}.wkl", "w") as fout:
-                for inp, res in v:
-                    fout.write(encode(inp, res) + "\n")
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(in_file))) as tmp_dir:
+        groups = sum(_process_logs([in_file], tmp_dir, num_workers, _reduce_split, clean), [])
+        logger.info("map done %.2f", time.time() - tic)
+        for i, (_, key, num, num_dup) in enumerate(sorted(groups)):
+            if clean:
+                logger.info("Key: %s\tValid: %d\tDup: %d\t", key, num, num_dup)
+            else:
+                logger.info("Key: %s\tNum: %d", key, num)
+            os.replace(os.path.join(tmp_dir, f"g{key}"), f"{in_file}.{i:03d}.wkl")
+
+
+def dedup(in_file, out_file, num_workers=None, skip_invalid=False):
+    """
+    Remove the duplicated records, i.e. those of the same input and config, from log files,
+    keeping the first one of each in the original order.
 
+    Parameters
+    ----------
+    in_file: str or list of str
+        The filename(s) of input
+    out_file: str
+        The filename of output
+    num_workers: Optional[int]
+        The number of processes, defaults to the number of CPUs
+    skip_invalid: bool
+        Whether to skip the input files that cannot be read or parsed with a warning,
+        instead of raising an error
+    """
+    in_files = _as_file_list(in_file)
+    out_dir = os.path.dirname(os.path.abspath(out_file))
+    with tempfile.TemporaryDirectory(dir=out_dir) as tmp_dir:
+        results = _process_logs(
+            in_files, tmp_dir, num_workers, _reduce_dedup, skip_invalid=skip_invalid
+        )
+        num_dup = sum(dup for _, dup in results)
+        logger.info("Keep %d records, remove %d duplicates", sum(n for n, _ in results), num_dup)
+        tmp_file = os.path.join(tmp_dir, "out.log")
+        with open(tmp_file, "w") as fout:
+            _merge_partitions(tmp_dir, _NUM_PARTITIONS, fout)
+        os.replace(tmp_file, out_file)
 
-def pick_best(in_file, out_file):
+
+def pick_best(in_file, out_file, top_k=1, num_workers=None, skip_invalid=False):
     """
     Pick the best entries from a file and store them to another file.
     This function distills the useful log entries from a large log file.
     If out_file already exists, the best entries from both
     in_file and out_file will be saved.
 
+    The best entries are picked by the same (target key or target model, workload) as
+    `ApplyHistoryBest`, streaming the logs in parallel chunks without decoding the records into
+    `MeasureInput`/`MeasureResult`, with memory bounded by the size of a partition of the logs.
+
     Parameters
     ----------
-    in_file: str
-        The filename of input
+    in_file: str or list of str
+        The filename(s) of input
     out_file: str or file
         The filename of output
+    top_k: int
+        The number of best entries to keep for each workload
+    num_workers: Optional[int]
+        The number of processes, defaults to the number of CPUs
+    skip_invalid: bool
+        Whether to skip the input files that cannot be read or parsed with a warning,
+        instead of raising an error
     """
-    context = load_from_file(in_file)
-    if os.path.isfile(out_file):
-        out_context = load_from_file(out_file)
-        context = itertools.chain(context, out_context)
-    context, context_clone = itertools.tee(context)
-    best_context = ApplyHistoryBest(context)
-    best_set = set()
+    in_files = _as_file_list(in_file)
+    is_path = isinstance(out_file, (str, bytes, os.PathLike))
+    if is_path and os.path.isfile(out_file):
+        in_files.append(out_file)
+    out_dir = os.path.dirname(os.path.abspath(out_file)) if is_path else None
+    with tempfile.TemporaryDirectory(dir=out_dir) as tmp_dir:
+        num_best = sum(
+            _process_logs(
+                in_files, tmp_dir, num_workers, _reduce_pick, top_k, skip_invalid=skip_invalid
+            )
+        )
+        logger.info("Extract %d best records from the %s", num_best, in_file)
+        if not is_path:
+            _merge_partitions(tmp_dir, _NUM_PARTITIONS, out_file)
+            return
+        tmp_file = os.path.join(tmp_dir, "out.log")
+        with open(tmp_file, "w") as fout:
+            _merge_partitions(tmp_dir, _NUM_PARTITIONS, fout)
+        os.replace(tmp_file, out_file)
+
 
-    for v in best_context.best_by_model.values():
-        best_set.add(measure_str_key(v[0]))
+# The format of the compiled best records, see `compile_best`
+_COMPILED_BEST_MAGIC = b"TVMATBR1"
+# (number of entries, offset of the index)
+_COMPILED_BEST_HEADER = struct.Struct("<QQ")
+_COMPILED_BEST_INDEX = np.dtype(
+    [("hash", "<u8"), ("cost", "<f8"), ("offset", "<u8"), ("size", "<u4")]
+)
 
-    for v in best_context.best_by_targetkey.values():
-        best_set.add(measure_str_key(v[0]))
 
-    logger.info("Extract %d best records from the %s", len(best_set), in_file)
-    fout = open(out_file, "w") if isinstance(out_file, str) else out_file
+def _compiled_best_key(kind, name, workload):
+    """The key of a best record, where kind is "model" or "key" (the target key)"""
+    key = repr((kind, name, workload)).encode("utf-8")
+    return key, int.from_bytes(hashlib.sha1(key).digest()[:8], "little")
 
-    for inp, res in context_clone:
-        if measure_str_key(inp) in best_set:
-            fout.write(encode(inp, res) + "\n")
-            best_set.remove(measure_str_key(inp))
+
+def is_compiled_best(filepath: Union[str, bytes, os.PathLike]) -> bool:
+    """Check if a file is the compiled best records generated by `compile_best`
+
+    Parameters
+    ----------
+    filepath: str, bytes, or os.PathLike
+
+    Returns
+    -------
+    ret: bool
+    """
+    if not os.path.isfile(filepath):
+        return False
+    with open(filepath, "rb") as f:
+        return f.read(len(_COMPILED_BEST_MAGIC)) == _COMPILED_BEST_MAGIC
+
+
+def compile_best(records, out_file: Union[str, bytes, os.PathLike]):
+    """
+    Compile the best records of each workload into a binary file, which can be passed to
+    `ApplyHistoryBest` in place of the log files.
+
+    Unlike log files, the compiled file is memory-mapped and indexed by (target model or target
+    key, workload), and only the records actually queried are decoded, so that loading it costs
+    almost nothing regardless of the size of the logs it is compiled from.
+
+    Parameters
+    ----------
+    records : Records, or iterator of Records objects
+        The tuning records, in any form accepted by `ApplyHistoryBest`.
+    out_file: str, bytes, or os.PathLike
+        The filename of output
+    """
+    best_context = ApplyHistoryBest(records)
+    entries = []
+    for kind, best_map in [
+        ("model", best_context.best_by_model),
+        ("key", best_context.best_by_targetkey),
+    ]:
+        for (name, workload), (inp, res) in best_map.items():
+            key, key_hash = _compiled_best_key(kind, name, workload)
+            payload = key + b"\n" + encode(inp, res).encode("utf-8")
+            entries.append((key_hash, float(np.mean(res.costs)), payload))
+    entries.sort(key=lambda entry: entry[0])
+
+    index = np.zeros(len(entries), dtype=_COMPILED_BEST_INDEX)
+    offset = len(_COMPILED_BEST_MAGIC) + _COMPILED_BEST_HEADER.size
+    tmp_file = f"{os.fsdecode(out_file)}.tmp"
+    with open(tmp_file, "wb") as fout:
+        fout.write(_COMPILED_BEST_MAGIC)
+        fout.write(_COMPILED_BEST_HEADER.pack(0, 0))
+        for i, (key_hash, cost, payload) in enumerate(entries):
+            index[i] = (key_hash, cost, offset, len(payload))
+            fout.write(payload)
+            offset += len(payload)
+        fout.write(index.tobytes())
+        fout.seek(len(_COMPILED_BEST_MAGIC))
+        fout.write(_COMPILED_BEST_HEADER.pack(len(entries), offset))
+    os.replace(tmp_file, out_file)
+    logger.info("Compiled %d best records into %s", len(entries), out_file)
+
+
+class CompiledBest(object):
+    """The best records compiled by `compile_best`, decoded lazily on query
+
+    Parameters
+    ----------
+    filepath: str, bytes, or os.PathLike
+        The compiled file
+    """
+
+    def __init__(self, filepath: Union[str, bytes, os.PathLike]):
+        self.filepath = filepath
+        with open(filepath, "rb") as f:
+            if f.read(len(_COMPILED_BEST_MAGIC)) != _COMPILED_BEST_MAGIC:
+                raise ValueError(f"Not a compiled best record file: {filepath}")
+            num_entries, index_offset = _COMPILED_BEST_HEADER.unpack(
+                f.read(_COMPILED_BEST_HEADER.size)
+            )
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if num_entries else None
+        self._index = (
+            np.frombuffer(
+                self._mmap, dtype=_COMPILED_BEST_INDEX, count=num_entries, offset=index_offset
+            )
+            if num_entries
+            else np.zeros(0, dtype=_COMPILED_BEST_INDEX)
+        )
+        self._cache: Dict[int, Tuple[MeasureInput, MeasureResult]] = {}
+
+    def __len__(self):
+        return len(self._index)
+
+    def query(self, kind, name, workload) -> Optional[Tuple[float, MeasureInput, MeasureResult]]:
+        """Look up the best record
+
+        Parameters
+        ----------
+        kind: str
+            "model" to look up by the target model, or "key" by the target key
+        name: str
+            The target model or the target key
+        workload: Tuple
+            The workload
+
+        Returns
+        -------
+        ret: Optional[Tuple[float, MeasureInput, MeasureResult]]
+            The mean cost, input and result of the best record, or None if not found
+        """
+        key, key_hash = _compiled_best_key(kind, name, workload)
+        hashes = self._index["hash"]
+        i = int(np.searchsorted(hashes, np.uint64(key_hash)))
+        while i < len(hashes) and int(hashes[i]) == key_hash:
+            if i not in self._cache:
+                entry = self._index[i]
+                offset, size = int(entry["offset"]), int(entry["size"])
+                entry_key, row = self._mmap[offset : offset + size].split(b"\n", 1)
+                if entry_key != key:
+                    i += 1
+                    continue
+                self._cache[i] = decode(row.decode("utf-8"))
+            inp, res = self._cache[i]
+            return float(self._index[i]["cost"]), inp, res
+        return None
 
 
 """
 Usage:
-This record executable module has three modes.
+This record executable module has five modes.
 
 * Print log file in readable format
 e.g. python -m tvm.autotvm.record --mode read --i collect_conv.log --begin 0 --end 5 --ir --code
@@ -339,23 +754,33 @@ e.g. python -m tvm.autotvm.record --mode pick --i collect.log
 
 * Split a log file into separate files, each of which contains only a single wkl
 e.g. python -m tvm.autotvm.record --mode split --i collect.log
+
+* Remove duplicated records from a log file
+e.g. python -m tvm.autotvm.record --mode dedup --i collect.log --workers 16
+
+* Compile the history best of a log file into a file to be memory-mapped by ApplyHistoryBest
+e.g. python -m tvm.autotvm.record --mode compile --i collect.log
 """
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--mode", choices=["read", "pick", "split"], default="read")
+    parser.add_argument(
+        "--mode", choices=["read", "pick", "split", "dedup", "compile"], default="read"
+    )
     parser.add_argument("--i", type=str, help="input file")
     parser.add_argument("--o", type=str, default=None, help="output file")
     parser.add_argument("--begin", type=int, default=0)
     parser.add_argument("--end", type=int, default=5)
     parser.add_argument("--ir", action="store_true")
     parser.add_argument("--code", action="store_true")
+    parser.add_argument("--top-k", type=int, default=1, help="number of best records to pick")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes")
 
     args = parser.parse_args()
     logging.basicConfig(level=logging.INFO)
 
     if args.mode == "pick":
         args.o = args.o or args.i + ".best.log"
-        pick_best(args.i, args.o)
+        pick_best(args.i, args.o, top_k=args.top_k, num_workers=args.workers)
     elif args.mode == "read":
         for i, (inp, result) in enumerate(load_from_file(args.i)):
             if args.begin <= i < args.end:
@@ -375,4 +800,10 @@ if __name__ == "__main__":
                         func = build(s, arg_bufs)
                         print(func.imported_modules[0].get_source())
     elif args.mode == "split":
-        split_workload(args.i)
+        split_workload(args.i, num_workers=args.workers)
+    elif args.mode == "dedup":
+        args.o = args.o or args.i + ".dedup.log"
+        dedup(args.i, args.o, num_workers=args.workers)
+    elif args.mode == "compile":
+        args.o = args.o or args.i + ".best.bin"
+        compile_best(args.i, args.o)
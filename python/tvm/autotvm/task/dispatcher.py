@@ -249,7 +249,8 @@ class ApplyHistoryBest(DispatchContext):
               or an iterator of (MeasureInput, MeasureResult).
 
         Collection of tuning records. If multiple Records objects are passed, their
-        contents will be merged.
+        contents will be merged. A path may also point to the best records compiled by
+        `autotvm.record.compile_best`, which are memory-mapped and only decoded on query.
     """
 
     def __init__(self, records: Union[None, Records, Iterable[Records]]):
@@ -258,6 +259,7 @@ class ApplyHistoryBest(DispatchContext):
         self.best_by_targetkey = {}
         self.best_by_model = {}
         self._best_user_defined = {}
+        self._compiled = []
 
         if records:
             self.load(records)
@@ -274,13 +276,16 @@ class ApplyHistoryBest(DispatchContext):
             contents will be merged.
         """
         # pylint: disable=import-outside-toplevel
-        from ..record import load_from_file, load_from_buffer
+        from ..record import CompiledBest, is_compiled_best, load_from_file, load_from_buffer
 
         def _unpack_records(
             records: Union[Records, Iterable[Records]]
         ) -> List[Tuple[MeasureInput, MeasureResult]]:
 
             if isinstance(records, (str, bytes, PathLike)):
+                if is_compiled_best(records):
+                    self._compiled.append(CompiledBest(records))
+                    return []
                 return load_from_file(records)
 
             if isinstance(records, TextIOBase):
@@ -330,6 +335,20 @@ class ApplyHistoryBest(DispatchContext):
 
         logger.debug("Finish loading %d records", counter)
 
+    def _query_best(self, best_map, kind, name, workload):
+        """Query the best config among the loaded and the compiled records"""
+        best_cost, best_config = None, None
+        if (name, workload) in best_map:
+            inp, res = best_map[(name, workload)]
+            if not self._compiled:
+                return inp.config
+            best_cost, best_config = np.mean(res.costs), inp.config
+        for compiled in self._compiled:
+            ret = compiled.query(kind, name, workload)
+            if ret is not None and (best_cost is None or ret[0] < best_cost):
+                best_cost, best_config = ret[0], ret[1].config
+        return best_config
+
     def _query_inside(self, target, workload):
         if target is None:
             raise RuntimeError(
@@ -342,18 +361,18 @@ class ApplyHistoryBest(DispatchContext):
         key = (target.model, workload)
         if key in self._best_user_defined:
             return self._best_user_defined[key]
-        if key in self.best_by_model:
-            inp, _ = self.best_by_model[key]
-            return inp.config
+        config = self._query_best(self.best_by_model, "model", target.model, workload)
+        if config is not None:
+            return config
 
         # then try matching by target key
         for k in target.keys:
             key = (k, workload)
             if key in self._best_user_defined:
                 return self._best_user_defined[key]
-            if key in self.best_by_targetkey:
-                inp, _ = self.best_by_targetkey[key]
-                return inp.config
+            config = self._query_best(self.best_by_targetkey, "key", k, workload)
+            if config is not None:
+                return config
 
         return None
 
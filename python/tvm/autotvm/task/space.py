@@ -668,6 +668,7 @@ class ConfigSpace(object):
         self._length = None
         self._range_length = None
         self._dims = None
+        self._strides = None
         self._entity_map = OrderedDict()  # name -> entity
         self._constraints = []
         self.errors = []
@@ -677,6 +678,7 @@ class ConfigSpace(object):
         self.is_fallback = False
         self._shared_filter = None
         self._shared_filter_cache = None
+        self._shared_filter_mask = None
 
     @staticmethod
     def axis(var):
@@ -1014,9 +1016,11 @@ class ConfigSpace(object):
         """Clears the cache of index validity"""
         del self._shared_filter_cache
         self._dims = None
+        self._strides = None
         self._length = None
         self._range_length = None
         self._shared_filter_cache = None
+        self._shared_filter_mask = None
 
     def _make_shared_filter_cache(self):
         def apply(t):
@@ -1066,9 +1070,88 @@ class ConfigSpace(object):
             point += int(np.prod(self.dims[:j])) * k
         return point
 
+    @property
+    def index_dtype(self):
+        """The numpy dtype of the arrays of indexes in the space: int64 if the range fits in it,
+        otherwise object, i.e. arrays of python ints"""
+        return np.int64 if self.range_length <= np.iinfo(np.int64).max else object
+
+    def _get_strides(self):
+        """The index stride of each knob"""
+        if self._strides is None:
+            strides, stride = [], 1
+            for dim in self.dims:
+                strides.append(stride)
+                stride *= dim
+            self._strides = np.array(strides, dtype=self.index_dtype)
+        return self._strides
+
+    def _get_shared_filter_mask(self):
+        """The validity of each index as a boolean array"""
+        if self._shared_filter_mask is None:
+            if self._shared_filter_cache is None:
+                self._make_shared_filter_cache()
+            self._shared_filter_mask = np.array(self._shared_filter_cache, dtype=bool)
+        return self._shared_filter_mask
+
+    def points2knobs(self, points):
+        """Convert an array of points (integers) to a matrix of knobs, the batched version of
+        `point2knob`
+
+        Parameters
+        ----------
+        points: array of int
+            points to convert
+
+        Returns
+        -------
+        knobs: numpy.ndarray
+            int64 matrix of shape (len(points), len(dims)), each row is the knob of a point
+        """
+        points = np.asarray(points, dtype=self.index_dtype).reshape(-1, 1)
+        dims = np.array(self.dims, dtype=self.index_dtype)
+        return ((points // self._get_strides()) % dims).astype(np.int64)
+
+    def knobs2points(self, knobs):
+        """Convert a matrix of knobs to an array of points (integers), the batched version of
+        `knob2point`
+
+        Parameters
+        ----------
+        knobs: matrix of int
+            knobs to convert, each row is a knob
+
+        Returns
+        -------
+        points: numpy.ndarray
+            points of the knobs, of `index_dtype`
+        """
+        knobs = np.asarray(knobs).reshape(-1, len(self.dims)).astype(self.index_dtype)
+        return (knobs * self._get_strides()).sum(axis=1, dtype=self.index_dtype)
+
+    def are_indexes_valid(self, indexes):
+        """Checks if the indexes satisfy the multi_filter condition, the batched version of
+        `is_index_valid`
+
+        Parameters
+        ----------
+        indexes: array of int
+            indexes from the range of the space
+
+        Returns
+        -------
+        valid: numpy.ndarray
+            boolean array, whether each index meets all the constraints
+        """
+        indexes = np.asarray(indexes, dtype=self.index_dtype).reshape(-1)
+        assert ((indexes >= 0) & (indexes < self.range_length)).all()
+        if self._shared_filter is None:
+            return np.ones(len(indexes), dtype=bool)
+        return self._get_shared_filter_mask()[indexes.astype(np.int64)]
+
     def sample_ints(self, m):
         """
-        Sample m different integer numbers from [0, self.range_length) without replacement
+        Sample m different valid integer numbers from [0, self.range_length) without replacement
         This function is an alternative of `np.random.choice` when self.range_length > 2 ^ 32, in
         which case numpy does not work.
 
@@ -1082,12 +1165,27 @@ class ConfigSpace(object):
         ints: an numpy array of size m
         """
         assert m <= len(self)
-        vis = set()
-        while len(vis) < m:
-            new = randrange(0, self.range_length)
-            if self.is_index_valid(new):
-                vis.add(new)
-        return np.fromiter(vis, int, len(vis))
+        if self.index_dtype is object:
+            vis = set()
+            while len(vis) < m:
+                new = randrange(0, self.range_length)
+                if self.is_index_valid(new):
+                    vis.add(new)
+            return np.fromiter(vis, object, len(vis))
+        if 2 * m >= len(self):
+            # Rejection sampling is slow when most of the valid indexes are to be sampled
+            if self._shared_filter is None:
+                return np.random.choice(self.range_length, m, replace=False)
+            valid = np.flatnonzero(self._get_shared_filter_mask())
+            return np.random.choice(valid, m, replace=False)
+        ints = np.empty(0, dtype=np.int64)
+        while len(ints) < m:
+            new = np.random.randint(0, self.range_length, size=2 * (m - len(ints)), dtype=np.int64)
+            ints = np.concatenate([ints, new[self.are_indexes_valid(new)]])
+            # Deduplicate, keeping the order of sampling
+            _, first = np.unique(ints, return_index=True)
+            ints = ints[np.sort(first)]
+        return ints[:m]
 
     def random_walk(self, point):
         """random walk as local transition
@@ -1102,18 +1200,35 @@ class ConfigSpace(object):
         new_point: int
             new neighborhood index
         """
-        # transform to knob form
-        old_knob = self.point2knob(point)
-        new_knob = old_knob.copy()
-        new_point = self.knob2point(new_knob)
-        # mutate
-        while new_knob == old_knob or not self.is_index_valid(new_point):
-            from_i = np.random.randint(len(old_knob))
-            to_v = np.random.randint(self.dims[from_i])
-            new_knob[from_i] = to_v
-            new_point = self.knob2point(new_knob)
-        # transform to index form
-        return new_point
+        return int(self.random_walks([point])[0])
+
+    def random_walks(self, points):
+        """random walk as local transition of each point, the batched version of `random_walk`
+
+        Parameters
+        ----------
+        points: array of int
+            indexes of the ConfigEntity
+
+        Returns
+        -------
+        new_points: numpy.ndarray
+            new neighborhood index of each point
+        """
+        old_knobs = self.points2knobs(points)
+        new_knobs = old_knobs.copy()
+        new_points = np.empty(len(old_knobs), dtype=self.index_dtype)
+        dims = np.array(self.dims, dtype=np.int64)
+        # mutate the points not moved to a valid neighbor yet, until all of them are
+        todo = np.arange(len(old_knobs))
+        while len(todo) > 0:
+            from_i = np.random.randint(len(dims), size=len(todo))
+            new_knobs[todo, from_i] = np.random.randint(0, dims[from_i])
+            points = self.knobs2points(new_knobs[todo])
+            done = (new_knobs[todo] != old_knobs[todo]).any(axis=1) & self.are_indexes_valid(points)
+            new_points[todo[done]] = points[done]
+            todo = todo[~done]
+        return new_points
 
     def _add_new_transform(self, space_class, name, axes, policy, **kwargs):
         """Add a new transform space in template"""
@@ -20,9 +20,18 @@ TopHub: Tensor Operator Hub
 To get the best performance, we typically need auto-tuning for the specific devices.
 TVM releases pre-tuned parameters in TopHub for some common networks and hardware targets.
 TVM will download these parameters for you when you call relay.build.
+
+TopHub can also be served from a local package directory built by `build_package`,
+by setting the environment variable TOPHUB_LOCATION to the directory, or by mirroring
+the directory into AUTOTVM_TOPHUB_ROOT_PATH. Then the pre-indexed files are only read on
+query, and the backends the package does not cover fall back to the TopHub logs. No network
+access is made if TOPHUB_LOCATION is a local package directory. A plain mirror of the TopHub
+logs can still be used by setting TOPHUB_LOCATION to its file:// URL.
 """
 
+import json
 import logging
+import os
 from os import getenv
 import sys
 from pathlib import Path
@@ -31,7 +40,8 @@ from tvm.ir.container import Array
 from .task import ApplyHistoryBest
 from ..target import Target
 from ..contrib.download import download
-from .record import load_from_file
+from ..contrib.utils import filelock
+from .record import compile_best, decode, load_from_file
 from .utils import EmptyContext
 
 # environment variable to read TopHub location
@@ -60,6 +70,12 @@ PACKAGE_VERSION = {
     "adreno": "v0.01",
 }
 
+# the manifest of a local TopHub package directory, see `build_package`
+AUTOTVM_TOPHUB_MANIFEST = "manifest.json"
+
+# the version of the local TopHub package format
+AUTOTVM_TOPHUB_FORMAT_VERSION = 1
+
 logger = logging.getLogger("autotvm")
 
 
@@ -81,10 +97,61 @@ def _get_tophub_location():
     return AUTOTVM_TOPHUB_DEFAULT_LOC if location is None else location
 
 
+def _local_package_dir(tophub_location):
+    """Return the local package directory to use, or None to use the TopHub logs.
+    It is the location itself if it is a local package directory, otherwise a package
+    directory mirrored into AUTOTVM_TOPHUB_ROOT_PATH."""
+    if tophub_location.startswith("file://"):
+        tophub_location = tophub_location[len("file://") :]
+    for package_dir in [tophub_location, AUTOTVM_TOPHUB_ROOT_PATH]:
+        if "://" not in str(package_dir) and Path(package_dir, AUTOTVM_TOPHUB_MANIFEST).is_file():
+            return Path(package_dir)
+    return None
+
+
+def _download_location(tophub_location):
+    """Return the location to download the TopHub logs from, e.g. a URL or a file:// URL of a
+    mirror of the logs, or None if it is a local directory, e.g. a local package directory,
+    from which nothing is downloaded."""
+    path = tophub_location
+    if path.startswith("file://"):
+        path = path[len("file://") :]
+    if "://" not in path and Path(path, AUTOTVM_TOPHUB_MANIFEST).is_file():
+        return None
+    return tophub_location if "://" in tophub_location else None
+
+
+# global cache for the manifests and indexes of local packages, keyed by (path, mtime)
+LOCAL_PACKAGE_CACHE = {}
+
+
+def _load_json(path):
+    key = (str(path), os.stat(path).st_mtime_ns)
+    if key not in LOCAL_PACKAGE_CACHE:
+        with open(path) as f:
+            LOCAL_PACKAGE_CACHE[key] = json.load(f)
+    return LOCAL_PACKAGE_CACHE[key]
+
+
+def _local_packages(package_dir):
+    """The packages of a local package directory, as a dict of backend to package entry"""
+    manifest = _load_json(Path(package_dir, AUTOTVM_TOPHUB_MANIFEST))
+    if manifest.get("format_version") != AUTOTVM_TOPHUB_FORMAT_VERSION:
+        logger.warning(
+            "Unsupported TopHub package format %s in %s",
+            manifest.get("format_version"),
+            package_dir,
+        )
+        return {}
+    return manifest["packages"]
+
+
 def context(target, extra_files=None):
     """Return the dispatch context with pre-tuned parameters.
     This function will load the corresponding *.log files in AUTOTVM_TOPHUB_ROOT_PATH.
     If cannot find them, it will download them from TopHub github repo.
+    If a local package directory built by `build_package` is found, the pre-indexed best
+    records of the package are used instead for the backends it covers.
     Users can also add their own files in argument `extra_files`.
 
     Parameters
@@ -99,6 +166,9 @@ def context(target, extra_files=None):
         return EmptyContext()
 
     best_context = ApplyHistoryBest([])
+    package_dir = _local_package_dir(tophub_location)
+    local_packages = _local_packages(package_dir) if package_dir is not None else {}
+    download_location = _download_location(tophub_location)
 
     targets = target if isinstance(target, (Array, list, tuple)) else [target]
 
@@ -122,14 +192,22 @@ def context(target, extra_files=None):
         possible_names.extend(tgt.keys)
         possible_names.append(tgt.kind.name)
 
+        local_names = [_alias(name) for name in possible_names if _alias(name) in local_packages]
+        if local_names:
+            best_context.load(Path(package_dir, local_packages[local_names[0]]["best"]))
+            continue
+
         all_packages = list(PACKAGE_VERSION.keys())
         for name in possible_names:
             name = _alias(name)
             if name in all_packages:
-                if not check_backend(tophub_location, name):
+                filename = f"{name}_{PACKAGE_VERSION[name]}.log"
+                if download_location is None:
+                    if not Path(AUTOTVM_TOPHUB_ROOT_PATH, filename).is_file():
+                        continue
+                elif not check_backend(download_location, name):
                     continue
 
-                filename = f"{name}_{PACKAGE_VERSION[name]}.log"
                 best_context.load(Path(AUTOTVM_TOPHUB_ROOT_PATH, filename))
                 break  # only load one file to avoid some fallback template mismatch problem
 
@@ -213,6 +291,10 @@ def load_reference_log(backend, model, workload_name):
     """
 
     backend = _alias(backend)
+    tophub_location = _get_tophub_location()
+    package_dir = _local_package_dir(tophub_location)
+    if package_dir is not None and backend in _local_packages(package_dir):
+        return _load_local_reference_log(package_dir, backend, model, workload_name)
     if backend not in PACKAGE_VERSION:
         return []
     version = PACKAGE_VERSION[backend]
@@ -227,9 +309,9 @@ def load_reference_log(backend, model, workload_name):
         # If TOPHUB_LOCATION is not AUTOTVM_TOPHUB_NONE_LOC,
         # Download the config file from tophub if not exists.
         if not Path(filename).exists():
-            tophub_location = _get_tophub_location()
-            if tophub_location != AUTOTVM_TOPHUB_NONE_LOC:
-                download_package(tophub_location, package_name)
+            download_location = _download_location(tophub_location)
+            if tophub_location != AUTOTVM_TOPHUB_NONE_LOC and download_location is not None:
+                download_package(download_location, package_name)
         if Path(filename).is_file():  # in case download failed
             find = False
             inp = None
@@ -249,3 +331,113 @@ def load_reference_log(backend, model, workload_name):
         REFERENCE_LOG_CACHE[key] = tmp
 
     return REFERENCE_LOG_CACHE[key]
+
+
+def _load_local_reference_log(package_dir, backend, model, workload_name):
+    """Load reference log from a local package, reading only the indexed records"""
+    package = _local_packages(package_dir)[backend]
+    key = (str(package_dir), package["log"], model, workload_name)
+    if key not in REFERENCE_LOG_CACHE:
+        index = _load_json(Path(package_dir, package["index"]))
+        # if device model is not find, use the device model with the most tuned workloads
+        if model not in index["models"] and index["models"]:
+            model = max(index["models"].items(), key=lambda k: k[1])[0]
+        tmp = []
+        ranges = index["offsets"].get(model, {}).get(workload_name, [])
+        if ranges:
+            with open(Path(package_dir, package["log"]), "rb") as f:
+                for offset, size in ranges:
+                    f.seek(offset)
+                    tmp.append(decode(f.read(size).decode("utf-8")))
+        REFERENCE_LOG_CACHE[key] = tmp
+    return REFERENCE_LOG_CACHE[key]
+
+
+def build_package(logs, package_dir, backend, version=None):
+    """Build a local TopHub package from tuning logs.
+
+    A package directory holds, for each backend and version, a subdirectory `backend/version`
+    with the merged log, the best records compiled by `autotvm.record.compile_best`, and an
+    index of the log by target model and workload name for `load_reference_log`. A manifest
+    maps each backend to its latest version. The directory is self-contained, so it can be
+    mirrored by copying, and used by setting TOPHUB_LOCATION to it. The subdirectories keep
+    the package files apart from the TopHub logs when mirrored into AUTOTVM_TOPHUB_ROOT_PATH,
+    and keep the packages of older versions.
+
+    Parameters
+    ----------
+    logs: str, os.PathLike, or list of them
+        The tuning log files, e.g. our own logs or the log files downloaded from TopHub
+    package_dir: str or os.PathLike
+        The package directory, created if not exists
+    backend: str
+        The name of backend
+    version: str, optional
+        The version of the package. Defaults to the version of the backend in TopHub.
+    """
+    if isinstance(logs, (str, bytes, os.PathLike)):
+        logs = [logs]
+    backend = _alias(backend)
+    version = version or PACKAGE_VERSION.get(backend, "v0.01")
+    package_dir = Path(package_dir)
+    Path(package_dir, backend, version).mkdir(parents=True, exist_ok=True)
+    # the paths are relative to the package directory
+    package = {
+        "version": version,
+        "log": f"{backend}/{version}/tuning.log",
+        "best": f"{backend}/{version}/best.bin",
+        "index": f"{backend}/{version}/index.json",
+    }
+
+    # merge the logs, indexing the byte range of each record by model and workload name
+    models = {}
+    offsets = {}
+    tmp_log = Path(package_dir, package["log"] + ".tmp")
+    with open(tmp_log, "wb") as fout:
+        for filename in logs:
+            with open(filename, "rb") as fin:
+                for line in fin:
+                    row = line.decode("utf-8")
+                    if not row.strip() or row.startswith("#"):
+                        continue
+                    ret = decode(row)
+                    if ret is None:
+                        continue
+                    if not line.endswith(b"\n"):
+                        line += b"\n"
+                    inp, _ = ret
+                    model = inp.target.model
+                    models[model] = models.get(model, 0) + 1
+                    offsets.setdefault(model, {}).setdefault(inp.task.workload[0], []).append(
+                        [fout.tell(), len(line)]
+                    )
+                    fout.write(line)
+    os.replace(tmp_log, Path(package_dir, package["log"]))
+    compile_best(Path(package_dir, package["log"]), Path(package_dir, package["best"]))
+    tmp_index = Path(package_dir, package["index"] + ".tmp")
+    with open(tmp_index, "w") as f:
+        json.dump({"models": models, "offsets": offsets}, f)
+    os.replace(tmp_index, Path(package_dir, package["index"]))
+
+    lock = filelock(Path(package_dir, AUTOTVM_TOPHUB_MANIFEST + ".lock"))
+    try:
+        manifest_path = Path(package_dir, AUTOTVM_TOPHUB_MANIFEST)
+        if manifest_path.is_file():
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        else:
+            manifest = {"format_version": AUTOTVM_TOPHUB_FORMAT_VERSION, "packages": {}}
+        manifest["packages"][backend] = package
+        tmp_manifest = Path(package_dir, AUTOTVM_TOPHUB_MANIFEST + ".tmp")
+        with open(tmp_manifest, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_manifest, manifest_path)
+    finally:
+        lock.release()
+    logger.info(
+        "Built TopHub package %s_%s with %d records in %s",
+        backend,
+        version,
+        sum(models.values()),
+        package_dir,
+    )
@@ -27,3 +27,4 @@ from .index_based_tuner import GridSearchTuner, RandomTuner
 from .tuner import Tuner
 from .xgboost_tuner import XGBTuner
 from .droplet_tuner import DropletTuner
+from .feature_store import FeatureStore
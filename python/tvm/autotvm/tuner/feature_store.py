@@ -0,0 +1,119 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Persistent on-disk store of extracted features, shared by cost models and processes"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from tvm.contrib.mmap_shard import MmapShard
+
+
+def _workload_key(task, target, fea_type):
+    """The key of the features of a task on a target"""
+    key = repr((task.workload, str(target), fea_type))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class FeatureStore(object):
+    """A persistent store of the features of configs, shared by cost models and processes.
+
+    Features are keyed by (task workload, target, config index, feature type), so that the
+    features of a config are extracted only once, no matter which tuner, which process or
+    which run asks for them. They are stored in memory-mapped files under `path`, one
+    `MmapShard` per (task workload, target, feature type) with the flop of each config attached
+    to its feature. A config stored without a feature failed to extract, and a flop of 0 means
+    unknown.
+
+    Parameters
+    ----------
+    path: str
+        The directory of the store
+    """
+
+    def __init__(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._shards = {}
+
+    def __getstate__(self):
+        # the memory-mapped shards are reopened on demand
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.path = state["path"]
+        self._shards = {}
+
+    def _get_shard(self, task, target, fea_type):
+        key = _workload_key(task, target, fea_type)
+        shard = self._shards.get(key)
+        if shard is None:
+            shard = MmapShard(os.path.join(self.path, fea_type, key))
+            self._shards[key] = shard
+        return shard
+
+    def get(self, task, target, fea_type, indexes):
+        """Look up the stored features of configs
+
+        Parameters
+        ----------
+        task: Task
+            The tuning task
+        target: Target
+            The target of the task
+        fea_type: str
+            The feature type
+        indexes: List of int
+            The config indexes
+
+        Returns
+        -------
+        features: dict of int to numpy.ndarray
+            The features of the stored configs, None for those failed to extract.
+            Configs not in the store are missing.
+        """
+        stored = self._get_shard(task, target, fea_type).get([str(index) for index in indexes])
+        return {
+            index: None if stored[str(index)] is None else np.array(stored[str(index)])
+            for index in indexes
+            if str(index) in stored
+        }
+
+    def get_flop(self, task, target, fea_type, index):
+        """Get the stored flop of a config, 0 if unknown"""
+        return self._get_shard(task, target, fea_type).get_value(str(index))
+
+    def put(self, task, target, fea_type, items):
+        """Store the features of configs
+
+        Parameters
+        ----------
+        task: Task
+            The tuning task
+        target: Target
+            The target of the task
+        fea_type: str
+            The feature type
+        items: List of (int, numpy.ndarray or None, float)
+            The config index, its feature or None if failed to extract,
+            and its flop or 0 if unknown. A stored config is only stored again with a new flop.
+        """
+        self._get_shard(task, target, fea_type).put(
+            [(str(index), fea, flop) for index, fea, flop in items],
+            replace=lambda stored_flop, flop: stored_flop <= 0 < flop,
+        )
@@ -23,6 +23,23 @@ import numpy as np
 from .tuner import Tuner
 
 
+def _sample_pairs(probs, num):
+    """Sample num pairs of different indexes with the given probabilities, i.e. the batched
+    version of `np.random.choice(len(probs), size=2, replace=False, p=probs)`"""
+    cum_probs = np.cumsum(probs)
+    first = np.minimum(
+        np.searchsorted(cum_probs, np.random.random(num), side="right"), len(probs) - 1
+    )
+    # sample the second one from the rest, by skipping over the probability of the first one
+    target = np.random.random(num) * (1.0 - probs[first])
+    before_first = cum_probs[first] - probs[first]
+    target = np.where(target >= before_first, target + probs[first], target)
+    second = np.minimum(np.searchsorted(cum_probs, target, side="right"), len(probs) - 1)
+    # guard against rounding errors
+    second = np.where(second == first, (first + 1) % len(probs), second)
+    return first, second
+
+
 class GATuner(Tuner):
     """Tuner with genetic algorithm.
     This tuner does not have a cost model so it always run measurement on real machines.
@@ -51,10 +68,11 @@ class GATuner(Tuner):
         # random initialization
         self.pop_size = min(self.pop_size, len(self.space))
         self.elite_num = min(self.pop_size, self.elite_num)
-        self.visited = set(self.space.sample_ints(self.pop_size))
+        points = self.space.sample_ints(self.pop_size)
+        self.visited = set(points.tolist())
 
         # current generation
-        self.genes = [self.space.point2knob(idx) for idx in self.visited]
+        self.genes = self.space.points2knobs(points).tolist()
         self.scores = []
         self.elites = []
         self.elite_scores = []
@@ -81,8 +99,9 @@ class GATuner(Tuner):
             # There is no reason to crossover or mutate since the size of the unvisited
             # is no larger than the size of the population.
             if len(self.space) - len(self.visited) <= self.pop_size:
-                for idx in range(self.space.range_length):
-                    if self.space.is_index_valid(idx) and idx not in self.visited:
+                points = np.arange(self.space.range_length, dtype=self.space.index_dtype)
+                for idx in points[self.space.are_indexes_valid(points)].tolist():
+                    if idx not in self.visited:
                         next_genes.append(self.space.point2knob(idx))
                         self.visited.add(idx)
             else:
@@ -96,24 +115,31 @@ class GATuner(Tuner):
                     self.elites.append(genes[ind])
                     self.elite_scores.append(scores[ind])
 
-                indices = np.arange(len(genes))
+                genes = np.array(genes, dtype=np.int64).reshape(len(genes), len(self.space.dims))
+                dims = np.array(self.space.dims, dtype=np.int64)
                 scores += 1e-8
                 scores /= np.max(scores)
                 probs = scores / np.sum(scores)
                 while len(next_genes) < self.pop_size:
+                    # generate the children in batch, some of which may be invalid
+                    num = 2 * (self.pop_size - len(next_genes))
+                    p1, p2 = _sample_pairs(probs, num)
                     # cross over
-                    p1, p2 = np.random.choice(indices, size=2, replace=False, p=probs)
-                    p1, p2 = genes[p1], genes[p2]
-                    point = np.random.randint(len(self.space.dims))
-                    tmp_gene = p1[:point] + p2[point:]
+                    point = np.random.randint(len(dims), size=(num, 1))
+                    children = np.where(np.arange(len(dims)) < point, genes[p1], genes[p2])
                     # mutation
-                    for j, dim in enumerate(self.space.dims):
-                        if np.random.random() < self.mutation_prob:
-                            tmp_gene[j] = np.random.randint(dim)
-
-                    if self.space.is_index_valid(self.space.knob2point(tmp_gene)):
-                        next_genes.append(tmp_gene)
-                        self.visited.add(self.space.knob2point(tmp_gene))
+                    mutated = np.random.random(children.shape) < self.mutation_prob
+                    random_knobs = np.random.randint(0, dims, size=children.shape)
+                    children = np.where(mutated, random_knobs, children)
+
+                    points = self.space.knobs2points(children)
+                    valid = self.space.are_indexes_valid(points)
+                    children, points = children[valid], points[valid]
+                    for gene, idx in zip(children.tolist(), points.tolist()):
+                        if len(next_genes) >= self.pop_size:
+                            break
+                        next_genes.append(gene)
+                        self.visited.add(idx)
             self.genes = next_genes
             self.trial_pt = 0
             self.scores = []
@@ -33,6 +33,8 @@ class IndexBaseTuner(Tuner):
         A tuple of index range that this tuner can select from [begin_idx, end_idx]
     """
 
+    supports_async = True
+
     def __init__(self, task, range_idx=None):
         super(IndexBaseTuner, self).__init__(task)
         assert range_idx is None or isinstance(
@@ -200,6 +200,8 @@ class ModelBasedTuner(Tuner):
         and then pick plan_size of them according to the diversity metric.
     """
 
+    supports_async = True
+
     def __init__(self, task, cost_model, model_optimizer, plan_size, diversity_filter_ratio=None):
         super(ModelBasedTuner, self).__init__(task)
 
@@ -271,7 +273,7 @@ class ModelBasedTuner(Tuner):
                     self.cost_model, self.plan_size * self.diversity_filter_ratio, self.visited
                 )
                 scores = self.cost_model.predict(candidate)
-                knobs = [self.space.point2knob(x) for x in candidate]
+                knobs = self.space.points2knobs(candidate)
                 pick_index = submodular_pick(0 * scores, knobs, self.plan_size, knob_weight=1)
                 maximums = np.array(candidate)[pick_index]
             else:
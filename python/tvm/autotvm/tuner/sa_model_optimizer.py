@@ -14,25 +14,135 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-# pylint: disable=consider-using-enumerate, invalid-name, invalid-sequence-index
+# pylint: disable=invalid-name
 """
 Cost model optimizer based on simulated annealing
 """
 
-import heapq
 import logging
 import time
 
 import numpy as np
 
+from tvm.contrib.popen_pool import PopenPoolExecutor
+
 from .model_based_tuner import ModelOptimizer
 
 logger = logging.getLogger("autotvm")
 
 
+def _merge_top_k(best_points, best_scores, points, scores, num, exclusive):
+    """Merge the scored points into the top-`num` points, skipping the points in `exclusive`
+
+    Returns
+    -------
+    best_points: numpy.ndarray
+        The merged top points, in no particular order
+    best_scores: numpy.ndarray
+        The scores of the merged top points
+    changed: bool
+        Whether any of the given points enters the top points
+    """
+    keep = ~np.isin(points, exclusive) & ~np.isin(points, best_points)
+    if not keep.any():
+        return best_points, best_scores, False
+    # deduplicate the new points, keeping the best score of each
+    order = np.argsort(-scores[keep], kind="stable")
+    points, first = np.unique(points[keep][order], return_index=True)
+    scores = scores[keep][order][first]
+
+    n_best = len(best_points)
+    points = np.concatenate((best_points, points))
+    scores = np.concatenate((best_scores, scores))
+    if len(points) <= num:
+        return points, scores, True
+    top = np.argpartition(-scores, num - 1)[:num]
+    return points[top], scores[top], bool((top >= n_best).any())
+
+
+def _anneal(model, space, points, num, exclusive, temp, n_iter, early_stop, log_interval):
+    """Run simulated annealing on a batch of independent chains
+
+    Returns
+    -------
+    best_points: numpy.ndarray
+        The top points ever visited
+    best_scores: numpy.ndarray
+        The scores of the top points
+    points: numpy.ndarray
+        The final states of the chains
+    """
+    tic = time.time()
+    points = np.asarray(points, dtype=space.index_dtype)
+    scores = model.predict(points)
+
+    best_points = np.empty(0, dtype=space.index_dtype)
+    best_scores = np.empty(0, dtype=np.float64)
+    best_points, best_scores, _ = _merge_top_k(
+        best_points, best_scores, points, scores, num, exclusive
+    )
+
+    k = 0
+    k_last_modify = 0
+
+    if isinstance(temp, (tuple, list, np.ndarray)):
+        t = temp[0]
+        cool = 1.0 * (temp[0] - temp[1]) / (n_iter + 1)
+    else:
+        t = temp
+        cool = 0
+
+    while k < n_iter and k < k_last_modify + early_stop:
+        # propose a neighbor for every chain and score all of them at once
+        new_points = space.random_walks(points)
+        new_scores = model.predict(new_points)
+
+        ac_prob = np.exp(np.minimum((new_scores - scores) / (t + 1e-5), 1))
+        ac_index = np.random.random(len(ac_prob)) < ac_prob
+
+        points[ac_index] = new_points[ac_index]
+        scores[ac_index] = new_scores[ac_index]
+
+        best_points, best_scores, changed = _merge_top_k(
+            best_points, best_scores, new_points, new_scores, num, exclusive
+        )
+        if changed:
+            k_last_modify = k
+
+        k += 1
+        t -= cool
+
+        if log_interval and k % log_interval == 0:
+            t_str = f"{t:.2f}"
+            logger.debug(
+                "SA iter: %d\tlast_update: %d\tmax-0: %.2f\tmax-1: %.2f\ttemp: %s\t"
+                "elapsed: %.2f",
+                k,
+                k_last_modify,
+                np.min(best_scores) if len(best_scores) == num else float("-inf"),
+                np.max(best_scores) if len(best_scores) else float("-inf"),
+                t_str,
+                time.time() - tic,
+            )
+
+    logger.debug("SA iter: %d\tlast_update: %d\telapsed: %.2f", k, k_last_modify, time.time() - tic)
+    return best_points, best_scores, points
+
+
+def _anneal_restart(seed, model, space, num, exclusive, parallel_size, *args):
+    """Run an independent restart of simulated annealing in a pool worker"""
+    np.random.seed(seed)
+    points = space.sample_ints(parallel_size)
+    best_points, best_scores, _ = _anneal(model, space, points, num, exclusive, *args)
+    return best_points, best_scores
+
+
 class SimulatedAnnealingOptimizer(ModelOptimizer):
     """parallel simulated annealing optimization algorithm
 
+    All the chains move in lockstep: the neighbors of all the chains are proposed as one
+    array and scored by one `model.predict` call in each iteration.
+
     Parameters
     ----------
     task: Task
@@ -46,6 +156,13 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         Stop iteration if the optimal set do not change in `early_stop` rounds
     log_interval: int, optional
         Print log every `log_interval` iterations
+    num_restarts: int, optional
+        The number of independent restarts, each with `parallel_size` chains.
+        The first restart continues from the previous chains if `persistent` is set.
+    n_parallel: int, optional
+        The number of processes to run the restarts. If is greater than 1, all but the first
+        restart run in a process pool, which requires the cost model to be picklable.
+        Otherwise, the chains of all the restarts run in this process as a single batch.
     """
 
     def __init__(
@@ -57,6 +174,8 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         parallel_size=128,
         early_stop=50,
         log_interval=50,
+        num_restarts=1,
+        n_parallel=1,
     ):
         super(SimulatedAnnealingOptimizer, self).__init__()
         self.task = task
@@ -66,90 +185,66 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         self.parallel_size = min(parallel_size, len(self.task.config_space))
         self.early_stop = early_stop or 1e9
         self.log_interval = log_interval
+        self.num_restarts = max(num_restarts, 1)
+        self.n_parallel = n_parallel
         self.points = None
+        self.pool = None
+
+    def _get_pool(self):
+        if self.pool is None:
+            self.pool = PopenPoolExecutor(max_workers=min(self.n_parallel, self.num_restarts - 1))
+        return self.pool
 
     def find_maximums(self, model, num, exclusive):
-        tic = time.time()
-        temp, n_iter, early_stop, log_interval = (
-            self.temp,
-            self.n_iter,
-            self.early_stop,
-            self.log_interval,
-        )
+        space = self.task.config_space
+        if num <= 0:
+            return []
+        exclusive = np.array(list(exclusive), dtype=space.index_dtype)
+        args = (self.temp, self.n_iter, self.early_stop, self.log_interval)
+        use_pool = self.n_parallel is not None and self.n_parallel > 1 and self.num_restarts > 1
 
         if self.persistent and self.points is not None:
             points = self.points
         else:
-            points = self.task.config_space.sample_ints(self.parallel_size)
-
-        scores = model.predict(points)
-
-        # build heap and insert initial points
-        heap_items = [(float("-inf"), -1 - i) for i in range(num)]
-        heapq.heapify(heap_items)
-        in_heap = set(exclusive)
-        in_heap.update([x[1] for x in heap_items])
+            n_local = 1 if use_pool else self.num_restarts
+            points = space.sample_ints(self.parallel_size * n_local)
+
+        futures = []
+        if use_pool:
+            pool = self._get_pool()
+            for _ in range(self.num_restarts - 1):
+                seed = np.random.randint(np.iinfo(np.int32).max)
+                futures.append(
+                    pool.submit(
+                        _anneal_restart,
+                        seed,
+                        model,
+                        space,
+                        num,
+                        exclusive,
+                        self.parallel_size,
+                        *args,
+                    )
+                )
 
-        for s, p in zip(scores, points):
-            if s > heap_items[0][0] and p not in in_heap:
-                pop = heapq.heapreplace(heap_items, (s, p))
-                in_heap.remove(pop[1])
-                in_heap.add(p)
+        best_points, best_scores, points = _anneal(model, space, points, num, exclusive, *args)
 
-        k = 0
-        k_last_modify = 0
+        for future in futures:
+            try:
+                restart_points, restart_scores = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("SA restart failed: %s", exc)
+                continue
+            best_points, best_scores, _ = _merge_top_k(
+                best_points, best_scores, restart_points, restart_scores, num, exclusive
+            )
 
-        if isinstance(temp, (tuple, list, np.ndarray)):
-            t = temp[0]
-            cool = 1.0 * (temp[0] - temp[1]) / (n_iter + 1)
-        else:
-            t = temp
-            cool = 0
-
-        while k < n_iter and k < k_last_modify + early_stop:
-            new_points = np.empty_like(points)
-            for i, p in enumerate(points):
-                new_points[i] = self.task.config_space.random_walk(p)
-
-            new_scores = model.predict(new_points)
-
-            ac_prob = np.exp(np.minimum((new_scores - scores) / (t + 1e-5), 1))
-            ac_index = np.random.random(len(ac_prob)) < ac_prob
-
-            points[ac_index] = new_points[ac_index]
-            scores[ac_index] = new_scores[ac_index]
-
-            for s, p in zip(new_scores, new_points):
-                if s > heap_items[0][0] and p not in in_heap:
-                    pop = heapq.heapreplace(heap_items, (s, p))
-                    in_heap.remove(pop[1])
-                    in_heap.add(p)
-                    k_last_modify = k
-
-            k += 1
-            t -= cool
-
-            if log_interval and k % log_interval == 0:
-                t_str = f"{t:.2f}"
-                logger.debug(
-                    "SA iter: %d\tlast_update: %d\tmax-0: %.2f\tmax-1: %.2f\ttemp: %s\t"
-                    "elapsed: %.2f",
-                    k,
-                    k_last_modify,
-                    heap_items[0][0],
-                    np.max([v for v, _ in heap_items]),
-                    t_str,
-                    time.time() - tic,
-                )
-
-        heap_items.sort(key=lambda item: -item[0])
-        heap_items = [x for x in heap_items if x[0] >= 0]
-        logger.debug(
-            "SA iter: %d\tlast_update: %d\telapsed: %.2f", k, k_last_modify, time.time() - tic
-        )
-        logger.debug("SA Maximums: %s", heap_items)
+        order = np.argsort(-best_scores, kind="stable")
+        best_points, best_scores = best_points[order], best_scores[order]
+        keep = best_scores >= 0
+        logger.debug("SA Maximums: %s", list(zip(best_scores[keep], best_points[keep])))
 
         if self.persistent:
             self.points = points
 
-        return [x[1] for x in heap_items]
+        return best_points[keep].tolist()
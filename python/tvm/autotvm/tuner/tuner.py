@@ -18,10 +18,11 @@
 """Base class of tuner"""
 import logging
 import tempfile
+from collections import deque
 
 import numpy as np
 
-from ..measure import MeasureInput, create_measure_batch
+from ..measure import MeasureInput, ThreadExecutor, create_measure_batch
 from ..utils import format_si_prefix
 
 from ..env import GLOBAL_SCOPE
@@ -38,6 +39,10 @@ class Tuner(object):
         Tuning Task
     """
 
+    # Whether next_batch can propose new configs before the results of the previous batches
+    # are fed back through update, which is required by asynchronous measurement
+    supports_async = False
+
     def __init__(self, task, **kwargs):
         self.param = kwargs
         self.recorder = None
@@ -91,7 +96,15 @@ class Tuner(object):
             result for measurement
         """
 
-    def tune(self, n_trial, measure_option, early_stopping=None, callbacks=(), si_prefix="G"):
+    def tune(
+        self,
+        n_trial,
+        measure_option,
+        early_stopping=None,
+        callbacks=(),
+        si_prefix="G",
+        n_inflight=1,
+    ):
         """Begin tuning
 
         Parameters
@@ -110,7 +123,18 @@ class Tuner(object):
             every measurement pair. See autotvm/tuner/callback.py for some examples.
         si_prefix: str
             One of tvm.autotvm.utils.SI_PREFIXES. The SI prefix to use when reporting FLOPS.
+        n_inflight: int
+            The maximum number of measurement batches in flight. If is greater than 1, the
+            batches are measured asynchronously: the tuner proposes the next batch and the
+            builds of later batches overlap with the runs of earlier ones, and the results
+            are fed back through `update` as they arrive. Only for tuners that support it.
         """
+        if n_inflight > 1 and not self.supports_async:
+            logger.warning(
+                "%s does not support asynchronous measurement, using n_inflight=1",
+                type(self).__name__,
+            )
+            n_inflight = 1
         measure_batch = create_measure_batch(self.task, measure_option)
         n_parallel = getattr(measure_batch, "n_parallel", 1)
         early_stopping = early_stopping or 1e9
@@ -123,80 +147,115 @@ class Tuner(object):
         old_level = logger.level
 
         GLOBAL_SCOPE.in_tuning = True
-        i = error_ct = 0
+        executor = ThreadExecutor(max_workers=n_inflight) if n_inflight > 1 else None
+        pending = deque()
+        i = n_submitted = error_ct = 0
         errors = []
-        while i < n_trial:
-            if not self.has_next():
-                break
-
-            configs = self.next_batch(min(n_parallel, n_trial - i))
-
-            inputs = [MeasureInput(self.task.target, self.task, config) for config in configs]
-            results = measure_batch(inputs)
-
-            # keep best config
-            for k, (inp, res) in enumerate(zip(inputs, results)):
-                config = inp.config
-                if res.error_no == 0:
-                    flops = inp.task.flop / np.mean(res.costs)
-                    error_ct = 0
-                    result_msg = res
+        stopped = False
+        try:
+            while i < n_trial:
+                if executor is None:
+                    if not self.has_next():
+                        break
+                    configs = self.next_batch(min(n_parallel, n_trial - i))
+                    inputs = [
+                        MeasureInput(self.task.target, self.task, config) for config in configs
+                    ]
+                    results = measure_batch(inputs)
                 else:
-                    flops = 0
-                    error_ct += 1
-                    tb, error = res.costs
-                    if isinstance(error, str):
-                        errors.append(tb + "\n" + error)
+                    # keep n_inflight batches in flight, then take the first finished one
+                    while (
+                        not stopped
+                        and len(pending) < n_inflight
+                        and n_submitted < n_trial
+                        and self.has_next()
+                    ):
+                        configs = self.next_batch(min(n_parallel, n_trial - n_submitted))
+                        if not configs:
+                            break
+                        inputs = [
+                            MeasureInput(self.task.target, self.task, config) for config in configs
+                        ]
+                        pending.append((inputs, executor.submit(measure_batch, inputs)))
+                        n_submitted += len(inputs)
+                    if not pending:
+                        break
+                    item = next((item for item in pending if item[1].done()), pending[0])
+                    pending.remove(item)
+                    inputs, results = item[0], item[1].get()
+
+                # keep best config
+                for k, (inp, res) in enumerate(zip(inputs, results)):
+                    config = inp.config
+                    if res.error_no == 0:
+                        flops = inp.task.flop / np.mean(res.costs)
+                        error_ct = 0
+                        result_msg = res
                     else:
-                        errors.append(tb + "\n" + str(error))
-                    result_msg = errors[-1]
-
-                if flops > self.best_flops:
-                    self.best_flops = flops
-                    self.best_config = config
-                    self.best_measure_pair = (inp, res)
-                    self.best_iter = i + k
-
-                logger.debug(
-                    "No: %d\t%sFLOPS: %.2f/%.2f\tresult: %s\t%s",
-                    i + k + 1,
-                    si_prefix,
-                    format_si_prefix(flops, si_prefix),
-                    format_si_prefix(self.best_flops, si_prefix),
-                    result_msg,
-                    config,
+                        flops = 0
+                        error_ct += 1
+                        tb, error = res.costs
+                        if isinstance(error, str):
+                            errors.append(tb + "\n" + error)
+                        else:
+                            errors.append(tb + "\n" + str(error))
+                        result_msg = errors[-1]
+
+                    if flops > self.best_flops:
+                        self.best_flops = flops
+                        self.best_config = config
+                        self.best_measure_pair = (inp, res)
+                        self.best_iter = i + k
+
+                    logger.debug(
+                        "No: %d\t%sFLOPS: %.2f/%.2f\tresult: %s\t%s",
+                        i + k + 1,
+                        si_prefix,
+                        format_si_prefix(flops, si_prefix),
+                        format_si_prefix(self.best_flops, si_prefix),
+                        result_msg,
+                        config,
+                    )
+
+                i += len(results)
+                self.ttl = min(early_stopping + self.best_iter, n_trial) - i
+
+                self.update(inputs, results)
+                for callback in callbacks:
+                    callback(self, inputs, results)
+
+                if not stopped and i >= self.best_iter + early_stopping:
+                    logger.debug("Early stopped. Best iter: %d.", self.best_iter)
+                    stopped = True
+                # the batches in flight are measured anyway, so drain them before stopping
+                if stopped and not pending:
+                    break
+
+                if error_ct > self.error_ct_threshold:
+                    logging.basicConfig()
+                    logger.warning("Too many errors happen in the tuning. Switching to debug mode.")
+                    logger.setLevel(logging.DEBUG)
+                else:
+                    logger.setLevel(old_level)
+
+            if error_ct == i:
+                _, f = tempfile.mkstemp(prefix="tvm_tuning_errors_", suffix=".log", text=True)
+                with open(f, "w") as file:
+                    file.write("\n".join(errors))
+                logging.warning(
+                    "Could not find any valid schedule for task %s. "
+                    "A file containing the errors has been written to %s.",
+                    self.task,
+                    f,
                 )
-
-            i += len(results)
-            self.ttl = min(early_stopping + self.best_iter, n_trial) - i
-
-            self.update(inputs, results)
-            for callback in callbacks:
-                callback(self, inputs, results)
-
-            if i >= self.best_iter + early_stopping:
-                logger.debug("Early stopped. Best iter: %d.", self.best_iter)
-                break
-
-            if error_ct > self.error_ct_threshold:
-                logging.basicConfig()
-                logger.warning("Too many errors happen in the tuning. Switching to debug mode.")
-                logger.setLevel(logging.DEBUG)
-            else:
-                logger.setLevel(old_level)
-
-        if error_ct == i:
-            _, f = tempfile.mkstemp(prefix="tvm_tuning_errors_", suffix=".log", text=True)
-            with open(f, "w") as file:
-                file.write("\n".join(errors))
-            logging.warning(
-                "Could not find any valid schedule for task %s. "
-                "A file containing the errors has been written to %s.",
-                self.task,
-                f,
-            )
-        GLOBAL_SCOPE.in_tuning = False
-        del measure_batch
+        finally:
+            # only reached with batches in flight on errors, in which case they are dropped
+            for _, future in pending:
+                future.cancel()
+            if executor is not None:
+                executor.shutdown(wait=True)
+            GLOBAL_SCOPE.in_tuning = False
+            del measure_batch
 
     def reset(self):
         """reset the status of tuner"""
@@ -27,6 +27,7 @@ from tvm.contrib.popen_pool import PopenPoolExecutor, StatusKind
 
 from .. import feature
 from ..utils import get_rank
+from .feature_store import FeatureStore
 from .metric import cover_curve, max_curve, recall_curve
 from .model_based_tuner import CostModel, FeatureCache
 
@@ -79,6 +80,11 @@ class XGBoostCostModel(CostModel):
         If is not none, the cost model will print training log every `log_interval` iterations.
     upper_model: XGBoostCostModel, optional
         The upper model used in transfer learning
+    feature_store: str or FeatureStore, optional
+        The persistent store of extracted features, or the path to it.
+        If is set, features are looked up in the store before extraction, and the newly
+        extracted ones are saved to it, so that they are shared by concurrent tuners and
+        reused across runs, including by `fit_log`.
     """
 
     def __init__(
@@ -89,6 +95,7 @@ class XGBoostCostModel(CostModel):
         num_threads=None,
         log_interval=25,
         upper_model=None,
+        feature_store=None,
     ):
         global xgb
         super(XGBoostCostModel, self).__init__()
@@ -156,6 +163,12 @@ class XGBoostCostModel(CostModel):
             self.feature_cache = upper_model.feature_cache
         else:
             self.feature_cache = FeatureCache()
+        if upper_model:
+            self.feature_store = upper_model.feature_store
+        elif isinstance(feature_store, str):
+            self.feature_store = FeatureStore(feature_store)
+        else:
+            self.feature_store = feature_store
         self.upper_model = upper_model
         self.feature_extra_ct = 0
         self.pool = None
@@ -186,6 +199,8 @@ class XGBoostCostModel(CostModel):
     def _get_pool(self):
         if self.upper_model:
             return self.upper_model._get_pool()
+        if self.pool is None:
+            self._reset_pool(self.space, self.target, self.task)
         return self.pool
 
     def _base_model_discount(self):
@@ -260,22 +275,38 @@ class XGBoostCostModel(CostModel):
             feature_extract_func = _extract_curve_feature_log
         else:
             raise RuntimeError("Invalid feature type: " + self.fea_type)
-        result = pool.map_with_error_catching(feature_extract_func, data)
-        result = list(result)  # store results so we can iterate through them twice
+
+        # look up the feature store first, and only extract the missing records
+        result = [None] * len(data)
+        if self.feature_store:
+            for i, (inp, res) in enumerate(data):
+                result[i] = self._lookup_log_feature(inp, res)
+        need_extract = [i for i, xy in enumerate(result) if xy is None]
+        extracted = pool.map_with_error_catching(
+            feature_extract_func, [data[i] for i in need_extract]
+        )
+        stored = []
+        for i, ret in zip(need_extract, extracted):
+            inp, res = data[i]
+            if ret.status != StatusKind.COMPLETE:
+                if _is_deterministic_failure(ret):
+                    stored.append((inp, None, 0.0))
+                continue
+            result[i] = ret.value
+            x, y = ret.value
+            flop = y * np.mean(res.costs) if res.error_no == 0 else 0.0
+            stored.append((inp, x, flop))
+        if self.feature_store:
+            self._store_log_features(stored)
+        result = [xy for xy in result if xy is not None and xy is not False]
 
         # get maximum feature length
         fea_len = -1
-        for res in result:
-            if res.status != StatusKind.COMPLETE:
-                continue
-            x, _ = res.value
+        for x, _ in result:
             fea_len = max(fea_len, x.shape[0])
 
         xs, ys = [], []
-        for res in result:
-            if res.status != StatusKind.COMPLETE:
-                continue
-            x, y = res.value
+        for x, y in result:
             # Features may not be the same size, pad them until they are
             if fea_len > len(x):
                 xs.append(np.pad(x, (0, fea_len - len(x))))
@@ -317,6 +348,34 @@ class XGBoostCostModel(CostModel):
 
         return True
 
+    def _lookup_log_feature(self, inp, res):
+        """Look up the (x, y) of a log item in the feature store.
+        Returns None if it is not stored, or False if its extraction failed before."""
+        index = inp.config.index
+        stored = self.feature_store.get(inp.task, inp.target, self.fea_type, [index])
+        if index not in stored:
+            return None
+        x = stored[index]
+        if x is None:
+            return False
+        if res.error_no != 0:
+            return x, 0.0
+        flop = self.feature_store.get_flop(inp.task, inp.target, self.fea_type, index)
+        if flop <= 0:
+            return None
+        return x, flop / np.mean(res.costs)
+
+    def _store_log_features(self, items):
+        """Save the (inp, x, flop) of log items to the feature store, grouped by workload"""
+        groups = {}
+        for inp, x, flop in items:
+            key = (inp.task.workload, str(inp.target))
+            if key not in groups:
+                groups[key] = (inp.task, inp.target, [])
+            groups[key][2].append((inp.config.index, x, flop))
+        for task, target, group in groups.values():
+            self.feature_store.put(task, target, self.fea_type, group)
+
     def predict(self, xs, output_margin=False):
         feas = self._get_feature(xs)
         dtest = xgb.DMatrix(feas)
@@ -349,11 +408,31 @@ class XGBoostCostModel(CostModel):
         indexes = np.array(indexes)
         need_extract = [x for x in indexes if x not in fea_cache]
 
+        if need_extract and self.feature_store:
+            stored = self.feature_store.get(
+                self.task, self.target, self.fea_type, [int(x) for x in need_extract]
+            )
+            for i in need_extract:
+                if int(i) in stored:
+                    fea_cache[i] = stored[int(i)]
+            need_extract = [x for x in need_extract if x not in fea_cache]
+
         if need_extract:
             pool = self._get_pool()
             feas = pool.map_with_error_catching(self.feature_extract_func, need_extract)
             for i, fea in zip(need_extract, feas):
                 fea_cache[i] = fea.value if fea.status == StatusKind.COMPLETE else None
+            if self.feature_store:
+                self.feature_store.put(
+                    self.task,
+                    self.target,
+                    self.fea_type,
+                    [
+                        (int(i), fea_cache[i], 0.0)
+                        for i, fea in zip(need_extract, feas)
+                        if fea.status == StatusKind.COMPLETE or _is_deterministic_failure(fea)
+                    ],
+                )
 
         feature_len = -1
         for idx in indexes:
@@ -368,10 +447,28 @@ class XGBoostCostModel(CostModel):
             ret[i, :] = t if t is not None else 0
         return ret
 
+    def __getstate__(self):
+        # the feature extraction pool cannot be pickled, and is recreated on demand
+        state = self.__dict__.copy()
+        state["pool"] = None
+        return state
+
+    def __setstate__(self, state):
+        global xgb
+        if xgb is None:
+            xgb = __import__("xgboost")
+        self.__dict__.update(state)
+
     def __del__(self):
         self._close_pool()
 
 
+def _is_deterministic_failure(result):
+    """Whether a failed feature extraction would fail again, so that it can be stored.
+    Timeouts and crashed workers may not happen next time."""
+    return result.status == StatusKind.EXCEPTION and not isinstance(result.value, ChildProcessError)
+
+
 # Global variables for passing arguments to extract functions.
 _extract_space = None
 _extract_target = None
@@ -72,6 +72,9 @@ class XGBTuner(ModelBasedTuner):
         The verbose level.
         If is 0, output nothing.
         Otherwise, output debug information every `verbose` iterations.
+
+    feature_store: str or FeatureStore, optional
+        The persistent store of extracted features shared by tuners, or the path to it.
     """
 
     def __init__(
@@ -84,6 +87,7 @@ class XGBTuner(ModelBasedTuner):
         optimizer="sa",
         diversity_filter_ratio=None,
         log_interval=50,
+        feature_store=None,
     ):
         cost_model = XGBoostCostModel(
             task,
@@ -91,6 +95,7 @@ class XGBTuner(ModelBasedTuner):
             loss_type=loss_type,
             num_threads=num_threads,
             log_interval=log_interval // 2,
+            feature_store=feature_store,
         )
         if optimizer == "sa":
             optimizer = SimulatedAnnealingOptimizer(task, log_interval=log_interval)
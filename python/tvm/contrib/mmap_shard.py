@@ -0,0 +1,159 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""An append-only store of float32 arrays in memory-mapped files, shared by processes"""
+import os
+import os.path as osp
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .utils import filelock
+
+
+class MmapShard:
+    """An append-only store of float32 arrays under a directory, keyed by strings.
+
+    The arrays are appended to a flat float32 file, which is memory-mapped for reading, and an
+    index file maps each key to the offset and shape of its array in that file, along with a number
+    attached to it, e.g. the flop of an AutoTVM config. A key may be stored without an array, e.g.
+    to record that the array cannot be computed. Processes sharing the directory append under a
+    file lock and see each other's entries, the last entry of a key winning.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the shard.
+    """
+
+    path: str
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.path_data = osp.join(path, "data.bin")
+        self.path_index = osp.join(path, "index.txt")
+        self.path_lock = osp.join(path, "lock")
+        # key -> (offset, shape or None if no array, value)
+        self.index: Dict[str, Tuple[int, Optional[Tuple[int, ...]], float]] = {}
+        self.index_size = 0
+        self.data: Optional[np.ndarray] = None
+
+    def refresh(self) -> None:
+        """Load the index entries appended since last time, possibly by other processes."""
+        if not osp.exists(self.path_index):
+            return
+        with open(self.path_index, "r", encoding="utf-8") as file:
+            file.seek(self.index_size)
+            for line in file:
+                if not line.endswith("\n"):
+                    break
+                key, offset, shape, value = line.split()
+                self.index[key] = (
+                    int(offset),
+                    None if shape == "-" else tuple(int(dim) for dim in shape.split(",")),
+                    float(value),
+                )
+                self.index_size += len(line.encode("utf-8"))
+        self.data = None
+
+    def _mmap(self, end: int) -> np.ndarray:
+        if self.data is None or self.data.shape[0] < end:
+            self.data = np.memmap(self.path_data, dtype="float32", mode="r")
+        return self.data
+
+    def get(self, keys: List[str]) -> Dict[str, Optional[np.ndarray]]:
+        """Look up the arrays of the given keys.
+
+        Parameters
+        ----------
+        keys : List[str]
+            The keys.
+
+        Returns
+        -------
+        arrays : Dict[str, Optional[np.ndarray]]
+            The read-only arrays of the stored keys, None for those stored without an array.
+            The keys not stored are missing.
+        """
+        if any(key not in self.index for key in keys):
+            self.refresh()
+        results: Dict[str, Optional[np.ndarray]] = {}
+        for key in keys:
+            entry = self.index.get(key)
+            if entry is None:
+                continue
+            offset, shape, _ = entry
+            if shape is None:
+                results[key] = None
+                continue
+            size = int(np.prod(shape))
+            if size == 0:
+                results[key] = np.zeros(shape, dtype="float32")
+                continue
+            results[key] = self._mmap(offset + size)[offset : offset + size].reshape(shape)
+        return results
+
+    def get_value(self, key: str) -> float:
+        """The number attached to the given key, 0 if not stored."""
+        if key not in self.index:
+            self.refresh()
+        entry = self.index.get(key)
+        return entry[2] if entry is not None else 0.0
+
+    def put(
+        self,
+        items: Iterable[Tuple[str, Optional[np.ndarray], float]],
+        replace: Optional[Callable[[float, float], bool]] = None,
+    ) -> None:
+        """Append the given items.
+
+        Parameters
+        ----------
+        items : Iterable[Tuple[str, Optional[np.ndarray], float]]
+            The key, its array or None, and the number attached to it.
+        replace : Optional[Callable[[float, float], bool]]
+            Given the stored and the new number of a stored key, whether to store the key again.
+            The stored keys are skipped if not specified.
+        """
+        lock = filelock(self.path_lock)
+        try:
+            self.refresh()
+            lines = []
+            with open(self.path_data, "ab") as file:
+                offset = file.seek(0, os.SEEK_END) // 4
+                for key, array, value in items:
+                    entry = self.index.get(key)
+                    if entry is not None and (replace is None or not replace(entry[2], value)):
+                        continue
+                    value = float(value)
+                    if array is None:
+                        entry = (offset, None, value)
+                    else:
+                        array = np.ascontiguousarray(array, dtype="float32")
+                        if array.ndim == 0:
+                            array = array.reshape(1)
+                        file.write(array.tobytes())
+                        entry = (offset, array.shape, value)
+                        offset += array.size
+                    self.index[key] = entry
+                    shape = "-" if entry[1] is None else ",".join(str(dim) for dim in entry[1])
+                    lines.append(f"{key} {entry[0]} {shape} {value!r}\n")
+            with open(self.path_index, "a", encoding="utf-8") as file:
+                file.write("".join(lines))
+                self.index_size = file.tell()
+        finally:
+            lock.release()
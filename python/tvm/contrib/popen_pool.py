@@ -103,9 +103,22 @@ class PopenWorker:
 
     stderr: Union[None, int, IO[Any]]
         The standard error streams handler specified for the popen process.
+
+    maximum_memory_bytes: Optional[int]
+        The maximum resident memory of the process. A process that exceeds it after
+        finishing a task is recycled before the next task. If `None`, the memory
+        usage is not checked.
     """
 
-    def __init__(self, initializer=None, initargs=(), maximum_uses=None, stdout=None, stderr=None):
+    def __init__(
+        self,
+        initializer=None,
+        initargs=(),
+        maximum_uses=None,
+        stdout=None,
+        stderr=None,
+        maximum_memory_bytes=None,
+    ):
         self._proc = None
         self._initializer = initializer
         self._initargs = initargs
@@ -113,6 +126,8 @@ class PopenWorker:
         self._remaining_uses = None
         self._stdout = stdout
         self._stderr = stderr
+        self._maximum_memory_bytes = maximum_memory_bytes
+        self._exceeds_memory = False
 
         if self._initializer is not None and not callable(self._initializer):
             raise TypeError("initializer must be callable for PopenWorker")
@@ -154,6 +169,7 @@ class PopenWorker:
             self.join(timeout=1.0)
             self._proc = None
             self._remaining_uses = None
+            self._exceeds_memory = False
 
     def _start(self):
         """Start a new subprocess if nothing is available"""
@@ -237,7 +253,9 @@ class PopenWorker:
         # pylint: disable=import-outside-toplevel
         import cloudpickle
 
-        if self._proc is not None and self._maximum_uses and self._remaining_uses == 0:
+        if self._proc is not None and (
+            self._exceeds_memory or (self._maximum_uses and self._remaining_uses == 0)
+        ):
             # Time to recycle the process.
             self.kill()
 
@@ -262,6 +280,20 @@ class PopenWorker:
         if self._remaining_uses:
             self._remaining_uses -= 1
 
+    def _check_memory(self):
+        """Mark the process to be recycled if it uses too much memory."""
+        if not self._maximum_memory_bytes or self._proc is None:
+            return
+        # pylint: disable=import-outside-toplevel
+        import psutil
+
+        try:
+            rss = psutil.Process(self._proc.pid).memory_info().rss
+        except psutil.NoSuchProcess:
+            return
+        if rss > self._maximum_memory_bytes:
+            self._exceeds_memory = True
+
     def _child_process_error(self):
         """Raise a child process error."""
         # kill and lazily restart the process in the next send.
@@ -299,6 +331,7 @@ class PopenWorker:
         except IOError:
             raise self._child_process_error()
 
+        self._check_memory()
         if status == StatusKind.COMPLETE:
             return value
         if status == StatusKind.EXCEPTION:
@@ -337,6 +370,17 @@ class PopenPoolExecutor:
     stderr: Union[None, int, IO[Any]]
         The standard error streams handler specified for the workers in the pool.
 
+    maximum_process_memory_bytes: Optional[int]
+        The maximum resident memory of each process. A process that exceeds it after
+        finishing a task is recycled before the next task. If `None`, the memory
+        usage is not checked.
+
+    finalizer: callable or None
+        A callable run in each live process when the executor is shut down, or None
+
+    finalargs: Tuple[object]
+        A tuple of args for the finalizer
+
     Note
     ----
     If max_workers is NONE then the number returned by
@@ -353,6 +397,9 @@ class PopenPoolExecutor:
         maximum_process_uses=None,
         stdout=None,
         stderr=None,
+        maximum_process_memory_bytes=None,
+        finalizer=None,
+        finalargs=(),
     ):
         if max_workers is None:
             max_workers = os.cpu_count()
@@ -366,13 +413,38 @@ class PopenPoolExecutor:
         self._maximum_process_uses = maximum_process_uses
         self._stdout = stdout
         self._stderr = stderr
+        self._maximum_process_memory_bytes = maximum_process_memory_bytes
+        self._finalizer = finalizer
+        self._finalargs = finalargs
 
         if self._initializer is not None and not callable(self._initializer):
             raise TypeError("initializer must be callable for PopenPoolExecutor")
+        if self._finalizer is not None and not callable(self._finalizer):
+            raise TypeError("finalizer must be callable for PopenPoolExecutor")
 
     def __del__(self):
+        self.shutdown()
+
+    def shutdown(self):
+        """Kill the worker processes and shut down the executor.
+
+        Note
+        ----
+        No more functions can be submitted after the executor is shut down.
+        If there is a finalizer, the submitted functions are waited for, so that the
+        finalizer runs in the idle processes.
+        """
+        if self._finalizer is not None:
+            self._threadpool.shutdown(wait=True)
         self._lock.acquire()
         for worker in self._worker_map.values():
+            if self._finalizer is not None and worker.is_alive():
+                # pylint: disable=broad-except
+                try:
+                    worker.send(self._finalizer, self._finalargs, timeout=self._timeout)
+                    worker.recv()
+                except Exception:
+                    pass
             try:
                 worker.kill()
             except ImportError:
@@ -391,6 +463,7 @@ class PopenPoolExecutor:
                 self._maximum_process_uses,
                 self._stdout,
                 self._stderr,
+                self._maximum_process_memory_bytes,
             )
             self._worker_map[tid] = proc
         else:
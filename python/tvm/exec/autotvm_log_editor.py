@@ -15,45 +15,67 @@
 # specific language governing permissions and limitations
 # under the License.
 # pylint: disable=invalid-name
-"""Pick best log entries from a large file and store them to a small file"""
+"""Pick best log entries from large files, deduplicate or split them"""
 
 import argparse
 import os
 import logging
-import warnings
 
 from .. import autotvm
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--act", type=str, choices=["pick-best"], required=True, help="The action")
+    parser.add_argument(
+        "--act",
+        type=str,
+        choices=["pick-best", "dedup", "split"],
+        required=True,
+        help="The action",
+    )
     parser.add_argument("--i", type=str, help="The input file or directory", required=True)
     parser.add_argument("--o", type=str, help="The output file")
+    parser.add_argument("--top-k", type=int, default=1, help="The number of best entries to pick")
+    parser.add_argument("--workers", type=int, default=None, help="The number of processes")
 
     args = parser.parse_args()
     logging.basicConfig(level=logging.INFO)
 
-    if args.act == "pick-best":
-        if os.path.isfile(args.i):
-            args.o = args.o or args.i + ".best.log"
-            autotvm.record.pick_best(args.i, args.o)
-        elif os.path.isdir(args.i):
-            args.o = args.o or "best.log"
-            tmp_filename = args.o + ".tmp"
-
-            with open(tmp_filename, "w") as tmp_fout:
-                for filename in os.listdir(args.i):
-                    if filename.endswith(".log"):
-                        try:
-                            autotvm.record.pick_best(filename, tmp_fout)
-                        except Exception:  # pylint: disable=broad-except
-                            warnings.warn("Ignore invalid file %s" % filename)
+    if os.path.isfile(args.i):
+        in_files = [args.i]
+        default_outputs = {"pick-best": args.i + ".best.log", "dedup": args.i + ".dedup.log"}
+    elif os.path.isdir(args.i):
+        # The output is written next to the directory, not into it
+        default_outputs = {
+            "pick-best": "best.log",
+            "dedup": os.path.normpath(args.i) + ".dedup.log",
+        }
+        in_files = [
+            os.path.join(args.i, filename)
+            for filename in sorted(os.listdir(args.i))
+            if filename.endswith(".log")
+        ]
+        out_file = args.o or default_outputs.get(args.act)
+        if out_file is not None:
+            # Do not read an earlier output as an input
+            in_files = [f for f in in_files if os.path.abspath(f) != os.path.abspath(out_file)]
+    else:
+        raise ValueError("Invalid input file: " + args.i)
+    # The invalid logs of a directory are skipped with a warning
+    skip_invalid = os.path.isdir(args.i)
 
-            logging.info("Run final filter...")
-            autotvm.record.pick_best(tmp_filename, args.o)
-            os.remove(tmp_filename)
-            logging.info("Output to %s ...", args.o)
-        else:
-            raise ValueError("Invalid input file: " + args.i)
+    if args.act == "pick-best":
+        args.o = args.o or default_outputs[args.act]
+        autotvm.record.pick_best(
+            in_files, args.o, top_k=args.top_k, num_workers=args.workers, skip_invalid=skip_invalid
+        )
+        logging.info("Output to %s ...", args.o)
+    elif args.act == "dedup":
+        args.o = args.o or default_outputs[args.act]
+        autotvm.record.dedup(in_files, args.o, num_workers=args.workers, skip_invalid=skip_invalid)
+        logging.info("Output to %s ...", args.o)
+    elif args.act == "split":
+        if len(in_files) != 1:
+            raise ValueError("Can only split a single file: " + args.i)
+        autotvm.record.split_workload(in_files[0], num_workers=args.workers)
     else:
         raise ValueError("Invalid action " + args.act)
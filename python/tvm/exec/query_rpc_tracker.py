@@ -19,6 +19,7 @@ from __future__ import absolute_import
 
 import logging
 import argparse
+import json
 import os
 from .. import rpc
 
@@ -28,6 +29,9 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--host", type=str, default="", help="the hostname of the tracker")
     parser.add_argument("--port", type=int, default=None, help="The port of the RPC")
+    parser.add_argument(
+        "--json", action="store_true", help="Print the summary with all the metrics in json"
+    )
     args = parser.parse_args()
     logging.basicConfig(level=logging.INFO)
 
@@ -39,6 +43,9 @@ def main():
         args.port = int(os.environ.get("TVM_TRACKER_PORT", "9190"))
 
     conn = rpc.connect_tracker(args.host, args.port)
+    if args.json:
+        print(json.dumps(conn.summary(), indent=2))
+        return
     # pylint: disable=superfluous-parens
     print("Tracker address %s:%d\n" % (args.host, args.port))
     print("%s" % conn.text_summary())
@@ -0,0 +1,294 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""Load test of the RPC tracker with many simulated servers and clients.
+
+The fake servers and clients speak the tracker protocol like RPC servers and
+TrackerSession do, but never open RPC sessions: a fake server reports a
+match-key, pings the tracker until the key is handed out, then pretends to
+serve a session for session_time seconds before it reports a new key.
+
+.. code-block:: bash
+
+    python -m tvm.exec.rpc_load_test --servers 10000 --clients 200 --requests 20
+"""
+import argparse
+import asyncio
+import json
+import struct
+import time
+
+from ..rpc import asyncio_util
+from ..rpc.base import RPC_TRACKER_MAGIC, TrackerCode
+
+
+async def _connect(tracker_addr):
+    reader, writer = await asyncio.open_connection(*tracker_addr)
+    writer.write(struct.pack("<i", RPC_TRACKER_MAGIC))
+    magic = struct.unpack("<i", await reader.readexactly(4))[0]
+    if magic != RPC_TRACKER_MAGIC:
+        raise RuntimeError(f"{str(tracker_addr)} is not RPC Tracker")
+    return reader, writer
+
+
+async def _call(conn, data):
+    reader, writer = conn
+    await asyncio_util.sendjson(writer, data)
+    return await asyncio_util.recvjson(reader)
+
+
+async def _fake_server(
+    tracker_addr, key, index, session_time, ping_period, registered, served, stop
+):
+    conn = await _connect(tracker_addr)
+    port = 10000 + index
+    info = {"key": "server:" + key, "addr": ["127.0.0.1", port]}
+    assert await _call(conn, [TrackerCode.UPDATE_INFO, info]) == TrackerCode.SUCCESS
+    count = 0
+    while not stop.is_set():
+        matchkey = f"{key}:{index}.{count}"
+        count += 1
+        ret = await _call(conn, [TrackerCode.PUT, key, (port, matchkey), "127.0.0.1"])
+        assert ret == TrackerCode.SUCCESS
+        if count == 1:
+            registered.append(time.time())
+        # wait until the key is handed out, like _accept_conn of the RPC server, checking
+        # once more after the stop for the keys handed out meanwhile
+        while True:
+            pending = matchkey in await _call(conn, [TrackerCode.GET_PENDING_MATCHKEYS])
+            if not pending or stop.is_set():
+                break
+            await asyncio.sleep(ping_period)
+        if pending:
+            break
+        served.append(matchkey)
+        await asyncio.sleep(session_time)
+    conn[1].close()
+
+
+async def _fake_client(tracker_addr, key, user, num_requests, latency, matchkeys, errors):
+    conn = await _connect(tracker_addr)
+    for _ in range(num_requests):
+        tic = time.time()
+        ret = await _call(conn, [TrackerCode.REQUEST, key, user, 1, 0])
+        if ret[0] != TrackerCode.SUCCESS:
+            errors.append(ret)
+            continue
+        latency.append(time.time() - tic)
+        matchkeys.append(ret[1][2])
+    conn[1].close()
+
+
+async def _summary_probe(tracker_addr, period, latency, errors, stop):
+    conn = await _connect(tracker_addr)
+    while not stop.is_set():
+        tic = time.time()
+        ret = await _call(conn, [TrackerCode.SUMMARY])
+        if ret[0] != TrackerCode.SUCCESS:
+            errors.append(ret)
+        latency.append(time.time() - tic)
+        await asyncio.sleep(period)
+    conn[1].close()
+
+
+def _percentiles(values):
+    values = sorted(values)
+    if not values:
+        return {}
+    return {
+        "p50": values[int(0.50 * (len(values) - 1))],
+        "p95": values[int(0.95 * (len(values) - 1))],
+        "p99": values[int(0.99 * (len(values) - 1))],
+        "max": values[-1],
+    }
+
+
+async def _load_test(
+    tracker_addr,
+    num_servers,
+    num_clients,
+    num_requests,
+    session_time,
+    ping_period,
+    num_users,
+    key,
+):
+    stop = asyncio.Event()
+    registered, served, matchkeys, errors = [], [], [], []
+    request_latency, summary_latency = [], []
+    tstart = time.time()
+    servers = [
+        asyncio.ensure_future(
+            _fake_server(tracker_addr, key, i, session_time, ping_period, registered, served, stop)
+        )
+        for i in range(num_servers)
+    ]
+    probe = asyncio.ensure_future(_summary_probe(tracker_addr, 0.2, summary_latency, errors, stop))
+    while len(registered) < num_servers:
+        await asyncio.sleep(0.05)
+        for server in servers:
+            if server.done():
+                # surface the error of a failed server
+                server.result()
+    tregister = time.time()
+    clients = [
+        _fake_client(
+            tracker_addr,
+            key,
+            f"user{i % num_users}",
+            num_requests,
+            request_latency,
+            matchkeys,
+            errors,
+        )
+        for i in range(num_clients)
+    ]
+    await asyncio.gather(*clients)
+    tend = time.time()
+    stop.set()
+    await asyncio.gather(probe, *servers)
+    return {
+        "servers": num_servers,
+        "clients": num_clients,
+        "register_time": tregister - tstart,
+        "requests": len(request_latency),
+        "errors": len(errors),
+        # whether the handed-out keys are exactly the keys the servers saw taken, once each
+        "matchkeys_consistent": len(set(matchkeys)) == len(matchkeys)
+        and sorted(matchkeys) == sorted(served),
+        "request_throughput": len(request_latency) / (tend - tregister),
+        "request_latency": _percentiles(request_latency),
+        "summary_latency": _percentiles(summary_latency),
+    }
+
+
+def run_load_test(
+    tracker_addr,
+    num_servers=1000,
+    num_clients=100,
+    num_requests=10,
+    session_time=0.1,
+    ping_period=2.0,
+    num_users=4,
+    key="loadtest",
+):
+    """Run a load test against a tracker.
+
+    Parameters
+    ----------
+    tracker_addr : tuple
+        The address tuple of the tracker.
+
+    num_servers : int, optional
+        The number of fake servers, each of which keeps one connection to the tracker.
+
+    num_clients : int, optional
+        The number of fake clients requesting concurrently.
+
+    num_requests : int, optional
+        The number of requests of each client.
+
+    session_time : float, optional
+        The time a fake server serves a session before it reports itself again.
+
+    ping_period : float, optional
+        The period a fake server checks whether its match-key is handed out.
+
+    num_users : int, optional
+        The number of users the clients are spread over.
+
+    key : str, optional
+        The device key of the fake servers.
+
+    Returns
+    -------
+    result : dict
+        The registration time of the servers, the number of successful requests, the number
+        of failed requests and summary queries, whether each handed-out match-key was taken
+        from exactly one server, the throughput of the requests, and the latency percentiles
+        of the requests and the summary queries meanwhile, in seconds.
+
+    Note
+    ----
+    The test opens one connection per fake server, raise the limit of open files
+    (e.g. ulimit -n) for more than a thousand servers. On a single host with one core, shared
+    by the test and the tracker, 10000 servers register in about 5 seconds and are served at
+    about 5000 requests per second.
+    """
+    return asyncio.run(
+        _load_test(
+            tracker_addr,
+            num_servers,
+            num_clients,
+            num_requests,
+            session_time,
+            ping_period,
+            num_users,
+            key,
+        )
+    )
+
+
+def main(args):
+    """Main function"""
+    tracker = None
+    if args.tracker:
+        host, port = args.tracker.rsplit(":", 1)
+        tracker_addr = (host, int(port))
+    else:
+        # pylint: disable=import-outside-toplevel
+        from ..rpc.tracker import Tracker
+
+        tracker = Tracker("127.0.0.1", port=9190, port_end=9299, silent=True)
+        tracker_addr = ("127.0.0.1", tracker.port)
+    try:
+        result = run_load_test(
+            tracker_addr,
+            num_servers=args.servers,
+            num_clients=args.clients,
+            num_requests=args.requests,
+            session_time=args.session_time,
+            ping_period=args.ping_period,
+            num_users=args.users,
+        )
+    finally:
+        if tracker is not None:
+            tracker.terminate()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--tracker",
+        type=str,
+        default="",
+        help="The address host:port of the tracker, a local tracker is started if not given",
+    )
+    parser.add_argument("--servers", type=int, default=1000, help="The number of fake servers")
+    parser.add_argument("--clients", type=int, default=100, help="The number of fake clients")
+    parser.add_argument(
+        "--requests", type=int, default=10, help="The number of requests of each client"
+    )
+    parser.add_argument(
+        "--session-time", type=float, default=0.1, help="The duration of a fake session"
+    )
+    parser.add_argument(
+        "--ping-period", type=float, default=2.0, help="The ping period of the fake servers"
+    )
+    parser.add_argument("--users", type=int, default=4, help="The number of users of the clients")
+    main(parser.parse_args())
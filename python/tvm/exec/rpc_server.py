@@ -49,6 +49,8 @@ def main(args):
         custom_addr=args.custom_addr,
         silent=args.silent,
         no_fork=not args.fork,
+        cache_dir=args.cache_dir,
+        cache_size_limit=int(args.cache_size_limit * (1 << 30)),
     )
     server.proc.join()
 
@@ -90,6 +92,17 @@ if __name__ == "__main__":
     parser.add_argument(
         "--custom-addr", type=str, help="Custom IP Address to Report to RPC Tracker"
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="The directory of a persistent cache of the uploaded files, kept across sessions.",
+    )
+    parser.add_argument(
+        "--cache-size-limit",
+        type=float,
+        default=16,
+        help="The maximum total size of the cache in GiB.",
+    )
 
     parser.set_defaults(fork=True)
     args = parser.parse_args()
@@ -23,7 +23,25 @@ from ..rpc.tracker import Tracker
 
 def main(args):
     """Main function"""
-    tracker = Tracker(args.host, port=args.port, port_end=args.port_end, silent=args.silent)
+    scheduler_args = None
+    if args.scheduler == "fair":
+        weights = {}
+        for item in args.user_weight:
+            user, weight = item.rsplit("=", 1)
+            weights[user] = float(weight)
+        scheduler_args = {
+            "weights": weights,
+            "max_leases_per_user": args.max_leases_per_user,
+            "aging": args.aging,
+        }
+    tracker = Tracker(
+        args.host,
+        port=args.port,
+        port_end=args.port_end,
+        silent=args.silent,
+        scheduler=args.scheduler,
+        scheduler_args=scheduler_args,
+    )
     tracker.proc.join()
 
 
@@ -35,6 +53,33 @@ if __name__ == "__main__":
     parser.add_argument("--port", type=int, default=9190, help="The port of the RPC")
     parser.add_argument("--port-end", type=int, default=9199, help="The end search port of the RPC")
     parser.add_argument("--silent", action="store_true", help="Whether run in silent mode.")
+    parser.add_argument(
+        "--scheduler",
+        type=str,
+        choices=["priority", "fair"],
+        default="priority",
+        help="The scheduling policy of the requests: priority then FIFO, "
+        "or weighted fair-share among the users.",
+    )
+    parser.add_argument(
+        "--user-weight",
+        type=str,
+        action="append",
+        default=[],
+        help="The fair-share weight of a user as user=weight, 1 by default. Can be repeated.",
+    )
+    parser.add_argument(
+        "--max-leases-per-user",
+        type=int,
+        default=0,
+        help="The maximum number of devices of a key leased to a user, no limit if 0.",
+    )
+    parser.add_argument(
+        "--aging",
+        type=float,
+        default=0.0,
+        help="The priority added to a request per second it waits.",
+    )
     args = parser.parse_args()
     logging.basicConfig(level=logging.INFO)
     main(args)
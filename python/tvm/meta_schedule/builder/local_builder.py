@@ -70,6 +70,12 @@ class LocalBuilder(PyBuilder):
     f_export : Union[None, str, T_EXPORT]
         Name of the export function to be used.
         Defaults to `meta_schedule.builder.default_export`.
+    reuse_pool : bool
+        Whether to keep the worker processes alive across `build` calls, until `shutdown`.
+    maximum_process_uses : Optional[int]
+        The maximum number of builds of each worker process before it is restarted.
+    maximum_process_memory_bytes : Optional[int]
+        The maximum resident memory of each worker process before it is restarted.
 
     Attributes
     ----------
@@ -106,6 +112,9 @@ class LocalBuilder(PyBuilder):
     initializer: Optional[Callable[[], None]]
     f_build: Union[None, str, T_BUILD]
     f_export: Union[None, str, T_EXPORT]
+    reuse_pool: bool
+    maximum_process_uses: Optional[int]
+    maximum_process_memory_bytes: Optional[int]
 
     def __init__(
         self,
@@ -115,6 +124,9 @@ class LocalBuilder(PyBuilder):
         f_build: Union[None, str, T_BUILD] = None,
         f_export: Union[None, str, T_EXPORT] = None,
         initializer: Optional[Callable[[], None]] = None,
+        reuse_pool: bool = False,
+        maximum_process_uses: Optional[int] = None,
+        maximum_process_memory_bytes: Optional[int] = None,
     ) -> None:
         """Constructor.
 
@@ -133,6 +145,17 @@ class LocalBuilder(PyBuilder):
             Defaults to `meta_schedule.builder.default_export`.
         initializer : Optional[Callable[[], None]]
             The initializer to be used for the worker processes.
+        reuse_pool : bool
+            Whether to keep the worker processes alive across `build` calls, so that process
+            startup, `import tvm` and the initializer are paid once instead of in every round.
+            Crashed or timed-out workers are restarted lazily. Call `shutdown` to stop the
+            workers when the builder is no longer used.
+        maximum_process_uses : Optional[int]
+            The maximum number of builds of each worker process before it is restarted,
+            which bounds the memory leaked by long-lived workers. No limit if None.
+        maximum_process_memory_bytes : Optional[int]
+            The maximum resident memory of each worker process, checked after each build.
+            A worker exceeding it is restarted before its next build. No limit if None.
         """
         super().__init__()
 
@@ -145,20 +168,34 @@ class LocalBuilder(PyBuilder):
         self.initializer = initializer
         self.f_build = f_build
         self.f_export = f_export
+        self.reuse_pool = reuse_pool
+        self.maximum_process_uses = maximum_process_uses
+        self.maximum_process_memory_bytes = maximum_process_memory_bytes
+        self._pool: Optional[PopenPoolExecutor] = None
         self._sanity_check()
 
-    def build(self, build_inputs: List[BuilderInput]) -> List[BuilderResult]:
-        results: List[BuilderResult] = []
-        map_result: MapResult
-
-        # Here we restart the PopenPool everytime because of a known memory leak issue with the
-        # PopenPool workers after a couple times of usage. We don't apply the same to runners to
-        # avoid potential problem caused by async behaviour.
+    def _get_pool(self) -> PopenPoolExecutor:
+        if self._pool is not None:
+            return self._pool
         pool = PopenPoolExecutor(
             max_workers=self.max_workers,
             timeout=self.timeout_sec,
             initializer=self.initializer,
+            maximum_process_uses=self.maximum_process_uses,
+            maximum_process_memory_bytes=self.maximum_process_memory_bytes,
         )
+        if self.reuse_pool:
+            self._pool = pool
+        return pool
+
+    def build(self, build_inputs: List[BuilderInput]) -> List[BuilderResult]:
+        results: List[BuilderResult] = []
+        map_result: MapResult
+
+        # Unless `reuse_pool` is set, here we restart the PopenPool everytime because of a known
+        # memory leak issue with the PopenPool workers after a couple times of usage. We don't
+        # apply the same to runners to avoid potential problem caused by async behaviour.
+        pool = self._get_pool()
 
         # Dispatch the build inputs to the worker processes.
         for map_result in pool.map_with_error_catching(
@@ -200,16 +237,21 @@ class LocalBuilder(PyBuilder):
             get_global_func_with_default_on_worker(name=f_build, default=None)
             get_global_func_with_default_on_worker(name=f_export, default=None)
 
-        # Same reason for the single use PopenPool as mentioned above
-        pool = PopenPoolExecutor(
-            max_workers=self.max_workers,
-            timeout=self.timeout_sec,
-            initializer=self.initializer,
-        )
+        # With `reuse_pool`, the check also warms up the pool for the builds
+        pool = self._get_pool()
         value = pool.submit(_check, self.f_build, self.f_export)
         value.result()
         del pool
 
+    def shutdown(self) -> None:
+        """Stop the worker processes kept alive by `reuse_pool`.
+
+        The builder can still be used afterwards, the next `build` starts new workers.
+        """
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
 
 def _worker_func(
     _f_build: Union[None, str, T_BUILD],
@@ -25,18 +25,22 @@ import random
 import tempfile
 from collections import OrderedDict
 from itertools import chain as itertools_chain
-from typing import Dict, List, NamedTuple, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
 import numpy as np  # type: ignore
 import torch  # type: ignore
 import tvm
 
 from ...contrib.tar import tar, untar
-from ...runtime import NDArray
 from ...target import Target
 from ..cost_model import PyCostModel
 from ..database import JSONDatabase
-from ..feature_extractor import FeatureExtractor, PerStoreFeature
+from ..feature_extractor import (
+    FeatureCache,
+    FeatureExtractor,
+    PerStoreFeature,
+    split_batched_features,
+)
 from ..logging import get_logger
 from ..runner import RunnerResult
 from ..search_strategy import MeasureCandidate
@@ -418,6 +422,7 @@ def extract_features(
     candidates: List[MeasureCandidate],
     results: Optional[List[RunnerResult]] = None,
     extractor: Optional[FeatureExtractor] = None,
+    feature_cache: Optional[FeatureCache] = None,
 ):
     """Extract feature vectors and compute mean costs.
 
@@ -431,6 +436,8 @@ def extract_features(
         The measured results, can be None if used in prediction.
     extractor: Optional[FeatureExtractor]
         The feature extractor.
+    feature_cache: Optional[FeatureCache]
+        The persistent feature cache, None if features are always extracted.
 
     Returns
     -------
@@ -441,15 +448,15 @@ def extract_features(
     """
     extractor = extractor or PerStoreFeature(extract_workload=True)
 
-    def _feature(feature: NDArray) -> np.ndarray:
-        return feature.numpy().astype("float32")
-
     def _mean_cost(res: RunnerResult) -> float:
         if not res.run_secs:
             return 1e10
         return float(np.median([float(s) for s in res.run_secs]))
 
-    new_features = [_feature(x) for x in extractor.extract_from(context, candidates)]
+    if feature_cache is not None:
+        new_features = feature_cache.extract_from(extractor, context, candidates)
+    else:
+        new_features = split_batched_features(*extractor.extract_batched(context, candidates))
     new_mean_costs = (
         np.array([_mean_cost(x) for x in results]).astype("float32")
         if results is not None
@@ -471,26 +478,33 @@ class State:
         The size of all data.
     untrained_size: int
         The size of the untrained data.
+    feature_cache: Optional[FeatureCache]
+        The persistent feature cache, which avoids re-extracting features of the same candidates.
     """
 
     model: SegmentSumMLP
     data: Dict[str, FeatureGroup]
     data_size: int
     untrained_size: int
+    feature_cache: Optional[FeatureCache]
 
     def __init__(
         self,
         model_config: Optional[SegmentSumMLPConfig] = None,
         extractor: Optional[FeatureExtractor] = None,
+        feature_cache: Union[None, str, FeatureCache] = None,
     ):
         model_config = model_config or SegmentSumMLPConfig()
         extractor = extractor or PerStoreFeature(extract_workload=True)
+        if isinstance(feature_cache, str):
+            feature_cache = FeatureCache(feature_cache)
 
         self.model = SegmentSumMLP(**model_config.to_dict())
         self.data = OrderedDict()
         self.data_size = 0
         self.untrained_size = 0
         self.extractor = extractor
+        self.feature_cache = feature_cache
 
     def load(  # pylint: disable=too-many-locals
         self,
@@ -553,7 +567,7 @@ class State:
                     assert len(candidates) == len(results)
                     context = TuneContext(mod=tuning_records[0].workload.mod, target=Target(target))
                     features, mean_costs = extract_features(
-                        context, candidates, results, self.extractor
+                        context, candidates, results, self.extractor, self.feature_cache
                     )
                     self.add_to_group(features, mean_costs, shash2hex(context.mod))
 
@@ -990,8 +1004,9 @@ class MLPModel(PyCostModel):
         results : List[RunnerResult]
             The running results of the measure candidates.
         """
+        state = self.trainer.state
         features, mean_costs = extract_features(
-            context, candidates, results, self.trainer.state.extractor
+            context, candidates, results, state.extractor, state.feature_cache
         )
         self.trainer.update(features, mean_costs, shash2hex(context.mod))
 
@@ -1010,6 +1025,9 @@ class MLPModel(PyCostModel):
         result : np.ndarray
             The predicted normalized score.
         """
-        features, _ = extract_features(context, candidates, None, self.trainer.state.extractor)
+        state = self.trainer.state
+        features, _ = extract_features(
+            context, candidates, None, state.extractor, state.feature_cache
+        )
         pred_results = self.trainer.predict_incremental(features)
         return pred_results
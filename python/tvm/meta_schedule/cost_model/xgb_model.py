@@ -19,16 +19,15 @@ import os
 import tempfile
 from collections import OrderedDict
 from itertools import chain as itertools_chain
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
 from typing_extensions import Literal
 
 import numpy as np  # type: ignore
 
 from ...contrib.tar import tar, untar
-from ...runtime import NDArray
 from ..cost_model import PyCostModel
-from ..feature_extractor import FeatureExtractor
+from ..feature_extractor import FeatureCache, FeatureExtractor, split_batched_features
 from ..logging import get_logger
 from ..runner import RunnerResult
 from ..search_strategy import MeasureCandidate
@@ -91,18 +90,58 @@ class PackSum:
         ys : Optional[List[float]]
             A batch of labels. None means no labels available.
         """
+        repeats = [x.shape[0] for x in xs]
+        self._init(
+            xs=np.concatenate(xs, axis=0),
+            ids=np.concatenate([[i] * repeat for i, repeat in enumerate(repeats)], axis=0),
+            ys=None if ys is None else np.repeat(ys, repeats),
+        )
+
+    def _init(
+        self,
+        xs: np.ndarray,  # pylint: disable=invalid-name
+        ids: np.ndarray,
+        ys: Optional[np.ndarray],  # pylint: disable=invalid-name
+    ) -> None:
         import xgboost as xgb  # type: ignore # pylint: disable=import-outside-toplevel
 
-        repeats = [x.shape[0] for x in xs]
-        xs = np.concatenate(xs, axis=0)
-        self.ids = np.concatenate([[i] * repeat for i, repeat in enumerate(repeats)], axis=0)
+        self.ids = ids
         if ys is None:
             self.dmatrix = xgb.DMatrix(data=xs, label=None)
         else:
-            ys = np.concatenate([[y] * repeat for y, repeat in zip(ys, repeats)], axis=0)
             self.dmatrix = xgb.DMatrix(data=xs, label=ys)
             self.dmatrix.set_weight(ys)
 
+    @staticmethod
+    def from_packed(
+        xs: np.ndarray,  # pylint: disable=invalid-name
+        ids: np.ndarray,
+        ys: Optional[np.ndarray],  # pylint: disable=invalid-name
+    ) -> "PackSum":
+        """Create PackSum format from samples that are already packed
+
+        Parameters
+        ----------
+        xs : np.ndarray
+            The packed blocks of all the samples, of shape [n, m]
+        ids : np.ndarray
+            The index of the sample that each block belongs to, of shape [n]
+        ys : Optional[np.ndarray]
+            The label of each sample. None means no labels available.
+
+        Returns
+        -------
+        pack_sum : PackSum
+            The PackSum format of the samples
+        """
+        pack_sum = PackSum.__new__(PackSum)
+        pack_sum._init(  # pylint: disable=protected-access
+            xs=xs,
+            ids=ids,
+            ys=None if ys is None else ys[ids],
+        )
+        return pack_sum
+
     def predict_with_score(self, pred: np.ndarray) -> np.ndarray:
         """Predict the labels given the block level prediction scores.
 
@@ -288,6 +327,132 @@ class FeatureGroup:
         self.min_cost = np.min(self.costs)
 
 
+class FeatureBuffer:
+    """A growing, preallocated buffer of all the data points in the pack-sum format.
+    The capacity is doubled when full, so that appending new samples does not re-concatenate
+    the features of all the existing samples.
+
+    Parameters
+    ----------
+    xs : np.ndarray
+        The float32 blocks of all the samples, of shape [capacity, m]
+    ids : np.ndarray
+        The index of the sample that each block belongs to
+    row_offsets : np.ndarray
+        The index of the first block of each sample
+    group_ids : np.ndarray
+        The index of the feature group that each sample belongs to
+    costs : np.ndarray
+        The cost of each sample
+    group_hashes : Dict[str, int]
+        The index of each feature group
+    num_rows : int
+        The number of blocks in the buffer
+    num_samples : int
+        The number of samples in the buffer
+    """
+
+    xs: Optional[np.ndarray]  # pylint: disable=invalid-name
+    ids: np.ndarray
+    row_offsets: np.ndarray
+    group_ids: np.ndarray
+    costs: np.ndarray
+    group_hashes: Dict[str, int]
+    num_rows: int
+    num_samples: int
+
+    def __init__(self) -> None:
+        self.xs = None
+        self.ids = np.empty((0,), dtype="int64")
+        self.row_offsets = np.zeros((1,), dtype="int64")
+        self.group_ids = np.empty((0,), dtype="int64")
+        self.costs = np.empty((0,), dtype="float32")
+        self.group_hashes = {}
+        self.num_rows = 0
+        self.num_samples = 0
+
+    @staticmethod
+    def _grow(array: np.ndarray, size: int) -> np.ndarray:
+        if array.shape[0] >= size:
+            return array
+        capacity = max(size, 2 * array.shape[0], 64)
+        new_array = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+        new_array[: array.shape[0]] = array
+        return new_array
+
+    def append(self, group_hash: str, features: List[np.ndarray], costs: np.ndarray) -> None:
+        """Append the samples of a feature group.
+
+        Parameters
+        ----------
+        group_hash : str
+            The hash of the group
+        features : List[np.ndarray]
+            The features of each sample
+        costs : np.ndarray
+            The cost of each sample
+        """
+        if not features:
+            return
+        group_id = self.group_hashes.setdefault(group_hash, len(self.group_hashes))
+        repeats = np.array([x.shape[0] for x in features], dtype="int64")
+        num_rows = self.num_rows + int(repeats.sum())
+        num_samples = self.num_samples + len(features)
+        if self.xs is None:
+            self.xs = np.empty((0, features[0].shape[1]), dtype="float32")
+        self.xs = self._grow(self.xs, num_rows)
+        self.ids = self._grow(self.ids, num_rows)
+        self.row_offsets = self._grow(self.row_offsets, num_samples + 1)
+        self.group_ids = self._grow(self.group_ids, num_samples)
+        self.costs = self._grow(self.costs, num_samples)
+        np.concatenate(features, axis=0, out=self.xs[self.num_rows : num_rows])
+        self.ids[self.num_rows : num_rows] = np.repeat(
+            np.arange(self.num_samples, num_samples), repeats
+        )
+        self.row_offsets[self.num_samples + 1 : num_samples + 1] = self.num_rows + np.cumsum(
+            repeats
+        )
+        self.group_ids[self.num_samples : num_samples] = group_id
+        self.costs[self.num_samples : num_samples] = costs
+        self.num_rows = num_rows
+        self.num_samples = num_samples
+
+    def pack(
+        self,
+        data: Dict[str, FeatureGroup],
+        start: int = 0,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the samples since `start` in the pack-sum format, normalized by the min cost
+        of their feature groups.
+
+        Parameters
+        ----------
+        data : Dict[str, FeatureGroup]
+            The feature groups, which provides the min cost of each group.
+        start : int
+            The index of the first sample.
+
+        Returns
+        -------
+        xs : np.ndarray
+            The blocks of the samples, a view of the buffer.
+        ids : np.ndarray
+            The index of the sample that each block belongs to, counting from `start`.
+        ys : np.ndarray
+            The label of each sample.
+        """
+        min_costs = np.empty((len(self.group_hashes),), dtype="float32")
+        for group_hash, group_id in self.group_hashes.items():
+            min_costs[group_id] = data[group_hash].min_cost
+        row_start = self.row_offsets[start]
+        sample_slice = slice(start, self.num_samples)
+        return (
+            self.xs[row_start : self.num_rows],
+            self.ids[row_start : self.num_rows] - start,
+            min_costs[self.group_ids[sample_slice]] / self.costs[sample_slice],
+        )
+
+
 @derived_object
 class XGBModel(PyCostModel):
     """XGBoost model
@@ -309,10 +474,21 @@ class XGBModel(PyCostModel):
         The number to calculate average peak score.
     adaptive_training : bool
         Whether use adaptive training to reduce tuning time.
+    feature_cache : Optional[FeatureCache]
+        The persistent feature cache, which avoids re-extracting features of the same candidates.
+    incremental_training : bool
+        Whether to keep the booster and continue boosting on the new samples only, instead of
+        re-training from scratch on all the samples on each update.
+    num_incremental_rounds : int
+        The maximum number of boosting rounds added by each incremental training.
+    full_refit_interval : int
+        The number of incremental trainings between two full re-trainings on all the samples.
+        Non-positive means never doing full re-training once the booster exists.
     """
 
     # feature extractor
     extractor: FeatureExtractor
+    feature_cache: Optional[FeatureCache]
     # xgboost model config
     config: XGBConfig
     # behavior of randomness
@@ -325,9 +501,15 @@ class XGBModel(PyCostModel):
     data: Dict[str, FeatureGroup]
     data_size: int
     booster: Optional["xgb.Booster"]
+    buffer: FeatureBuffer
     # adaptive training
     adaptive_training: bool
     last_train_size: int
+    # incremental training
+    incremental_training: bool
+    num_incremental_rounds: int
+    full_refit_interval: int
+    num_incremental_trains: int
 
     def __init__(
         self,
@@ -345,12 +527,19 @@ class XGBModel(PyCostModel):
         adaptive_training: bool = True,
         num_tuning_cores: Optional[int] = None,
         tree_method: Optional[Literal["auto", "exact", "approx", "hist", "gpu_hist"]] = None,
+        feature_cache: Union[None, str, FeatureCache] = None,
+        incremental_training: bool = False,
+        num_incremental_rounds: int = 100,
+        full_refit_interval: int = 10,
     ):
         super().__init__()
         if not isinstance(extractor, FeatureExtractor):
             extractor = FeatureExtractor.create(extractor)
+        if isinstance(feature_cache, str):
+            feature_cache = FeatureCache(feature_cache)
         # feature extractor
         self.extractor = extractor
+        self.feature_cache = feature_cache
         # model-related
         if config.nthread is None:
             # use physical core number
@@ -373,9 +562,15 @@ class XGBModel(PyCostModel):
         self.data = OrderedDict()
         self.data_size = 0
         self.booster = None
+        self.buffer = FeatureBuffer()
         # adaptive training
         self.adaptive_training = adaptive_training
         self.last_train_size = 0
+        # incremental training
+        self.incremental_training = incremental_training
+        self.num_incremental_rounds = num_incremental_rounds
+        self.full_refit_interval = full_refit_interval
+        self.num_incremental_trains = 0
 
     def load(self, path: str) -> None:
         """Load the cost model from given file location.
@@ -416,6 +611,9 @@ class XGBModel(PyCostModel):
                 self.booster = None
         self.data = data
         self.data_size = data_size
+        self.buffer = FeatureBuffer()
+        for group in data.values():
+            self.buffer.append(group.group_hash, group.features, group.costs)
         self.booster = booster
 
     def save(self, path: str) -> None:
@@ -484,15 +682,12 @@ class XGBModel(PyCostModel):
         group = self.data.get(new_group_hash, None)
 
         # Step 2. Extract features
-        def _feature(x: NDArray) -> np.ndarray:
-            return x.numpy().astype("float32")
-
         def _mean_cost(x: RunnerResult) -> float:
             if not x.run_secs:
                 return 1e10
             return float(np.median([float(s) for s in x.run_secs]))
 
-        new_features = [_feature(x) for x in self.extractor.extract_from(context, candidates)]
+        new_features = self._extract_features(context, candidates)
         new_mean_costs = [_mean_cost(x) for x in results]
 
         # Filter instances with no features
@@ -526,6 +721,7 @@ class XGBModel(PyCostModel):
             group.append(new_features, new_mean_costs_np)
         self.data[new_group_hash] = group
         self.data_size += len(new_features)
+        self.buffer.append(new_group_hash, new_features, new_mean_costs_np)
 
         if (
             self.adaptive_training
@@ -534,16 +730,27 @@ class XGBModel(PyCostModel):
             # Set a training threshold related to `last_train_size` to reduce the training
             # overhead when there're too many results
             return
-        self.last_train_size = self.data_size
 
         # Step 5. Re-train the model
-        self._train(
-            xs=list(itertools_chain.from_iterable([g.features for g in self.data.values()])),
-            ys=np.concatenate(
-                [g.min_cost / g.costs for g in self.data.values()],
-                axis=0,
-            ),
-        )
+        if (
+            self.incremental_training
+            and self.booster is not None
+            and (
+                self.full_refit_interval <= 0
+                or self.num_incremental_trains < self.full_refit_interval
+            )
+        ):
+            # Continue boosting on the samples added since the last training
+            self.num_incremental_trains += 1
+            self._train(
+                PackSum.from_packed(*self.buffer.pack(self.data, start=self.last_train_size)),
+                num_boost_round=self.num_incremental_rounds,
+                xgb_model=self.booster,
+            )
+        else:
+            self.num_incremental_trains = 0
+            self._train(PackSum.from_packed(*self.buffer.pack(self.data)))
+        self.last_train_size = self.data_size
 
     def predict(
         self,
@@ -565,15 +772,7 @@ class XGBModel(PyCostModel):
             The predicted normalized score.
         """
         if self.data_size >= self.num_warmup_samples and self.booster is not None:
-            ret = self._predict(
-                xs=[
-                    x.numpy().astype("float32")
-                    for x in self.extractor.extract_from(
-                        context,
-                        candidates,
-                    )
-                ]
-            )
+            ret = self._predict(xs=self._extract_features(context, candidates))
         else:
             ret = np.random.uniform(
                 low=0,
@@ -582,14 +781,27 @@ class XGBModel(PyCostModel):
             )
         return ret.astype("float64")
 
+    def _extract_features(
+        self,
+        context: "TuneContext",
+        candidates: List[MeasureCandidate],
+    ) -> List[np.ndarray]:
+        if self.feature_cache is not None:
+            return self.feature_cache.extract_from(self.extractor, context, candidates)
+        return split_batched_features(*self.extractor.extract_batched(context, candidates))
+
     def _train(  # type: ignore # pylint: disable=invalid-name
         self,
-        xs: List[np.ndarray],
-        ys: np.ndarray,
+        d_train: PackSum,
+        num_boost_round: int = 10000,
+        xgb_model: Optional["xgb.Booster"] = None,
     ) -> None:
         import xgboost as xgb  # type: ignore # pylint: disable=import-outside-toplevel
 
-        self.d_train = PackSum(xs=xs, ys=ys)
+        self.d_train = d_train
+        if xgb_model is not None:
+            # Reset the early stopping states of the previous training
+            xgb_model.set_attr(best_score=None, best_iteration=None, best_msg=None)
 
         def obj(ys_pred: np.ndarray, d_train: "xgb.DMatrix"):  # type: ignore # pylint: disable = unused-argument
             return self.d_train.obj_square_error(ys_pred)
@@ -603,8 +815,9 @@ class XGBModel(PyCostModel):
         self.booster = xgb.train(
             self.config.to_dict(),
             self.d_train.dmatrix,
-            num_boost_round=10000,
+            num_boost_round=num_boost_round,
             obj=obj,
+            xgb_model=xgb_model,
             callbacks=[
                 _get_custom_call_back(
                     early_stopping_rounds=self.early_stopping_rounds,
@@ -18,9 +18,12 @@
 The tvm.meta_schedule.database package.
 The database that stores serialized tuning records and workloads
 """
+from .binary_database import BinaryDatabase, convert_json_database
 from .database import Database, PyDatabase, TuningRecord, Workload, create
 from .json_database import JSONDatabase
 from .memory_database import MemoryDatabase
 from .ordered_union_database import OrderedUnionDatabase
 from .schedule_fn_database import ScheduleFnDatabase
+from .sqlite_database import SQLiteDatabase
 from .union_database import UnionDatabase
+from .warm_start_database import WarmStartDatabase, anchor_signature
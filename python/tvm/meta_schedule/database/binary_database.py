@@ -0,0 +1,416 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A database that stores tuning records in indexed, append-only binary files"""
+import bisect
+import json
+import os
+import os.path as osp
+import struct
+import zlib
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from tvm.ir import IRModule
+
+from ..logging import get_logger
+from ..utils import (
+    MAX_MEAN_RUN_SECS,
+    derived_object,
+    is_valid_run_secs,
+    mean_run_secs,
+    module_equal,
+    module_hash,
+)
+from .database import PyDatabase, TuningRecord, Workload
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+_WORKLOAD_MAGIC = b"TVMMSWL1"
+_RECORD_MAGIC = b"TVMMSTR1"
+_INDEX_MAGIC = b"TVMMSIX1"
+# (module hash, payload size)
+_WORKLOAD_HEADER = struct.Struct("<qI")
+# (workload index, payload size, mean run secs)
+_RECORD_HEADER = struct.Struct("<IId")
+# (workload index, mean run secs, record offset)
+_INDEX_ENTRY = struct.Struct("<IdQ")
+
+
+def _dump_payload(json_obj: Any, compress_level: int) -> bytes:
+    return zlib.compress(json.dumps(json_obj).encode("utf-8"), compress_level)
+
+
+def _load_payload(payload: bytes) -> Any:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+def _open_table(path: str, magic: bytes, allow_missing: bool) -> BinaryIO:
+    """Open a table file for reading and appending, creating it if allowed."""
+    if not osp.exists(path):
+        if not allow_missing:
+            raise ValueError(f"File doesn't exist: {path}")
+        with open(path, "wb") as file:
+            file.write(magic)
+    file = open(path, "a+b")  # pylint: disable=consider-using-with
+    file.seek(0)
+    if file.read(len(magic)) != magic:
+        file.close()
+        raise ValueError(f"Not a valid binary database file: {path}")
+    return file
+
+
+def _scan_table(
+    file: BinaryIO,
+    header: struct.Struct,
+    start: int,
+    size_field: int,
+) -> List[Tuple[int, Tuple]]:
+    """Scan the headers of a table from `start`, skipping the payloads.
+    A trailing entry that was only partially written is truncated from the file.
+
+    Returns
+    -------
+    entries : List[Tuple[int, Tuple]]
+        The offset and the unpacked header of each complete entry.
+    """
+    file_size = file.seek(0, os.SEEK_END)
+    entries = []
+    offset = start
+    while offset < file_size:
+        file.seek(offset)
+        raw = file.read(header.size)
+        if len(raw) < header.size:
+            break
+        fields = header.unpack(raw)
+        end = offset + header.size + fields[size_field]
+        if end > file_size:
+            break
+        entries.append((offset, fields))
+        offset = end
+    if offset < file_size:
+        logger.warning(
+            "Truncating %d bytes of incomplete entry from: %s", file_size - offset, file.name
+        )
+        file.truncate(offset)
+    return entries
+
+
+@derived_object
+class BinaryDatabase(PyDatabase):
+    """A database backed by indexed, append-only binary files.
+
+    Unlike JSONDatabase, opening the database does not parse every record. Only the compact
+    record index is loaded in memory; workloads and tuning records are decoded lazily from disk
+    when they are queried. Each workload keeps its records sorted by mean run time, so that
+    `has_workload`, `commit_tuning_record` and `get_top_k` do not scan the whole database.
+
+    Parameters
+    ----------
+    path_workload : str
+        The path to the workload table.
+    path_tuning_record : str
+        The path to the tuning record table.
+    path_index : str
+        The path to the tuning record index.
+    compress_level : int
+        The zlib compression level of the serialized entries.
+    module_equality : str
+        The module equality to identify the workloads, see JSONDatabase.
+
+    Note
+    ----
+    The workload table stores the hashes of the given module equality, so a database must be
+    reopened with the module equality it was created with.
+    """
+
+    path_workload: str
+    path_tuning_record: str
+    path_index: str
+    compress_level: int
+    module_equality: str
+
+    def __init__(
+        self,
+        path_workload: Optional[str] = None,
+        path_tuning_record: Optional[str] = None,
+        path_index: Optional[str] = None,
+        *,
+        work_dir: Optional[str] = None,
+        allow_missing: bool = True,
+        compress_level: int = 6,
+        module_equality: str = "structural",
+    ) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        path_workload : Optional[str] = None
+            The path to the workload table. If not specified,
+            will be generated from `work_dir` as `$work_dir/database_workload.bin`.
+        path_tuning_record : Optional[str] = None
+            The path to the tuning record table. If not specified,
+            will be generated from `work_dir` as `$work_dir/database_tuning_record.bin`.
+        path_index : Optional[str] = None
+            The path to the tuning record index. If not specified,
+            will be generated from `path_tuning_record` by replacing the suffix with `.idx`.
+        work_dir : Optional[str] = None
+            The work directory, if specified, will be used to generate `path_tuning_record`
+            and `path_workload`.
+        allow_missing : bool
+            Whether to create new file when the given path is not found.
+        compress_level : int
+            The zlib compression level of the serialized entries.
+        module_equality : str
+            The module equality to identify the workloads, one of "structural",
+            "ignore-ndarray" and "anchor-block".
+        """
+        super().__init__(module_equality=module_equality)
+        if work_dir is not None:
+            if path_workload is None:
+                path_workload = osp.join(work_dir, "database_workload.bin")
+            if path_tuning_record is None:
+                path_tuning_record = osp.join(work_dir, "database_tuning_record.bin")
+        if path_workload is None:
+            raise ValueError("`path_workload` is not specified.")
+        if path_tuning_record is None:
+            raise ValueError("`path_tuning_record` is not specified.")
+        if path_index is None:
+            path_index = osp.splitext(path_tuning_record)[0] + ".idx"
+        self.path_workload = path_workload
+        self.path_tuning_record = path_tuning_record
+        self.path_index = path_index
+        self.compress_level = compress_level
+        # The decoded workloads, None if not yet loaded from disk
+        self._workloads: List[Optional[Workload]] = []
+        # The offset of each workload in the workload table
+        self._workload_offsets: List[int] = []
+        # Structural hash => indices of the workloads
+        self._shash2indices: Dict[int, List[int]] = {}
+        # Workload index => sorted (mean run secs, offset) of its tuning records
+        self._records: Dict[int, List[Tuple[float, int]]] = {}
+        self._num_records = 0
+        self._f_workload = _open_table(path_workload, _WORKLOAD_MAGIC, allow_missing)
+        self._f_record = _open_table(path_tuning_record, _RECORD_MAGIC, allow_missing)
+        self._f_index = _open_table(path_index, _INDEX_MAGIC, True)
+        self._load_workloads()
+        self._load_index()
+
+    def _load_workloads(self) -> None:
+        for offset, (shash, _) in _scan_table(
+            self._f_workload, _WORKLOAD_HEADER, len(_WORKLOAD_MAGIC), size_field=1
+        ):
+            self._shash2indices.setdefault(shash, []).append(len(self._workloads))
+            self._workloads.append(None)
+            self._workload_offsets.append(offset)
+
+    def _load_index(self) -> None:
+        self._f_index.seek(len(_INDEX_MAGIC))
+        raw = self._f_index.read()
+        num_entries = len(raw) // _INDEX_ENTRY.size
+        if num_entries * _INDEX_ENTRY.size != len(raw):
+            self._f_index.truncate(len(_INDEX_MAGIC) + num_entries * _INDEX_ENTRY.size)
+        end = len(_RECORD_MAGIC)
+        # The entries are appended unsorted, then each workload is sorted once
+        for workload_idx, mean, offset in _INDEX_ENTRY.iter_unpack(
+            raw[: num_entries * _INDEX_ENTRY.size]
+        ):
+            self._records.setdefault(workload_idx, []).append((mean, offset))
+            end = offset
+        self._num_records += num_entries
+        if num_entries > 0:
+            self._f_record.seek(end)
+            _, size, _ = _RECORD_HEADER.unpack(self._f_record.read(_RECORD_HEADER.size))
+            end += _RECORD_HEADER.size + size
+        # Recover the records appended after the last index entry, e.g. after a crash
+        missing = _scan_table(self._f_record, _RECORD_HEADER, end, size_field=1)
+        if missing:
+            logger.info("Rebuilding index of %d tuning records: %s", len(missing), self.path_index)
+        for offset, (workload_idx, _, mean) in missing:
+            self._f_index.write(_INDEX_ENTRY.pack(workload_idx, mean, offset))
+            self._records.setdefault(workload_idx, []).append((mean, offset))
+        self._num_records += len(missing)
+        self._f_index.flush()
+        for entries in self._records.values():
+            entries.sort()
+
+    def _insert_index(self, workload_idx: int, mean: float, offset: int) -> None:
+        bisect.insort(self._records.setdefault(workload_idx, []), (mean, offset))
+        self._num_records += 1
+
+    def _get_workload(self, workload_idx: int) -> Workload:
+        workload = self._workloads[workload_idx]
+        if workload is None:
+            self._f_workload.seek(self._workload_offsets[workload_idx])
+            _, size = _WORKLOAD_HEADER.unpack(self._f_workload.read(_WORKLOAD_HEADER.size))
+            workload = Workload.from_json(_load_payload(self._f_workload.read(size)))
+            self._workloads[workload_idx] = workload
+        return workload
+
+    def _find_workload(self, mod: IRModule, shash: int) -> Optional[int]:
+        for workload_idx in self._shash2indices.get(shash, []):
+            workload = self._workloads[workload_idx]
+            if workload is not None and workload.mod.same_as(mod):
+                return workload_idx
+        for workload_idx in self._shash2indices.get(shash, []):
+            if module_equal(self._get_workload(workload_idx).mod, mod, self.module_equality):
+                return workload_idx
+        return None
+
+    def _hash(self, mod: IRModule) -> int:
+        return module_hash(mod, self.module_equality)
+
+    def _get_record(self, offset: int) -> TuningRecord:
+        self._f_record.seek(offset)
+        workload_idx, size, _ = _RECORD_HEADER.unpack(self._f_record.read(_RECORD_HEADER.size))
+        return TuningRecord.from_json(
+            _load_payload(self._f_record.read(size)),
+            self._get_workload(workload_idx),
+        )
+
+    def _append_workload(self, workload: Workload, shash: int) -> int:
+        payload = _dump_payload(workload.as_json(), self.compress_level)
+        offset = self._f_workload.seek(0, os.SEEK_END)
+        self._f_workload.write(_WORKLOAD_HEADER.pack(shash, len(payload)) + payload)
+        self._f_workload.flush()
+        workload_idx = len(self._workloads)
+        self._shash2indices.setdefault(shash, []).append(workload_idx)
+        self._workloads.append(workload)
+        self._workload_offsets.append(offset)
+        return workload_idx
+
+    def _append_record(self, workload_idx: int, json_obj: Any) -> None:
+        run_secs = json_obj[1]
+        mean = mean_run_secs(run_secs) if is_valid_run_secs(run_secs) else MAX_MEAN_RUN_SECS
+        payload = _dump_payload(json_obj, self.compress_level)
+        offset = self._f_record.seek(0, os.SEEK_END)
+        self._f_record.write(_RECORD_HEADER.pack(workload_idx, len(payload), mean) + payload)
+        self._f_record.flush()
+        self._f_index.write(_INDEX_ENTRY.pack(workload_idx, mean, offset))
+        self._f_index.flush()
+        self._insert_index(workload_idx, mean, offset)
+
+    def has_workload(self, mod: IRModule) -> bool:
+        return self._find_workload(mod, self._hash(mod)) is not None
+
+    def commit_workload(self, mod: IRModule) -> Workload:
+        shash = self._hash(mod)
+        workload_idx = self._find_workload(mod, shash)
+        if workload_idx is None:
+            workload_idx = self._append_workload(Workload(mod), shash)
+        return self._get_workload(workload_idx)
+
+    def commit_tuning_record(self, record: TuningRecord) -> None:
+        mod = record.workload.mod
+        shash = self._hash(mod)
+        workload_idx = self._find_workload(mod, shash)
+        if workload_idx is None:
+            workload_idx = self._append_workload(record.workload, shash)
+        self._append_record(workload_idx, record.as_json())
+
+    def get_top_k(self, workload: Workload, top_k: int) -> List[TuningRecord]:
+        if top_k < 0:
+            raise ValueError("top_k must be non-negative")
+        workload_idx = self._find_workload(workload.mod, self._hash(workload.mod))
+        if top_k == 0 or workload_idx is None:
+            return []
+        results: List[TuningRecord] = []
+        for mean, offset in self._records.get(workload_idx, []):
+            if mean >= MAX_MEAN_RUN_SECS or len(results) == top_k:
+                break
+            results.append(self._get_record(offset))
+        return results
+
+    def get_all_tuning_records(self) -> List[TuningRecord]:
+        return [
+            self._get_record(offset)
+            for _, offset in sorted(
+                entry for entries in self._records.values() for entry in entries
+            )
+        ]
+
+    def __len__(self) -> int:
+        return self._num_records
+
+    def import_json_database(self, path_workload: str, path_tuning_record: str) -> None:
+        """Import the tables of a JSONDatabase, streaming them line by line.
+
+        Parameters
+        ----------
+        path_workload : str
+            The path to the workload table of the JSONDatabase.
+        path_tuning_record : str
+            The path to the tuning record table of the JSONDatabase.
+        """
+        workload_indices: List[int] = []
+        with open(path_workload, "r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                mod = Workload.from_json(json.loads(line)).mod
+                shash = self._hash(mod)
+                workload_idx = self._find_workload(mod, shash)
+                if workload_idx is None:
+                    workload_idx = self._append_workload(Workload(mod), shash)
+                workload_indices.append(workload_idx)
+        with open(path_tuning_record, "r", encoding="utf-8") as file:
+            for line_no, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                json_workload_idx, json_obj = json.loads(line)
+                if not 0 <= json_workload_idx < len(workload_indices):
+                    raise ValueError(
+                        f"Invalid workload index {json_workload_idx}, on line {line_no} "
+                        f"of file {path_tuning_record}"
+                    )
+                self._append_record(workload_indices[json_workload_idx], json_obj)
+
+
+def convert_json_database(
+    json_path_workload: str,
+    json_path_tuning_record: str,
+    path_workload: Optional[str] = None,
+    path_tuning_record: Optional[str] = None,
+    *,
+    work_dir: Optional[str] = None,
+    module_equality: str = "structural",
+) -> BinaryDatabase:
+    """Migrate a JSONDatabase to a BinaryDatabase.
+
+    Parameters
+    ----------
+    json_path_workload : str
+        The path to the workload table of the JSONDatabase.
+    json_path_tuning_record : str
+        The path to the tuning record table of the JSONDatabase.
+    path_workload : Optional[str] = None
+        The path to the workload table of the BinaryDatabase.
+    path_tuning_record : Optional[str] = None
+        The path to the tuning record table of the BinaryDatabase.
+    work_dir : Optional[str] = None
+        The work directory of the BinaryDatabase.
+    module_equality : str
+        The module equality of the BinaryDatabase.
+
+    Returns
+    -------
+    database : BinaryDatabase
+        The BinaryDatabase containing all the workloads and tuning records.
+    """
+    database = BinaryDatabase(
+        path_workload, path_tuning_record, work_dir=work_dir, module_equality=module_equality
+    )
+    database.import_json_database(json_path_workload, json_path_tuning_record)
+    return database
@@ -164,7 +164,7 @@ class TuningRecord(Object):
 class Database(Object):
     """The abstract database interface."""
 
-    DatabaseType = Union["Database", Literal["json", "memory"]]
+    DatabaseType = Union["Database", Literal["json", "memory", "binary", "sqlite"]]
 
     def has_workload(self, mod: IRModule) -> bool:
         """Check if the database has the given workload.
@@ -325,6 +325,16 @@ class Database(Object):
             self, destination
         )
 
+    def get_module_equality(self) -> str:
+        """Get the module equality the database identifies the workloads with.
+
+        Returns
+        -------
+        module_equality : str
+            The module equality, "structural", "ignore-ndarray" or "anchor-block".
+        """
+        return str(_ffi_api.DatabaseModuleEquality(self))  # type: ignore # pylint: disable=no-member
+
     def query(
         self,
         mod: IRModule,
@@ -381,6 +391,8 @@ class Database(Object):
             Literal[
                 "json",
                 "memory",
+                "binary",
+                "sqlite",
                 "union",
                 "ordered_union",
             ],
@@ -393,10 +405,11 @@ class Database(Object):
 
         Parameters
         ----------
-        kind : str = "json" | "memory" | "union" | "ordered_union" | Callable[[tvm.tir.Schedule],
-        bool]
+        kind : str = "json" | "memory" | "binary" | "sqlite" | "union" | "ordered_union" |
+        Callable[[tvm.tir.Schedule], bool]
             The kind of the database to be created. The following kinds are supported:
-            "json", "memory", "union", "ordered_union", and a custom schedule function.
+            "json", "memory", "binary", "sqlite", "union", "ordered_union", and a custom schedule
+            function.
 
         Returns
         -------
@@ -404,10 +417,12 @@ class Database(Object):
             The created database.
         """
         from . import (  # pylint: disable=import-outside-toplevel
+            BinaryDatabase,
             JSONDatabase,
             MemoryDatabase,
             OrderedUnionDatabase,
             ScheduleFnDatabase,
+            SQLiteDatabase,
             UnionDatabase,
         )
 
@@ -417,6 +432,10 @@ class Database(Object):
             return JSONDatabase(*args, **kwargs)
         if kind == "memory":
             return MemoryDatabase(*args, **kwargs)  # type: ignore
+        if kind == "binary":
+            return BinaryDatabase(*args, **kwargs)  # type: ignore
+        if kind == "sqlite":
+            return SQLiteDatabase(*args, **kwargs)  # type: ignore
         if kind == "union":
             return UnionDatabase(*args, **kwargs)  # type: ignore
         if kind == "ordered_union":
@@ -438,6 +457,7 @@ class _PyDatabase(Database):
 
     def __init__(
         self,
+        module_equality: str = "structural",
         f_has_workload: Callable = None,
         f_commit_workload: Callable = None,
         f_commit_tuning_record: Callable = None,
@@ -447,7 +467,6 @@ class _PyDatabase(Database):
         f_query_schedule: Callable = None,
         f_query_ir_module: Callable = None,
         f_size: Callable = None,
-        module_equality: str = "structural",
     ):
         """Constructor."""
 
@@ -476,6 +495,7 @@ class PyDatabase:
 
     _tvm_metadata = {
         "cls": _PyDatabase,
+        "fields": ["module_equality"],
         "methods": [
             "has_workload",
             "commit_workload",
@@ -489,6 +509,21 @@ class PyDatabase:
         ],
     }
 
+    # The default for the subclasses that do not call the constructor
+    module_equality = "structural"
+
+    def __init__(self, module_equality: str = "structural") -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        module_equality : Optional[str]
+            A string to specify the module equality testing and hashing method,
+            used by the default query methods on the C++ side.
+            It must be one of "structural", "ignore-ndarray" and "anchor-block".
+        """
+        self.module_equality = module_equality
+
     def has_workload(self, mod: IRModule) -> bool:
         """Check if the database has the given workload.
         Parameters
@@ -0,0 +1,236 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A database that stores tuning records in SQLite, shared by concurrent processes"""
+import json
+import os
+import os.path as osp
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from tvm.ir import IRModule
+
+from ..utils import (
+    MAX_MEAN_RUN_SECS,
+    derived_object,
+    is_valid_run_secs,
+    mean_run_secs,
+    module_equal,
+    module_hash,
+)
+from .database import PyDatabase, TuningRecord, Workload
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workloads (
+    id INTEGER PRIMARY KEY,
+    shash INTEGER NOT NULL,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS workloads_shash ON workloads (shash);
+CREATE TABLE IF NOT EXISTS tuning_records (
+    id INTEGER PRIMARY KEY,
+    workload_id INTEGER NOT NULL REFERENCES workloads (id),
+    mean_run_secs REAL NOT NULL,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tuning_records_top_k
+    ON tuning_records (workload_id, mean_run_secs, id);
+"""
+
+
+@derived_object
+class SQLiteDatabase(PyDatabase):
+    """A database backed by SQLite, which can be shared by multiple tuning processes.
+
+    The database runs in WAL mode, so that readers do not block the writer. Every query goes to
+    the database file, so that records committed by other processes are visible immediately.
+    Workloads are deduplicated by their module hash inside a write transaction. Each thread
+    opens its own connection, so that the database can be used by several threads.
+
+    Parameters
+    ----------
+    path : str
+        The path to the SQLite database file.
+    timeout_sec : float
+        The time to wait for a lock held by another process before raising an error.
+    module_equality : str
+        The module equality to identify the workloads, see JSONDatabase.
+
+    Note
+    ----
+    The workload table stores the hashes of the given module equality, so all the processes
+    sharing a database must use the module equality it was created with.
+    """
+
+    path: str
+    timeout_sec: float
+    module_equality: str
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        work_dir: Optional[str] = None,
+        allow_missing: bool = True,
+        timeout_sec: float = 60.0,
+        module_equality: str = "structural",
+    ) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        path : Optional[str] = None
+            The path to the SQLite database file. If not specified,
+            will be generated from `work_dir` as `$work_dir/database.sqlite`.
+        work_dir : Optional[str] = None
+            The work directory, if specified, will be used to generate `path`.
+        allow_missing : bool
+            Whether to create new file when the given path is not found.
+        timeout_sec : float
+            The time to wait for a lock held by another process before raising an error.
+        module_equality : str
+            The module equality to identify the workloads, one of "structural",
+            "ignore-ndarray" and "anchor-block".
+        """
+        super().__init__(module_equality=module_equality)
+        if path is None and work_dir is not None:
+            path = osp.join(work_dir, "database.sqlite")
+        if path is None:
+            raise ValueError("`path` is not specified.")
+        if not allow_missing and not osp.exists(path):
+            raise ValueError(f"File doesn't exist: {path}")
+        self.path = path
+        self.timeout_sec = timeout_sec
+        # The decoded workloads of this process, keyed by row id
+        self._workloads: Dict[int, Workload] = {}
+        # The connection of each thread
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared across threads or a fork
+        local = self._local
+        if getattr(local, "conn", None) is None or local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout_sec, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            local.conn = conn
+            local.pid = os.getpid()
+        return local.conn
+
+    def _get_workload(self, workload_id: int, json_str: Optional[str] = None) -> Workload:
+        workload = self._workloads.get(workload_id)
+        if workload is None:
+            if json_str is None:
+                (json_str,) = (
+                    self._connect()
+                    .execute("SELECT json FROM workloads WHERE id = ?", (workload_id,))
+                    .fetchone()
+                )
+            workload = Workload.from_json(json.loads(json_str))
+            self._workloads[workload_id] = workload
+        return workload
+
+    def _find_workload(self, mod: IRModule, shash: int) -> Optional[int]:
+        rows = (
+            self._connect()
+            .execute("SELECT id, json FROM workloads WHERE shash = ? ORDER BY id", (shash,))
+            .fetchall()
+        )
+        for workload_id, json_str in rows:
+            if module_equal(
+                self._get_workload(workload_id, json_str).mod, mod, self.module_equality
+            ):
+                return workload_id
+        return None
+
+    def _commit_workload(self, workload: Workload) -> int:
+        mod = workload.mod
+        shash = module_hash(mod, self.module_equality)
+        workload_id = self._find_workload(mod, shash)
+        if workload_id is not None:
+            return workload_id
+        conn = self._connect()
+        # Take the write lock, then check again for a workload committed by another process
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            workload_id = self._find_workload(mod, shash)
+            if workload_id is None:
+                workload_id = conn.execute(
+                    "INSERT INTO workloads (shash, json) VALUES (?, ?)",
+                    (shash, json.dumps(workload.as_json())),
+                ).lastrowid
+                self._workloads[workload_id] = workload
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return workload_id
+
+    def has_workload(self, mod: IRModule) -> bool:
+        return self._find_workload(mod, module_hash(mod, self.module_equality)) is not None
+
+    def commit_workload(self, mod: IRModule) -> Workload:
+        return self._get_workload(self._commit_workload(Workload(mod)))
+
+    def commit_tuning_record(self, record: TuningRecord) -> None:
+        workload_id = self._commit_workload(record.workload)
+        json_obj = record.as_json()
+        run_secs = json_obj[1]
+        mean = mean_run_secs(run_secs) if is_valid_run_secs(run_secs) else MAX_MEAN_RUN_SECS
+        self._connect().execute(
+            "INSERT INTO tuning_records (workload_id, mean_run_secs, json) VALUES (?, ?, ?)",
+            (workload_id, mean, json.dumps(json_obj)),
+        )
+
+    def get_top_k(self, workload: Workload, top_k: int) -> List[TuningRecord]:
+        if top_k < 0:
+            raise ValueError("top_k must be non-negative")
+        workload_id = self._find_workload(
+            workload.mod, module_hash(workload.mod, self.module_equality)
+        )
+        if top_k == 0 or workload_id is None:
+            return []
+        rows = (
+            self._connect()
+            .execute(
+                "SELECT json FROM tuning_records WHERE workload_id = ? AND mean_run_secs < ? "
+                "ORDER BY mean_run_secs, id LIMIT ?",
+                (workload_id, MAX_MEAN_RUN_SECS, top_k),
+            )
+            .fetchall()
+        )
+        workload = self._get_workload(workload_id)
+        return [TuningRecord.from_json(json.loads(json_str), workload) for (json_str,) in rows]
+
+    def get_all_tuning_records(self) -> List[TuningRecord]:
+        rows = (
+            self._connect()
+            .execute(
+                "SELECT workload_id, json FROM tuning_records ORDER BY mean_run_secs, id",
+            )
+            .fetchall()
+        )
+        return [
+            TuningRecord.from_json(json.loads(json_str), self._get_workload(workload_id))
+            for workload_id, json_str in rows
+        ]
+
+    def __len__(self) -> int:
+        (size,) = self._connect().execute("SELECT COUNT(*) FROM tuning_records").fetchone()
+        return size
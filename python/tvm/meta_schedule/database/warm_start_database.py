@@ -0,0 +1,277 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A database that warm-starts new workloads from similar workloads of another database"""
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from tvm.ir import IRModule, structural_equal, structural_hash
+from tvm.target import Target
+from tvm.tir.analysis import find_anchor_block
+from tvm.tir.schedule import Schedule, Trace
+
+from ..logging import get_logger
+from ..trace_apply import schedule_using_anchor_trace
+from ..utils import derived_object, is_valid_run_secs, mean_run_secs
+from .database import Database, PyDatabase, TuningRecord, Workload
+
+if TYPE_CHECKING:
+    from ..postproc import Postproc
+    from ..tune_context import TuneContext
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+
+def anchor_signature(mod: IRModule) -> Optional[str]:
+    """The shape-agnostic signature of the anchor block of the module.
+
+    Two modules with the same signature share the anchor block up to its loop extents, e.g. the
+    same conv2d with different batch sizes or spatial shapes.
+
+    Parameters
+    ----------
+    mod : IRModule
+        The module.
+
+    Returns
+    -------
+    signature : Optional[str]
+        The signature, or None if the module has no anchor block.
+    """
+    block = find_anchor_block(mod)
+    if block is None:
+        return None
+    iter_types = "".join(str(int(iter_var.iter_type)) for iter_var in block.iter_vars)
+    buffers = ",".join(
+        f"{region.buffer.dtype}x{len(region.buffer.shape)}"
+        for region in list(block.reads) + list(block.writes)
+    )
+    return f"{block.name_hint}|{iter_types}|{buffers}"
+
+
+def _target_key(target: Optional[Target]) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """The kind and keys of a target, the parts a schedule depends on."""
+    if target is None:
+        return None
+    return target.kind.name, tuple(str(key) for key in target.keys)
+
+
+def _passes_postprocs(sch: Schedule, postprocs: List["Postproc"]) -> bool:
+    """Whether a copy of the schedule passes the postprocessors, as a searched one must."""
+    sch = sch.copy()
+    sch.enter_postproc()
+    for postproc in postprocs:
+        try:
+            if not postproc.apply(sch):
+                return False
+        except Exception:  # pylint: disable=broad-except
+            return False
+    return True
+
+
+def _transfer_trace(
+    mod: IRModule,
+    record: TuningRecord,
+    postprocs: Optional[List["Postproc"]] = None,
+) -> Optional[Trace]:
+    """Apply the trace of a record on a similar workload to the given module.
+    The transferred trace must pass the postprocessors if they are given."""
+    target = record.target
+    trace = record.trace
+    # Tile sizes sampled for the old extents may not divide the new ones. In that case,
+    # keep the structure of the trace and sample the tile sizes again.
+    resampled = Trace(
+        trace.insts,
+        {
+            inst: decision
+            for inst, decision in trace.decisions.items()
+            if inst.kind.name != "SamplePerfectTile"
+        },
+    )
+    for anchor_trace in [trace, resampled]:
+        sch = Schedule(mod, error_render_level="none")
+        try:
+            if target is None:
+                anchor_trace.apply_to_schedule(sch, remove_postproc=True)
+            else:
+                schedule_using_anchor_trace(sch, anchor_trace, target)
+        except Exception:  # pylint: disable=broad-except
+            continue
+        if postprocs is not None and not _passes_postprocs(sch, postprocs):
+            continue
+        return sch.trace
+    return None
+
+
+@derived_object
+class WarmStartDatabase(PyDatabase):
+    """A database that warm-starts the tuning of new workloads from another database.
+
+    All the operations go to `database`, except that `get_top_k` fills the missing records of a
+    workload with the best records of similar workloads in `source`, i.e. those with the same
+    anchor block but different loop extents, tuned for a target of the same kind and keys. Their
+    traces are applied to the new workload with `schedule_using_anchor_trace`, so the
+    evolutionary search starts from the known good schedules instead of a random population.
+
+    The filled records are never committed, and keep the run time of the source records. Only
+    use this database during tuning, and query the wrapped database afterwards. The evolutionary
+    search fails on a record it cannot postprocess, so when the tasks are given, the records
+    transferred to the workload of a task are only kept if they pass its postprocessors.
+
+    Parameters
+    ----------
+    database : Database
+        The database to store the tuning records of this run.
+    source : Database
+        The database with the tuning records of similar workloads.
+    target : Optional[Target]
+        The target of the tuning. Only the source records of a target with the same kind and keys
+        are used. All the source records are used if None.
+    top_k_per_workload : int
+        The number of the best records to take from each similar workload.
+    tasks : Optional[List[TuneContext]]
+        The tuning tasks, whose postprocessors the transferred records must pass.
+    module_equality : str
+        The module equality testing and hashing method, see `PyDatabase`.
+    """
+
+    database: Database
+    source: Database
+    target: Optional[Target]
+    top_k_per_workload: int
+    tasks: List["TuneContext"]
+
+    def __init__(
+        self,
+        database: Database,
+        source: Database,
+        *,
+        target: Optional[Target] = None,
+        top_k_per_workload: int = 8,
+        tasks: Optional[List["TuneContext"]] = None,
+        module_equality: str = "structural",
+    ) -> None:
+        super().__init__(module_equality)
+        self.database = database
+        self.source = source
+        self.target = target
+        self.top_k_per_workload = top_k_per_workload
+        self.tasks = list(tasks) if tasks is not None else []
+        # The best records of the source workloads per target, grouped by the anchor signature
+        self._index: Optional[Dict[str, List[Tuple[Workload, List[TuningRecord]]]]] = None
+        # The transferred records, keyed by the structural hash of the new workload
+        self._transferred: Dict[int, List[Tuple[IRModule, List[TuningRecord]]]] = {}
+
+    def _build_index(self) -> Dict[str, List[Tuple[Workload, List[TuningRecord]]]]:
+        if self._index is not None:
+            return self._index
+        target_key = _target_key(self.target)
+        groups: Dict[int, Tuple[Workload, List[TuningRecord]]] = {}
+        for record in self.source.get_all_tuning_records():
+            if not is_valid_run_secs(record.run_secs):
+                continue
+            if target_key is not None and _target_key(record.target) != target_key:
+                continue
+            workload = record.workload
+            key = structural_hash(workload.mod)
+            if key not in groups:
+                groups[key] = (workload, [])
+            groups[key][1].append(record)
+        index: Dict[str, List[Tuple[Workload, List[TuningRecord]]]] = {}
+        for workload, records in groups.values():
+            signature = anchor_signature(workload.mod)
+            if signature is None:
+                continue
+            records.sort(key=lambda record: mean_run_secs(record.run_secs))
+            index.setdefault(signature, []).append((workload, records[: self.top_k_per_workload]))
+        self._index = index
+        return index
+
+    def similar_records(self, mod: IRModule) -> List[TuningRecord]:
+        """The best records of the workloads similar to the given module in the source database,
+        excluding the module itself, sorted by mean run time.
+
+        Parameters
+        ----------
+        mod : IRModule
+            The module to be searched for.
+
+        Returns
+        -------
+        records : List[TuningRecord]
+            The records of the similar workloads.
+        """
+        signature = anchor_signature(mod)
+        if signature is None:
+            return []
+        results: List[TuningRecord] = []
+        for workload, records in self._build_index().get(signature, []):
+            if not structural_equal(workload.mod, mod):
+                results.extend(records)
+        results.sort(key=lambda record: mean_run_secs(record.run_secs))
+        return results
+
+    def _postprocs(self, mod: IRModule) -> Optional[List["Postproc"]]:
+        """The postprocessors of the task of the module, or None if it is not a task."""
+        for task in self.tasks:
+            if task.space_generator is not None and structural_equal(task.mod, mod):
+                return list(task.space_generator.postprocs)
+        return None
+
+    def _transferred_records(self, workload: Workload) -> List[TuningRecord]:
+        mod = workload.mod
+        entries = self._transferred.setdefault(structural_hash(mod), [])
+        for entry_mod, records in entries:
+            if structural_equal(entry_mod, mod):
+                return records
+        postprocs = self._postprocs(mod)
+        records = []
+        for record in self.similar_records(mod):
+            trace = _transfer_trace(mod, record, postprocs)
+            if trace is not None:
+                records.append(
+                    TuningRecord(
+                        trace=trace,
+                        workload=workload,
+                        run_secs=record.run_secs,
+                        target=record.target,
+                        args_info=None,
+                    )
+                )
+        if records:
+            logger.info("Warm-starting a workload with %d record(s) of similar ones", len(records))
+        entries.append((mod, records))
+        return records
+
+    def has_workload(self, mod: IRModule) -> bool:
+        return self.database.has_workload(mod)
+
+    def commit_workload(self, mod: IRModule) -> Workload:
+        return self.database.commit_workload(mod)
+
+    def commit_tuning_record(self, record: TuningRecord) -> None:
+        self.database.commit_tuning_record(record)
+
+    def get_top_k(self, workload: Workload, top_k: int) -> List[TuningRecord]:
+        records = list(self.database.get_top_k(workload, top_k))
+        if len(records) < top_k:
+            records.extend(self._transferred_records(workload)[: top_k - len(records)])
+        return records
+
+    def get_all_tuning_records(self) -> List[TuningRecord]:
+        return self.database.get_all_tuning_records()
+
+    def __len__(self) -> int:
+        return len(self.database)
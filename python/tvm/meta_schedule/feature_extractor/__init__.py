@@ -19,6 +19,7 @@ The tvm.meta_schedule.feature_extractor package.
 Meta Schedule feature extractors that extracts features from
 measure candidates for use in cost model.
 """
-from .feature_extractor import FeatureExtractor, PyFeatureExtractor
+from .feature_cache import FeatureCache
+from .feature_extractor import FeatureExtractor, PyFeatureExtractor, split_batched_features
 from .per_store_feature import PerStoreFeature
 from .random_feature_extractor import RandomFeatureExtractor
@@ -0,0 +1,130 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A persistent, content-addressed cache of extracted features."""
+import hashlib
+import os
+import os.path as osp
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np  # type: ignore
+
+from ...contrib.mmap_shard import MmapShard
+from ..search_strategy import MeasureCandidate
+from ..tune_context import TuneContext
+from ..utils import shash2hex
+from .feature_extractor import FeatureExtractor, split_batched_features
+from .per_store_feature import PerStoreFeature
+
+
+def _extractor_config(extractor: FeatureExtractor) -> str:
+    if isinstance(extractor, PerStoreFeature):
+        return (
+            "PerStoreFeature("
+            f"buffers_per_store={extractor.buffers_per_store},"
+            f"arith_intensity_curve_num_samples={extractor.arith_intensity_curve_num_samples},"
+            f"cache_line_bytes={extractor.cache_line_bytes},"
+            f"extract_workload={bool(extractor.extract_workload)})"
+        )
+    raise ValueError(
+        f"Cannot derive the cache key of feature extractor: {extractor}. "
+        "Please specify `extractor_config` explicitly."
+    )
+
+
+def _candidate_hash(candidate: MeasureCandidate) -> str:
+    # The features are extracted from the scheduled module, which is hashed instead of the trace,
+    # so that candidates rebuilt from the module without their trace hit the cache as well
+    return shash2hex(candidate.sch.mod)
+
+
+class FeatureCache:
+    """A persistent cache of extracted features, shared by cost models and processes.
+
+    The cache is content-addressed by (workload hash, target kind, scheduled module hash,
+    extractor config), so that the features of a candidate are extracted only once, no matter
+    which process or which run of the cost model asks for them. Features are stored in
+    memory-mapped files under `path`, one `MmapShard` per (workload, target kind, extractor
+    config).
+
+    The target kind is part of the key because the features depend on it, e.g. PerStoreFeature
+    treats the CUDA target differently. An extractor depending on other attributes of the target
+    should include them in its `extractor_config`.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the cache.
+    """
+
+    path: str
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._shards: Dict[Tuple[str, str, str], MmapShard] = {}
+
+    def _get_shard(self, workload_hash: str, target_kind: str, extractor_config: str) -> MmapShard:
+        key = (workload_hash, target_kind, extractor_config)
+        shard = self._shards.get(key)
+        if shard is None:
+            config_hash = hashlib.sha1(extractor_config.encode("utf-8")).hexdigest()
+            shard = MmapShard(osp.join(self.path, config_hash[:16], target_kind, workload_hash))
+            self._shards[key] = shard
+        return shard
+
+    def extract_from(
+        self,
+        extractor: FeatureExtractor,
+        context: TuneContext,
+        candidates: List[MeasureCandidate],
+        extractor_config: Optional[str] = None,
+    ) -> List[np.ndarray]:
+        """Extract features of the candidates, only running the extractor on cache misses.
+
+        Parameters
+        ----------
+        extractor : FeatureExtractor
+            The feature extractor.
+        context : TuneContext
+            The tuning context for feature extraction.
+        candidates : List[MeasureCandidate]
+            The measure candidates to extract features from.
+        extractor_config : Optional[str]
+            The string identifying the configuration of the extractor in the cache key.
+            Derived from the extractor if not specified.
+
+        Returns
+        -------
+        features : List[np.ndarray]
+            The float32 feature arrays, which may be read-only memory-mapped views.
+        """
+        if extractor_config is None:
+            extractor_config = _extractor_config(extractor)
+        target_kind = "none" if context.target is None else context.target.kind.name
+        shard = self._get_shard(shash2hex(context.mod), target_kind, extractor_config)
+        keys = [_candidate_hash(candidate) for candidate in candidates]
+        stored = shard.get(keys)
+        features: List[Optional[np.ndarray]] = [stored.get(key) for key in keys]
+        missing = [i for i, feature in enumerate(features) if feature is None]
+        if missing:
+            new_features = split_batched_features(
+                *extractor.extract_batched(context, [candidates[i] for i in missing])
+            )
+            for i, feature in zip(missing, new_features):
+                features[i] = np.asarray(feature, dtype="float32")
+            shard.put([(keys[i], features[i], 0.0) for i in missing])
+        return features  # type: ignore
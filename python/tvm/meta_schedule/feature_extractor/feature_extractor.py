@@ -15,16 +15,19 @@
 # specific language governing permissions and limitations
 # under the License.
 """Meta Schedule FeatureExtractor."""
-from typing import Callable, List, Union
+from typing import Callable, List, Tuple, Union
 
 # isort: off
 from typing_extensions import Literal
 
 # isort: on
 
+import numpy as np  # type: ignore
+
 from tvm._ffi import register_object
 from tvm.runtime import Object
 from tvm.runtime.ndarray import NDArray
+from tvm.runtime.ndarray import array as nd_array
 
 from .. import _ffi_api
 from ..search_strategy import MeasureCandidate
@@ -60,6 +63,43 @@ class FeatureExtractor(Object):
         )
         return result
 
+    def extract_batched(
+        self, context: TuneContext, candidates: List[MeasureCandidate]
+    ) -> Tuple[NDArray, NDArray]:
+        """Extract features from the given measure candidates into one contiguous buffer.
+
+        Parameters
+        ----------
+        context : TuneContext
+            The tuning context for feature extraction.
+        candidates : List[MeasureCandidate]
+            The measure candidates to extract features from.
+
+        Returns
+        -------
+        features : NDArray
+            The float32 features of all the candidates, of shape [n, m], where the features
+            of the i-th candidate are the rows from `offsets[i]` to `offsets[i + 1]`.
+        offsets : NDArray
+            The int64 segment offsets, of shape [len(candidates) + 1].
+
+        Note
+        ----
+        Both arrays can be exported without copying through DLPack, e.g. `np.from_dlpack` or
+        `torch.from_dlpack`. See also `split_batched_features`.
+        """
+        features = [x.numpy().astype("float32") for x in self.extract_from(context, candidates)]
+        offsets = np.zeros(len(features) + 1, dtype="int64")
+        np.cumsum([x.shape[0] for x in features], out=offsets[1:])
+        # A candidate may have no feature rows, whose width cannot be inferred
+        widths = [x.size // x.shape[0] for x in features if x.shape[0] > 0]
+        features = [x.reshape(x.shape[0], widths[0] if widths else 0) for x in features]
+        if features:
+            data = np.concatenate(features, axis=0)
+        else:
+            data = np.zeros((0, 0), dtype="float32")
+        return nd_array(data), nd_array(offsets)
+
     @staticmethod
     def create(
         kind: Literal["per-store-feature"],
@@ -74,6 +114,28 @@ class FeatureExtractor(Object):
         raise ValueError(f"Unknown CostModel: {kind}")
 
 
+def split_batched_features(features: NDArray, offsets: NDArray) -> List[np.ndarray]:
+    """Split the batched features into per-candidate numpy arrays without copying the rows.
+
+    Parameters
+    ----------
+    features : NDArray
+        The features of all the candidates, as returned by `FeatureExtractor.extract_batched`.
+    offsets : NDArray
+        The segment offsets, as returned by `FeatureExtractor.extract_batched`.
+
+    Returns
+    -------
+    features : List[np.ndarray]
+        The features of each candidate, as views into the batched buffer.
+    """
+    if hasattr(np, "from_dlpack"):
+        data = np.from_dlpack(features)
+    else:
+        data = features.numpy()
+    return np.split(data, offsets.numpy()[1:-1])
+
+
 @register_object("meta_schedule.PyFeatureExtractor")
 class _PyFeatureExtractor(FeatureExtractor):
     """
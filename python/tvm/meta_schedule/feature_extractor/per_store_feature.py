@@ -18,9 +18,14 @@
 """We extract one feature vector per BufferStoreNode statement in a TIR Stmt,
 so we call this feature as "per-store" feature.
 """
+from typing import List, Tuple
+
 from tvm._ffi import register_object
+from tvm.runtime.ndarray import NDArray
 
 from .. import _ffi_api
+from ..search_strategy import MeasureCandidate
+from ..tune_context import TuneContext
 from .feature_extractor import FeatureExtractor
 
 
@@ -65,3 +70,11 @@ class PerStoreFeature(FeatureExtractor):
             cache_line_bytes,
             extract_workload,
         )
+
+    def extract_batched(
+        self, context: TuneContext, candidates: List[MeasureCandidate]
+    ) -> Tuple[NDArray, NDArray]:
+        features, offsets = _ffi_api.FeatureExtractorPerStoreFeatureExtractBatched(  # type: ignore # pylint: disable=no-member
+            self, context, candidates
+        )
+        return features, offsets
@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 """Local Runner"""
+import concurrent.futures
 import logging
 from contextlib import contextmanager
 from typing import Callable, List, Optional, Union
@@ -32,12 +33,16 @@ from .runner import PyRunner, PyRunnerFuture, RunnerFuture, RunnerInput, RunnerR
 from .utils import (
     T_ARG_INFO_JSON_OBJ_LIST,
     T_ARGUMENT_LIST,
+    ArgumentCache,
     alloc_argument_common,
     run_evaluator_common,
 )
 
 logger = get_logger(__name__)  # pylint: disable=invalid-name
 
+# The cache of allocated arguments in the worker process, kept across candidates
+_ARGUMENT_CACHE: Optional[ArgumentCache] = None
+
 
 T_ALLOC_ARGUMENT = Callable[  # pylint: disable=invalid-name
     [
@@ -72,18 +77,29 @@ class LocalRunnerFuture(PyRunnerFuture):
         The optional result as a list of float.
     error_message: Optional[str]
         The optional error message.
+    future: Optional[concurrent.futures.Future]
+        The optional pending run in the worker, which gives the result when it finishes.
+    timeout_sec: float
+        The timeout in seconds of the pending run.
 
     Note
     ----
-    Only one of the parameters should be None upon the creation
-    of LocalRunnerFuture object
+    Only one of the parameters res, error_message and future should be given
+    upon the creation of LocalRunnerFuture object
     """
 
     res: Optional[List[float]]
     error_message: Optional[str]
+    future: Optional[concurrent.futures.Future]
+    timeout_sec: float
 
     def __init__(
-        self, res: Optional[List[float]] = None, error_message: Optional[str] = None
+        self,
+        res: Optional[List[float]] = None,
+        error_message: Optional[str] = None,
+        *,
+        future: Optional[concurrent.futures.Future] = None,
+        timeout_sec: float = 0.0,
     ) -> None:
         """Constructor
 
@@ -93,26 +109,44 @@ class LocalRunnerFuture(PyRunnerFuture):
             The result of this LocalRunnerFuture
         error_message: Optional[str]
             The stringfied error message of any exception during execution
+        future: Optional[concurrent.futures.Future]
+            The pending run in the worker
+        timeout_sec: float
+            The timeout in seconds of the pending run
 
         """
         super().__init__()
         self.res = res
         self.error_message = error_message
+        self.future = future
+        self.timeout_sec = timeout_sec
 
         # sanity check upon the creation of LocalRunnerFuture object
-        if (res is None and error_message is None) or (
-            res is not None and error_message is not None
-        ):
+        if [res, error_message, future].count(None) != 2:
             raise AttributeError(
-                "Only one of the two parameters should be None upon the creation"
+                "Only one of res, error_message and future should be given upon the creation "
                 "of LocalRunnerFuture object."
             )
 
     def done(self) -> bool:
-        return True
+        return self.future is None or self.future.done()
 
     def result(self) -> RunnerResult:
-        return RunnerResult(self.res, self.error_message)
+        if self.future is None:
+            return RunnerResult(self.res, self.error_message)
+        try:
+            run_secs: List[float] = self.future.result()
+        except TimeoutError:
+            return RunnerResult(
+                None,
+                error_msg=f"LocalRunner: Timeout, killed after {self.timeout_sec} seconds\n",
+            )
+        except Exception as exception:  # pylint: disable=broad-except
+            return RunnerResult(
+                None,
+                error_msg="LocalRunner: An exception occurred\n" + str(exception),
+            )
+        return RunnerResult(run_secs, None)
 
 
 def _worker_func(
@@ -121,10 +155,12 @@ def _worker_func(
     _f_cleanup: Optional[str],
     evaluator_config: EvaluatorConfig,
     alloc_repeat: int,
+    arg_cache_bytes: int,
     artifact_path: str,
     device_type: str,
     args_info: T_ARG_INFO_JSON_OBJ_LIST,
 ) -> List[float]:
+    global _ARGUMENT_CACHE  # pylint: disable=global-statement
     f_alloc_argument: T_ALLOC_ARGUMENT = get_global_func_with_default_on_worker(
         _f_alloc_argument, default_alloc_argument
     )
@@ -149,11 +185,21 @@ def _worker_func(
         # Step 2: Allocate input arguments
         with Profiler.timeit("LocalRunner/alloc_argument"):
             device = tvm.runtime.device(dev_type=device_type, dev_id=0)
-            repeated_args: List[T_ARGUMENT_LIST] = f_alloc_argument(
-                device,
-                args_info,
-                alloc_repeat,
-            )
+            if arg_cache_bytes > 0:
+                if _ARGUMENT_CACHE is None or _ARGUMENT_CACHE.max_bytes != arg_cache_bytes:
+                    _ARGUMENT_CACHE = ArgumentCache(arg_cache_bytes)
+                repeated_args: List[T_ARGUMENT_LIST] = _ARGUMENT_CACHE.get_or_alloc(
+                    f_alloc_argument,
+                    device,
+                    args_info,
+                    alloc_repeat,
+                )
+            else:
+                repeated_args = f_alloc_argument(
+                    device,
+                    args_info,
+                    alloc_repeat,
+                )
         # Step 3: Run time_evaluator
         with Profiler.timeit("LocalRunner/run_evaluator"):
             costs: List[float] = f_run_evaluator(
@@ -177,6 +223,8 @@ class LocalRunner(PyRunner):
         The cooldown in seconds.
     alloc_repeat: int
         The number of times to repeat the allocation.
+    arg_cache_bytes: int
+        The memory budget of the argument cache in the worker process, in bytes.
     f_alloc_argument: Optional[str, Callable]
         The function name to allocate the arguments or the function itself.
     f_run_evaluator: Optional[str, Callable]
@@ -226,6 +274,7 @@ class LocalRunner(PyRunner):
     evaluator_config: EvaluatorConfig
     cooldown_sec: float
     alloc_repeat: int
+    arg_cache_bytes: int
 
     f_alloc_argument: Union[T_ALLOC_ARGUMENT, str, None]
     f_run_evaluator: Union[T_RUN_EVALUATOR, str, None]
@@ -243,6 +292,7 @@ class LocalRunner(PyRunner):
         f_run_evaluator: Union[T_RUN_EVALUATOR, str, None] = None,
         f_cleanup: Union[T_CLEANUP, str, None] = None,
         initializer: Optional[Callable[[], None]] = None,
+        arg_cache_bytes: int = 0,
     ) -> None:
         """Constructor
 
@@ -264,12 +314,18 @@ class LocalRunner(PyRunner):
             The function name to cleanup the session or the function itself.
         initializer: Optional[Callable[[], None]]
             The initializer function.
+        arg_cache_bytes: int
+            The memory budget of the argument cache in the worker process, in bytes. When
+            positive, the arguments allocated by `f_alloc_argument` are reused by the later
+            candidates with the same arguments info, and the least recently used ones are
+            evicted beyond the budget. Zero disables the cache.
         """
         super().__init__()
         self.timeout_sec = timeout_sec
         self.evaluator_config = EvaluatorConfig._normalized(evaluator_config)
         self.cooldown_sec = cooldown_sec
         self.alloc_repeat = alloc_repeat
+        self.arg_cache_bytes = arg_cache_bytes
         self.f_alloc_argument = f_alloc_argument
         self.f_run_evaluator = f_run_evaluator
         self.f_cleanup = f_cleanup
@@ -288,6 +344,9 @@ class LocalRunner(PyRunner):
         self._sanity_check()
 
     def run(self, runner_inputs: List[RunnerInput]) -> List[RunnerFuture]:
+        # The candidates are queued to the worker and measured one at a time. The futures are
+        # returned before the measurements finish, so that the task scheduler can build the
+        # next batch meanwhile.
         results: List[RunnerFuture] = []
         for runner_input in runner_inputs:
             future = self.pool.submit(
@@ -297,20 +356,12 @@ class LocalRunner(PyRunner):
                 self.f_cleanup,
                 self.evaluator_config,
                 self.alloc_repeat,
+                self.arg_cache_bytes,
                 str(runner_input.artifact_path),
                 str(runner_input.device_type),
                 tuple(arg_info.as_json() for arg_info in runner_input.args_info),
             )
-            try:
-                result: List[float] = future.result()
-                error_message: str = None
-            except TimeoutError:
-                result = None
-                error_message = f"LocalRunner: Timeout, killed after {self.timeout_sec} seconds\n"
-            except Exception as exception:  # pylint: disable=broad-except
-                result = None
-                error_message = "LocalRunner: An exception occurred\n" + str(exception)
-            local_future = LocalRunnerFuture(res=result, error_message=error_message)
+            local_future = LocalRunnerFuture(future=future, timeout_sec=self.timeout_sec)
             results.append(local_future)  # type: ignore
         return results
 
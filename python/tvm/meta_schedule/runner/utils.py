@@ -16,9 +16,11 @@
 # under the License.
 """Runner utility functions"""
 import itertools
-from typing import Any, Callable, Dict, List
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
 
-from ...runtime import Device, Module, ndarray
+from ...runtime import DataType, Device, Module, ndarray
 from .config import EvaluatorConfig
 
 T_ARG_INFO_JSON_OBJ = List[Any]  # pylint: disable=invalid-name
@@ -77,6 +79,95 @@ def alloc_argument_common(
     return repeated_args
 
 
+def _args_info_bytes(args_info: T_ARG_INFO_JSON_OBJ_LIST) -> int:
+    num_bytes = 0
+    for arg_info in args_info:
+        if arg_info[0] == "TENSOR":
+            _, dtype, shape = arg_info
+            dtype = DataType(dtype)
+            num_elements = 1
+            for dim in shape:
+                num_elements *= int(dim)
+            num_bytes += num_elements * ((dtype.bits * dtype.lanes + 7) // 8)
+    return num_bytes
+
+
+class ArgumentCache:
+    """An LRU cache of allocated arguments, keyed by the device and the arguments info.
+
+    Candidates of the same workload share their arguments info, so the arguments allocated for
+    one candidate can be reused by the others instead of being allocated and randomly filled
+    again. Each entry keeps all the `alloc_repeat` copies, so that the cache flushing behavior of
+    repeated allocations is preserved.
+
+    Parameters
+    ----------
+    max_bytes : int
+        The memory budget of the cache in bytes. The least recently used entries are evicted
+        when it is exceeded.
+    """
+
+    max_bytes: int
+    num_bytes: int
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.num_bytes = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[List[T_ARGUMENT_LIST], int]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self, key: Tuple[str, str]) -> None:
+        _, num_bytes = self._entries.pop(key)
+        self.num_bytes -= num_bytes
+
+    def get_or_alloc(
+        self,
+        f_alloc_argument: Callable,
+        device: Device,
+        args_info: T_ARG_INFO_JSON_OBJ_LIST,
+        alloc_repeat: int,
+    ) -> List[T_ARGUMENT_LIST]:
+        """Get the cached arguments, or allocate them with `f_alloc_argument` on a cache miss.
+
+        Parameters
+        ----------
+        f_alloc_argument: Callable
+            The function to allocate the arguments, with the same signature as
+            `alloc_argument_common` except `f_random_fill`.
+        device: Device
+            The device to allocate the arguments
+        args_info: T_ARG_INFO_JSON_OBJ_LIST
+            The arguments info
+        alloc_repeat: int
+            The number of times to repeat the allocation
+
+        Returns
+        -------
+        repeated_args: List[T_ARGUMENT_LIST]
+            The allocation args
+        """
+        key = (str(device), json.dumps(list(args_info)))
+        entry = self._entries.get(key)
+        if entry is not None:
+            repeated_args, _ = entry
+            if len(repeated_args) >= alloc_repeat:
+                self._entries.move_to_end(key)
+                return repeated_args[:alloc_repeat]
+            self._evict(key)
+        repeated_args = f_alloc_argument(device, args_info, alloc_repeat)
+        num_bytes = _args_info_bytes(args_info) * alloc_repeat
+        if num_bytes <= self.max_bytes:
+            while self.num_bytes + num_bytes > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+            self._entries[key] = (repeated_args, num_bytes)
+            self.num_bytes += num_bytes
+        return repeated_args
+
+
 def run_evaluator_common(
     rt_mod: Module,
     device: Device,
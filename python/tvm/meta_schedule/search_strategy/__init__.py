@@ -24,3 +24,4 @@ from .evolutionary_search import EvolutionarySearch
 from .replay_func import ReplayFunc
 from .replay_trace import ReplayTrace
 from .search_strategy import MeasureCandidate, PySearchStrategy, SearchStrategy, create
+from .sharded_evolutionary_search import ShardedEvolutionarySearch
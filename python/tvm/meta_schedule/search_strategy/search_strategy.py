@@ -84,6 +84,7 @@ class SearchStrategy(Object):
             "replay-func",
             "replay-trace",
             "evolutionary",
+            "sharded-evolutionary",
         ],
     ]
 
@@ -179,6 +180,7 @@ class SearchStrategy(Object):
     def create(  # pylint: disable=keyword-arg-before-vararg
         kind: Literal[
             "evolutionary",
+            "sharded-evolutionary",
             "replay-trace",
             "replay-func",
         ] = "evolutionary",
@@ -190,10 +192,13 @@ class SearchStrategy(Object):
             EvolutionarySearch,
             ReplayFunc,
             ReplayTrace,
+            ShardedEvolutionarySearch,
         )
 
         if kind == "evolutionary":
             return EvolutionarySearch(*args, **kwargs)
+        if kind == "sharded-evolutionary":
+            return ShardedEvolutionarySearch(*args, **kwargs)  # type: ignore
         if kind == "replay-trace":
             return ReplayTrace(*args, **kwargs)
         if kind == "replay-func":
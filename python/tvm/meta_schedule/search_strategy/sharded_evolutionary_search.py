@@ -0,0 +1,651 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Evolutionary search with the population sharded across worker processes"""
+import hashlib
+import heapq
+import json
+import os
+import os.path as osp
+import random
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
+
+from tvm.ir import IRModule
+from tvm.target import Target
+from tvm.tir.schedule import Schedule, Trace
+
+from ...contrib.popen_pool import PopenPoolExecutor
+from ..arg_info import ArgInfo
+from ..logging import get_logger
+from ..profiler import Profiler
+from ..runner import RunnerResult
+from ..utils import cpu_count, derived_object, module_hash, shash2hex
+from .search_strategy import MeasureCandidate, PySearchStrategy, SearchStrategy
+
+if TYPE_CHECKING:
+    from ..cost_model import CostModel
+    from ..database import Database
+    from ..mutator import Mutator
+    from ..postproc import Postproc
+    from ..tune_context import TuneContext
+
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+# The JSON-serialized trace of a schedule
+T_TRACE_JSON = Any  # pylint: disable=invalid-name
+# A trace validated by a worker, and the module it schedules
+T_CANDIDATE = Tuple[T_TRACE_JSON, IRModule]  # pylint: disable=invalid-name
+
+# The states of the worker process, set up by `_worker_initializer`
+_WORKER: Dict[str, Any] = {}
+
+
+def _worker_initializer(
+    mod: IRModule,
+    target_config: Dict[str, Any],
+    postprocs: List["Postproc"],
+    mutator_probs: Dict["Mutator", float],
+) -> None:
+    # pylint: disable=import-outside-toplevel
+    from ..space_generator import PostOrderApply
+    from ..tune_context import TuneContext
+
+    # pylint: enable=import-outside-toplevel
+    # Initialize the postprocessors and mutators with a tuning context of the worker's own
+    context = TuneContext(
+        mod=mod,
+        target=Target(target_config),
+        space_generator=PostOrderApply(
+            sch_rules=[],
+            postprocs=postprocs,
+            mutator_probs=mutator_probs,
+        ),
+        task_name="shard",
+        num_threads=1,
+    )
+    space_generator = context.space_generator
+    _WORKER["mod"] = context.mod
+    _WORKER["postprocs"] = list(space_generator.postprocs)
+    _WORKER["mutators"] = list(space_generator.mutator_probs.keys())
+    _WORKER["mutator_probs"] = [float(p) for p in space_generator.mutator_probs.values()]
+
+
+def _replay_trace(trace: T_TRACE_JSON) -> Schedule:
+    sch = Schedule(_WORKER["mod"], error_render_level="none")
+    Trace.apply_json_to_schedule(trace, sch)
+    return sch
+
+
+def _apply_trace(trace: Union[Trace, T_TRACE_JSON], seed: int) -> Optional[Schedule]:
+    """Replay the trace with its postprocessing instructions removed, then run the
+    postprocessors. Returns None if the replay or any of the postprocessors fails."""
+    sch = Schedule(_WORKER["mod"], seed=seed, error_render_level="none")
+    try:
+        if isinstance(trace, Trace):
+            trace.apply_to_schedule(sch, remove_postproc=True)
+        else:
+            Trace.apply_json_to_schedule(trace, sch)
+        sch.enter_postproc()
+        for postproc in _WORKER["postprocs"]:
+            if not postproc.apply(sch):
+                return None
+    except Exception:  # pylint: disable=broad-except
+        return None
+    return sch
+
+
+def _to_candidate(sch: Schedule) -> T_CANDIDATE:
+    return sch.trace.as_json(remove_postproc=False), sch.mod
+
+
+def _worker_sample_init(
+    design_spaces: List[T_TRACE_JSON],
+    num: int,
+    seed: int,
+) -> List[T_CANDIDATE]:
+    rng = random.Random(seed)
+    traces = [_replay_trace(design_space).trace for design_space in design_spaces]
+    results = []
+    for _ in range(num):
+        design_space = rng.choice(traces)
+        # Drop the decisions, so that they are sampled again
+        sch = _apply_trace(Trace(design_space.insts, {}), rng.getrandbits(31) + 1)
+        if sch is not None:
+            results.append(_to_candidate(sch))
+    return results
+
+
+def _worker_postprocess(traces: List[T_TRACE_JSON], seed: int) -> List[Optional[T_CANDIDATE]]:
+    rng = random.Random(seed)
+    results = []
+    for trace in traces:
+        sch = _apply_trace(trace, rng.getrandbits(31) + 1)
+        results.append(None if sch is None else _to_candidate(sch))
+    return results
+
+
+def _worker_replay(traces: List[T_TRACE_JSON]) -> List[Optional[T_CANDIDATE]]:
+    results = []
+    for trace in traces:
+        try:
+            results.append((trace, _replay_trace(trace).mod))
+        except Exception:  # pylint: disable=broad-except
+            results.append(None)
+    return results
+
+
+def _worker_evolve(
+    parents: List[T_TRACE_JSON],
+    weights: List[float],
+    num: int,
+    mutate_prob: float,
+    max_fail_count: int,
+    seed: int,
+) -> List[T_CANDIDATE]:
+    rng = random.Random(seed)
+    parent_schs = [_replay_trace(parent) for parent in parents]
+    traces = [sch.trace for sch in parent_schs]
+    if sum(weights) <= 0.0:
+        weights = [1.0] * len(traces)
+    mutators: List["Mutator"] = _WORKER["mutators"]
+    mutator_probs: List[float] = _WORKER["mutator_probs"]
+    kept: Set[int] = set()
+    results = []
+    for _ in range(num):
+        result = None
+        parent_id = -1
+        for _ in range(max_fail_count + 1):
+            parent_id = rng.choices(range(len(traces)), weights=weights)[0]
+            if mutators and rng.random() < mutate_prob:
+                # Decision: mutate
+                mutator = rng.choices(mutators, weights=mutator_probs)[0]
+                new_trace = mutator.apply(traces[parent_id])
+                if new_trace is not None:
+                    sch = _apply_trace(new_trace, rng.getrandbits(31) + 1)
+                    if sch is not None:
+                        result = _to_candidate(sch)
+                        break
+            elif parent_id not in kept:
+                # Decision: do not mutate
+                kept.add(parent_id)
+                break
+        # If the retry count exceeds the limit, reuse an old sample
+        if result is None:
+            result = (parents[parent_id], parent_schs[parent_id].mod)
+        results.append(result)
+    return results
+
+
+@derived_object
+class ShardedEvolutionarySearch(PySearchStrategy):
+    """Evolutionary search with the population sharded across worker processes.
+
+    Each generation, the population is scored by the cost model in the tuning process, and split
+    into `num_shards` shards of similar quality. Each worker process samples parents from its
+    shard plus the elites of the whole population, mutates them and validates the children with
+    the postprocessors, so that trace replay and postprocessor checks scale with the number of
+    processes rather than the number of threads of one process. The workers send back the
+    scheduled modules along with the traces, so the tuning process only scores the modules, and
+    replays the traces of the few candidates picked for measurement. The children of all the
+    shards are merged into the next generation.
+
+    When `checkpoint_dir` is given, the population, the number of trials already generated and
+    the candidates already picked for measurement are saved after every generation, keyed by the
+    workload, the target and the design spaces.
+    If the run is interrupted, a later run of the same task resumes from them instead of
+    starting from a random population. The checkpoint is removed once the run finishes.
+
+    Parameters
+    ----------
+    num_shards : int
+        The number of worker processes.
+    population_size : int
+        The initial population of traces from measured samples and randomly generated samples.
+    init_measured_ratio : float
+        The ratio of measured samples in the initial population.
+    init_min_unmeasured : int
+        The minimal size of unmeasured population in the initial sampling.
+    max_fail_count : int
+        The maximum number of failure during initial sampling.
+    num_empty_iters_before_early_stop : int
+        The number of consecutive iterations without new candidates before the search stops.
+    genetic_num_iters : int
+        The number of iterations for genetic algorithm.
+    genetic_mutate_prob : float
+        The probability of mutation.
+    genetic_max_fail_count : int
+        The maximum number to retry mutation.
+    eps_greedy : float
+        The ratio of greedy selected samples in the final picks.
+    num_elites : int
+        The number of best traces of the whole population shared with every shard.
+    checkpoint_dir : Optional[str]
+        The directory to save the population to, None means no checkpointing.
+    """
+
+    num_shards: int
+    population_size: int
+    init_measured_ratio: float
+    init_min_unmeasured: int
+    max_fail_count: int
+    num_empty_iters_before_early_stop: int
+    genetic_num_iters: int
+    genetic_mutate_prob: float
+    genetic_max_fail_count: int
+    eps_greedy: float
+    num_elites: int
+    checkpoint_dir: Optional[str]
+
+    def __init__(
+        self,
+        *,
+        num_shards: Optional[int] = None,
+        population_size: int = 512,
+        init_measured_ratio: float = 0.2,
+        init_min_unmeasured: int = 50,
+        max_fail_count: int = 5,
+        num_empty_iters_before_early_stop: int = 5,
+        genetic_num_iters: int = 4,
+        genetic_mutate_prob: float = 0.85,
+        genetic_max_fail_count: int = 10,
+        eps_greedy: float = 0.05,
+        num_elites: int = 16,
+        checkpoint_dir: Optional[str] = None,
+    ) -> None:
+        """Constructor"""
+        super().__init__()
+        if num_shards is None:
+            num_shards = cpu_count(logical=False)
+        if num_shards <= 0:
+            raise ValueError(f"`num_shards` must be positive, but gets: {num_shards}")
+        self.num_shards = num_shards
+        self.population_size = population_size
+        self.init_measured_ratio = init_measured_ratio
+        self.init_min_unmeasured = init_min_unmeasured
+        self.max_fail_count = max_fail_count
+        self.num_empty_iters_before_early_stop = num_empty_iters_before_early_stop
+        self.genetic_num_iters = genetic_num_iters
+        self.genetic_mutate_prob = genetic_mutate_prob
+        self.genetic_max_fail_count = genetic_max_fail_count
+        self.eps_greedy = eps_greedy
+        self.num_elites = num_elites
+        self.checkpoint_dir = checkpoint_dir
+        self._context: Optional["TuneContext"] = None
+        self._rng = random.Random()
+        self._state: Optional[Dict[str, Any]] = None
+
+    def _initialize_with_tune_context(self, context: "TuneContext") -> None:
+        space_generator = context.space_generator
+        if space_generator is None or space_generator.postprocs is None:
+            raise ValueError("`TuneContext.space_generator.postprocs` must be defined")
+        if space_generator.mutator_probs is None:
+            raise ValueError("`TuneContext.space_generator.mutator_probs` must be defined")
+        self._context = context
+        self._rng = random.Random(context.rand_state if context.rand_state > 0 else None)
+        self._state = None
+
+    def pre_tuning(
+        self,
+        max_trials: int,
+        num_trials_per_iter: int,
+        design_spaces: List[Schedule],
+        database: Optional["Database"] = None,
+        cost_model: Optional["CostModel"] = None,
+    ) -> None:
+        if self._context is None:
+            raise ValueError("Did you forget to initialize the TuneContext?")
+        if database is None:
+            raise ValueError("Database is not supplied in PreTuning.")
+        if cost_model is None:
+            raise ValueError("CostModel is not supplied in PreTuning.")
+        if self._state is not None:
+            raise ValueError("`PreTuning` is already invoked without corresponding `PostTuning`.")
+        context = self._context
+        space_generator = context.space_generator
+        self._state = {
+            "max_trials": max_trials,
+            "num_trials_per_iter": num_trials_per_iter,
+            "st": 0,
+            "ed": num_trials_per_iter,
+            "num_empty_iters": 0,
+            "design_spaces": [
+                space.trace.simplified(remove_postproc=True).as_json() for space in design_spaces
+            ],
+            "database": database,
+            "cost_model": cost_model,
+            "workload": database.commit_workload(context.mod),
+            # The hashes of the candidates picked for measurement, under the module equality of
+            # the database
+            "module_equality": database.get_module_equality(),
+            "measured": set(),
+            "population": None,
+            "last_population": None,
+            "pool": PopenPoolExecutor(
+                max_workers=self.num_shards,
+                initializer=_worker_initializer,
+                initargs=(
+                    context.mod,
+                    context.target.export(),
+                    list(space_generator.postprocs),
+                    dict(space_generator.mutator_probs),
+                ),
+            ),
+        }
+        self._load_checkpoint()
+
+    def post_tuning(self) -> None:
+        if self._state is None:
+            raise ValueError("`PostTuning` is invoked without corresponding `PreTuning`.")
+        self._state["pool"].shutdown()
+        path = self._checkpoint_path()
+        if path is not None and osp.exists(path):
+            # The run is complete, a later run of the task starts afresh
+            os.remove(path)
+        self._state = None
+
+    def generate_measure_candidates(self) -> Optional[List[MeasureCandidate]]:
+        state = self._state
+        assert state is not None
+        max_trials = state["max_trials"]
+        if state["st"] >= max_trials:
+            return None
+        sample_num = state["num_trials_per_iter"]
+        if state["ed"] > max_trials:
+            sample_num = max_trials - state["st"]
+            state["ed"] = max_trials
+        with Profiler.timeit("ShardedEvoSearch/SampleInitPopulation"):
+            measured = self._pick_best_from_database(
+                int(self.population_size * self.init_measured_ratio)
+            )
+            unmeasured = self._sample_init_population(self.population_size - len(measured))
+        if len(unmeasured) < self.init_min_unmeasured:
+            logger.warning("Cannot sample enough initial population, evolutionary search failed.")
+            return None
+        inits = measured + unmeasured
+        if state["population"] is not None:
+            # Resume from the population of the last generation
+            inits = state["population"] + measured
+            state["population"] = None
+        bests = self._evolve_with_cost_model(inits, sample_num)
+        picks = self._pick_with_eps_greedy(unmeasured, bests, sample_num)
+        logger.info("Sending %d candidate(s) for measurement", len(picks))
+        if not picks:
+            state["num_empty_iters"] += 1
+            if state["num_empty_iters"] >= self.num_empty_iters_before_early_stop:
+                return None
+        results = []
+        for trace, _ in picks:
+            sch = self._replay(trace)
+            results.append(
+                MeasureCandidate(sch, ArgInfo.from_entry_func(sch.mod, remove_preproc=True))
+            )
+        return results
+
+    def notify_runner_results(
+        self,
+        measure_candidates: List[MeasureCandidate],
+        results: List[RunnerResult],
+    ) -> None:
+        state = self._state
+        assert state is not None
+        state["st"] += len(results)
+        state["ed"] += len(results)
+        # Record the progress, so that a resumed run does not generate these trials again
+        if state["last_population"]:
+            self._save_checkpoint(state["last_population"])
+
+    def clone(self) -> SearchStrategy:
+        return ShardedEvolutionarySearch(
+            num_shards=self.num_shards,
+            population_size=self.population_size,
+            init_measured_ratio=self.init_measured_ratio,
+            init_min_unmeasured=self.init_min_unmeasured,
+            max_fail_count=self.max_fail_count,
+            num_empty_iters_before_early_stop=self.num_empty_iters_before_early_stop,
+            genetic_num_iters=self.genetic_num_iters,
+            genetic_mutate_prob=self.genetic_mutate_prob,
+            genetic_max_fail_count=self.genetic_max_fail_count,
+            eps_greedy=self.eps_greedy,
+            num_elites=self.num_elites,
+            checkpoint_dir=self.checkpoint_dir,
+        )
+
+    def _seed(self) -> int:
+        return self._rng.getrandbits(31) + 1
+
+    def _map_shards(self, func, args_list: List[Tuple]) -> List[Any]:
+        """Run the function on each shard in the worker processes"""
+        futures = [self._state["pool"].submit(func, *args) for args in args_list]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as err:  # pylint: disable=broad-except
+                logger.warning("A shard of the evolutionary search failed: %s", err)
+                results.append(None)
+        return results
+
+    def _replay(self, trace: T_TRACE_JSON) -> Schedule:
+        """Rebuild the schedule of a trace validated by the workers"""
+        sch = Schedule(self._context.mod, seed=self._seed(), error_render_level="none")
+        Trace.apply_json_to_schedule(trace, sch)
+        return sch
+
+    def _collect(self, shards: List[Optional[List[Optional[T_CANDIDATE]]]]) -> List[T_CANDIDATE]:
+        return [candidate for shard in shards for candidate in shard or [] if candidate is not None]
+
+    def _split(self, items: List[Any]) -> List[List[Any]]:
+        return [items[i :: self.num_shards] for i in range(self.num_shards)]
+
+    def _pick_best_from_database(self, num: int) -> List[T_CANDIDATE]:
+        state = self._state
+        records = state["database"].get_top_k(state["workload"], num)
+        traces = [record.trace.as_json(remove_postproc=True) for record in records]
+        if not traces:
+            return []
+        return self._collect(
+            self._map_shards(
+                _worker_postprocess,
+                [(shard, self._seed()) for shard in self._split(traces) if shard],
+            )
+        )
+
+    def _sample_init_population(self, num: int) -> List[T_CANDIDATE]:
+        state = self._state
+        results: List[T_CANDIDATE] = []
+        fail_count = 0
+        while len(results) < self.init_min_unmeasured and fail_count < self.max_fail_count:
+            shards = self._map_shards(
+                _worker_sample_init,
+                [
+                    (state["design_spaces"], len(shard), self._seed())
+                    for shard in self._split(list(range(num)))
+                    if shard
+                ],
+            )
+            found_new = False
+            for shard in shards:
+                if shard:
+                    found_new = True
+                    results.extend(shard)
+            fail_count += not found_new
+        return results
+
+    def _predict(self, population: List[T_CANDIDATE]) -> List[float]:
+        state = self._state
+        with Profiler.timeit("ShardedEvoSearch/Evolve/PredictNormalizedScore"):
+            scores = state["cost_model"].predict(
+                self._context,
+                [
+                    # The cost model only looks at the module, no need to replay the trace
+                    MeasureCandidate(
+                        Schedule(mod, error_render_level="none", enable_check=False),
+                        ArgInfo.from_entry_func(mod, remove_preproc=True),
+                    )
+                    for _, mod in population
+                ],
+            )
+        return [max(0.0, float(score)) for score in scores]
+
+    def _evolve_with_cost_model(self, population: List[T_CANDIDATE], num: int) -> List[T_CANDIDATE]:
+        state = self._state
+        module_equality = state["module_equality"]
+        exists = set(state["measured"])
+        # A min-heap of (score, index, candidate) to record the best candidates
+        heap: List[Tuple[float, int, T_CANDIDATE]] = []
+        counter = 0
+        for i in range(self.genetic_num_iters + 1):
+            scores = self._predict(population)
+            for candidate, score in zip(population, scores):
+                shash = module_hash(candidate[1], module_equality)
+                if shash in exists:
+                    continue
+                exists.add(shash)
+                counter += 1
+                if len(heap) < num:
+                    heapq.heappush(heap, (score, counter, candidate))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, counter, candidate))
+            if i == self.genetic_num_iters:
+                break
+            with Profiler.timeit("ShardedEvoSearch/Evolve/Mutation"):
+                population = self._evolve_one_generation(population, scores)
+            logger.info("Evolve iter #%d done", i)
+            self._save_checkpoint(population)
+        heap.sort(key=lambda item: (-item[0], item[1]))
+        logger.info(
+            "Scores of the best %d candidates: %s",
+            len(heap),
+            " ".join(f"{score:.4f}" for score, _, _ in heap),
+        )
+        return [candidate for _, _, candidate in heap]
+
+    def _evolve_one_generation(
+        self, population: List[T_CANDIDATE], scores: List[float]
+    ) -> List[T_CANDIDATE]:
+        # Interleave the population sorted by score, so that the shards are of similar quality
+        order = sorted(range(len(population)), key=lambda i: -scores[i])
+        elites = order[: self.num_elites]
+        num_children = [len(shard) for shard in self._split(list(range(self.population_size)))]
+        parents_list = []
+        args_list = []
+        for shard, num_child in zip(self._split(order), num_children):
+            if num_child == 0:
+                continue
+            # Every shard sees the elites of the whole population besides its own traces
+            parents = shard + [i for i in elites if i not in set(shard)]
+            parents_list.append(parents[:num_child])
+            args_list.append(
+                (
+                    [population[i][0] for i in parents],
+                    [scores[i] for i in parents],
+                    num_child,
+                    self.genetic_mutate_prob,
+                    self.genetic_max_fail_count,
+                    self._seed(),
+                )
+            )
+        children: List[T_CANDIDATE] = []
+        for parents, shard in zip(parents_list, self._map_shards(_worker_evolve, args_list)):
+            if shard is None:
+                # Keep the parents of the failed shard
+                shard = [population[i] for i in parents]
+            children.extend(shard)
+        return children
+
+    def _pick_with_eps_greedy(
+        self, unmeasured: List[T_CANDIDATE], bests: List[T_CANDIDATE], num: int
+    ) -> List[T_CANDIDATE]:
+        measured: Set[int] = self._state["measured"]
+        module_equality = self._state["module_equality"]
+        num_rands = int(num * self.eps_greedy)
+        num_bests = num - num_rands
+        rands = self._rng.sample(range(len(unmeasured)), len(unmeasured))
+        results: List[T_CANDIDATE] = []
+        i_bests = i_rands = 0
+        for i in range(num):
+            has_best = i_bests < len(bests)
+            has_rand = i_rands < len(rands)
+            if (i < num_bests and has_best) or (i >= num_bests and not has_rand and has_best):
+                candidate = bests[i_bests]
+                i_bests += 1
+            elif has_rand:
+                candidate = unmeasured[rands[i_rands]]
+                i_rands += 1
+            else:
+                break
+            shash = module_hash(candidate[1], module_equality)
+            if shash not in measured:
+                measured.add(shash)
+                results.append(candidate)
+        return results
+
+    def _checkpoint_path(self) -> Optional[str]:
+        if self.checkpoint_dir is None:
+            return None
+        state = self._state
+        # The population is only valid for the same target and design spaces
+        key = json.dumps([str(self._context.target), state["design_spaces"]])
+        key_hash = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return osp.join(self.checkpoint_dir, f"{shash2hex(self._context.mod)}_{key_hash}.json")
+
+    def _save_checkpoint(self, population: List[T_CANDIDATE]) -> None:
+        path = self._checkpoint_path()
+        state = self._state
+        state["last_population"] = population
+        if path is None:
+            return
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        checkpoint = {
+            "st": state["st"],
+            "population": [trace for trace, _ in population],
+            "module_equality": state["module_equality"],
+            "measured": sorted(state["measured"]),
+        }
+        # Write to a temporary file first, so that an interrupted write keeps the last checkpoint
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(checkpoint, file)
+        os.replace(tmp_path, path)
+
+    def _load_checkpoint(self) -> None:
+        path = self._checkpoint_path()
+        if path is None or not osp.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as file:
+            checkpoint = json.load(file)
+        state = self._state
+        state["st"] = min(int(checkpoint["st"]), state["max_trials"])
+        state["ed"] = state["st"] + state["num_trials_per_iter"]
+        # The hashes are only valid for the same module equality
+        if checkpoint.get("module_equality") == state["module_equality"]:
+            state["measured"] = set(checkpoint.get("measured", []))
+        traces = checkpoint["population"]
+        state["population"] = (
+            self._collect(
+                self._map_shards(
+                    _worker_replay, [(shard,) for shard in self._split(traces) if shard]
+                )
+            )
+            or None
+        )
+        logger.info(
+            "Resumed the evolutionary search from %s at trial #%d with a population of %d",
+            path,
+            state["st"],
+            len(traces),
+        )
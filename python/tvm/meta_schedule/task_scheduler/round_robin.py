@@ -28,9 +28,17 @@ logger = get_logger(__name__)  # pylint: disable=invalid-name
 class RoundRobin(TaskScheduler):
     """Round Robin Task Scheduler"""
 
-    def __init__(self) -> None:
-        """Constructor."""
+    def __init__(self, *, pipeline_chunk_size: int = 0) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        pipeline_chunk_size : int = 0
+            The number of candidates built at a time in the pipelined mode, see
+            `TaskScheduler.pipeline_chunk_size`. Non-positive values disable the pipelined mode.
+        """
         self.__init_handle_by_constructor__(
             _ffi_api.TaskSchedulerRoundRobin,  # type: ignore # pylint: disable=no-member
             get_logging_func(logger),
+            pipeline_chunk_size,
         )
@@ -51,17 +51,32 @@ class TaskRecord(Object):
     measure_candidates: List[MeasureCandidate]
     builder_results: List[BuilderResult]
     runner_results: List[RunnerResult]
+    prefetched_candidates: Optional[List[MeasureCandidate]]
+    prefetched_builder_results: Optional[List[BuilderResult]]
 
 
 @register_object("meta_schedule.TaskScheduler")
 class TaskScheduler(Object):
-    """The abstract task scheduler interface."""
+    """The abstract task scheduler interface.
+
+    In the pipelined mode, i.e. when `pipeline_chunk_size` is positive, the candidates are sent to
+    the builder `pipeline_chunk_size` at a time, and each chunk is sent to the runner as soon as it
+    is built. After a batch is sent to the runner, the next batch of the same task is generated and
+    built while the current one is being measured, at the cost of the next batch not seeing the
+    latest measurements. The stages are timed by `ms.Profiler` as "SendToBuilder",
+    "SendToRunner", "PrefetchNextBatch" (generating and building while measuring) and
+    "JoinRunnerFutures" (waiting for the runner), so that the overlap can be checked from
+    `Profiler.get()`. The overlap requires a runner that returns its futures before the
+    measurements finish, as `LocalRunner` and `RPCRunner` do. With `LocalRunner`, the builds
+    compete with the measurements for the host CPU, which may add noise to the measurements.
+    """
 
     tasks_: List[TaskRecord]
     measure_callbacks_: List[MeasureCallback]
     database_: Optional[Database]
     cost_model_: Optional[CostModel]
     remaining_tasks_: int
+    pipeline_chunk_size: int
 
     TaskSchedulerType = Union["TaskScheduler", Literal["gradient", "round-robin"]]
 
@@ -15,16 +15,61 @@
 # specific language governing permissions and limitations
 # under the License.
 """The core tuning API"""
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from tvm.ir import structural_hash
 
 from .builder import Builder
 from .cost_model import CostModel
-from .database import Database
+from .database import Database, TuningRecord, WarmStartDatabase
+from .logging import get_logger
 from .measure_callback import MeasureCallback
-from .runner import Runner
+from .runner import Runner, RunnerResult
 from .task_scheduler import TaskScheduler
 from .tune_context import TuneContext
 
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+
+def _pretrain_cost_model(
+    cost_model: CostModel,
+    tasks: List[TuneContext],
+    database: WarmStartDatabase,
+) -> None:
+    """Train the cost model on the records of the workloads similar to the tasks."""
+    groups: Dict[int, Tuple[TuneContext, List[TuningRecord]]] = {}
+    for task in tasks:
+        # The records of a similar workload are the same for all the tasks it is similar to
+        new_groups: Dict[int, Tuple[TuneContext, List[TuningRecord]]] = {}
+        for record in database.similar_records(task.mod):
+            key = structural_hash(record.workload.mod)
+            if key in groups:
+                continue
+            if key not in new_groups:
+                context = TuneContext(
+                    mod=record.workload.mod,
+                    target=task.target,
+                    task_name="warm-start",
+                    num_threads=task.num_threads,
+                )
+                new_groups[key] = (context, [])
+            new_groups[key][1].append(record)
+        groups.update(new_groups)
+    num_records = 0
+    for context, records in groups.values():
+        cost_model.update(
+            context,
+            [record.as_measure_candidate() for record in records],
+            [RunnerResult(run_secs=record.run_secs, error_msg=None) for record in records],
+        )
+        num_records += len(records)
+    if num_records:
+        logger.info(
+            "Pretrained the cost model on %d record(s) of %d similar workload(s)",
+            num_records,
+            len(groups),
+        )
+
 
 def tune_tasks(
     *,
@@ -41,6 +86,7 @@ def tune_tasks(
     measure_callbacks: MeasureCallback.CallbackListType = "default",
     task_scheduler: TaskScheduler.TaskSchedulerType = "gradient",
     module_equality: str = "structural",
+    warm_start: Optional[Database] = None,
 ) -> Database:
     """Tune a list of tasks. Using a task scheduler.
 
@@ -81,6 +127,11 @@ def tune_tasks(
                 a given module. The "ignore-ndarray" varint is used for the extracted blocks or in
                 case no anchor block is found. For the definition of the anchor block, see
                 tir/analysis/analysis.py.
+    warm_start : Optional[Database]
+        A database of earlier tuning runs. If given, the tasks without enough records of their own
+        start the evolutionary search from the best schedules of the workloads in it sharing the
+        same anchor block but with different shapes, tuned for the same kind of target, and the
+        cost model is pretrained on the records of those workloads. See also `WarmStartDatabase`.
 
     Returns
     -------
@@ -103,7 +154,7 @@ def tune_tasks(
         builder = Builder.create(builder, max_workers=num_cores)
     if not isinstance(runner, Runner):
         runner = Runner.create(runner, max_workers=num_cores)
-    if database == "json":
+    if database in ("json", "binary", "sqlite"):
         database = Database.create(database, work_dir=work_dir, module_equality=module_equality)
     elif not isinstance(database, Database):
         database = Database.create(database, module_equality=module_equality)
@@ -115,6 +166,16 @@ def tune_tasks(
         measure_callbacks = MeasureCallback.create(measure_callbacks)
     if not isinstance(task_scheduler, TaskScheduler):
         task_scheduler = TaskScheduler.create(task_scheduler)
+    tuning_database = database
+    if warm_start is not None:
+        tuning_database = WarmStartDatabase(
+            database,
+            warm_start,
+            target=tasks[0].target,
+            tasks=tasks,
+            module_equality=module_equality,
+        )
+        _pretrain_cost_model(cost_model, tasks, tuning_database)
     task_scheduler.tune(
         tasks=tasks,
         task_weights=task_weights,
@@ -124,7 +185,7 @@ def tune_tasks(
         builder=builder,
         runner=runner,
         measure_callbacks=measure_callbacks,
-        database=database,
+        database=tuning_database,
         cost_model=cost_model,
     )
     return database
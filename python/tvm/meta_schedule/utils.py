@@ -379,6 +379,86 @@ def shash2hex(mod: IRModule) -> str:
     return str(func(mod))
 
 
+# kMaxMeanTime in C++, the stub for undefined measurement times
+MAX_MEAN_RUN_SECS = 1e10
+
+
+def mean_run_secs(run_secs: Optional[List[Any]]) -> float:
+    """Mean of the measured run secs, following `SortTuningRecordByMeanRunSecs` in C++.
+
+    Parameters
+    ----------
+    run_secs : Optional[List[Any]]
+        The run secs of a tuning record.
+
+    Returns
+    -------
+    result : float
+        The mean run secs, or MAX_MEAN_RUN_SECS if there is no run secs.
+    """
+    if not run_secs:
+        return MAX_MEAN_RUN_SECS
+    return sum(float(x) for x in run_secs) / len(run_secs)
+
+
+def is_valid_run_secs(run_secs: Optional[List[Any]]) -> bool:
+    """Whether any of the run secs is an actual measurement.
+
+    Parameters
+    ----------
+    run_secs : Optional[List[Any]]
+        The run secs of a tuning record.
+
+    Returns
+    -------
+    result : bool
+        Whether the run secs are not all missing or MAX_MEAN_RUN_SECS.
+    """
+    if not run_secs:
+        return False
+    return any(x is not None and float(x) != MAX_MEAN_RUN_SECS for x in run_secs)
+
+
+def module_hash(mod: IRModule, module_equality: str = "structural") -> int:
+    """Get the hash of a module under a module equality.
+
+    Parameters
+    ----------
+    mod : IRModule
+        The module to be hashed.
+    module_equality : str
+        The module equality, "structural", "ignore-ndarray" or "anchor-block".
+
+    Returns
+    -------
+    result : int
+        The hash of the module.
+    """
+    func = get_global_func("meta_schedule._ModuleEqualityHash")
+    return int(func(mod, module_equality))
+
+
+def module_equal(lhs: IRModule, rhs: IRModule, module_equality: str = "structural") -> bool:
+    """Check whether two modules are equal under a module equality.
+
+    Parameters
+    ----------
+    lhs : IRModule
+        The left module.
+    rhs : IRModule
+        The right module.
+    module_equality : str
+        The module equality, "structural", "ignore-ndarray" or "anchor-block".
+
+    Returns
+    -------
+    result : bool
+        Whether the modules are equal.
+    """
+    func = get_global_func("meta_schedule._ModuleEqualityEqual")
+    return bool(func(lhs, rhs, module_equality))
+
+
 def _get_default_str(obj: Any) -> str:
     return (
         # pylint: disable=protected-access
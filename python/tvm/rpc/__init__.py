@@ -28,4 +28,5 @@ upload and run remote RPC server, get the result back to verify correctness.
 from .server import Server
 from .client import connect, connect_tracker
 from .client import RPCSession, LocalSession, PopenSession, TrackerSession
+from .session_pool import SessionPool
 from .minrpc import with_minrpc
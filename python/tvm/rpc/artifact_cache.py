@@ -0,0 +1,201 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Content-addressed cache of the files uploaded to RPC servers."""
+import hashlib
+import os
+import re
+import shutil
+import stat
+
+from tvm.contrib.utils import filelock
+
+from .base import RPC_CHUNK_SIZE, logger
+
+# The default size limit of the cache in bytes
+DEFAULT_CACHE_SIZE_LIMIT = 16 << 30
+
+_DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def sha256_digest(data):
+    """The sha256 digest of a file or a binary, which is the key of the cache.
+
+    Parameters
+    ----------
+    data : str or bytearray
+        The file name or binary.
+
+    Returns
+    -------
+    digest : str
+        The hex digest.
+    """
+    sha = hashlib.sha256()
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        sha.update(data)
+        return sha.hexdigest()
+    with open(data, "rb") as f:
+        for block in iter(lambda: f.read(RPC_CHUNK_SIZE), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class ArtifactCache(object):
+    """A persistent cache of files keyed by the sha256 of their content, shared by the
+    sessions of RPC servers, so that identical modules and parameters are uploaded only once.
+
+    A file is stored as `<path>/<digest[:2]>/<digest>/<file name>` and kept read-only. When
+    the total size exceeds the limit, the least recently used files are evicted.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the cache.
+
+    size_limit : int, optional
+        The maximum total size of the cached files in bytes.
+    """
+
+    def __init__(self, path, size_limit=DEFAULT_CACHE_SIZE_LIMIT):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.size_limit = size_limit
+        os.makedirs(self.path, exist_ok=True)
+
+    def _entry_dir(self, digest):
+        if not _DIGEST_PATTERN.match(digest):
+            raise ValueError(f"Invalid sha256 digest: {digest}")
+        return os.path.join(self.path, digest[:2], digest)
+
+    def lookup(self, digest):
+        """Look up a file by its digest, and mark it as recently used.
+
+        Parameters
+        ----------
+        digest : str
+            The sha256 hex digest of the file.
+
+        Returns
+        -------
+        path : str or None
+            The path of the cached file, or None if not cached.
+        """
+        entry_dir = self._entry_dir(digest)
+        try:
+            names = os.listdir(entry_dir)
+            if len(names) != 1:
+                return None
+            os.utime(entry_dir)
+        except FileNotFoundError:
+            return None
+        return os.path.join(entry_dir, names[0])
+
+    def copy_to(self, digest, target):
+        """Place a cached file at target, by a hard link if possible.
+
+        Parameters
+        ----------
+        digest : str
+            The sha256 hex digest of the file.
+
+        target : str
+            The destination path.
+
+        Returns
+        -------
+        found : bool
+            Whether the file is cached.
+        """
+        path = self.lookup(digest)
+        if path is None:
+            return False
+        if os.path.lexists(target):
+            os.remove(target)
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copyfile(path, target)
+        return True
+
+    def store(self, digest, source):
+        """Add a file to the cache, and evict the least recently used files if needed.
+
+        Parameters
+        ----------
+        digest : str
+            The sha256 hex digest of the file, which is verified.
+
+        source : str
+            The path of the file.
+        """
+        entry_dir = self._entry_dir(digest)
+        if os.path.isdir(entry_dir):
+            os.utime(entry_dir)
+            return
+        if sha256_digest(source) != digest:
+            raise ValueError(f"The content of {source} does not match sha256 {digest}")
+        if os.path.getsize(source) > self.size_limit:
+            return
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        tmp_dir = f"{entry_dir}.{os.getpid()}.tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+        cached = os.path.join(tmp_dir, os.path.basename(source))
+        shutil.copyfile(source, cached)
+        os.chmod(cached, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # stored by another session in the meantime
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self._evict(keep=entry_dir)
+
+    def _evict(self, keep):
+        """Remove the least recently used files until the cache fits in the size limit."""
+        lock = filelock(os.path.join(self.path, ".lock"))
+        try:
+            entries = []
+            total = 0
+            for prefix in os.listdir(self.path):
+                prefix_dir = os.path.join(self.path, prefix)
+                if not os.path.isdir(prefix_dir):
+                    continue
+                for digest in os.listdir(prefix_dir):
+                    entry_dir = os.path.join(prefix_dir, digest)
+                    if not _DIGEST_PATTERN.match(digest):
+                        continue
+                    try:
+                        size = sum(
+                            os.path.getsize(os.path.join(entry_dir, name))
+                            for name in os.listdir(entry_dir)
+                        )
+                        entries.append((os.path.getmtime(entry_dir), size, entry_dir))
+                    except FileNotFoundError:
+                        continue
+                    total += size
+            entries.sort()
+            for _, size, entry_dir in entries:
+                if total <= self.size_limit:
+                    break
+                if entry_dir == keep:
+                    continue
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total -= size
+                logger.info("evict %s from the artifact cache", os.path.basename(entry_dir))
+        finally:
+            lock.release()
+
+    def __repr__(self):
+        return f"ArtifactCache({self.path!r}, size_limit={self.size_limit})"
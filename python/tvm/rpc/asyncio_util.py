@@ -0,0 +1,129 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Utilities used in asyncio."""
+
+import asyncio
+import json
+import struct
+
+from .._ffi.base import py_str
+
+
+class TCPHandler(asyncio.Protocol):
+    """TCP connection handler backed by the asyncio event loop.
+
+    Subclasses receive the data by on_message, and are notified by
+    on_close once the connection is closed by either side.
+    """
+
+    def __init__(self):
+        self._transport = None
+        self.addr = None
+
+    @property
+    def closed(self):
+        """Whether the connection is closed."""
+        return self._transport is None
+
+    def connection_made(self, transport):
+        self._transport = transport
+        self.addr = transport.get_extra_info("peername")
+
+    def data_received(self, data):
+        self.on_message(bytes(data))
+
+    def connection_lost(self, exc):
+        if self._transport is None:
+            return
+        self._transport = None
+        if exc is not None:
+            self.on_error(exc)
+        self.on_close()
+
+    def signal_close(self):
+        """Signal the handler to close.
+
+        The handler will be closed after the existing
+        pending message are sent to the peer.
+        """
+        self.close()
+
+    def close(self):
+        """Close the connection after the pending messages are sent."""
+        if self._transport is not None:
+            transport, self._transport = self._transport, None
+            transport.close()
+            self.on_close()
+
+    def write_message(self, message, binary=True):
+        assert binary
+        if self._transport is None:
+            raise IOError("socket is already closed")
+        self._transport.write(message)
+
+    def pause_reading(self):
+        """Stop receiving data, e.g. when the peer it is forwarded to is slow."""
+        if self._transport is not None:
+            self._transport.pause_reading()
+
+    def resume_reading(self):
+        """Resume receiving data."""
+        if self._transport is not None:
+            self._transport.resume_reading()
+
+    def on_message(self, message):
+        """Callback when data is received."""
+        raise NotImplementedError()
+
+    def on_close(self):
+        """Callback when the connection is closed."""
+
+    def on_error(self, err):
+        """Callback when the connection is lost by an error."""
+
+
+async def sendjson(writer, data):
+    """send a python value to remote via json
+
+    Parameters
+    ----------
+    writer : asyncio.StreamWriter
+        The stream to send.
+
+    data : object
+        Python value to be sent.
+    """
+    data = json.dumps(data).encode("utf-8")
+    writer.write(struct.pack("<i", len(data)) + data)
+    await writer.drain()
+
+
+async def recvjson(reader):
+    """receive python value from remote via json
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+        The stream to receive from.
+
+    Returns
+    -------
+    value : object
+        The value received.
+    """
+    size = struct.unpack("<i", await reader.readexactly(4))[0]
+    return json.loads(py_str(await reader.readexactly(size)))
@@ -24,6 +24,7 @@ import errno
 import struct
 import random
 import logging
+import zlib
 
 from .._ffi.base import py_str
 
@@ -53,10 +54,20 @@ class TrackerCode(object):
     UPDATE_INFO = 5
     SUMMARY = 6
     GET_PENDING_MATCHKEYS = 7
+    RENEW = 8
 
 
 RPC_SESS_MASK = 128
 
+# The default size of the chunks of file transfer
+RPC_CHUNK_SIZE = 16 << 20
+
+# The compression codecs of file transfer chunks
+CHUNK_CODECS = {None: 0, "zlib": 1, "zstd": 2}
+
+# Header of a file transfer chunk: (codec, crc32 of the uncompressed data)
+CHUNK_HEADER = struct.Struct("<BI")
+
 # Use "127.0.0.1" or "::1" if there is a need to force ip4 or ip6
 # connection for "localhost".
 def get_addr_family(addr):
@@ -197,3 +208,99 @@ def connect_with_retry(addr, timeout=60, retry_period=5):
                 f"Cannot connect to tracker {str(addr)}, retry in {retry_period:g} secs..."
             )
             time.sleep(retry_period)
+
+
+def _zstd():
+    try:
+        import zstandard  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        raise ImportError("zstd compression requires the zstandard package")
+    return zstandard
+
+
+def encode_chunk(data, compression=None):
+    """Encode a chunk of file transfer, with a header of the codec and the checksum.
+
+    The chunk is compressed only if it gets smaller.
+
+    Parameters
+    ----------
+    data : bytes-like
+        The data of the chunk.
+
+    compression : str, optional
+        The compression codec, None, "zlib" or "zstd".
+
+    Returns
+    -------
+    chunk : bytearray
+        The encoded chunk.
+    """
+    if compression not in CHUNK_CODECS:
+        raise ValueError(f"Unknown compression codec: {compression}")
+    codec = CHUNK_CODECS[compression]
+    payload = data
+    if compression == "zlib":
+        payload = zlib.compress(data, 1)
+    elif compression == "zstd":
+        payload = _zstd().ZstdCompressor().compress(data)
+    if len(payload) >= len(data):
+        codec, payload = CHUNK_CODECS[None], data
+    chunk = bytearray(CHUNK_HEADER.pack(codec, zlib.crc32(data)))
+    chunk += payload
+    return chunk
+
+
+def decode_chunk(chunk):
+    """Decode a chunk encoded by `encode_chunk`, verifying its checksum.
+
+    Parameters
+    ----------
+    chunk : bytes-like
+        The encoded chunk.
+
+    Returns
+    -------
+    data : bytes
+        The data of the chunk.
+    """
+    codec, crc = CHUNK_HEADER.unpack_from(chunk)
+    payload = memoryview(chunk)[CHUNK_HEADER.size :]
+    if codec == CHUNK_CODECS["zlib"]:
+        data = zlib.decompress(payload)
+    elif codec == CHUNK_CODECS["zstd"]:
+        data = _zstd().ZstdDecompressor().decompress(payload)
+    elif codec == CHUNK_CODECS[None]:
+        data = bytes(payload)
+    else:
+        raise ValueError(f"Unknown chunk codec: {codec}")
+    if zlib.crc32(data) != crc:
+        raise IOError("Checksum mismatch in file transfer chunk")
+    return data
+
+
+def file_crc32(path, size):
+    """The crc32 checksum of the first size bytes of a file.
+
+    Parameters
+    ----------
+    path : str
+        The file path.
+
+    size : int
+        The number of bytes.
+
+    Returns
+    -------
+    crc : int
+        The checksum.
+    """
+    crc = 0
+    with open(path, "rb") as f:
+        while size > 0:
+            data = f.read(min(size, RPC_CHUNK_SIZE))
+            if not data:
+                break
+            crc = zlib.crc32(data, crc)
+            size -= len(data)
+    return crc
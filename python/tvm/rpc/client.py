@@ -16,11 +16,15 @@
 # under the License.
 # pylint: disable=used-before-assignment
 """RPC client tools"""
+import contextlib
+import getpass
 import os
 import socket
 import stat
 import struct
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 
 import tvm._ffi
 from tvm._ffi.base import TVMError
@@ -29,6 +33,7 @@ from tvm.runtime import ndarray as nd
 from tvm._ffi.runtime_ctypes import Device
 
 from . import _ffi_api, base, server
+from .artifact_cache import sha256_digest
 
 
 class RPCSession(object):
@@ -42,6 +47,8 @@ class RPCSession(object):
         self._sess = sess
         self._tbl_index = _ffi_api.SessTableIndex(sess)
         self._remote_funcs = {}
+        # The match-key of the session in the tracker, if it is requested from a tracker.
+        self.lease_key = None
 
     def system_lib(self):
         """Get system-wide library module.
@@ -92,9 +99,40 @@ class RPCSession(object):
         dev._rpc_sess = self
         return dev
 
-    def upload(self, data, target=None):
+    def _get_server_func(self, name):
+        """Get a function of tvm.rpc.server, or None if the server does not have it."""
+        if name not in self._remote_funcs:
+            try:
+                self._remote_funcs[name] = self.get_function(f"tvm.rpc.server.{name}")
+            except AttributeError:
+                self._remote_funcs[name] = None
+        return self._remote_funcs[name]
+
+    def _remote_file_info(self, path, size):
+        """The size of a remote file and the crc32 of its first size bytes."""
+        file_size, crc = self._get_server_func("file_info")(path, size).split()
+        return int(file_size), int(crc)
+
+    def upload(
+        self,
+        data,
+        target=None,
+        chunk_size=None,
+        compression=None,
+        resume=False,
+        callback=None,
+        use_cache=True,
+    ):
         """Upload file to remote runtime temp folder
 
+        The file is sent in chunks, each optionally compressed and checked by crc32, so that
+        neither side holds the whole file in memory. The next chunk is read and compressed
+        while the current one is sent. The remote file appears only when it is complete.
+        Servers without chunked transfer receive the whole file at once.
+
+        If the server has an artifact cache, the file is only sent when the cache does not
+        have its sha256 digest yet.
+
         Parameters
         ----------
         data : str or bytearray
@@ -102,36 +140,178 @@ class RPCSession(object):
 
         target : str, optional
             The path in remote
+
+        chunk_size : int, optional
+            The size of the chunks in bytes. Defaults to base.RPC_CHUNK_SIZE.
+
+        compression : str, optional
+            The compression codec of the chunks, None, "zlib" or "zstd".
+
+        resume : bool, optional
+            Whether to resume an interrupted upload of the same file to the same target from
+            the data already received by the remote, if it matches the local one. A server
+            keeps the partial uploads across its sessions for an hour, so the upload can be
+            resumed in a new session after a dropped connection.
+
+        callback : function(int, int), optional
+            Called with the number of bytes sent and the total after each chunk.
+
+        use_cache : bool, optional
+            Whether to use the artifact cache of the server.
         """
         if isinstance(data, bytearray):
             if not target:
                 raise ValueError("target must present when file is a bytearray")
-            blob = data
+            size = len(data)
         else:
-            blob = bytearray(open(data, "rb").read())
             if not target:
                 target = os.path.basename(data)
-
-        if "upload" not in self._remote_funcs:
-            self._remote_funcs["upload"] = self.get_function("tvm.rpc.server.upload")
-        self._remote_funcs["upload"](target, blob)
-
-    def download(self, path):
+            size = os.path.getsize(data)
+
+        cache_lookup = self._get_server_func("cache_lookup") if use_cache else None
+        if cache_lookup is not None:
+            digest = sha256_digest(data)
+            if cache_lookup(digest, target):
+                if callback:
+                    callback(size, size)
+                return
+        self._upload(data, target, size, chunk_size, compression, resume, callback)
+        if cache_lookup is not None:
+            self._get_server_func("cache_store")(digest, target)
+
+    def _upload(self, data, target, size, chunk_size, compression, resume, callback):
+        """Send a file to the server."""
+        if self._get_server_func("upload_chunk") is None:
+            blob = data if isinstance(data, bytearray) else bytearray(open(data, "rb").read())
+            self._get_server_func("upload")(target, blob)
+            if callback:
+                callback(size, size)
+            return
+
+        chunk_size = chunk_size or base.RPC_CHUNK_SIZE
+        offset = 0
+        if resume:
+            part_size, crc = self._get_server_func("upload_part_info")(target, size).split()
+            part_size, crc = int(part_size), int(crc)
+            if 0 < part_size <= size:
+                if isinstance(data, bytearray):
+                    local_crc = zlib.crc32(memoryview(data)[:part_size])
+                else:
+                    local_crc = base.file_crc32(data, part_size)
+                if crc == local_crc:
+                    offset = part_size
+
+        with contextlib.ExitStack() as stack:
+            if isinstance(data, bytearray):
+                view = memoryview(data)
+
+                def _read(pos):
+                    return view[pos : pos + chunk_size]
+
+            else:
+                fin = stack.enter_context(open(data, "rb"))
+
+                def _read(pos):
+                    fin.seek(pos)
+                    return fin.read(chunk_size)
+
+            def _encode(pos):
+                return pos, base.encode_chunk(_read(pos), compression)
+
+            upload_chunk = self._get_server_func("upload_chunk")
+            pool = stack.enter_context(ThreadPoolExecutor(max_workers=1))
+            future = pool.submit(_encode, offset) if offset < size or size == 0 else None
+            while future is not None:
+                pos, chunk = future.result()
+                next_pos = pos + chunk_size
+                future = pool.submit(_encode, next_pos) if next_pos < size else None
+                offset = upload_chunk(target, size, pos, chunk)
+                if callback:
+                    callback(offset, size)
+        self._get_server_func("upload_commit")(target, size)
+
+    def download(
+        self, path, out_file=None, chunk_size=None, compression=None, resume=False, callback=None
+    ):
         """Download file from remote temp folder.
 
+        The file is received in chunks, each optionally compressed and checked by crc32.
+        Servers without chunked transfer send the whole file at once.
+
         Parameters
         ----------
         path : str
             The relative location to remote temp folder.
 
+        out_file : str, optional
+            The local file to write to, so that the file is never held in memory.
+
+        chunk_size : int, optional
+            The size of the chunks in bytes. Defaults to base.RPC_CHUNK_SIZE.
+
+        compression : str, optional
+            The compression codec of the chunks, None, "zlib" or "zstd".
+
+        resume : bool, optional
+            Whether to resume an interrupted download into out_file from its current
+            content, if it matches the remote one.
+
+        callback : function(int, int), optional
+            Called with the number of bytes received and the total after each chunk.
+
         Returns
         -------
         blob : bytearray
-            The result blob from the file.
+            The result blob from the file, or None if out_file is given.
         """
-        if "download" not in self._remote_funcs:
-            self._remote_funcs["download"] = self.get_function("tvm.rpc.server.download")
-        return self._remote_funcs["download"](path)
+        if self._get_server_func("download_chunk") is None:
+            blob = self._get_server_func("download")(path)
+            if callback:
+                callback(len(blob), len(blob))
+            if out_file is None:
+                return blob
+            with open(out_file, "wb") as fout:
+                fout.write(blob)
+            return None
+
+        chunk_size = chunk_size or base.RPC_CHUNK_SIZE
+        size, _ = self._remote_file_info(path, 0)
+        if size < 0:
+            raise RuntimeError(f"Cannot find remote file {path}")
+
+        offset = 0
+        if out_file is None:
+            blob = bytearray(size)
+        else:
+            if resume and os.path.isfile(out_file):
+                local_size = os.path.getsize(out_file)
+                if 0 < local_size <= size:
+                    _, crc = self._remote_file_info(path, local_size)
+                    if crc == base.file_crc32(out_file, local_size):
+                        offset = local_size
+            fout = open(out_file, "r+b" if offset > 0 else "wb")
+
+        download_chunk = self._get_server_func("download_chunk")
+        try:
+            while offset < size:
+                data = base.decode_chunk(
+                    download_chunk(path, offset, chunk_size, compression or "")
+                )
+                if not data:
+                    raise RuntimeError(f"Remote file {path} is truncated during download")
+                if out_file is None:
+                    blob[offset : offset + len(data)] = data
+                else:
+                    fout.seek(offset)
+                    fout.write(data)
+                offset += len(data)
+                if callback:
+                    callback(offset, size)
+        finally:
+            if out_file is not None:
+                fout.truncate(offset)
+                fout.close()
+        return blob if out_file is None else None
 
     def remove(self, path):
         """Remove file from remote temp folder.
@@ -145,6 +325,26 @@ class RPCSession(object):
             self._remote_funcs["remove"] = self.get_function("tvm.rpc.server.remove")
         self._remote_funcs["remove"](path)
 
+    def renew_lease(self, duration):
+        """Renew the lease of the session, so the server ends it duration seconds from now.
+
+        Parameters
+        ----------
+        duration: float
+            The new duration of the session in seconds. When duration is zero,
+            the session is kept alive until it is closed.
+
+        Returns
+        -------
+        renewed: bool
+            Whether the lease is renewed, False if the server does not support it.
+        """
+        renew = self._get_server_func("renew_lease")
+        if renew is None:
+            return False
+        renew(duration)
+        return True
+
     def listdir(self, path):
         """ls files from remote temp folder.
 
@@ -168,7 +368,8 @@ class RPCSession(object):
         Parameters
         ----------
         path : str
-            The relative location to remote temp folder.
+            The relative location to remote temp folder, or "sha256:<digest>" to load a
+            file in the artifact cache of the server by its digest.
 
         Returns
         -------
@@ -297,6 +498,15 @@ class PopenSession(RPCSession):
         RPCSession.__init__(self, _popen_session(binary))
 
 
+def _default_user():
+    if "TVM_TRACKER_USER" in os.environ:
+        return os.environ["TVM_TRACKER_USER"]
+    try:
+        return getpass.getuser()
+    except Exception:  # pylint: disable=broad-except
+        return ""
+
+
 class TrackerSession(object):
     """Tracker client session.
 
@@ -368,19 +578,54 @@ class TrackerSession(object):
             max_key_len = 0
 
         res += "Queue Status\n"
-        title = f"{'key':<{max_key_len}s}   total  free  pending\n"
+        title = f"{'key':<{max_key_len}s}   total  free  leased  pending  wait-p95(s)  util(%)\n"
         separate_line = "-" * len(title) + "\n"
         res += separate_line + title + separate_line
+        users = []
         for k in keys:
+            info = queue_info[k]
             total = total_ct.get(k, 0)
-            free, pending = queue_info[k]["free"], queue_info[k]["pending"]
+            free, pending = info["free"], info["pending"]
+            # older trackers do not report the leases and metrics
+            leased, wait, util = (
+                info.get("leased", 0),
+                info.get("wait_p95", 0),
+                info.get("utilization", 0),
+            )
             if total or pending:
-                res += f"{k:<{max_key_len}}   {total:<5d}  {free:<4d}  {pending:<7d}\n"
+                res += (
+                    f"{k:<{max_key_len}}   {total:<5d}  {free:<4d}  {leased:<6d}  {pending:<7d}"
+                    f"  {wait:<11.3f}  {util * 100:<7.1f}\n"
+                )
+            for user, uinfo in sorted(info.get("users", {}).items()):
+                users.append((k, user or "-", uinfo))
         res += separate_line
+        if users:
+            max_user_len = max([len(user) for _, user, _ in users] + [4])
+            res += "\n"
+            res += "User Status\n"
+            title = (
+                f"{'key':<{max_key_len}s}   {'user':<{max_user_len}s}   leased  pending  share\n"
+            )
+            separate_line = "-" * len(title) + "\n"
+            res += separate_line + title + separate_line
+            for k, user, uinfo in users:
+                share = f"{uinfo['share']:.3f}" if "share" in uinfo else "-"
+                res += (
+                    f"{k:<{max_key_len}}   {user:<{max_user_len}}   {uinfo['leased']:<6d}"
+                    f"  {uinfo['pending']:<7d}  {share}\n"
+                )
+            res += separate_line
         return res
 
     def request(
-        self, key, priority=1, session_timeout=0, max_retry=5, session_constructor_args=None
+        self,
+        key,
+        priority=1,
+        session_timeout=0,
+        max_retry=5,
+        session_constructor_args=None,
+        user=None,
     ):
         """Request a new connection from the tracker.
 
@@ -404,24 +649,34 @@ class TrackerSession(object):
             List of additional arguments to passed as the remote session constructor.
             The first element of the list is always a string specifying the name of
             the session constructor, the following args are the positional args to that function.
+
+        user : str, optional
+            The user the device is shared by, see tvm.rpc.tracker.FairShareScheduler.
+            Defaults to the environment variable TVM_TRACKER_USER, or the login name.
         """
+        if user is None:
+            user = _default_user()
         last_err = None
         for _ in range(max_retry):
             try:
                 if self._sock is None:
                     self._connect()
-                base.sendjson(self._sock, [base.TrackerCode.REQUEST, key, "", priority])
+                base.sendjson(
+                    self._sock, [base.TrackerCode.REQUEST, key, user, priority, session_timeout]
+                )
                 value = base.recvjson(self._sock)
                 if value[0] != base.TrackerCode.SUCCESS:
                     raise RuntimeError(f"Invalid return value {str(value)}")
                 url, port, matchkey = value[1]
-                return connect(
+                sess = connect(
                     url,
                     port,
                     matchkey,
                     session_timeout,
                     session_constructor_args=session_constructor_args,
                 )
+                sess.lease_key = matchkey
+                return sess
             except socket.error as err:
                 self.close()
                 last_err = err
@@ -431,6 +686,30 @@ class TrackerSession(object):
             f"Cannot request {key} after {max_retry} retry, last_error:{str(last_err)}"
         )
 
+    def renew(self, lease_key, duration):
+        """Renew the lease of a requested session in the tracker.
+
+        The tracker only records the lease, use RPCSession.renew_lease
+        to extend the session on the server.
+
+        Parameters
+        ----------
+        lease_key : str
+            The lease_key of the session.
+
+        duration : float
+            The new duration of the lease in seconds, zero to keep it until the session ends.
+
+        Returns
+        -------
+        renewed : bool
+            Whether the lease is renewed, False if the session has ended.
+        """
+        if self._sock is None:
+            self._connect()
+        base.sendjson(self._sock, [base.TrackerCode.RENEW, lease_key, duration])
+        return base.recvjson(self._sock) == base.TrackerCode.SUCCESS
+
     def request_and_run(self, key, func, priority=1, session_timeout=0, max_retry=2):
         """Request a resource from tracker and run the func.
 
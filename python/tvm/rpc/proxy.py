@@ -20,6 +20,9 @@ In normal RPC, client directly connect to server's IP address.
 Sometimes this cannot be done when server do not have a static address.
 RPCProxy allows both client and server connect to the proxy server,
 the proxy server will forward the message between the client and server.
+
+The TCP connections are served by an asyncio event loop, on which tornado
+serves the websocket and http connections of the web port.
 """
 # pylint: disable=unused-variable, unused-argument
 import os
@@ -36,7 +39,6 @@ try:
     from tornado import gen
     from tornado import websocket
     from tornado import ioloop
-    from . import tornado_util
 except ImportError as error_msg:
     raise ImportError(
         f"RPCProxy module requires tornado package {error_msg}. Try 'pip install tornado'."
@@ -44,6 +46,7 @@ except ImportError as error_msg:
 
 from tvm.contrib.popen_pool import PopenWorker
 from . import _ffi_api
+from . import asyncio_util
 from . import base
 from .base import TrackerCode
 from .server import _server_env
@@ -143,13 +146,12 @@ class ForwardHandler(object):
         self.forward_proxy = None
 
 
-class TCPHandler(tornado_util.TCPHandler, ForwardHandler):
+class TCPHandler(asyncio_util.TCPHandler, ForwardHandler):
     """Event driven TCP handler."""
 
-    def __init__(self, sock, addr):
-        super(TCPHandler, self).__init__(sock)
+    def __init__(self):
+        super(TCPHandler, self).__init__()
         self._init_handler()
-        self.addr = addr
 
     def name(self):
         return f"TCPSocketProxy:{str(self.addr[0])}:{self.rpc_key}"
@@ -169,6 +171,15 @@ class TCPHandler(tornado_util.TCPHandler, ForwardHandler):
             self.forward_proxy = None
         self.on_close_event()
 
+    def pause_writing(self):
+        # the peer sends faster than this connection drains, stop reading from it
+        if isinstance(self.forward_proxy, TCPHandler):
+            self.forward_proxy.pause_reading()
+
+    def resume_writing(self):
+        if isinstance(self.forward_proxy, TCPHandler):
+            self.forward_proxy.resume_reading()
+
 
 class WebSocketHandler(websocket.WebSocketHandler, ForwardHandler):
     """Handler for websockets."""
@@ -279,13 +290,7 @@ class ProxyServerHandler(object):
             self.app.listen(web_port)
 
         self.sock = sock
-        self.sock.setblocking(0)
-        self.loop = ioloop.IOLoop.current()
-
-        def event_handler(_, events):
-            self._on_event(events)
-
-        self.loop.add_handler(self.sock.fileno(), event_handler, self.loop.READ)
+        self.loop = asyncio.get_event_loop()
         self._client_pool = {}
         self._server_pool = {}
         self.timeout_alloc = 5
@@ -294,28 +299,16 @@ class ProxyServerHandler(object):
         # tracker information
         self._listen_port = listen_port
         self._tracker_addr = tracker_addr
+        # the (reader, writer) streams of the tracker connection
         self._tracker_conn = None
+        self._tracker_lock = asyncio.Lock()
         self._tracker_pending_puts = []
         self._key_set = set()
         self.update_tracker_period = 2
         if tracker_addr:
             logging.info("Tracker address:%s", str(tracker_addr))
-
-            def _callback():
-                self._update_tracker(True)
-
-            self.loop.call_later(self.update_tracker_period, _callback)
         logging.info("RPCProxy: Websock port bind to %d", web_port)
 
-    def _on_event(self, _):
-        while True:
-            try:
-                conn, addr = self.sock.accept()
-                TCPHandler(conn, addr)
-            except socket.error as err:
-                if err.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK):
-                    break
-
     def _pair_up(self, lhs, rhs):
         lhs.forward_proxy = rhs
         rhs.forward_proxy = lhs
@@ -344,77 +337,85 @@ class ProxyServerHandler(object):
             new_keys.append(new_key)
         return new_keys
 
-    def _update_tracker(self, period_update=False):
+    async def _tracker_call(self, data):
+        reader, writer = self._tracker_conn
+        await asyncio_util.sendjson(writer, data)
+        return await asyncio_util.recvjson(reader)
+
+    async def _update_tracker(self, period_update=False):
         """Update information on tracker."""
-        try:
-            if self._tracker_conn is None:
-                self._tracker_conn = socket.socket(
-                    base.get_addr_family(self._tracker_addr), socket.SOCK_STREAM
-                )
-                self._tracker_conn.connect(self._tracker_addr)
-                self._tracker_conn.sendall(struct.pack("<i", base.RPC_TRACKER_MAGIC))
-                magic = struct.unpack("<i", base.recvall(self._tracker_conn, 4))[0]
-                if magic != base.RPC_TRACKER_MAGIC:
-                    self.loop.stop()
-                    raise RuntimeError(f"{self._tracker_addr} is not RPC Tracker")
-                # just connect to tracker, need to update all keys
-                self._tracker_pending_puts = self._server_pool.keys()
-
-            if self._tracker_conn and period_update:
-                # periodically update tracker information
-                # regenerate key if the key is not in tracker anymore
-                # and there is no in-coming connection after timeout_alloc
-                base.sendjson(self._tracker_conn, [TrackerCode.GET_PENDING_MATCHKEYS])
-                pending_keys = set(base.recvjson(self._tracker_conn))
-                update_keys = []
-                for k, v in self._server_pool.items():
-                    if k not in pending_keys:
-                        if v.alloc_time is None:
-                            v.alloc_time = time.time()
-                        elif time.time() - v.alloc_time > self.timeout_alloc:
-                            update_keys.append(k)
-                            v.alloc_time = None
-                if update_keys:
-                    logging.info(
-                        "RPCProxy: No incoming conn on %s, regenerate keys...", str(update_keys)
+        async with self._tracker_lock:
+            try:
+                if self._tracker_conn is None:
+                    reader, writer = await asyncio.open_connection(*self._tracker_addr)
+                    writer.write(struct.pack("<i", base.RPC_TRACKER_MAGIC))
+                    magic = struct.unpack("<i", await reader.readexactly(4))[0]
+                    if magic != base.RPC_TRACKER_MAGIC:
+                        self.loop.stop()
+                        raise RuntimeError(f"{self._tracker_addr} is not RPC Tracker")
+                    self._tracker_conn = (reader, writer)
+                    # just connect to tracker, need to update all keys
+                    self._tracker_pending_puts = list(self._server_pool.keys())
+
+                if period_update:
+                    # periodically update tracker information
+                    # regenerate key if the key is not in tracker anymore
+                    # and there is no in-coming connection after timeout_alloc
+                    pending_keys = set(
+                        await self._tracker_call([TrackerCode.GET_PENDING_MATCHKEYS])
                     )
-                    new_keys = self._regenerate_server_keys(update_keys)
-                    self._tracker_pending_puts += new_keys
-
-            need_update_info = False
-            # report new connections
-            for key in self._tracker_pending_puts:
-                rpc_key, _ = base.split_random_key(key)
-                base.sendjson(
-                    self._tracker_conn, [TrackerCode.PUT, rpc_key, (self._listen_port, key), None]
+                    update_keys = []
+                    for k, v in self._server_pool.items():
+                        if k not in pending_keys:
+                            if v.alloc_time is None:
+                                v.alloc_time = time.time()
+                            elif time.time() - v.alloc_time > self.timeout_alloc:
+                                update_keys.append(k)
+                                v.alloc_time = None
+                    if update_keys:
+                        logging.info(
+                            "RPCProxy: No incoming conn on %s, regenerate keys...",
+                            str(update_keys),
+                        )
+                        new_keys = self._regenerate_server_keys(update_keys)
+                        self._tracker_pending_puts += new_keys
+
+                need_update_info = False
+                # report new connections
+                while self._tracker_pending_puts:
+                    key = self._tracker_pending_puts[0]
+                    rpc_key, _ = base.split_random_key(key)
+                    # the key is used or regenerated meanwhile
+                    if key in self._server_pool:
+                        ret = await self._tracker_call(
+                            [TrackerCode.PUT, rpc_key, (self._listen_port, key), None]
+                        )
+                        assert ret == TrackerCode.SUCCESS
+                    self._tracker_pending_puts.pop(0)
+                    if rpc_key not in self._key_set:
+                        self._key_set.add(rpc_key)
+                        need_update_info = True
+
+                if need_update_info:
+                    keylist = "[" + ",".join(self._key_set) + "]"
+                    cinfo = {"key": "server:proxy" + keylist, "addr": [None, self._listen_port]}
+                    ret = await self._tracker_call([TrackerCode.UPDATE_INFO, cinfo])
+                    assert ret == TrackerCode.SUCCESS
+            except (socket.error, IOError, asyncio.IncompleteReadError) as err:
+                logging.info(
+                    "Lost tracker connection: %s, try reconnect in %g sec",
+                    str(err),
+                    self.update_tracker_period,
                 )
-                assert base.recvjson(self._tracker_conn) == TrackerCode.SUCCESS
-                if rpc_key not in self._key_set:
-                    self._key_set.add(rpc_key)
-                    need_update_info = True
-
-            if need_update_info:
-                keylist = "[" + ",".join(self._key_set) + "]"
-                cinfo = {"key": "server:proxy" + keylist, "addr": [None, self._listen_port]}
-                base.sendjson(self._tracker_conn, [TrackerCode.UPDATE_INFO, cinfo])
-                assert base.recvjson(self._tracker_conn) == TrackerCode.SUCCESS
-            self._tracker_pending_puts = []
-        except (socket.error, IOError) as err:
-            logging.info(
-                "Lost tracker connection: %s, try reconnect in %g sec",
-                str(err),
-                self.update_tracker_period,
-            )
-            self._tracker_conn.close()
-            self._tracker_conn = None
-            self._regenerate_server_keys(self._server_pool.keys())
-
-        if period_update:
-
-            def _callback():
-                self._update_tracker(True)
-
-            self.loop.call_later(self.update_tracker_period, _callback)
+                if self._tracker_conn is not None:
+                    self._tracker_conn[1].close()
+                    self._tracker_conn = None
+                self._regenerate_server_keys(list(self._server_pool.keys()))
+
+    async def _update_tracker_loop(self):
+        while True:
+            await asyncio.sleep(self.update_tracker_period)
+            await self._update_tracker(True)
 
     def _handler_ready_tracker_mode(self, handler):
         """tracker mode to handle handler ready."""
@@ -423,7 +424,7 @@ class ProxyServerHandler(object):
             handler.match_key = key
             self._server_pool[key] = handler
             self._tracker_pending_puts.append(key)
-            self._update_tracker()
+            self.loop.create_task(self._update_tracker())
         else:
             if handler.match_key in self._server_pool:
                 self._pair_up(self._server_pool.pop(handler.match_key), handler)
@@ -475,7 +476,12 @@ class ProxyServerHandler(object):
 
     def run(self):
         """Run the proxy server"""
-        ioloop.IOLoop.current().start()
+        self.loop.run_until_complete(
+            self.loop.create_server(TCPHandler, sock=self.sock, backlog=socket.SOMAXCONN)
+        )
+        if self._tracker_addr:
+            self.loop.create_task(self._update_tracker_loop())
+        self.loop.run_forever()
 
 
 def _proxy_server(
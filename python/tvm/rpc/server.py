@@ -23,10 +23,14 @@ Server is TCP based with the following protocol:
   - [RPC_MAGIC, keysize(int32), key-bytes]
 - The key is in format
    - {server|client}:device-type[:random-key] [-timeout=timeout]
+- The timeout is the lease of the session, which the client can renew
+  by calling tvm.rpc.server.renew_lease.
 """
 # pylint: disable=invalid-name
 import os
 import ctypes
+import hashlib
+import shutil
 import socket
 import select
 import struct
@@ -45,6 +49,7 @@ from tvm.contrib import utils
 from tvm.contrib.popen_pool import PopenWorker
 from . import _ffi_api
 from . import base
+from .artifact_cache import DEFAULT_CACHE_SIZE_LIMIT, ArtifactCache
 
 # pylint: disable=unused-import
 from . import testing
@@ -62,12 +67,38 @@ logger.setLevel(logging.INFO)
 logger.propagate = False
 
 
-def _server_env(load_library, work_path=None):
+# Partial uploads not resumed for this many seconds are removed
+PARTIAL_UPLOAD_TTL = 3600
+
+
+def _partial_upload_path(partial_dir, file_name, size):
+    """The partial file of an upload, keyed by its target name and size."""
+    key = hashlib.sha1(f"{file_name}\0{size}".encode("utf-8")).hexdigest()
+    return os.path.join(partial_dir, key + ".part")
+
+
+def _expire_partial_uploads(partial_dir, ttl=PARTIAL_UPLOAD_TTL):
+    """Remove the partial uploads not written to for ttl seconds."""
+    now = time.time()
+    for name in os.listdir(partial_dir):
+        path = os.path.join(partial_dir, name)
+        try:
+            if name.endswith(".part") and now - os.path.getmtime(path) > ttl:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _server_env(load_library, work_path=None, cache=None, lease=None, partial_dir=None):
     """Server environment function return temp dir"""
     if work_path:
         temp = work_path
     else:
         temp = utils.tempdir()
+    # The partial uploads outlive the session when the server keeps them in its own directory,
+    # so that a client can resume an upload after a dropped connection.
+    if partial_dir is None:
+        partial_dir = temp.temp_dir
 
     # pylint: disable=unused-variable
     @tvm._ffi.register_func("tvm.rpc.server.workpath", override=True)
@@ -76,12 +107,91 @@ def _server_env(load_library, work_path=None):
 
     @tvm._ffi.register_func("tvm.rpc.server.load_module", override=True)
     def load_module(file_name):
-        """Load module from remote side."""
+        """Load module from remote side, or from the cache by "sha256:<digest>"."""
+        if file_name.startswith("sha256:") and cache is not None:
+            digest = file_name[len("sha256:") :]
+            cached = cache.lookup(digest)
+            if cached is None:
+                raise RuntimeError(f"Cannot find {file_name} in the artifact cache")
+            file_name = os.path.basename(cached)
+            cache.copy_to(digest, temp.relpath(file_name))
         path = temp.relpath(file_name)
         m = _load_module(path)
         logger.info("load_module %s", path)
         return m
 
+    @tvm._ffi.register_func("tvm.rpc.server.upload_chunk", override=True)
+    def upload_chunk(file_name, size, offset, chunk):
+        """Write a chunk of an upload of size bytes at offset into the partial file."""
+        data = base.decode_chunk(chunk)
+        path = _partial_upload_path(partial_dir, file_name, size)
+        with open(path, "r+b" if os.path.isfile(path) else "wb") as f:
+            f.seek(offset)
+            f.write(data)
+            f.truncate()
+        return offset + len(data)
+
+    @tvm._ffi.register_func("tvm.rpc.server.upload_commit", override=True)
+    def upload_commit(file_name, size):
+        """Move the complete partial file of an upload to its place."""
+        path = temp.relpath(file_name)
+        part_path = _partial_upload_path(partial_dir, file_name, size)
+        if os.path.getsize(part_path) != size:
+            raise RuntimeError(f"Incomplete upload of {file_name}")
+        shutil.move(part_path, path)
+        logger.info("upload %s, nbytes=%d", path, size)
+
+    @tvm._ffi.register_func("tvm.rpc.server.upload_part_info", override=True)
+    def upload_part_info(file_name, size):
+        """Return "<size received> <crc32 of it>" of an upload of size bytes, or "-1 0"."""
+        path = _partial_upload_path(partial_dir, file_name, size)
+        if not os.path.isfile(path):
+            return "-1 0"
+        part_size = os.path.getsize(path)
+        return f"{part_size} {base.file_crc32(path, part_size)}"
+
+    @tvm._ffi.register_func("tvm.rpc.server.file_info", override=True)
+    def file_info(file_name, size):
+        """Return "<file size> <crc32 of the first size bytes>", or "-1 0" if not found."""
+        path = temp.relpath(file_name)
+        if not os.path.isfile(path):
+            return "-1 0"
+        file_size = os.path.getsize(path)
+        size = file_size if size < 0 else min(size, file_size)
+        return f"{file_size} {base.file_crc32(path, size)}"
+
+    @tvm._ffi.register_func("tvm.rpc.server.download_chunk", override=True)
+    def download_chunk(file_name, offset, size, compression):
+        """Read a chunk of a download."""
+        with open(temp.relpath(file_name), "rb") as f:
+            f.seek(offset)
+            data = f.read(size)
+        return base.encode_chunk(data, compression or None)
+
+    if lease is not None:
+
+        @tvm._ffi.register_func("tvm.rpc.server.renew_lease", override=True)
+        def renew_lease(duration):
+            """End the session duration seconds from now, never if duration is not positive."""
+            with lease.get_lock():
+                lease[0] = time.time() + duration if duration > 0 else 0.0
+                lease[1] = duration
+
+    if cache is not None:
+
+        @tvm._ffi.register_func("tvm.rpc.server.cache_lookup", override=True)
+        def cache_lookup(digest, file_name):
+            """Place the cached file of digest at file_name, return whether it is cached."""
+            found = cache.copy_to(digest, temp.relpath(file_name))
+            if found:
+                logger.info("upload %s from the artifact cache", file_name)
+            return found
+
+        @tvm._ffi.register_func("tvm.rpc.server.cache_store", override=True)
+        def cache_store(digest, file_name):
+            """Add an uploaded file to the cache."""
+            cache.store(digest, temp.relpath(file_name))
+
     @tvm._ffi.register_func("tvm.rpc.server.download_linked_module", override=True)
     def download_linked_module(file_name):
         """Load module from remote side."""
@@ -120,8 +230,8 @@ def _server_env(load_library, work_path=None):
     return temp
 
 
-def _serve_loop(sock, load_library, work_path):
-    _server_env(load_library, work_path)
+def _serve_loop(sock, load_library, work_path, cache=None, lease=None, partial_dir=None):
+    _server_env(load_library, work_path, cache, lease, partial_dir)
     _ffi_api.ServerLoop(sock.fileno())
 
 
@@ -134,25 +244,37 @@ def _parse_server_opt(opts):
     return ret
 
 
-def _serving(sock, addr, opts, load_library):
+def _serving(sock, addr, opts, load_library, cache=None, partial_dir=None):
     logger.info(f"connected from {addr}")
+    if partial_dir is not None:
+        _expire_partial_uploads(partial_dir)
     work_path = utils.tempdir()
     old_cwd = os.getcwd()
     os.chdir(work_path.path)  # Avoiding file name conflict between sessions.
     logger.info(f"start serving at {work_path.path}")
 
-    server_proc = multiprocessing.Process(target=_serve_loop, args=(sock, load_library, work_path))
+    # The lease of the session, [deadline, duration], renewable by the client.
+    timeout = opts.get("timeout", 0)
+    lease = multiprocessing.Array("d", [time.time() + timeout if timeout else 0.0, timeout])
+    server_proc = multiprocessing.Process(
+        target=_serve_loop, args=(sock, load_library, work_path, cache, lease, partial_dir)
+    )
     server_proc.start()
-    server_proc.join(opts.get("timeout", None))  # Wait until finish or timeout.
+    while True:  # Wait until finish or the lease expires.
+        deadline, duration = lease[0], lease[1]
+        if deadline and time.time() >= deadline:
+            break
+        server_proc.join(min(max(deadline - time.time(), 0), 1.0) if deadline else 1.0)
+        if not server_proc.is_alive():
+            break
 
     if server_proc.is_alive():
         logger.info("timeout in RPC session, kill..")
         _ffi_api.ReturnException(
             sock.fileno(),
-            f'RPCSessionTimeoutError: Your {opts["timeout"]}s session has expired, '
+            f"RPCSessionTimeoutError: Your {duration}s session has expired, "
             f'try to increase the "session_timeout" value.',
         )
-
         try:
             import psutil  # pylint: disable=import-outside-toplevel
 
@@ -176,7 +298,9 @@ def _serving(sock, addr, opts, load_library):
     sock.close()
 
 
-def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
+def _listen_loop(
+    sock, port, rpc_key, tracker_addr, load_library, custom_addr, cache=None, partial_dir=None
+):
     """Listening loop of the server."""
 
     def _accept_conn(listen_sock, tracker_conn, ping_period=2):
@@ -276,10 +400,10 @@ def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
             raise exc
 
         # step 3: serving
-        _serving(conn, addr, opts, load_library)
+        _serving(conn, addr, opts, load_library, cache, partial_dir)
 
 
-def _connect_proxy_loop(addr, key, load_library):
+def _connect_proxy_loop(addr, key, load_library, cache=None, partial_dir=None):
     key = "server:" + key
     retry_count = 0
     max_retry = 5
@@ -302,7 +426,14 @@ def _connect_proxy_loop(addr, key, load_library):
             keylen = struct.unpack("<i", base.recvall(sock, 4))[0]
             remote_key = py_str(base.recvall(sock, keylen))
 
-            _serving(sock, addr, _parse_server_opt(remote_key.split()[1:]), load_library)
+            _serving(
+                sock,
+                addr,
+                _parse_server_opt(remote_key.split()[1:]),
+                load_library,
+                cache,
+                partial_dir,
+            )
             retry_count = 0
         except (socket.error, IOError) as err:
             retry_count += 1
@@ -330,6 +461,7 @@ class PopenRPCServerState(object):
         silent=False,
         reuse_addr=True,
         timeout=None,
+        cache=None,
     ):
 
         # start update
@@ -337,6 +469,8 @@ class PopenRPCServerState(object):
         self.port = port
         self.libs = []
         self.custom_addr = custom_addr
+        # The partial uploads of all the sessions, resumable after a dropped connection
+        self.partial_dir = utils.tempdir()
 
         if silent:
             logger.setLevel(logging.ERROR)
@@ -369,12 +503,22 @@ class PopenRPCServerState(object):
             self.sock = sock
             self.thread = threading.Thread(
                 target=_listen_loop,
-                args=(self.sock, self.port, key, tracker_addr, load_library, self.custom_addr),
+                args=(
+                    self.sock,
+                    self.port,
+                    key,
+                    tracker_addr,
+                    load_library,
+                    self.custom_addr,
+                    cache,
+                    self.partial_dir.temp_dir,
+                ),
             )
             self.thread.start()
         else:
             self.thread = threading.Thread(
-                target=_connect_proxy_loop, args=((host, port), key, load_library)
+                target=_connect_proxy_loop,
+                args=((host, port), key, load_library, cache, self.partial_dir.temp_dir),
             )
             self.thread.start()
 
@@ -393,6 +537,8 @@ def _popen_start_rpc_server(
     server_init_callback=None,
     reuse_addr=True,
     timeout=None,
+    cache_dir=None,
+    cache_size_limit=DEFAULT_CACHE_SIZE_LIMIT,
 ):
     if no_fork:
         multiprocessing.set_start_method("spawn")
@@ -415,6 +561,7 @@ def _popen_start_rpc_server(
         silent,
         reuse_addr,
         timeout,
+        ArtifactCache(cache_dir, cache_size_limit) if cache_dir else None,
     )
     PopenRPCServerState.current = state
     # returns the port so that the main can get the port number.
@@ -472,6 +619,15 @@ class Server(object):
     timeout: float, optional
          set a timeout for all operations on the socket
 
+    cache_dir: str, optional
+        The directory of a persistent cache of the uploaded files, keyed by their sha256.
+        With it, a client uploads a file only if the server has not seen it before, and
+        can load a module by "sha256:<digest>". The directory can be shared by servers.
+
+    cache_size_limit: int, optional
+        The maximum total size of the cache in bytes, beyond which the least recently
+        used files are evicted.
+
     Note
     ----
     The RPC server only sees functions in the tvm namespace.
@@ -504,6 +660,8 @@ class Server(object):
         server_init_callback=None,
         reuse_addr=True,
         timeout=None,
+        cache_dir=None,
+        cache_size_limit=DEFAULT_CACHE_SIZE_LIMIT,
     ):
         try:
             if _ffi_api.ServerLoop is None:
@@ -528,6 +686,8 @@ class Server(object):
                 server_init_callback,
                 reuse_addr,
                 timeout,
+                cache_dir,
+                cache_size_limit,
             ],
         )
         # receive the port
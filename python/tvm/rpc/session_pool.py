@@ -0,0 +1,275 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A client-side pool of RPC sessions requested from a tracker."""
+import contextlib
+import socket
+import threading
+
+from tvm._ffi.base import TVMError
+
+from .client import TrackerSession
+
+
+class _PooledSession(object):
+    """A session of the pool, and how many times it has been used."""
+
+    def __init__(self, sess, key):
+        self.sess = sess
+        self.key = key
+        self.uses = 0
+
+
+class SessionPool(object):
+    """A pool of warm RPC sessions, which are requested from a tracker and reused.
+
+    Instead of closing a session after a job, :py:meth:`release` returns it to the pool,
+    and the next :py:meth:`acquire` of the same key reuses it, so the device stays held
+    without a new connection or a wait in the queue of the tracker.
+
+    The sessions are kept alive by leases. :py:meth:`acquire` renews the lease of a
+    session to session_timeout, the time limit of a job, and :py:meth:`release` renews
+    it to max_idle. When the lease of an idle session expires, the server ends the
+    session and reports the device to the tracker again, so an idle pool does not hold
+    the devices for longer than max_idle.
+
+    Parameters
+    ----------
+    tracker_addr : tuple
+        The address tuple of the tracker.
+
+    session_timeout : float, optional
+        The duration of a job in a session, allows server to kill the connection when
+        duration is longer than this value. When duration is zero, it means the job is
+        never killed.
+
+    max_idle : float, optional
+        The duration an idle session is kept in the pool.
+
+    max_uses : int, optional
+        The number of jobs run in a session before it is closed, to give the device
+        back to the tracker. When max_uses is zero, the sessions are reused until they
+        expire.
+
+    priority : int, optional
+        The priority of the requests to the tracker.
+
+    max_retry : int, optional
+        Maximum number of times to retry a request to the tracker before give up.
+
+    session_constructor_args : list, optional
+        List of additional arguments to passed as the remote session constructor.
+        See :py:func:`tvm.rpc.connect`.
+
+    user : str, optional
+        The user of the requests, see :py:meth:`TrackerSession.request`.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        pool = rpc.SessionPool((tracker_host, tracker_port), session_timeout=10)
+        for batch in batches:
+            with pool.session("rasp3b") as remote:
+                run(remote, batch)
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        tracker_addr,
+        session_timeout=60,
+        max_idle=60,
+        max_uses=0,
+        priority=1,
+        max_retry=5,
+        session_constructor_args=None,
+        user=None,
+    ):
+        self.tracker_addr = tracker_addr
+        self.session_timeout = session_timeout
+        self.max_idle = max_idle
+        self.max_uses = max_uses
+        self.priority = priority
+        self.max_retry = max_retry
+        self.session_constructor_args = session_constructor_args
+        self.user = user
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._busy = {}
+        # free tracker connections, one is used by each request at a time
+        self._trackers = []
+        self._closed = False
+        self.num_requested = 0
+        self.num_reused = 0
+
+    @contextlib.contextmanager
+    def _tracker(self):
+        with self._lock:
+            tracker = self._trackers.pop() if self._trackers else None
+        if tracker is None:
+            tracker = TrackerSession(self.tracker_addr)
+        try:
+            yield tracker
+        except (socket.error, IOError):
+            # reconnect on the next use
+            tracker.close()
+            raise
+        finally:
+            with self._lock:
+                self._trackers.append(tracker)
+
+    def _renew(self, entry, duration):
+        """Renew the lease of a session, return whether it is still alive."""
+        try:
+            if not entry.sess.renew_lease(duration):
+                # an older server, whose sessions end after the first session_timeout
+                return False
+        except TVMError:
+            return False
+        if entry.sess.lease_key is not None:
+            try:
+                with self._tracker() as tracker:
+                    tracker.renew(entry.sess.lease_key, duration)
+            except (socket.error, IOError):
+                # the lease in the tracker is only informative
+                pass
+        return True
+
+    def acquire(self, key, priority=None):
+        """Get a session of the key, reuse an idle one if possible.
+
+        Parameters
+        ----------
+        key : str
+            The type key of the device.
+
+        priority : int, optional
+            The priority of the request, the priority of the pool by default.
+
+        Returns
+        -------
+        sess : RPCSession
+            The session, which must be given back by release.
+        """
+        if self._closed:
+            raise RuntimeError("The session pool is closed")
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                # the most recently used session is the least likely to have expired
+                entry = idle.pop() if idle else None
+            if entry is None:
+                break
+            if self._renew(entry, self.session_timeout):
+                with self._lock:
+                    self.num_reused += 1
+                    self._busy[id(entry.sess)] = entry
+                return entry.sess
+        with self._tracker() as tracker:
+            sess = tracker.request(
+                key,
+                priority=self.priority if priority is None else priority,
+                session_timeout=self.session_timeout,
+                max_retry=self.max_retry,
+                session_constructor_args=self.session_constructor_args,
+                user=self.user,
+            )
+        with self._lock:
+            self.num_requested += 1
+            self._busy[id(sess)] = _PooledSession(sess, key)
+        return sess
+
+    def release(self, sess, discard=False):
+        """Give back a session, which is kept in the pool unless it is used up.
+
+        Parameters
+        ----------
+        sess : RPCSession
+            The session returned by acquire.
+
+        discard : bool, optional
+            Whether to close the session, e.g. when the job failed and left the
+            session in an unknown state.
+        """
+        with self._lock:
+            entry = self._busy.pop(id(sess), None)
+        if entry is None:
+            raise ValueError("The session is not acquired from this pool")
+        entry.uses += 1
+        if (
+            discard
+            or self._closed
+            or (self.max_uses and entry.uses >= self.max_uses)
+            or not self._renew(entry, self.max_idle)
+        ):
+            # dropping the last reference closes the connection
+            return
+        with self._lock:
+            self._idle.setdefault(entry.key, []).append(entry)
+
+    @contextlib.contextmanager
+    def session(self, key, priority=None):
+        """Acquire a session of the key for the scope of the with statement.
+
+        The session is discarded if the body raises an exception.
+
+        Parameters
+        ----------
+        key : str
+            The type key of the device.
+
+        priority : int, optional
+            The priority of the request, the priority of the pool by default.
+        """
+        sess = self.acquire(key, priority)
+        try:
+            yield sess
+        except BaseException:
+            self.release(sess, discard=True)
+            raise
+        self.release(sess)
+
+    def summary(self):
+        """Get the summary dict of the pool."""
+        with self._lock:
+            keys = set(self._idle) | set(entry.key for entry in self._busy.values())
+            return {
+                "queue_info": {
+                    key: {
+                        "idle": len(self._idle.get(key, [])),
+                        "busy": sum(entry.key == key for entry in self._busy.values()),
+                    }
+                    for key in keys
+                },
+                "num_requested": self.num_requested,
+                "num_reused": self.num_reused,
+            }
+
+    def close(self):
+        """Close the idle sessions, and the busy ones when they are released."""
+        with self._lock:
+            self._closed = True
+            self._idle = {}
+            trackers, self._trackers = self._trackers, []
+        for tracker in trackers:
+            tracker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
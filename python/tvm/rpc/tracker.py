@@ -20,7 +20,7 @@ This folder implements the tracker server logic.
 
 Note
 ----
-Tracker is a TCP based rest api with the following protocol:
+Tracker is a TCP based rest api served by an asyncio event loop, with the following protocol:
 - Initial handshake to the peer
   - RPC_TRACKER_MAGIC
 - Normal message: [size(int32), json-data]
@@ -36,31 +36,33 @@ List of available APIs:
   - return: TrackerCode.SUCCESS
   - note: match-key is a randomly generated identify the resource during connection.
 - REQUEST: request a new resource from tracker
-  - input: [TrackerCode.REQUEST, [key, user, priority]]
+  - input: [TrackerCode.REQUEST, [key, user, priority, lease]]
   - return: [TrackerCode.SUCCESS, [url, port, match-key]]
+  - note: the resource is leased to the user for lease seconds, or until the server
+    reports it again if lease is omitted or zero. The requests are served by the
+    scheduling policy of the tracker, see SCHEDULERS.
+- RENEW: renew the lease of a requested resource
+  - input: [TrackerCode.RENEW, match-key, lease]
+  - return: TrackerCode.SUCCESS, or TrackerCode.FAIL if the resource is not leased.
 """
 # pylint: disable=invalid-name
 
 import asyncio
+import collections
 import heapq
 import logging
+import math
 import socket
 import threading
 import errno
 import struct
 import json
 import sys
+import time
 from tvm.contrib.popen_pool import PopenWorker
 
-try:
-    from tornado import ioloop
-    from . import tornado_util
-except ImportError as error_msg:
-    raise ImportError(
-        f"RPCTracker module requires tornado package {error_msg}. Try 'pip install tornado'."
-    )
-
 from .._ffi.base import py_str
+from . import asyncio_util
 from . import base
 from .base import RPC_TRACKER_MAGIC, TrackerCode
 
@@ -117,11 +119,52 @@ class Scheduler(object):
             The resource to remove
         """
 
+    def release(self, matchkey):
+        """Notify that a resource handed out by request is reported again.
+
+        Parameters
+        ----------
+        matchkey: str
+            The match-key of the resource
+        """
+
     def summary(self):
         """Get summary information of the scheduler."""
         raise NotImplementedError()
 
 
+class _QueueMetrics(object):
+    """Queue latency and utilization metrics of a scheduler."""
+
+    def __init__(self, window=1000):
+        # wait time of the recently served requests
+        self._waits = collections.deque(maxlen=window)
+        self._last = time.time()
+        self._leased_time = 0.0
+        self._total_time = 0.0
+        self.num_served = 0
+
+    def advance(self, now, num_free, num_leased):
+        """Account the time since the last change of the number of resources."""
+        duration = now - self._last
+        self._leased_time += duration * num_leased
+        self._total_time += duration * (num_free + num_leased)
+        self._last = now
+
+    def served(self, wait):
+        self._waits.append(wait)
+        self.num_served += 1
+
+    def summary(self):
+        waits = sorted(self._waits)
+        return {
+            "served": self.num_served,
+            "wait_mean": sum(waits) / len(waits) if waits else 0.0,
+            "wait_p95": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+            "utilization": self._leased_time / self._total_time if self._total_time else 0.0,
+        }
+
+
 class PriorityScheduler(Scheduler):
     """Priority based scheduler, FIFO based on request order"""
 
@@ -129,40 +172,177 @@ class PriorityScheduler(Scheduler):
         self._key = key
         self._request_cnt = 0
         self._lock = threading.Lock()
-        self._values = []
+        # the free resources in FIFO order
+        self._values = collections.OrderedDict()
+        # heap of (-priority, request order, request time, user, callback)
         self._requests = []
+        # match-key -> user of the resources handed out
+        self._leases = {}
+        self._metrics = _QueueMetrics()
+
+    def _advance(self):
+        now = time.time()
+        self._metrics.advance(now, len(self._values), len(self._leases))
+        return now
+
+    def _pop_request(self):
+        """Pop the next request to serve, None if no pending request can be served."""
+        return heapq.heappop(self._requests)
+
+    def _on_lease(self, user, matchkey):
+        self._leases[matchkey] = user
 
     def _schedule(self):
         while self._requests and self._values:
-            value = self._values.pop(0)
-            item = heapq.heappop(self._requests)
-            callback = item[-1]
+            now = self._advance()
+            item = self._pop_request()
+            if item is None:
+                break
+            value, _ = self._values.popitem(last=False)
+            _, _, tstart, user, callback = item
             if callback(value[1:]):
                 value[0].pending_matchkeys.remove(value[-1])
+                self._on_lease(user, value[-1])
+                self._metrics.served(now - tstart)
             else:
-                self._values.append(value)
+                self._values[value] = None
 
     def put(self, value):
-        self._values.append(value)
+        self._advance()
+        self._values[value] = None
         self._schedule()
 
     def request(self, user, priority, callback):
         with self._lock:
-            heapq.heappush(self._requests, (-priority, self._request_cnt, callback))
+            heapq.heappush(
+                self._requests, (-priority, self._request_cnt, time.time(), user, callback)
+            )
             self._request_cnt += 1
         self._schedule()
 
     def remove(self, value):
         if value in self._values:
-            self._values.remove(value)
+            self._advance()
+            del self._values[value]
+            self._schedule()
+
+    def release(self, matchkey):
+        if matchkey in self._leases:
+            self._advance()
+            del self._leases[matchkey]
             self._schedule()
 
     def summary(self):
         """Get summary information of the scheduler."""
-        return {"free": len(self._values), "pending": len(self._requests)}
+        now = self._advance()
+        users = {}
+        for user in self._leases.values():
+            users.setdefault(user, {"leased": 0, "pending": 0})["leased"] += 1
+        for item in self._requests:
+            users.setdefault(item[3], {"leased": 0, "pending": 0})["pending"] += 1
+        res = {
+            "free": len(self._values),
+            "pending": len(self._requests),
+            "leased": len(self._leases),
+            "wait_max": max((now - item[2] for item in self._requests), default=0.0),
+            "users": users,
+        }
+        res.update(self._metrics.summary())
+        return res
+
+
+class FairShareScheduler(PriorityScheduler):
+    """Weighted fair-share scheduler among the users.
+
+    A request of higher priority is served first, where the priority of a request
+    increases by one every 1 / aging seconds it waits. Among the requests of the same priority,
+    the user with the least share is served first, then FIFO. The share of a user is
+
+        (number of leased resources + recent usage) / weight
+
+    where the recent usage is the number of resources the user has leased, averaged
+    by an exponential decay of decay seconds.
+
+    Parameters
+    ----------
+    key : str
+        The type key of the device.
+
+    weights : dict of str to float, optional
+        The weight of each user, 1 by default.
+
+    max_leases_per_user : int, optional
+        The maximum number of resources leased to a user at the same time, no limit if 0.
+
+    aging : float, optional
+        The priority added to a request per second it waits, in whole steps.
+
+    decay : float, optional
+        The time constant in seconds of the decay of the recent usage. If infinite, the recent
+        usage stays zero, so that the share only counts the leased resources.
+    """
+
+    def __init__(self, key, weights=None, max_leases_per_user=0, aging=0.0, decay=600.0):
+        super(FairShareScheduler, self).__init__(key)
+        self._weights = weights or {}
+        self._max_leases_per_user = max_leases_per_user
+        self._aging = aging
+        self._decay = decay
+        # user -> number of leased resources
+        self._user_leases = {}
+        # user -> [recent usage, last update time]
+        self._usage = {}
+
+    def _update_usage(self, user, now):
+        usage = self._usage.setdefault(user, [0.0, now])
+        factor = math.exp(-(now - usage[1]) / self._decay)
+        usage[0] = usage[0] * factor + self._user_leases.get(user, 0) * (1 - factor)
+        usage[1] = now
+        return usage[0]
+
+    def _share(self, user, now):
+        leased = self._user_leases.get(user, 0)
+        return (leased + self._update_usage(user, now)) / self._weights.get(user, 1.0)
+
+    def _pop_request(self):
+        # the requests are kept as a plain list, ordered by the key below
+        now = time.time()
+        best, best_key = None, None
+        for i, (neg_priority, cnt, tstart, user, _) in enumerate(self._requests):
+            if 0 < self._max_leases_per_user <= self._user_leases.get(user, 0):
+                continue
+            # the aged priority is quantized, so that the share orders requests of similar age
+            priority = -neg_priority + int(self._aging * (now - tstart))
+            key = (-priority, self._share(user, now), cnt)
+            if best_key is None or key < best_key:
+                best, best_key = i, key
+        return None if best is None else self._requests.pop(best)
+
+    def _on_lease(self, user, matchkey):
+        self._update_usage(user, time.time())
+        self._user_leases[user] = self._user_leases.get(user, 0) + 1
+        super(FairShareScheduler, self)._on_lease(user, matchkey)
+
+    def release(self, matchkey):
+        user = self._leases.get(matchkey)
+        if user is not None:
+            self._update_usage(user, time.time())
+            self._user_leases[user] -= 1
+        super(FairShareScheduler, self).release(matchkey)
+
+    def summary(self):
+        res = super(FairShareScheduler, self).summary()
+        now = time.time()
+        for user, info in res["users"].items():
+            info["share"] = self._share(user, now)
+        return res
 
 
-class TCPEventHandler(tornado_util.TCPHandler):
+# The scheduling policies of the tracker
+SCHEDULERS = {"priority": PriorityScheduler, "fair": FairShareScheduler}
+
+
+class TCPEventHandler(asyncio_util.TCPHandler):
     """Base asynchronize message handler.
 
     The tracker and client follows a simple message protocol.
@@ -170,18 +350,25 @@ class TCPEventHandler(tornado_util.TCPHandler):
     All the information is packed in json-str
     """
 
-    def __init__(self, tracker, sock, addr):
-        super(TCPEventHandler, self).__init__(sock)
+    def __init__(self, tracker):
+        super(TCPEventHandler, self).__init__()
         self._data = bytearray()
         self._tracker = tracker
         self._msg_size = 0
-        self._addr = addr
+        self._addr = None
         self._init_req_nbytes = 4
         self._info = {}
         # list of pending match keys that has not been used.
         self.pending_matchkeys = set()
+        # match-key -> the resources put by this connection that are not handed out yet
+        self.put_values = {}
+        # match-keys of the resources of this connection that are leased
+        self.leased_matchkeys = set()
+
+    def connection_made(self, transport):
+        super(TCPEventHandler, self).connection_made(transport)
+        self._addr = self.addr
         self._tracker._connections.add(self)
-        self.put_values = []
 
     def name(self):
         """name of connection"""
@@ -193,13 +380,11 @@ class TCPEventHandler(tornado_util.TCPHandler):
 
     def _init_conn(self, message):
         """Initialize the connection"""
-        if len(message) != 4:
-            logger.warning("Invalid connection from %s", self.name())
-            self.close()
         magic = struct.unpack("<i", message)[0]
         if magic != RPC_TRACKER_MAGIC:
             logger.warning("Invalid magic from %s", self.name())
             self.close()
+            return
         self.write_message(struct.pack("<i", RPC_TRACKER_MAGIC), binary=True)
         self._init_req_nbytes = 0
 
@@ -212,13 +397,14 @@ class TCPEventHandler(tornado_util.TCPHandler):
             The bytes received
         """
         assert isinstance(message, bytes)
-        if self._init_req_nbytes:
-            self._init_conn(message)
-            return
-
         self._data += message
+        if self._init_req_nbytes:
+            if len(self._data) < self._init_req_nbytes:
+                return
+            self._init_conn(bytes(self._data[:4]))
+            del self._data[:4]
 
-        while True:
+        while not self.closed:
             if self._msg_size == 0:
                 if len(self._data) >= 4:
                     self._msg_size = struct.unpack("<i", self._data[:4])[0]
@@ -228,16 +414,18 @@ class TCPEventHandler(tornado_util.TCPHandler):
                 msg = py_str(bytes(self._data[4 : 4 + self._msg_size]))
                 del self._data[: 4 + self._msg_size]
                 self._msg_size = 0
-                # pylint: disable=broad-except
-                self.call_handler(json.loads(msg))
+                try:
+                    self.call_handler(json.loads(msg))
+                except Exception as err:  # pylint: disable=broad-except
+                    logger.warning("%s: Invalid request %s: %s", self.name(), msg, err)
+                    self.close()
             else:
                 return
 
     def ret_value(self, data):
         """return value to the output"""
-        data = json.dumps(data)
-        self.write_message(struct.pack("<i", len(data)), binary=True)
-        self.write_message(data.encode("utf-8"), binary=True)
+        data = json.dumps(data).encode("utf-8")
+        self.write_message(struct.pack("<i", len(data)) + data, binary=True)
 
     def call_handler(self, args):
         """Event handler when json request arrives."""
@@ -251,22 +439,24 @@ class TCPEventHandler(tornado_util.TCPHandler):
                 value = (self, args[3], port, matchkey)
             else:
                 value = (self, self._addr[0], port, matchkey)
+            self.put_values[matchkey] = value
             self._tracker.put(key, value)
-            self.put_values.append(value)
             self.ret_value(TrackerCode.SUCCESS)
         elif code == TrackerCode.REQUEST:
             key = args[1]
             user = args[2]
             priority = args[3]
+            lease = args[4] if len(args) >= 5 else 0
 
             def _cb(value):
                 # if the connection is already closed
-                if not self._sock:
+                if self.closed:
                     return False
                 try:
                     self.ret_value([TrackerCode.SUCCESS, value])
                 except (socket.error, IOError):
                     return False
+                self._tracker.lease(key, user, value, lease)
                 return True
 
             self._tracker.request(key, user, priority, _cb)
@@ -274,6 +464,11 @@ class TCPEventHandler(tornado_util.TCPHandler):
             self.ret_value(TrackerCode.SUCCESS)
         elif code == TrackerCode.GET_PENDING_MATCHKEYS:
             self.ret_value(list(self.pending_matchkeys))
+        elif code == TrackerCode.RENEW:
+            if self._tracker.renew(args[1], args[2]):
+                self.ret_value(TrackerCode.SUCCESS)
+            else:
+                self.ret_value(TrackerCode.FAIL)
         elif code == TrackerCode.STOP:
             # safe stop tracker
             if self._tracker._stop_key == args[1]:
@@ -306,34 +501,29 @@ class TCPEventHandler(tornado_util.TCPHandler):
 class TrackerServerHandler(object):
     """Tracker that tracks the resources."""
 
-    def __init__(self, sock, stop_key):
+    def __init__(self, sock, stop_key, scheduler="priority", scheduler_args=None):
         self._scheduler_map = {}
+        self._scheduler = SCHEDULERS[scheduler]
+        self._scheduler_args = scheduler_args or {}
         self._sock = sock
-        self._sock.setblocking(0)
-        self._ioloop = ioloop.IOLoop.current()
+        self._loop = asyncio.get_event_loop()
+        self._server = None
         self._stop_key = stop_key
         self._connections = set()
-
-        def _event_handler(_, events):
-            self._on_event(events)
-
-        self._ioloop.add_handler(self._sock.fileno(), _event_handler, self._ioloop.READ)
-
-    def _on_event(self, _):
-        while True:
-            try:
-                conn, addr = self._sock.accept()
-                TCPEventHandler(self, conn, addr)
-            except socket.error as err:
-                if err.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK):
-                    break
+        # match-key -> lease of the resources handed out to the users
+        self._leases = {}
+        # match-key -> connection of the resources not handed out yet
+        self._put_conns = {}
 
     def create_scheduler(self, key):
         """Create a new scheduler."""
-        return PriorityScheduler(key)
+        return self._scheduler(key, **self._scheduler_args)
 
     def put(self, key, value):
         """Report a new resource to the tracker."""
+        # the server reports again when its session ends, which ends the lease on it
+        self._end_leases(value[0])
+        self._put_conns[value[-1]] = value[0]
         if key not in self._scheduler_map:
             self._scheduler_map[key] = self.create_scheduler(key)
         self._scheduler_map[key].put(value)
@@ -344,42 +534,101 @@ class TrackerServerHandler(object):
             self._scheduler_map[key] = self.create_scheduler(key)
         self._scheduler_map[key].request(user, priority, callback)
 
+    def lease(self, key, user, value, duration):
+        """Record the lease of a resource handed out to a user."""
+        matchkey = value[-1]
+        conn = self._put_conns.pop(matchkey, None)
+        if conn is not None:
+            conn.put_values.pop(matchkey, None)
+            conn.leased_matchkeys.add(matchkey)
+        self._leases[matchkey] = {
+            "key": key,
+            "conn": conn,
+            "addr": value[:2],
+            "user": user,
+            "expire": time.time() + duration if duration else None,
+        }
+
+    def renew(self, matchkey, duration):
+        """Renew the lease of a resource, return whether it is leased."""
+        lease = self._leases.get(matchkey)
+        if lease is None:
+            return False
+        lease["expire"] = time.time() + duration if duration else None
+        return True
+
+    def _end_lease(self, matchkey):
+        lease = self._leases.pop(matchkey, None)
+        if lease is not None:
+            if lease["conn"] is not None:
+                lease["conn"].leased_matchkeys.discard(matchkey)
+            self._scheduler_map[lease["key"]].release(matchkey)
+
+    def _end_leases(self, conn):
+        for matchkey in list(conn.leased_matchkeys):
+            self._end_lease(matchkey)
+
     def close(self, conn):
-        self._connections.remove(conn)
+        self._connections.discard(conn)
+        self._end_leases(conn)
         if "key" in conn._info:
-            for value in conn.put_values:
+            for value in conn.put_values.values():
                 _, _, _, key = value
                 rpc_key, _ = base.split_random_key(key)
                 self._scheduler_map[rpc_key].remove(value)
+        for matchkey in conn.put_values:
+            self._put_conns.pop(matchkey, None)
+        conn.put_values.clear()
 
     def stop(self):
         """Safely stop tracker."""
         for conn in list(self._connections):
             conn.close()
-        self._sock.close()
-        self._ioloop.stop()
+        self._server.close()
+        self._loop.stop()
 
     def summary(self):
         """Return a dict summarizing current status."""
-        qinfo = {}
-        for k, v in self._scheduler_map.items():
-            qinfo[k] = v.summary()
         cinfo = []
         # ignore client connections without key
         for conn in self._connections:
             res = conn.summary()
             if res.get("key", "").startswith("server"):
                 cinfo.append(res)
-        return {"queue_info": qinfo, "server_info": cinfo}
+        now = time.time()
+        linfo = []
+        for matchkey, lease in list(self._leases.items()):
+            if lease["expire"] is not None and lease["expire"] < now:
+                # the server has ended the session by itself
+                self._end_lease(matchkey)
+                continue
+            expire_in = None if lease["expire"] is None else lease["expire"] - now
+            linfo.append(
+                {
+                    "key": lease["key"],
+                    "addr": lease["addr"],
+                    "user": lease["user"],
+                    "expire_in": expire_in,
+                }
+            )
+        qinfo = {}
+        for k, v in self._scheduler_map.items():
+            qinfo[k] = v.summary()
+        return {"queue_info": qinfo, "server_info": cinfo, "lease_info": linfo}
 
     def run(self):
         """Run the tracker server"""
-        self._ioloop.start()
+        self._server = self._loop.run_until_complete(
+            self._loop.create_server(
+                lambda: TCPEventHandler(self), sock=self._sock, backlog=socket.SOMAXCONN
+            )
+        )
+        self._loop.run_forever()
 
 
-def _tracker_server(listen_sock, stop_key):
+def _tracker_server(listen_sock, stop_key, scheduler, scheduler_args):
     asyncio.set_event_loop(asyncio.new_event_loop())
-    handler = TrackerServerHandler(listen_sock, stop_key)
+    handler = TrackerServerHandler(listen_sock, stop_key, scheduler, scheduler_args)
     handler.run()
 
 
@@ -388,7 +637,17 @@ class PopenTrackerServerState(object):
 
     current = None
 
-    def __init__(self, host, port=9190, port_end=9199, silent=False, reuse_addr=True, timeout=None):
+    def __init__(
+        self,
+        host,
+        port=9190,
+        port_end=9199,
+        silent=False,
+        reuse_addr=True,
+        timeout=None,
+        scheduler="priority",
+        scheduler_args=None,
+    ):
         if silent:
             logger.setLevel(logging.WARN)
 
@@ -417,18 +676,29 @@ class PopenTrackerServerState(object):
             raise ValueError(f"cannot bind to any port in [{port}, {port_end})")
         logger.info("bind to %s:%d", host, self.port)
         sock.listen(1)
-        self.thread = threading.Thread(target=_tracker_server, args=(sock, self.stop_key))
+        self.thread = threading.Thread(
+            target=_tracker_server, args=(sock, self.stop_key, scheduler, scheduler_args)
+        )
         self.thread.start()
         self.host = host
 
 
 def _popen_start_tracker_server(
-    host, port=9190, port_end=9199, silent=False, reuse_addr=True, timeout=None
+    host,
+    port=9190,
+    port_end=9199,
+    silent=False,
+    reuse_addr=True,
+    timeout=None,
+    scheduler="priority",
+    scheduler_args=None,
 ):
     # This is a function that will be sent to the
     # Popen worker to run on a separate process.
     # Create and start the server in a different thread
-    state = PopenTrackerServerState(host, port, port_end, silent, reuse_addr, timeout)
+    state = PopenTrackerServerState(
+        host, port, port_end, silent, reuse_addr, timeout, scheduler, scheduler_args
+    )
     PopenTrackerServerState.current = state
     # returns the port so that the main can get the port number.
     return (state.port, state.stop_key)
@@ -459,17 +729,35 @@ class Tracker(object):
     timeout: float, optional
          set a timeout for all operations on the socket
 
+    scheduler: str, optional
+        The scheduling policy of the requests, a key of SCHEDULERS:
+        "priority" serves by priority then FIFO, and "fair" shares the
+        devices among the users, see FairShareScheduler.
+
+    scheduler_args: dict, optional
+        The keyword arguments to create the scheduler of each device key.
     """
 
     def __init__(
-        self, host="0.0.0.0", port=9190, port_end=9199, silent=False, reuse_addr=True, timeout=None
+        self,
+        host="0.0.0.0",
+        port=9190,
+        port_end=9199,
+        silent=False,
+        reuse_addr=True,
+        timeout=None,
+        scheduler="priority",
+        scheduler_args=None,
     ):
         if silent:
             logger.setLevel(logging.WARN)
+        if scheduler not in SCHEDULERS:
+            raise ValueError(f"Unknown scheduler {scheduler}, expect one of {list(SCHEDULERS)}")
         self.proc = PopenWorker()
         # send the function
         self.proc.send(
-            _popen_start_tracker_server, [host, port, port_end, silent, reuse_addr, timeout]
+            _popen_start_tracker_server,
+            [host, port, port_end, silent, reuse_addr, timeout, scheduler, scheduler_args],
         )
         # receive the port
         self.port, self.stop_key = self.proc.recv()
@@ -322,6 +322,9 @@ TVM_REGISTER_GLOBAL("meta_schedule.DatabaseQueryIRModule")
     .set_body_method<Database>(&DatabaseNode::QueryIRModule);
 TVM_REGISTER_GLOBAL("meta_schedule.DatabaseDumpPruned")
     .set_body_method<Database>(&DatabaseNode::DumpPruned);
+TVM_REGISTER_GLOBAL("meta_schedule.DatabaseModuleEquality").set_body_typed([](Database db) {
+  return db->GetModuleEquality().GetName();
+});
 TVM_REGISTER_GLOBAL("meta_schedule.DatabasePyDatabase").set_body_typed(Database::PyDatabase);
 
 }  // namespace meta_schedule
@@ -1390,10 +1390,16 @@ class PerStoreFeatureNode : public FeatureExtractorNode {
     }
   }
 
-  Array<runtime::NDArray> ExtractFrom(const TuneContext& tune_context,
-                                      const Array<MeasureCandidate>& candidates) {
+  /*!
+   * \brief Extract the feature rows of each candidate in parallel.
+   * \param tune_context The tuning context.
+   * \param candidates The measure candidates.
+   * \return The feature rows of each candidate.
+   */
+  std::vector<std::vector<std::vector<double>>> ExtractRows(
+      const TuneContext& tune_context, const Array<MeasureCandidate>& candidates) {
     bool is_gpu = tune_context->target.value()->kind->name == "cuda";
-    std::vector<runtime::NDArray> results;
+    std::vector<std::vector<std::vector<double>>> results;
     results.resize(candidates.size());
     std::unique_ptr<tir::group6::Feature> feature_group6 = nullptr;
     if (extract_workload) {
@@ -1401,19 +1407,68 @@ class PerStoreFeatureNode : public FeatureExtractorNode {
     }
     auto f = [this, is_gpu, &feature_group6, &candidates, &results](int, int task_id) -> void {
       const auto& candidate = candidates[task_id];
-      std::vector<std::vector<double>> features;
+      std::vector<std::vector<double>>& features = results[task_id];
       ExtractSingle(DeepCopyIRModule(candidate->sch->mod()), is_gpu, &features);
       if (extract_workload) {
         for (auto& feature : features) {
           feature_group6->Export(&feature);
         }
       }
-      results[task_id] = tir::utils::AsNDArray(features, this->feature_vector_length);
     };
     support::parallel_for_dynamic(0, candidates.size(), tune_context->num_threads, f);
     return results;
   }
 
+  Array<runtime::NDArray> ExtractFrom(const TuneContext& tune_context,
+                                      const Array<MeasureCandidate>& candidates) {
+    std::vector<std::vector<std::vector<double>>> features =
+        ExtractRows(tune_context, candidates);
+    Array<runtime::NDArray> results;
+    results.reserve(features.size());
+    for (const std::vector<std::vector<double>>& rows : features) {
+      results.push_back(tir::utils::AsNDArray(rows, this->feature_vector_length));
+    }
+    return results;
+  }
+
+  /*!
+   * \brief Extract the features of all the candidates into one contiguous buffer.
+   * \param tune_context The tuning context.
+   * \param candidates The measure candidates.
+   * \return A float32 array of shape [n, feature_vector_length] of all the feature rows, and an
+   * int64 array of shape [len(candidates) + 1] of the offsets, where the rows of the i-th
+   * candidate are rows offsets[i] to offsets[i + 1].
+   */
+  Array<runtime::NDArray> ExtractBatched(const TuneContext& tune_context,
+                                         const Array<MeasureCandidate>& candidates) {
+    std::vector<std::vector<std::vector<double>>> features =
+        ExtractRows(tune_context, candidates);
+    int64_t n = features.size();
+    runtime::NDArray offsets = runtime::NDArray::Empty(
+        /*shape=*/{n + 1},
+        /*dtype=*/DLDataType{kDLInt, 64, 1},
+        /*ctx=*/DLDevice{kDLCPU, 0});
+    int64_t* offsets_data = static_cast<int64_t*>(offsets->data);
+    offsets_data[0] = 0;
+    for (int64_t i = 0; i < n; ++i) {
+      offsets_data[i + 1] = offsets_data[i] + static_cast<int64_t>(features[i].size());
+    }
+    runtime::NDArray data = runtime::NDArray::Empty(
+        /*shape=*/{offsets_data[n], this->feature_vector_length},
+        /*dtype=*/DLDataType{kDLFloat, 32, 1},
+        /*ctx=*/DLDevice{kDLCPU, 0});
+    float* ptr = static_cast<float*>(data->data);
+    for (const std::vector<std::vector<double>>& rows : features) {
+      for (const std::vector<double>& row : rows) {
+        ICHECK_EQ(static_cast<int>(row.size()), this->feature_vector_length);
+        for (double v : row) {
+          *ptr++ = static_cast<float>(v);
+        }
+      }
+    }
+    return {data, offsets};
+  }
+
   static constexpr const char* _type_key = "meta_schedule.PerStoreFeature";
   TVM_DECLARE_FINAL_OBJECT_INFO(PerStoreFeatureNode, FeatureExtractorNode);
 };
@@ -1440,6 +1495,15 @@ FeatureExtractor FeatureExtractor::PerStoreFeature(int buffers_per_store,
 TVM_REGISTER_NODE_TYPE(PerStoreFeatureNode);
 TVM_REGISTER_GLOBAL("meta_schedule.FeatureExtractorPerStoreFeature")
     .set_body_typed(FeatureExtractor::PerStoreFeature);
+TVM_REGISTER_GLOBAL("meta_schedule.FeatureExtractorPerStoreFeatureExtractBatched")
+    .set_body_typed([](FeatureExtractor extractor, TuneContext tune_context,
+                       Array<MeasureCandidate> candidates) -> Array<runtime::NDArray> {
+      PerStoreFeatureNode* self = const_cast<PerStoreFeatureNode*>(
+          extractor.as<PerStoreFeatureNode>());
+      CHECK(self != nullptr) << "TypeError: Expect PerStoreFeature, but gets: "
+                             << extractor->GetTypeKey();
+      return self->ExtractBatched(tune_context, candidates);
+    });
 
 }  // namespace meta_schedule
 }  // namespace tvm
@@ -21,6 +21,7 @@
 #include <tvm/ir/module.h>
 #include <tvm/node/structural_equal.h>
 #include <tvm/node/structural_hash.h>
+#include <tvm/runtime/registry.h>
 #include <tvm/tir/analysis.h>
 
 #include <memory>
@@ -96,5 +97,14 @@ std::unique_ptr<ModuleEquality> ModuleEquality::Create(const std::string& mod_eq
   LOG(FATAL) << "Unknown module equality " << mod_eq_name;
 }
 
+TVM_REGISTER_GLOBAL("meta_schedule._ModuleEqualityHash")
+    .set_body_typed([](IRModule mod, String mod_eq_name) -> int64_t {
+      return static_cast<int64_t>(ModuleEquality::Create(mod_eq_name)->Hash(mod));
+    });
+TVM_REGISTER_GLOBAL("meta_schedule._ModuleEqualityEqual")
+    .set_body_typed([](IRModule lhs, IRModule rhs, String mod_eq_name) -> bool {
+      return ModuleEquality::Create(mod_eq_name)->Equal(lhs, rhs);
+    });
+
 }  // namespace meta_schedule
 }  // namespace tvm
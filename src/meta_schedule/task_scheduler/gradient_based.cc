@@ -135,9 +135,11 @@ class GradientBasedNode final : public TaskSchedulerNode {
 };
 
 TaskScheduler TaskScheduler::GradientBased(PackedFunc logger, double alpha, int window_size,
-                                           support::LinearCongruentialEngine::TRandState seed) {
+                                           support::LinearCongruentialEngine::TRandState seed,
+                                           int pipeline_chunk_size) {
   ObjectPtr<GradientBasedNode> n = make_object<GradientBasedNode>();
   n->logger = logger;
+  n->pipeline_chunk_size = pipeline_chunk_size;
   n->alpha = alpha;
   n->window_size = window_size;
   n->rand_state = support::LinearCongruentialEngine::NormalizeSeed(seed);
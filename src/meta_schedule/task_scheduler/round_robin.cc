@@ -55,9 +55,10 @@ class RoundRobinNode final : public TaskSchedulerNode {
   }
 };
 
-TaskScheduler TaskScheduler::RoundRobin(PackedFunc logger) {
+TaskScheduler TaskScheduler::RoundRobin(PackedFunc logger, int pipeline_chunk_size) {
   ObjectPtr<RoundRobinNode> n = make_object<RoundRobinNode>();
   n->logger = logger;
+  n->pipeline_chunk_size = pipeline_chunk_size;
   n->task_id = -1;
   return TaskScheduler(n);
 }
@@ -38,23 +38,21 @@ TaskRecord::TaskRecord(TuneContext ctx, double task_weight) {
   this->data_ = std::move(n);
 }
 
-void SendToBuilder(TaskRecordNode* self, const Builder& builder) {
+Array<BuilderResult> BuildCandidates(const Array<MeasureCandidate>& candidates,
+                                     const Target& target, const Builder& builder) {
   auto _ = Profiler::TimedScope("SendToBuilder");
-  Array<MeasureCandidate> candidates = self->measure_candidates.value();
-  Target target = self->ctx->target.value();
   Array<BuilderInput> inputs;
   inputs.reserve(candidates.size());
   for (const MeasureCandidate& candidate : candidates) {
     inputs.push_back(BuilderInput(candidate->sch->mod(), target));
   }
-  self->builder_results = builder->Build(inputs);
+  return builder->Build(inputs);
 }
 
-void SendToRunner(TaskRecordNode* self, const Runner& runner) {
+Array<RunnerFuture> RunCandidates(const Array<MeasureCandidate>& candidates,
+                                  const Array<BuilderResult>& builder_results,
+                                  const Target& target, const Runner& runner) {
   auto _ = Profiler::TimedScope("SendToRunner");
-  Array<MeasureCandidate> candidates = self->measure_candidates.value();
-  Array<BuilderResult> builder_results = self->builder_results.value();
-  Target target = self->ctx->target.value();
   ICHECK_EQ(candidates.size(), builder_results.size());
   int n = candidates.size();
   int n_build_errors = 0;
@@ -73,8 +71,7 @@ void SendToRunner(TaskRecordNode* self, const Runner& runner) {
   }
   Array<RunnerFuture> futures = runner->Run(inputs);
   if (n_build_errors == 0) {
-    self->runner_futures = futures;
-    return;
+    return futures;
   }
   Array<RunnerFuture> results;
   results.reserve(n);
@@ -91,7 +88,61 @@ void SendToRunner(TaskRecordNode* self, const Runner& runner) {
       results.push_back(futures[j++]);
     }
   }
-  self->runner_futures = results;
+  return results;
+}
+
+void SendToBuilder(TaskRecordNode* self, const Builder& builder) {
+  self->builder_results =
+      BuildCandidates(self->measure_candidates.value(), self->ctx->target.value(), builder);
+}
+
+void SendToRunner(TaskRecordNode* self, const Runner& runner) {
+  self->runner_futures = RunCandidates(self->measure_candidates.value(),
+                                       self->builder_results.value(), self->ctx->target.value(),
+                                       runner);
+}
+
+/*!
+ * \brief Build the candidates chunk by chunk, and send each chunk to the runner as soon as it is
+ * built, so that the earlier chunks are being measured while the later ones are being built.
+ */
+void StreamToRunner(TaskRecordNode* self, const Builder& builder, const Runner& runner,
+                    int chunk_size) {
+  Array<MeasureCandidate> candidates = self->measure_candidates.value();
+  Target target = self->ctx->target.value();
+  int n = candidates.size();
+  Array<BuilderResult> builder_results;
+  Array<RunnerFuture> runner_futures;
+  builder_results.reserve(n);
+  runner_futures.reserve(n);
+  for (int st = 0; st < n; st += chunk_size) {
+    int ed = std::min(st + chunk_size, n);
+    Array<MeasureCandidate> chunk(candidates.begin() + st, candidates.begin() + ed);
+    Array<BuilderResult> chunk_builder_results = BuildCandidates(chunk, target, builder);
+    Array<RunnerFuture> chunk_runner_futures =
+        RunCandidates(chunk, chunk_builder_results, target, runner);
+    builder_results.insert(builder_results.end(), chunk_builder_results.begin(),
+                           chunk_builder_results.end());
+    runner_futures.insert(runner_futures.end(), chunk_runner_futures.begin(),
+                          chunk_runner_futures.end());
+  }
+  self->builder_results = builder_results;
+  self->runner_futures = runner_futures;
+}
+
+/*! \brief Drop the prefetched batch of a task, and remove its build artifacts. */
+void DiscardPrefetched(TaskRecordNode* self) {
+  if (self->prefetched_builder_results.defined()) {
+    static const PackedFunc* f_rm = runtime::Registry::Get("meta_schedule.remove_build_dir");
+    ICHECK(f_rm != nullptr) << "The `remove_build_dir` func is not in tvm registry.";
+    for (const BuilderResult& builder_result : self->prefetched_builder_results.value()) {
+      if (Optional<String> path = builder_result->artifact_path) {
+        (*f_rm)(path.value());
+      }
+    }
+  }
+  self->prefetched_candidates = NullOpt;
+  self->prefetched_builder_results = NullOpt;
 }
 
 void TaskCleanUp(TaskRecordNode* self, int task_id, const Array<RunnerResult>& results) {
@@ -176,6 +227,7 @@ void TaskSchedulerNode::Tune(Array<TuneContext> ctxs, Array<FloatImm> task_weigh
   }
 
   int num_trials_already = 0;
+  bool pipelined = this->pipeline_chunk_size > 0;
   for (int task_id; num_trials_already < max_trials_global && (task_id = NextTaskId()) != -1;) {
     TVM_PY_LOG(INFO, this->logger)
         << "TaskScheduler picks Task #" << task_id << ": " << tasks_[task_id]->ctx->task_name;
@@ -186,16 +238,50 @@ void TaskSchedulerNode::Tune(Array<TuneContext> ctxs, Array<FloatImm> task_weigh
       TerminateTask(task_id);
       continue;
     }
-    if (Optional<Array<MeasureCandidate>> candidates = task->measure_candidates =
-            task->ctx->search_strategy.value()->GenerateMeasureCandidates()) {
-      int num_candidates = candidates.value().size();
+    if (task->prefetched_candidates.defined()) {
+      // The batch has been generated and built while the previous one was being measured
+      task->measure_candidates = task->prefetched_candidates;
+      task->builder_results = task->prefetched_builder_results;
+      task->prefetched_candidates = NullOpt;
+      task->prefetched_builder_results = NullOpt;
+      int num_candidates = task->measure_candidates.value().size();
       num_trials_already += num_candidates;
-      TVM_PY_LOG(INFO, this->logger) << "Sending " << num_candidates << " sample(s) to builder";
-      SendToBuilder(task, builder);
-      TVM_PY_LOG(INFO, this->logger) << "Sending " << num_candidates << " sample(s) to runner";
+      TVM_PY_LOG(INFO, this->logger)
+          << "Sending " << num_candidates << " prefetched sample(s) to runner";
       SendToRunner(task, runner);
+    } else if (Optional<Array<MeasureCandidate>> candidates = task->measure_candidates =
+                   task->ctx->search_strategy.value()->GenerateMeasureCandidates()) {
+      int num_candidates = candidates.value().size();
+      num_trials_already += num_candidates;
+      if (pipelined) {
+        TVM_PY_LOG(INFO, this->logger)
+            << "Streaming " << num_candidates << " sample(s) to builder and runner";
+        StreamToRunner(task, builder, runner, this->pipeline_chunk_size);
+      } else {
+        TVM_PY_LOG(INFO, this->logger) << "Sending " << num_candidates << " sample(s) to builder";
+        SendToBuilder(task, builder);
+        TVM_PY_LOG(INFO, this->logger) << "Sending " << num_candidates << " sample(s) to runner";
+        SendToRunner(task, runner);
+      }
     } else {
       TerminateTask(task_id);
+      continue;
+    }
+    int num_trials_in_flight = task->latency_ms.size() + task->measure_candidates.value().size();
+    if (pipelined && num_trials_already + num_trials_per_iter <= max_trials_global &&
+        num_trials_in_flight + num_trials_per_iter <= max_trials_per_task) {
+      // Generate and build the next batch while the current one is being measured. The next
+      // batch is generated before the cost model sees the results of the current one, and is
+      // only counted as trials when it is sent to the runner.
+      auto _ = Profiler::TimedScope("PrefetchNextBatch");
+      if (Optional<Array<MeasureCandidate>> candidates =
+              task->ctx->search_strategy.value()->GenerateMeasureCandidates()) {
+        TVM_PY_LOG(INFO, this->logger)
+            << "Prefetching " << candidates.value().size() << " sample(s) to builder";
+        task->prefetched_builder_results =
+            BuildCandidates(candidates.value(), task->ctx->target.value(), builder);
+        task->prefetched_candidates = candidates;
+      }
     }
   }
   for (int task_id = 0; task_id < n_tasks; ++task_id) {
@@ -254,6 +340,7 @@ void TaskSchedulerNode::TouchTask(int task_id) {
 void TaskSchedulerNode::TerminateTask(int task_id) {
   TaskRecordNode* task = this->tasks_[task_id].get();
   ICHECK(!task->is_terminated);
+  DiscardPrefetched(task);
   task->is_terminated = true;
   --this->remaining_tasks_;
   TVM_PY_LOG_CLEAR_SCREEN(this->logger);
@@ -19,6 +19,7 @@
 import json
 
 import multiprocessing
+import os
 import numpy as np
 import tvm
 from tvm import topi
@@ -203,6 +204,49 @@ def test_recover_measure_input():
         assert str(correct_inp.state) == str(inp.state)
 
 
+def test_indexed_record_store():
+    target = tvm.target.Target("llvm")
+    tasks = [
+        auto_scheduler.SearchTask(func=matmul_auto_scheduler_test, args=(n, n, n), target=target)
+        for n in [64, 128]
+    ]
+    inputs, results = [], []
+    for task, costs in zip(tasks, [[0.3, 0.1, 0.2], [0.5]]):
+        for cost in costs:
+            inputs.append(auto_scheduler.measure.MeasureInput(task, task.compute_dag.init_state))
+            results.append(auto_scheduler.measure.MeasureResult([cost], 0, "", 0.2, 1))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        log_file = os.path.join(tmpdir, "records.json")
+        store = auto_scheduler.IndexedRecordStore(log_file)
+        store.append(inputs[:4], results[:4])
+        assert os.path.isfile(log_file + ".index")
+
+        # The index is reused and agrees with scanning the log
+        store = auto_scheduler.IndexedRecordStore(log_file)
+        for task in tasks:
+            expected = auto_scheduler.load_best_record(log_file, task.workload_key, target)
+            inp, res = auto_scheduler.load_best_record(store, task.workload_key, target)
+            assert str(res) == str(expected[1])
+        assert auto_scheduler.load_best_record(store)[1].costs[0].value == 0.1
+
+        # Records appended by others are indexed on refresh
+        auto_scheduler.save_records(
+            log_file, [inputs[0]], [auto_scheduler.measure.MeasureResult([0.05], 0, "", 0.2, 1)]
+        )
+        _, res = auto_scheduler.load_best_record(store, tasks[0].workload_key, target)
+        assert res.costs[0].value == 0.05
+
+        dispatch_context = auto_scheduler.ApplyHistoryBest(store)
+        state = dispatch_context._query_inside(target, tasks[1].workload_key, None)
+        assert state is not None
+
+        best_file = os.path.join(tmpdir, "best.json")
+        auto_scheduler.measure_record.distill_record_file(log_file, best_file)
+        best = sorted(res.costs[0].value for _, res in auto_scheduler.load_records(best_file))
+        assert best == [0.05, 0.5]
+
+
 def test_workload_dis_factor():
     calc = auto_scheduler.utils.calc_workload_dis_factor
     decode = auto_scheduler.utils.decode_workload_key
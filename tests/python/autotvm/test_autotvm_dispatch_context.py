@@ -20,6 +20,8 @@ to the parameters of workload"""
 
 from tvm import autotvm
 import tvm
+from tvm.autotvm.measure import MeasureInput, MeasureResult
+from tvm.testing.autotvm import get_sample_task
 
 
 @autotvm.template("testing/dispatch_fallback")
@@ -47,5 +49,68 @@ def test_tophub_kinds_match():
     verify_arm_cpu("llvm -model=snapdragon835 -mtriple=arm64-linux-android -mattr=+neon")
 
 
+def test_tophub_local_package(tmpdir, monkeypatch):
+    tsk, target = get_sample_task()
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(3)]
+    results = [MeasureResult((cost,), 0, 0, 0) for cost in [2.0, 0.5, 1.0]]
+    log_file = str(tmpdir / "tuning.log")
+    with open(log_file, "w") as file:
+        autotvm.callback.log_to_file(file)(None, inputs, results)
+
+    package_dir = tmpdir / "tophub"
+    autotvm.tophub.build_package(log_file, package_dir, "llvm", version="v1.0")
+    monkeypatch.setenv(autotvm.tophub.AUTOTVM_TOPHUB_LOC_VAR, str(package_dir))
+
+    # The best records are served from the package without network access
+    best = autotvm.tophub.context(target).query(target, tsk.workload)
+    assert str(best) == str(tsk.config_space.get(1))
+
+    # The reference log falls back to the model with the most records
+    ref_log = autotvm.tophub.load_reference_log("llvm", "no-such-model", tsk.workload[0])
+    assert [str(inp.config) for inp, _ in ref_log] == [str(inp.config) for inp in inputs]
+    assert not autotvm.tophub.load_reference_log("llvm", "unknown", "no-such-workload")
+
+    # Mirrored into the TopHub root path, the backends the package does not cover fall back to
+    # the TopHub logs, which exist already
+    root_path = tmpdir / "root"
+    root_path.mkdir()
+    monkeypatch.setattr(autotvm.tophub, "AUTOTVM_TOPHUB_ROOT_PATH", str(root_path))
+    tophub_log = root_path / f"llvm_{autotvm.tophub.PACKAGE_VERSION['llvm']}.log"
+    tophub_log.write(open(log_file).read())
+    autotvm.tophub.build_package(log_file, str(root_path), "cuda")
+    for location in [str(root_path), "https://example.invalid/tophub"]:
+        monkeypatch.setenv(autotvm.tophub.AUTOTVM_TOPHUB_LOC_VAR, location)
+        best = autotvm.tophub.context(target).query(target, tsk.workload)
+        assert str(best) == str(tsk.config_space.get(1))
+
+    # The package files do not overwrite the TopHub logs
+    tophub_log.write("")
+    autotvm.tophub.build_package(log_file, str(root_path), "llvm")
+    assert tophub_log.read() == ""
+    assert (root_path / "llvm" / autotvm.tophub.PACKAGE_VERSION["llvm"]).isdir()
+
+
+def test_tophub_file_mirror(tmpdir, monkeypatch):
+    tsk, target = get_sample_task()
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(3)]
+    results = [MeasureResult((cost,), 0, 0, 0) for cost in [2.0, 0.5, 1.0]]
+
+    # A plain mirror of the TopHub logs, without a package manifest
+    mirror = tmpdir / "mirror"
+    mirror.mkdir()
+    with open(mirror / f"llvm_{autotvm.tophub.PACKAGE_VERSION['llvm']}.log", "w") as file:
+        autotvm.callback.log_to_file(file)(None, inputs, results)
+    root_path = tmpdir / "root"
+    monkeypatch.setattr(autotvm.tophub, "AUTOTVM_TOPHUB_ROOT_PATH", str(root_path))
+    monkeypatch.setattr(autotvm.tophub, "REFERENCE_LOG_CACHE", {})
+    monkeypatch.setenv(autotvm.tophub.AUTOTVM_TOPHUB_LOC_VAR, "file://" + str(mirror))
+
+    # The logs are downloaded from the mirror
+    best = autotvm.tophub.context(target).query(target, tsk.workload)
+    assert str(best) == str(tsk.config_space.get(1))
+    ref_log = autotvm.tophub.load_reference_log("llvm", "no-such-model", tsk.workload[0])
+    assert [str(inp.config) for inp, _ in ref_log] == [str(inp.config) for inp in inputs]
+
+
 if __name__ == "__main__":
     test_fallback()
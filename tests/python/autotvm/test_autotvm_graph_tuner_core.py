@@ -31,7 +31,8 @@ from tvm import autotvm
 from tvm import relay
 from tvm.autotvm.task import ConfigEntity
 from tvm.autotvm.measure import MeasureResult, MeasureInput
-from tvm.autotvm.graph_tuner import DPTuner, PBQPTuner
+from tvm.autotvm.graph_tuner import DPTuner, LocalSearchTuner, PBQPTuner
+from tvm.autotvm.graph_tuner import base_graph_tuner
 
 
 def _create_args(dshape, kshape, strides, padding, dilation, layout, out_layout, dtype, out_dtype):
@@ -148,6 +149,49 @@ def _create_data(target, dshape, dtype, layout):
     return net, records, ltf_records, ltf_keys, tasks
 
 
+def _append_alternative_records(target, records, tasks):
+    """Append another config of each task to the records"""
+    costs = [0.02, 0.02, 0.045]
+    config_list = []
+    cfg_dict = {
+        "index": -1,
+        "code_hash": None,
+        "entity": [
+            ["tile_ic", "sp", [1, 3]],
+            ["tile_oc", "sp", [2, 8]],
+            ["tile_ow", "sp", [4, 2]],
+            ["unroll_kw", "ot", True],
+        ],
+    }
+    config_list.append(ConfigEntity.from_json_dict(cfg_dict))
+    cfg_dict = {
+        "index": -1,
+        "code_hash": None,
+        "entity": [
+            ["tile_ic", "sp", [4, 4]],
+            ["tile_oc", "sp", [2, 16]],
+            ["tile_oh", "ot", 1],
+            ["tile_ow", "sp", [4, 2]],
+        ],
+    }
+    config_list.append(ConfigEntity.from_json_dict(cfg_dict))
+    cfg_dict = {
+        "index": -1,
+        "code_hash": None,
+        "entity": [
+            ["tile_ic", "sp", [16, 2]],
+            ["tile_oc", "sp", [8, 4]],
+            ["tile_ow", "sp", [2, 4]],
+            ["unroll_kw", "ot", False],
+        ],
+    }
+    config_list.append(ConfigEntity.from_json_dict(cfg_dict))
+    for cost, config, task in zip(costs, config_list, tasks):
+        ms_input = MeasureInput(target=target, task=task, config=config)
+        ms_output = MeasureResult(costs=(cost,), error_no=0, all_cost=-1, timestamp=-1)
+        records.append((ms_input, ms_output))
+
+
 @tvm.testing.requires_x86
 def test_graph_tuner_layout_transform():
     log_file = "%s/test_tuner.log" % (os.getcwd())
@@ -233,6 +277,76 @@ def test_graph_tuner_layout_transform_runner():
         )
 
 
+@tvm.testing.requires_x86
+def test_graph_tuner_layout_cache(monkeypatch, tmp_path):
+    target = "llvm"
+    dshape = (1, 3, 8, 8)
+    dtype = "float32"
+    layout = "NCHW"
+    conv2d = relay.op.get("nn.conv2d")
+    target_ops = [conv2d]
+
+    g, records, _, _, tasks = _create_data(target, dshape, dtype, layout)
+    _append_alternative_records(target, records, tasks)
+    layout_cache = str(tmp_path / "layout_cache.log")
+    runner = autotvm.LocalRunner(number=1, repeat=1, timeout=10)
+
+    num_measured = []
+
+    def create_measure_batch(task, option):
+        measure_batch = create_measure_batch_orig(task, option)
+
+        def _measure_batch(inputs):
+            num_measured.append(len(inputs))
+            return measure_batch(inputs)
+
+        return _measure_batch
+
+    create_measure_batch_orig = base_graph_tuner.create_measure_batch
+    monkeypatch.setattr(base_graph_tuner, "create_measure_batch", create_measure_batch)
+
+    def _benchmark():
+        num_measured.clear()
+        executor = DPTuner(g, {"data": dshape}, records, target_ops, target=target)
+        executor.benchmark_layout_transform(runner=runner, layout_cache=layout_cache)
+        return executor.layout_transform_perf_records, sum(num_measured)
+
+    def _read_cache():
+        return list(autotvm.record.load_from_file(layout_cache))
+
+    # all the layout transforms are measured, and the valid ones are appended to the cache
+    _, num_first = _benchmark()
+    cached = _read_cache()
+    assert 0 < len(cached) <= num_first
+    num_invalid = num_first - len(cached)
+
+    # the cached ones are reused
+    out, num = _benchmark()
+    assert num == num_invalid
+    for inp, res in cached:
+        assert out[inp.task.workload][1].costs == res.costs
+    assert len(_read_cache()) == len(cached)
+
+    # the missing ones are measured and appended
+    with open(layout_cache) as in_file:
+        lines = in_file.readlines()
+    with open(layout_cache, "w") as out_file:
+        out_file.writelines(lines[1:])
+    _, num = _benchmark()
+    assert num == num_invalid + 1
+    assert len(_read_cache()) == len(cached)
+
+    # the records of other targets are ignored
+    other_target = tvm.target.Target("llvm -mcpu=skylake-avx512")
+    with open(layout_cache, "w") as out_file:
+        for inp, res in cached:
+            inp = MeasureInput(target=other_target, task=inp.task, config=inp.config)
+            out_file.write(autotvm.record.encode(inp, res) + "\n")
+    _, num = _benchmark()
+    assert num == num_first
+    assert len(_read_cache()) == 2 * len(cached)
+
+
 @tvm.testing.requires_x86
 def test_DPTuner_run():
     log_file = "%s/test_tuner.log" % (os.getcwd())
@@ -359,6 +473,32 @@ def test_PBQPTuner_run():
     )
 
 
+@tvm.testing.requires_x86
+def test_LocalSearchTuner_run():
+    target = "llvm"
+    dtype = "float32"
+    layout = "NCHW"
+    dshape = (1, 3, 8, 8)
+    conv2d = relay.op.get("nn.conv2d")
+    target_ops = [conv2d]
+
+    g, records, ltf_records, ltf_keys, tasks = _create_data(target, dshape, dtype, layout)
+    _append_alternative_records(target, records, tasks)
+
+    expected_out = [records[3][0].config, records[1][0].config, records[2][0].config]
+    for init in ["pbqp", "greedy"]:
+        executor = LocalSearchTuner(g, {"data": dshape}, records, target_ops, target)
+        executor.benchmark_layout_transform(layout_records=ltf_records, infer_layout=True)
+        executor.run(time_budget=1, init=init, seed=0)
+        out = [record[0].config for record in executor.get_optimal_records()]
+        assert expected_out == out, "Output mismatch: expecting %s but got %s" % (
+            str(expected_out),
+            str(out),
+        )
+        quality = executor.quality
+        assert quality["lower_bound"] <= quality["cost"] <= quality["initial_cost"]
+
+
 @tvm.testing.requires_x86
 def test_many_sub_graphs():
     target = "llvm"
@@ -787,6 +927,7 @@ if __name__ == "__main__":
     test_graph_tuner_layout_transform()
     test_DPTuner_run()
     test_PBQPTuner_run()
+    test_LocalSearchTuner_run()
     test_many_sub_graphs()
     test_tuple()
     test_triangle_block()
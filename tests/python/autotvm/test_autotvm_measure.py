@@ -18,8 +18,11 @@
 import logging
 import multiprocessing
 import concurrent
+import os
+import tarfile
 
 import numpy as np
+import pytest
 
 import tvm
 from tvm import te
@@ -28,6 +31,8 @@ from tvm.testing.autotvm import DummyRunner, bad_matmul, get_sample_task
 from tvm import autotvm
 from tvm.autotvm.measure.measure import MeasureErrorNo, MeasureResult
 from tvm.autotvm import measure
+from tvm.autotvm.measure import measure_methods
+from tvm.autotvm.env import GLOBAL_SCOPE
 from inspect import Signature
 
 
@@ -50,6 +55,143 @@ def test_task_tuner_without_measurement():
         assert tuner.best_flops > 1
 
 
+def test_task_tuner_async_measurement():
+    """test tuners with measurement batches in flight"""
+    task, _ = get_sample_task()
+
+    measure_option = autotvm.measure_option(builder=autotvm.LocalBuilder(), runner=DummyRunner())
+
+    for tuner_class in [autotvm.tuner.RandomTuner, autotvm.tuner.XGBTuner]:
+        tuner = tuner_class(task)
+        records = []
+        tuner.tune(
+            n_trial=20,
+            measure_option=measure_option,
+            callbacks=[lambda _, inputs, results: records.extend(zip(inputs, results))],
+            n_inflight=3,
+        )
+        assert len(records) == 20
+        assert len({inp.config.index for inp, _ in records}) == 20
+        assert tuner.best_flops > 1
+
+
+@tvm.testing.requires_llvm
+def test_task_tuner_async_local_runner():
+    """test running batches built while other batches are built or run"""
+    task, _ = get_sample_task()
+
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(n_parallel=1), runner=autotvm.LocalRunner()
+    )
+
+    tuner = autotvm.tuner.RandomTuner(task)
+    records = []
+    tuner.tune(
+        n_trial=12,
+        measure_option=measure_option,
+        callbacks=[lambda _, inputs, results: records.extend(zip(inputs, results))],
+        n_inflight=3,
+    )
+    assert len(records) == 12
+    for _, res in records:
+        assert res.error_no == MeasureErrorNo.NO_ERROR, res
+
+
+@tvm.testing.requires_llvm
+def test_packed_local_runner(monkeypatch):
+    """test measuring candidates packed into one library"""
+    packed_filenames = []
+
+    def pack_libraries(filenames, packed_filename):
+        pack_libraries_orig(filenames, packed_filename)
+        # an uncompressed tar, which the remote links as is
+        with tarfile.open(packed_filename, "r:") as tar:
+            assert len(tar.getnames()) == len(filenames)
+        packed_filenames.append(packed_filename)
+
+    pack_libraries_orig = measure_methods._pack_libraries
+    monkeypatch.setattr(measure_methods, "_pack_libraries", pack_libraries)
+
+    task, target = get_sample_task()
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(), runner=autotvm.LocalRunner(pack_size=4)
+    )
+    measure_batch = autotvm.measure.create_measure_batch(task, measure_option)
+    inputs = [
+        autotvm.MeasureInput(target, task, task.config_space.get(i))
+        for i in task.config_space.sample_ints(6)
+    ]
+    results = measure_batch(inputs)
+    assert len(results) == len(inputs)
+    for res in results:
+        assert res.error_no == MeasureErrorNo.NO_ERROR, res
+        assert all(cost > 0 for cost in res.costs)
+    assert packed_filenames
+    assert not any(os.path.exists(filename) for filename in packed_filenames)
+
+
+@tvm.testing.requires_llvm
+def test_packed_local_runner_pack_error(monkeypatch):
+    """test measuring the candidates one by one when their libraries cannot be packed"""
+
+    def pack_libraries(filenames, packed_filename):
+        raise OSError("no space left on device")
+
+    monkeypatch.setattr(measure_methods, "_pack_libraries", pack_libraries)
+
+    task, target = get_sample_task()
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(), runner=autotvm.LocalRunner(pack_size=4)
+    )
+    measure_batch = autotvm.measure.create_measure_batch(task, measure_option)
+    inputs = [
+        autotvm.MeasureInput(target, task, task.config_space.get(i))
+        for i in task.config_space.sample_ints(6)
+    ]
+    results = measure_batch(inputs)
+    assert len(results) == len(inputs)
+    for res in results:
+        assert res.error_no == MeasureErrorNo.NO_ERROR, res
+        assert all(cost > 0 for cost in res.costs)
+
+
+def test_task_tuner_async_early_stopping():
+    """test tuners draining or dropping the measurement batches in flight when stopping"""
+    task, _ = get_sample_task()
+
+    # one config per batch, so that the bounds below do not depend on the number of cores
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(n_parallel=1), runner=DummyRunner()
+    )
+
+    tuner = autotvm.tuner.RandomTuner(task)
+    records = []
+    tuner.tune(
+        n_trial=50,
+        measure_option=measure_option,
+        early_stopping=5,
+        callbacks=[lambda _, inputs, results: records.extend(zip(inputs, results))],
+        n_inflight=3,
+    )
+    # the batches in flight at the early stop are still recorded
+    assert len(records) < 50
+    assert len(records) <= tuner.best_iter + 5 + 2
+    assert len({inp.config.index for inp, _ in records}) == len(records)
+    assert not GLOBAL_SCOPE.in_tuning
+
+    def callback(_, inputs, results):
+        records.extend(zip(inputs, results))
+        if len(records) >= 3:
+            raise RuntimeError("stop")
+
+    records = []
+    tuner = autotvm.tuner.RandomTuner(task)
+    with pytest.raises(RuntimeError):
+        tuner.tune(n_trial=50, measure_option=measure_option, callbacks=[callback], n_inflight=3)
+    assert len(records) == 3
+    assert not GLOBAL_SCOPE.in_tuning
+
+
 def task_tuner_spawn():
     assert multiprocessing.get_start_method(False) == "spawn"
     test_task_tuner_without_measurement()
@@ -91,4 +233,8 @@ if __name__ == "__main__":
 
     test_task_tuner_without_measurement()
     test_task_tuner_without_measurement_spawn()
+    test_task_tuner_async_measurement()
+    test_task_tuner_async_early_stopping()
+    test_task_tuner_async_local_runner()
+    test_packed_local_runner(pytest.MonkeyPatch())
     test_task_runner_with_ref_input()
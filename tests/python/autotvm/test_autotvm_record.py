@@ -19,11 +19,21 @@ from io import StringIO
 from os import PathLike
 import time
 
+import pytest
 from tvm.contrib import utils
 
 from tvm import autotvm
 from tvm.autotvm.measure import MeasureInput, MeasureResult, MeasureErrorNo
-from tvm.autotvm.record import encode, decode, ApplyHistoryBest, measure_str_key
+from tvm.autotvm.record import (
+    encode,
+    decode,
+    ApplyHistoryBest,
+    measure_str_key,
+    compile_best,
+    dedup,
+    pick_best,
+    split_workload,
+)
 
 from tvm.testing.autotvm import get_sample_task
 
@@ -157,6 +167,121 @@ def test_apply_history_best_multiple_batches(tmpdir):
     assert str(hist_best.query(target, tsk.workload)) == best
 
 
+def test_compile_best(tmpdir):
+    tsk, target = get_sample_task()
+
+    inputs_batch_1 = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(2)]
+    results_batch_1 = [MeasureResult((i,), 0, 0, 0) for i in range(1, 3)]
+    filepath_batch_1 = tmpdir / "batch_1.log"
+    with open(filepath_batch_1, "w") as file:
+        autotvm.callback.log_to_file(file)(None, inputs_batch_1, results_batch_1)
+    compiled_batch_1 = tmpdir / "batch_1.bin"
+    compile_best(filepath_batch_1, compiled_batch_1)
+
+    # The compiled file works in place of the log
+    hist_best = ApplyHistoryBest(compiled_batch_1)
+    assert not hist_best.best_by_targetkey
+    assert str(hist_best.query(target, tsk.workload)) == str(tsk.config_space.get(0))
+
+    # The better one wins when mixed with the records of a log
+    inputs_batch_2 = [MeasureInput(target, tsk, tsk.config_space.get(2))]
+    results_batch_2 = [MeasureResult((0.5,), 0, 0, 0)]
+    hist_best = ApplyHistoryBest([compiled_batch_1, zip(inputs_batch_2, results_batch_2)])
+    assert str(hist_best.query(target, tsk.workload)) == str(tsk.config_space.get(2))
+
+    # Workloads not in the compiled file are not found
+    other_tsk, _ = get_sample_task(n=32)
+    assert hist_best._query_inside(target, other_tsk.workload) is None
+
+
+def test_pick_best_and_dedup(tmpdir):
+    tsk, target = get_sample_task()
+    other_tsk, _ = get_sample_task(n=32)
+
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(4)]
+    inputs += [MeasureInput(target, other_tsk, other_tsk.config_space.get(i)) for i in range(2)]
+    results = [MeasureResult((c,), 0, 0, 0) for c in [3, 1, 2, 0.5, 2, 1]]
+    # A failed measurement is never the best
+    results[3] = MeasureResult((0.1,), MeasureErrorNo.RUNTIME_DEVICE, 0, 0)
+    filepath = tmpdir / "tuning.log"
+    with open(filepath, "w") as file:
+        callback = autotvm.callback.log_to_file(file)
+        callback(None, inputs, results)
+        # Duplicate the records of the first task
+        callback(None, inputs[:4], results[:4])
+
+    best_filepath = str(tmpdir / "best.log")
+    pick_best(filepath, best_filepath)
+    best_records = list(autotvm.record.load_from_file(best_filepath))
+    assert [str(inp.config) for inp, _ in best_records] == [
+        str(tsk.config_space.get(1)),
+        str(other_tsk.config_space.get(1)),
+    ]
+
+    pick_best(filepath, best_filepath + ".top2", top_k=2)
+    assert len(list(autotvm.record.load_from_file(best_filepath + ".top2"))) == 4
+
+    dedup_filepath = str(tmpdir / "dedup.log")
+    dedup(filepath, dedup_filepath)
+    dedup_records = list(autotvm.record.load_from_file(dedup_filepath))
+    assert [measure_str_key(inp) for inp, _ in dedup_records] == [
+        measure_str_key(inp) for inp in inputs
+    ]
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_pick_best_and_dedup_skip_invalid(tmpdir, num_workers):
+    tsk, target = get_sample_task()
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(3)]
+    results = [MeasureResult((c,), 0, 0, 0) for c in [3, 1, 2]]
+    filepath = str(tmpdir / "tuning.log")
+    with open(filepath, "w") as file:
+        autotvm.callback.log_to_file(file)(None, inputs, results)
+    # A valid record, then a broken one
+    invalid_filepath = str(tmpdir / "invalid.log")
+    with open(invalid_filepath, "w") as file:
+        autotvm.callback.log_to_file(file)(None, inputs[2:], [MeasureResult((0.5,), 0, 0, 0)])
+        file.write("{not json\n")
+    in_files = [filepath, invalid_filepath, str(tmpdir / "missing.log")]
+
+    with pytest.raises(Exception):
+        pick_best(in_files, str(tmpdir / "best.log"), num_workers=num_workers)
+    pick_best(in_files, str(tmpdir / "best.log"), num_workers=num_workers, skip_invalid=True)
+    best_records = list(autotvm.record.load_from_file(str(tmpdir / "best.log")))
+    assert [str(inp.config) for inp, _ in best_records] == [str(tsk.config_space.get(1))]
+
+    dedup(in_files, str(tmpdir / "dedup.log"), num_workers=num_workers, skip_invalid=True)
+    dedup_records = list(autotvm.record.load_from_file(str(tmpdir / "dedup.log")))
+    assert [measure_str_key(inp) for inp, _ in dedup_records] == [
+        measure_str_key(inp) for inp in inputs
+    ]
+
+
+def test_split_workload(tmpdir, monkeypatch):
+    # Append the buffered rows to the files after every row
+    monkeypatch.setattr(autotvm.record, "_SPLIT_BUFFER_BYTES", 1)
+    tsk, target = get_sample_task()
+    other_tsk, _ = get_sample_task(n=32)
+
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(3)]
+    inputs += [MeasureInput(target, other_tsk, other_tsk.config_space.get(i)) for i in range(2)]
+    inputs = [inputs[0], inputs[3], inputs[1], inputs[4], inputs[2]]
+    results = [MeasureResult((1,), 0, 0, 0) for _ in inputs]
+    filepath = str(tmpdir / "tuning.log")
+    with open(filepath, "w") as file:
+        callback = autotvm.callback.log_to_file(file)
+        callback(None, inputs, results)
+        # Duplicate a record of the first task
+        callback(None, inputs[:1], results[:1])
+
+    split_workload(filepath)
+    for i, task in enumerate([tsk, other_tsk]):
+        records = list(autotvm.record.load_from_file(f"{filepath}.{i:03d}.wkl"))
+        assert [str(inp.config) for inp, _ in records] == [
+            str(inp.config) for inp in inputs if inp.task.args == task.args
+        ]
+
+
 if __name__ == "__main__":
     test_load_dump()
     test_apply_history_best()
@@ -16,6 +16,8 @@
 # under the License.
 """Test space definition primitives"""
 
+import numpy as np
+
 from tvm import te
 from tvm.autotvm.task.space import ConfigSpace, FallbackConfigEntity
 
@@ -257,7 +259,33 @@ def test_filter_and_multi_filter():
     assert cfg.range_length == 48
 
 
+def test_batched_conversions():
+    cfg = ConfigSpace()
+    gemm_func(cfg, 128)
+    cfg_mf = ConfigSpace()
+    gemm_func(cfg_mf, 128)
+    cfg_mf.multi_filter(
+        filter=lambda entity: 32 <= (entity["tile_x"].size[1] * entity["tile_y"].size[1]) < 1024
+    )
+    points = np.arange(cfg.range_length)
+    for space in [cfg, cfg_mf]:
+        knobs = space.points2knobs(points)
+        assert knobs.tolist() == [space.point2knob(p) for p in range(space.range_length)]
+        assert space.knobs2points(knobs).tolist() == points.tolist()
+        assert space.are_indexes_valid(points).tolist() == [
+            space.is_index_valid(p) for p in range(space.range_length)
+        ]
+        for m in [5, len(space)]:
+            ints = space.sample_ints(m)
+            assert len(set(ints.tolist())) == m
+            assert space.are_indexes_valid(ints).all()
+        walks = space.random_walks(np.array([15] * 8))
+        assert (walks != 15).all()
+        assert space.are_indexes_valid(walks).all()
+
+
 if __name__ == "__main__":
     test_split()
     test_multi_filter()
     test_filter_and_multi_filter()
+    test_batched_conversions()
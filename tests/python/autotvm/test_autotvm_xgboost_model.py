@@ -23,8 +23,12 @@ import tvm
 from tvm import te
 from tvm import autotvm
 from tvm.autotvm import MeasureInput, MeasureResult
-from tvm.autotvm.tuner.xgboost_cost_model import XGBoostCostModel
+from tvm.autotvm.tuner import FeatureStore
+from tvm.autotvm.tuner.sa_model_optimizer import SimulatedAnnealingOptimizer
+from tvm.autotvm.tuner.xgboost_cost_model import XGBoostCostModel, _is_deterministic_failure
 
+from tvm.contrib import utils
+from tvm.contrib.popen_pool import MapResult, StatusKind
 from tvm.testing.autotvm import get_sample_task, get_sample_records
 
 
@@ -91,8 +95,58 @@ def test_update():
     assert all(x in tuner.visited for x in tuner.xs)
 
 
+def test_sa_optimizer():
+    task, target = get_sample_task()
+    records = get_sample_records(n=50)
+    model = XGBoostCostModel(task, feature_type="itervar", loss_type="reg")
+    model.fit_log(records, plan_size=32)
+
+    exclusive = set(range(10))
+    for n_parallel in [1, 2]:
+        optimizer = SimulatedAnnealingOptimizer(
+            task, n_iter=20, parallel_size=16, num_restarts=3, n_parallel=n_parallel
+        )
+        maximums = optimizer.find_maximums(model, 8, exclusive)
+        assert len(maximums) <= 8
+        assert len(set(maximums)) == len(maximums)
+        assert not exclusive.intersection(maximums)
+        scores = model.predict(maximums)
+        assert np.all(np.diff(scores) <= 1e-6)
+
+
+def test_feature_store():
+    task, target = get_sample_task()
+    records = get_sample_records(n=50)
+    path = utils.tempdir().relpath("features")
+
+    model = XGBoostCostModel(task, feature_type="itervar", loss_type="reg", feature_store=path)
+    model.fit_log(records, plan_size=32, min_seed_records=10)
+    expected = model.predict(np.arange(8))
+
+    store = FeatureStore(path)
+    indexes = [inp.config.index for inp, _ in records]
+    stored = store.get(task, target, "itervar", indexes)
+    assert set(stored) == set(indexes)
+
+    # a new model reuses the stored features, and predicts the same with the same booster
+    other = XGBoostCostModel(task, feature_type="itervar", loss_type="reg", feature_store=store)
+    other.bst = model.bst
+    np.testing.assert_allclose(other.predict(np.arange(8)), expected)
+    assert other.fit_log(records, plan_size=32, min_seed_records=10)
+
+
+def test_feature_store_failures():
+    # only the failures which would happen again are stored
+    assert _is_deterministic_failure(MapResult(StatusKind.EXCEPTION, ValueError("invalid")))
+    assert not _is_deterministic_failure(MapResult(StatusKind.TIMEOUT, TimeoutError()))
+    assert not _is_deterministic_failure(MapResult(StatusKind.EXCEPTION, ChildProcessError()))
+
+
 if __name__ == "__main__":
     test_fit()
     test_fit_spawn()
     test_tuner()
     test_update()
+    test_sa_optimizer()
+    test_feature_store()
+    test_feature_store_failures()
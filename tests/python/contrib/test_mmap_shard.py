@@ -0,0 +1,48 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Tests for tvm/python/tvm/contrib/mmap_shard.py."""
+import numpy as np
+
+from tvm.contrib import utils
+from tvm.contrib.mmap_shard import MmapShard
+
+
+def test_mmap_shard():
+    path = utils.tempdir().relpath("shard")
+    shard = MmapShard(path)
+    array = np.arange(6, dtype="float32").reshape(2, 3)
+    shard.put([("a", array, 0.0), ("b", None, 2.0), ("c", np.zeros((0, 3)), 0.0)])
+    shard.put([("a", np.ones(4), 1.0)])
+
+    # another process sees the same entries
+    other = MmapShard(path)
+    stored = other.get(["a", "b", "c", "d"])
+    assert set(stored) == {"a", "b", "c"}
+    np.testing.assert_array_equal(stored["a"], array)
+    assert stored["b"] is None
+    assert stored["c"].shape == (0, 3)
+    assert other.get_value("b") == 2.0
+    assert other.get_value("d") == 0.0
+
+    # a stored key is only stored again if asked to
+    other.put([("a", np.ones(4), 1.0)], replace=lambda stored, new: stored < new)
+    np.testing.assert_array_equal(shard.get(["d", "a"])["a"], np.ones(4))
+    assert shard.get_value("a") == 1.0
+
+
+if __name__ == "__main__":
+    test_mmap_shard()
@@ -79,6 +79,18 @@ def test_popen_worker_recycles():
     assert not psutil.pid_exists(initial_pid)
 
 
+def test_popen_worker_recycles_on_memory():
+    proc = PopenWorker(maximum_memory_bytes=1)
+
+    proc.send(os.getpid)
+    initial_pid = proc.recv()
+    assert psutil.pid_exists(initial_pid)
+
+    proc.send(os.getpid)
+    assert proc.recv() != initial_pid
+    assert not psutil.pid_exists(initial_pid)
+
+
 def test_popen_pool_executor():
     import tvm
 
@@ -179,9 +191,19 @@ def test_popen_pool_executor_recycles():
     assert initial_pid != pool.submit(os.getpid).result()
 
 
+def test_popen_pool_executor_finalizer(tmpdir):
+    path = str(tmpdir / "finalized")
+    pool = PopenPoolExecutor(max_workers=1, timeout=None, finalizer=os.mkdir, finalargs=(path,))
+    pool.submit(os.getpid).result()
+    assert not os.path.exists(path)
+    pool.shutdown()
+    assert os.path.isdir(path)
+
+
 if __name__ == "__main__":
     test_popen_worker()
     test_popen_worker_recycles()
+    test_popen_worker_recycles_on_memory()
     test_popen_pool_executor()
     test_popen_initializer()
     test_popen_worker_recycles_with_initializer()
@@ -19,6 +19,7 @@
 import logging
 import time
 import tvm
+import tvm.testing
 from tvm import rpc
 
 
@@ -103,6 +104,234 @@ def check_server_drop():
         print("Skip because tornado is not available")
 
 
+@tvm.testing.requires_rpc
+def test_rpc_session_pool():
+    """test session reuse and lease renewal"""
+    # pylint: disable=import-outside-toplevel
+    from tvm.rpc import tracker
+
+    tserver = tracker.Tracker("127.0.0.1", 8888)
+    server = rpc.Server(
+        "127.0.0.1", port=9099, tracker_addr=("127.0.0.1", tserver.port), key="pool"
+    )
+    tclient = rpc.connect_tracker("127.0.0.1", tserver.port)
+    pool = rpc.SessionPool(("127.0.0.1", tserver.port), session_timeout=1, max_idle=5, max_uses=3)
+
+    def workpath(remote):
+        return remote.get_function("tvm.rpc.server.workpath")("")
+
+    # the idle session outlives its session_timeout, as its lease is renewed
+    with pool.session("pool") as remote:
+        path = workpath(remote)
+    time.sleep(1.5)
+    with pool.session("pool") as remote:
+        assert workpath(remote) == path
+    assert pool.num_requested == 1 and pool.num_reused == 1
+    leases = tclient.summary()["lease_info"]
+    assert len(leases) == 1 and leases[0]["key"] == "pool"
+    assert 0 < leases[0]["expire_in"] <= 5
+
+    # the session is closed after max_uses, and the device goes back to the tracker
+    with pool.session("pool") as remote:
+        pass
+    assert pool.summary()["queue_info"]["pool"] == {"idle": 0, "busy": 0}
+    with pool.session("pool") as remote:
+        assert workpath(remote) != path
+    assert pool.num_requested == 2
+
+    # a failed job discards the session
+    try:
+        with pool.session("pool") as remote:
+            raise ValueError()
+    except ValueError:
+        pass
+    assert pool.summary()["queue_info"]["pool"]["idle"] == 0
+
+    pool.close()
+    server.terminate()
+    tserver.terminate()
+
+
+@tvm.testing.requires_rpc
+def test_pooled_remote_close():
+    """test closing the session pools of autotvm"""
+    # pylint: disable=import-outside-toplevel
+    from tvm.rpc import tracker
+    from tvm.autotvm.measure.measure_methods import close_session_pools, pooled_remote
+
+    tserver = tracker.Tracker("127.0.0.1", 8888)
+    server = rpc.Server(
+        "127.0.0.1", port=9099, tracker_addr=("127.0.0.1", tserver.port), key="pool"
+    )
+    tclient = rpc.connect_tracker("127.0.0.1", tserver.port)
+    remote_kwargs = dict(
+        device_key="pool", host="127.0.0.1", port=tserver.port, timeout=1, max_session_uses=3
+    )
+
+    def free():
+        return tclient.summary()["queue_info"].get("pool", {}).get("free", 0)
+
+    with pooled_remote(**remote_kwargs) as remote:
+        assert remote.get_function("tvm.rpc.server.workpath")("")
+    # the idle session keeps the device until the pool is closed
+    assert free() == 0
+    close_session_pools()
+    for _ in range(50):
+        if free() == 1:
+            break
+        time.sleep(0.1)
+    assert free() == 1
+
+    server.terminate()
+    tserver.terminate()
+
+
+def test_fair_share_scheduler():
+    """test the fair-share policy and the metrics of the tracker"""
+    # pylint: disable=import-outside-toplevel
+    from tvm.rpc.tracker import FairShareScheduler
+
+    class _Conn:
+        def __init__(self):
+            self.pending_matchkeys = set()
+
+    granted = []
+
+    def _request(scheduler, user, priority=1):
+        def _cb(value):
+            granted.append((user, value[-1]))
+            return True
+
+        scheduler.request(user, priority, _cb)
+
+    def _put(scheduler, matchkey):
+        conn = _Conn()
+        conn.pending_matchkeys.add(matchkey)
+        scheduler.put((conn, "127.0.0.1", 9090, matchkey))
+
+    # a user flooding the queue does not starve the others, with weights
+    # no decay of the recent usage, so that the shares, and their ties, do not depend on timing
+    scheduler = FairShareScheduler("x", weights={"a": 3}, decay=float("inf"))
+    for _ in range(8):
+        _request(scheduler, "a")
+    for _ in range(8):
+        _request(scheduler, "b")
+    for i in range(8):
+        _put(scheduler, f"x:{i}")
+    assert [user for user, _ in granted].count("b") == 2
+
+    # a user holds at most max_leases_per_user devices
+    granted.clear()
+    scheduler = FairShareScheduler("x", max_leases_per_user=1)
+    for _ in range(2):
+        _request(scheduler, "a")
+    for i in range(2):
+        _put(scheduler, f"x:{i}")
+    assert granted == [("a", "x:0")]
+    summary = scheduler.summary()
+    assert summary["free"] == 1 and summary["leased"] == 1
+    assert summary["users"]["a"]["pending"] == 1
+    scheduler.release("x:0")
+    assert granted == [("a", "x:0"), ("a", "x:1")]
+    summary = scheduler.summary()
+    assert summary["served"] == 2 and 0 < summary["utilization"] <= 1
+
+    # a waiting request ages to a higher priority
+    granted.clear()
+    scheduler = FairShareScheduler("x", aging=100)
+    _request(scheduler, "a", priority=0)
+    time.sleep(0.1)
+    _request(scheduler, "b", priority=1)
+    _put(scheduler, "x:0")
+    assert granted == [("a", "x:0")]
+
+    # the weights still decide among the requests that aged to the same priority
+    granted.clear()
+    scheduler = FairShareScheduler("x", weights={"a": 3}, aging=0.01, decay=float("inf"))
+    for _ in range(8):
+        _request(scheduler, "a")
+    for _ in range(8):
+        _request(scheduler, "b")
+    for i in range(8):
+        _put(scheduler, f"x:{i}")
+    assert [user for user, _ in granted].count("b") == 2
+
+
+def test_tracker_put_values():
+    """test that the tracker keeps only the resources of a server not handed out"""
+    # pylint: disable=import-outside-toplevel
+    import asyncio
+
+    from tvm.rpc.tracker import TrackerServerHandler
+
+    class _Conn:
+        def __init__(self):
+            self.pending_matchkeys = set()
+            self.put_values = {}
+            self.leased_matchkeys = set()
+            self._info = {"key": "server:x"}
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    handler = TrackerServerHandler(None, "stop")
+    conn = _Conn()
+
+    def _put(matchkey):
+        value = (conn, "127.0.0.1", 9090, matchkey)
+        conn.pending_matchkeys.add(matchkey)
+        conn.put_values[matchkey] = value
+        handler.put("x", value)
+
+    def _request():
+        def _cb(value):
+            handler.lease("x", "a", value, 0)
+            return True
+
+        handler.request("x", "a", 1, _cb)
+
+    for i in range(3):
+        _put(f"x:{i}")
+        assert list(conn.put_values) == [f"x:{i}"]
+        _request()
+        # the resource handed out is only tracked by its lease
+        assert not conn.put_values
+        assert conn.leased_matchkeys == {f"x:{i}"}
+    # reporting again ends the lease
+    _put("x:3")
+    assert not conn.leased_matchkeys
+    assert not handler.summary()["lease_info"]
+    handler.close(conn)
+    assert not conn.put_values
+    assert handler.summary()["queue_info"]["x"]["free"] == 0
+    loop.close()
+
+
+def test_rpc_tracker_load():
+    """test the tracker with many simulated servers and clients"""
+    # pylint: disable=import-outside-toplevel
+    from tvm.exec.rpc_load_test import run_load_test
+    from tvm.rpc import tracker
+
+    tserver = tracker.Tracker("127.0.0.1", 8888, silent=True, scheduler="fair")
+    result = run_load_test(
+        ("127.0.0.1", tserver.port),
+        num_servers=200,
+        num_clients=20,
+        num_requests=5,
+        session_time=0.01,
+        ping_period=0.1,
+    )
+    assert result["requests"] == 100
+    assert result["errors"] == 0
+    assert result["matchkeys_consistent"]
+    assert result["summary_latency"]
+    tserver.terminate()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     check_server_drop()
+    test_rpc_session_pool()
+    test_fair_share_scheduler()
+    test_tracker_put_values()
+    test_rpc_tracker_load()
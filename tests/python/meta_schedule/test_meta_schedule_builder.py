@@ -134,6 +134,27 @@ def test_meta_schedule_multiple_build():
     _check_build_results(builder_results)
 
 
+def test_meta_schedule_build_reuse_pool():
+    """Test meta schedule builder reusing its worker processes across builds"""
+    builder = LocalBuilder(max_workers=2, reuse_pool=True, maximum_process_uses=4)
+    pool = builder._pool  # pylint: disable=protected-access
+    assert pool is not None
+    for _ in range(3):
+        builder_inputs = [
+            BuilderInput(MatmulModule, Target("llvm")),
+            BuilderInput(MatmulReluModule, Target("llvm")),
+        ]
+        builder_results = builder.build(builder_inputs)
+        assert len(builder_results) == len(builder_inputs)
+        _check_build_results(builder_results)
+    assert builder._pool is pool  # pylint: disable=protected-access
+    builder.shutdown()
+    assert builder._pool is None  # pylint: disable=protected-access
+    # A new pool is started by the next build
+    _check_build_results(builder.build([BuilderInput(MatmulModule, Target("llvm"))]))
+    builder.shutdown()
+
+
 def test_meta_schedule_error_handle_test_builder():
     """Test the error handing during building"""
 
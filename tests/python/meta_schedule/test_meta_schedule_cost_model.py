@@ -27,13 +27,23 @@ import numpy as np
 import tvm
 import tvm.testing
 from tvm.meta_schedule.cost_model import PyCostModel, RandomModel, XGBModel
-from tvm.meta_schedule.cost_model.xgb_model import PackSum, _get_custom_call_back
-from tvm.meta_schedule.feature_extractor import RandomFeatureExtractor
+from tvm.meta_schedule.cost_model.xgb_model import (
+    FeatureBuffer,
+    FeatureGroup,
+    PackSum,
+    _get_custom_call_back,
+)
+from tvm.meta_schedule.feature_extractor import (
+    FeatureCache,
+    PyFeatureExtractor,
+    RandomFeatureExtractor,
+)
 from tvm.meta_schedule.runner import RunnerResult
 from tvm.meta_schedule.search_strategy import MeasureCandidate
 from tvm.meta_schedule.tune_context import TuneContext
 from tvm.meta_schedule.utils import derived_object
 from tvm.script import tir as T
+from tvm.target import Target
 from tvm.tir.schedule.schedule import Schedule
 
 
@@ -234,6 +244,81 @@ def test_meta_schedule_xgb_model_reload():
             assert (f1 == f2).all()
 
 
+def _split_candidate(factor: int) -> MeasureCandidate:
+    sch = Schedule(Matmul)
+    (i, _, _) = sch.get_loops(sch.get_block("matmul"))
+    sch.split(i, factors=[None, factor])
+    return MeasureCandidate(sch, [])
+
+
+@derived_object
+class CountingFeatureExtractor(PyFeatureExtractor):
+    def __init__(self):
+        super().__init__()
+        self.num_extracted = []
+
+    def extract_from(self, context, candidates):
+        self.num_extracted.append(len(candidates))
+        return [
+            tvm.nd.array(np.full((2, 3), len(str(c.sch.trace)), dtype="float32"))
+            for c in candidates
+        ]
+
+
+def test_meta_schedule_feature_cache():
+    extractor = CountingFeatureExtractor()
+    context = TuneContext(mod=Matmul)
+    candidates = [_split_candidate(factor) for factor in [2, 4, 8, 16]]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = FeatureCache(tmpdir)
+        features_0 = cache.extract_from(extractor, context, candidates[:2], "counting")
+        features_1 = cache.extract_from(extractor, context, candidates, "counting")
+        # A new cache on the same directory, e.g. in another process
+        features_2 = FeatureCache(tmpdir).extract_from(extractor, context, candidates, "counting")
+        assert extractor.num_extracted == [2, 2]
+        for f_0, f_1 in zip(features_0, features_1):
+            assert (f_0 == f_1).all()
+        for c, f_1, f_2 in zip(candidates, features_1, features_2):
+            assert f_2.dtype == "float32"
+            assert (f_1 == f_2).all()
+            assert (f_2 == len(str(c.sch.trace))).all()
+
+
+@derived_object
+class ZeroRowFeatureExtractor(PyFeatureExtractor):
+    def extract_from(self, context, candidates):
+        # Every other candidate has no feature rows
+        return [
+            tvm.nd.array(np.ones((i % 2 * 2, 3), dtype="float32")) for i in range(len(candidates))
+        ]
+
+
+def test_meta_schedule_feature_cache_zero_rows():
+    context = TuneContext(mod=Matmul)
+    candidates = [_split_candidate(factor) for factor in [2, 4]]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        features = FeatureCache(tmpdir).extract_from(
+            ZeroRowFeatureExtractor(), context, candidates, "zero-row"
+        )
+        reloaded = FeatureCache(tmpdir).extract_from(
+            ZeroRowFeatureExtractor(), context, candidates, "zero-row"
+        )
+        for feature in [features, reloaded]:
+            assert [f.shape for f in feature] == [(0, 3), (2, 3)]
+
+
+def test_meta_schedule_feature_cache_target():
+    extractor = CountingFeatureExtractor()
+    candidates = [_split_candidate(factor) for factor in [2, 4]]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = FeatureCache(tmpdir)
+        for target in ["llvm", "cuda", "llvm -num-cores=4", "cuda"]:
+            context = TuneContext(mod=Matmul, target=Target(target))
+            cache.extract_from(extractor, context, candidates, "counting")
+        # The features are not shared across target kinds
+        assert extractor.num_extracted == [2, 2]
+
+
 def test_meta_schedule_xgb_model_reupdate():
     extractor = RandomFeatureExtractor()
     model = XGBModel(extractor=extractor, num_warmup_samples=2)
@@ -257,6 +342,62 @@ def test_meta_schedule_xgb_model_reupdate():
     model.predict(TuneContext(), [_dummy_candidate() for i in range(predict_sample_count)])
 
 
+def test_meta_schedule_xgb_model_incremental():
+    extractor = RandomFeatureExtractor()
+    model = XGBModel(
+        extractor=extractor,
+        num_warmup_samples=2,
+        adaptive_training=False,
+        incremental_training=True,
+        num_incremental_rounds=5,
+        full_refit_interval=2,
+    )
+    update_sample_count = 20
+    predict_sample_count = 30
+    num_rounds = []
+    trees = []
+    for _ in range(4):
+        model.update(
+            TuneContext(),
+            [_dummy_candidate() for i in range(update_sample_count)],
+            [_dummy_result() for i in range(update_sample_count)],
+        )
+        num_rounds.append(model.booster.num_boosted_rounds())
+        trees.append(model.booster.get_dump())
+    # full, incremental, incremental, full
+    for i in [1, 2]:
+        # The booster continues from the previous model: its trees are kept, and at most
+        # `num_incremental_rounds` new ones are added
+        assert num_rounds[i - 1] < num_rounds[i] <= num_rounds[i - 1] + 5
+        assert trees[i][: num_rounds[i - 1]] == trees[i - 1]
+    assert model.num_incremental_trains == 0
+    assert model.buffer.num_samples == model.data_size == 4 * update_sample_count
+    model.predict(TuneContext(), [_dummy_candidate() for i in range(predict_sample_count)])
+
+
+def test_meta_schedule_xgb_feature_buffer():
+    groups = {
+        "a": FeatureGroup("a", [np.random.rand(2, 3), np.random.rand(1, 3)], np.array([2.0, 1.0])),
+        "b": FeatureGroup("b", [np.random.rand(3, 3)], np.array([4.0])),
+    }
+    buffer = FeatureBuffer()
+    for _ in range(30):
+        for group in groups.values():
+            buffer.append(group.group_hash, group.features, group.costs)
+    xs, ids, ys = buffer.pack(groups)
+    pack = PackSum(
+        xs=[f for _ in range(30) for g in groups.values() for f in g.features],
+        ys=np.concatenate([g.min_cost / g.costs for _ in range(30) for g in groups.values()]),
+    )
+    assert np.allclose(xs, pack.dmatrix.get_data().toarray())
+    assert (ids == pack.ids).all()
+    assert np.allclose(ys[ids], pack.dmatrix.get_label())
+    xs, ids, ys = buffer.pack(groups, start=3)
+    assert xs.shape == (6 * 29, 3)
+    assert ids[0] == 0 and ids[-1] == 3 * 29 - 1
+    assert np.allclose(ys[:3], [0.5, 1.0, 1.0])
+
+
 def test_meta_schedule_xgb_model_callback_as_function():
     # pylint: disable=import-outside-toplevel
     from itertools import chain as itertools_chain
@@ -16,17 +16,22 @@
 # under the License.
 # pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
 """Test Meta Schedule Database"""
+import multiprocessing
 import os.path as osp
+import sqlite3
 import tempfile
-from typing import Callable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
 
+import numpy as np
 import pytest
 import tvm
 import tvm.testing
 from tvm import meta_schedule as ms
-from tvm import relay, tir
+from tvm import relay, te, tir
 from tvm.ir.module import IRModule
 from tvm.meta_schedule.database import TuningRecord, Workload
+from tvm.meta_schedule.tune import _pretrain_cost_model
 from tvm.script import tir as T
 from tvm.target import Target
 from tvm.tir import Schedule
@@ -491,6 +496,27 @@ def test_meta_schedule_pydatabase_default_query():
     assert mod_res is not None and tvm.ir.structural_equal(mod_res, mod)
 
 
+def test_meta_schedule_pydatabase_no_constructor():
+    @ms.utils.derived_object
+    class PyWorkloadDatabase(ms.database.PyDatabase):
+        def __init__(self):  # pylint: disable=super-init-not-called
+            self.workloads_: List[Workload] = []
+
+        def has_workload(self, mod: IRModule) -> bool:
+            return any(tvm.ir.structural_equal(mod, w.mod) for w in self.workloads_)
+
+        def commit_workload(self, mod: IRModule) -> ms.database.Workload:
+            workload = ms.database.Workload(mod)
+            self.workloads_.append(workload)
+            return workload
+
+    mod: IRModule = Matmul
+    db = PyWorkloadDatabase()  # pylint: disable=invalid-name
+    assert db.module_equality == "structural"
+    db.commit_workload(mod)
+    assert db.has_workload(mod)
+
+
 def test_meta_schedule_pydatabase_override_query():
 
     mod: IRModule = Matmul
@@ -584,6 +610,355 @@ def test_json_database_get_top_k(k, expected):
     assert result == expected
 
 
+@pytest.mark.parametrize(
+    "k,expected",
+    [
+        (0, []),
+        (4, [[0.0, 2.0], [2.0], [1.5, 4.5], [3.0, 1e10]]),
+        (5, [[0.0, 2.0], [2.0], [1.5, 4.5], [3.0, 1e10]]),
+    ],
+)
+def test_binary_database_get_top_k(k, expected):
+    run_secs_list = [[1.5, 4.5], [], [0.0, 2.0], None, [2.0], [3.0, 1e10], [1e10]]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = ms.database.BinaryDatabase(work_dir=tmpdir)
+        result = call_get_top_k(run_secs_list, database, k)
+        assert len(database) == len(run_secs_list)
+    assert result == expected
+
+
+def test_binary_database_reload():
+    mod: IRModule = Matmul
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = ms.database.BinaryDatabase(work_dir=tmpdir)
+        token = database.commit_workload(mod)
+        trace = _create_schedule(mod, _schedule_matmul).trace
+        records = [
+            ms.database.TuningRecord(
+                trace,
+                token,
+                run_secs,
+                tvm.target.Target("llvm"),
+                ms.arg_info.ArgInfo.from_prim_func(func=mod["main"]),
+            )
+            for run_secs in [[7.0, 8.0, 9.0], [1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+        ]
+        for record in records:
+            database.commit_tuning_record(record)
+        # Drop the index to check that it is rebuilt from the tuning record table
+        with open(database.path_index, "r+b") as file:
+            file.truncate(file.seek(0, 2) - 1)
+        new_database = ms.database.BinaryDatabase(work_dir=tmpdir)
+        assert len(new_database) == 3
+        assert new_database.has_workload(mod)
+        assert not new_database.has_workload(MatmulRelu)
+        ret = new_database.get_top_k(new_database.commit_workload(mod), 2)
+        assert len(ret) == 2
+        _equal_record(ret[0], records[1])
+        _equal_record(ret[1], records[2])
+
+
+def test_binary_database_convert_json_database():
+    mod: IRModule = Matmul
+    run_secs_list = [[1.5, 4.5], [], [0.0, 2.0], None, [2.0]]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_database = _create_tmp_database(tmpdir)
+        json_database.commit_workload(MatmulRelu)
+        expected = call_get_top_k(run_secs_list, json_database, 5)
+        database = ms.database.convert_json_database(
+            json_database.path_workload,
+            json_database.path_tuning_record,
+            work_dir=tmpdir,
+        )
+        assert len(database) == len(json_database)
+        assert database.has_workload(MatmulRelu)
+        workload = database.commit_workload(mod)
+        result = [[v.value for v in r.run_secs] for r in database.get_top_k(workload, 5)]
+        assert result == expected
+
+
+@pytest.mark.parametrize("mod_eq,expected", [("structural", False), ("anchor-block", True)])
+def test_binary_database_module_equality(mod_eq, expected):
+    # Same anchor block as Matmul, but not structurally equal
+    mod = IRModule({"main": Matmul["main"].with_attr("tir.noalias", True)})
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = ms.database.BinaryDatabase(work_dir=tmpdir, module_equality=mod_eq)
+        database.commit_workload(Matmul)
+        assert database.has_workload(mod) == expected
+        new_database = ms.database.BinaryDatabase(work_dir=tmpdir, module_equality=mod_eq)
+        assert new_database.has_workload(mod) == expected
+
+
+@pytest.mark.parametrize(
+    "k,expected",
+    [
+        (0, []),
+        (4, [[0.0, 2.0], [2.0], [1.5, 4.5], [3.0, 1e10]]),
+        (5, [[0.0, 2.0], [2.0], [1.5, 4.5], [3.0, 1e10]]),
+    ],
+)
+def test_sqlite_database_get_top_k(k, expected):
+    run_secs_list = [[1.5, 4.5], [], [0.0, 2.0], None, [2.0], [3.0, 1e10], [1e10]]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = ms.database.SQLiteDatabase(work_dir=tmpdir)
+        result = call_get_top_k(run_secs_list, database, k)
+        assert len(database) == len(run_secs_list)
+    assert result == expected
+
+
+def test_sqlite_database_shared():
+    mod: IRModule = Matmul
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database_0 = ms.database.SQLiteDatabase(work_dir=tmpdir)
+        database_1 = ms.database.SQLiteDatabase(work_dir=tmpdir)
+        workload_0 = database_0.commit_workload(mod)
+        assert database_1.has_workload(mod)
+        workload_1 = database_1.commit_workload(mod)
+        trace = _create_schedule(mod, _schedule_matmul).trace
+        for database, workload, run_secs in [
+            (database_0, workload_0, [3.0]),
+            (database_1, workload_1, [1.0]),
+            (database_0, workload_0, [2.0]),
+        ]:
+            database.commit_tuning_record(
+                ms.database.TuningRecord(
+                    trace,
+                    workload,
+                    run_secs,
+                    tvm.target.Target("llvm"),
+                    ms.arg_info.ArgInfo.from_prim_func(func=mod["main"]),
+                )
+            )
+        for database, workload in [(database_0, workload_0), (database_1, workload_1)]:
+            assert len(database) == 3
+            ret = database.get_top_k(workload, 2)
+            assert [[v.value for v in r.run_secs] for r in ret] == [[1.0], [2.0]]
+        assert len(database_1.get_all_tuning_records()) == 3
+
+
+def _commit_sqlite_records(path: str, run_secs_list: List[List[float]]):
+    mod: IRModule = Matmul
+    database = ms.database.SQLiteDatabase(path)
+    trace = _create_schedule(mod, _schedule_matmul).trace
+
+    def _commit(run_secs):
+        database.commit_tuning_record(
+            ms.database.TuningRecord(
+                trace,
+                database.commit_workload(mod),
+                run_secs,
+                tvm.target.Target("llvm"),
+                ms.arg_info.ArgInfo.from_prim_func(func=mod["main"]),
+            )
+        )
+
+    # The records are committed from several threads of each process
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_commit, run_secs_list))
+
+
+def test_sqlite_database_concurrent_writers():
+    num_procs, num_records = 4, 16
+    run_secs_lists = [
+        [[float(i * num_records + j)] for j in range(num_records)] for i in range(num_procs)
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = osp.join(tmpdir, "database.sqlite")
+        ctx = multiprocessing.get_context("spawn")
+        procs = [
+            ctx.Process(target=_commit_sqlite_records, args=(path, run_secs_list))
+            for run_secs_list in run_secs_lists
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+            assert proc.exitcode == 0
+        database = ms.database.SQLiteDatabase(path)
+        assert len(database) == num_procs * num_records
+        workload = database.commit_workload(Matmul)
+        ret = database.get_top_k(workload, num_procs * num_records)
+        assert [r.run_secs[0].value for r in ret] == [
+            run_secs[0] for run_secs_list in run_secs_lists for run_secs in run_secs_list
+        ]
+        # The workload is committed once by all the writers
+        conn = sqlite3.connect(path)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM workloads").fetchone() == (1,)
+        finally:
+            conn.close()
+
+
+@pytest.mark.parametrize("mod_eq,expected", [("structural", False), ("anchor-block", True)])
+def test_sqlite_database_module_equality(mod_eq, expected):
+    # Same anchor block as Matmul, but not structurally equal
+    mod = IRModule({"main": Matmul["main"].with_attr("tir.noalias", True)})
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = ms.database.SQLiteDatabase(work_dir=tmpdir, module_equality=mod_eq)
+        database.commit_workload(Matmul)
+        assert database.has_workload(mod) == expected
+        other = ms.database.SQLiteDatabase(work_dir=tmpdir, module_equality=mod_eq)
+        assert other.has_workload(mod) == expected
+
+
+def _matmul_relu(n: int) -> IRModule:
+    a = te.placeholder((n, n), name="A")
+    b = te.placeholder((n, n), name="B")
+    k = te.reduce_axis((0, n), name="k")
+    c = te.compute((n, n), lambda i, j: te.sum(a[i, k] * b[k, j], axis=k), name="matmul")
+    d = te.compute((n, n), lambda i, j: tir.max(c[i, j], tir.const(0, "float32")), name="relu")
+    return IRModule({"main": te.create_prim_func([a, b, d])})
+
+
+def _schedule_matmul_sampled(sch: Schedule):
+    block = sch.get_block("matmul")
+    i, j, _ = sch.get_loops(block=block)
+    sch.split(i, sch.sample_perfect_tile(i, n=2))
+    sch.split(j, sch.sample_perfect_tile(j, n=2))
+
+
+def _create_warm_start_source(
+    workloads: List[Tuple[IRModule, str, float]]
+) -> ms.database.MemoryDatabase:
+    source = ms.database.MemoryDatabase()
+    for mod, target, run_secs in workloads:
+        source.commit_tuning_record(
+            ms.database.TuningRecord(
+                _create_schedule(mod, _schedule_matmul_sampled).trace,
+                source.commit_workload(mod),
+                [run_secs],
+                Target(target),
+                ms.arg_info.ArgInfo.from_prim_func(func=mod["main"]),
+            )
+        )
+    return source
+
+
+def test_warm_start_database():
+    mod_128, mod_16 = _matmul_relu(128), _matmul_relu(16)
+    assert ms.database.anchor_signature(mod_128) == ms.database.anchor_signature(mod_16)
+    assert ms.database.anchor_signature(mod_128) != ms.database.anchor_signature(Matmul)
+    source = _create_warm_start_source([(mod_128, "llvm", 1.0)])
+    database = ms.database.WarmStartDatabase(ms.database.MemoryDatabase(), source)
+    # The exact workload is not transferred to itself
+    assert database.get_top_k(database.commit_workload(mod_128), 2) == []
+    workload = database.commit_workload(mod_16)
+    (record,) = database.get_top_k(workload, 2)
+    assert [v.value for v in record.run_secs] == [1.0]
+    sch = Schedule(mod_16)
+    record.trace.apply_to_schedule(sch, remove_postproc=True)
+    assert len(sch.get_loops(sch.get_block("matmul"))) == 5
+    # The transferred records are never committed
+    assert len(database) == 0
+
+
+def test_warm_start_database_postprocs():
+    @ms.utils.derived_object
+    class AlwaysFailPostproc(ms.postproc.PyPostproc):
+        """A postproc that always fails."""
+
+        def _initialize_with_tune_context(self, context: ms.TuneContext) -> None:
+            pass
+
+        def apply(self, sch: Schedule) -> bool:
+            return False
+
+        def clone(self) -> "AlwaysFailPostproc":
+            return AlwaysFailPostproc()
+
+        def __str__(self) -> str:
+            return "AlwaysFailPostproc"
+
+    mod_16, mod_32 = _matmul_relu(16), _matmul_relu(32)
+    source = _create_warm_start_source([(_matmul_relu(128), "llvm", 1.0)])
+    task = ms.TuneContext(
+        mod=mod_16,
+        target=Target("llvm"),
+        space_generator=ms.space_generator.ScheduleFn(
+            sch_fn=_schedule_matmul_sampled,
+            sch_rules=[],
+            postprocs=[AlwaysFailPostproc()],
+            mutator_probs={},
+        ),
+        task_name="matmul_relu_16",
+    )
+    database = ms.database.WarmStartDatabase(
+        ms.database.MemoryDatabase(),
+        source,
+        tasks=[task],
+    )
+    # The records the search could not postprocess are dropped
+    assert database.get_top_k(database.commit_workload(mod_16), 2) == []
+    # The workloads of no task are not postprocessed
+    assert len(database.get_top_k(database.commit_workload(mod_32), 2)) == 1
+
+
+def test_warm_start_database_target():
+    source = _create_warm_start_source(
+        [
+            (_matmul_relu(128), "llvm", 1.0),
+            (_matmul_relu(64), "cuda", 2.0),
+            (_matmul_relu(32), "llvm -num-cores=4", 3.0),
+        ]
+    )
+    mod = _matmul_relu(16)
+
+    def _similar(target: Optional[str]) -> List[float]:
+        database = ms.database.WarmStartDatabase(
+            ms.database.MemoryDatabase(),
+            source,
+            target=None if target is None else Target(target),
+        )
+        return [record.run_secs[0].value for record in database.similar_records(mod)]
+
+    assert _similar(None) == [1.0, 2.0, 3.0]
+    # Only the kind and keys of the target matter
+    assert _similar("llvm") == [1.0, 3.0]
+    assert _similar("cuda") == [2.0]
+    assert _similar("opencl") == []
+
+
+def test_warm_start_pretrain_cost_model():
+    @ms.utils.derived_object
+    class RecordingCostModel(ms.cost_model.PyCostModel):
+        def __init__(self):
+            super().__init__()
+            self.updates: List[Tuple[IRModule, Target, List[float]]] = []
+
+        def load(self, path: str) -> None:
+            pass
+
+        def save(self, path: str) -> None:
+            pass
+
+        def update(self, context, candidates, results) -> None:
+            assert len(candidates) == len(results)
+            self.updates.append(
+                (context.mod, context.target, [result.run_secs[0].value for result in results])
+            )
+
+        def predict(self, context, candidates) -> np.ndarray:
+            return np.zeros(len(candidates))
+
+    mod_128, mod_64 = _matmul_relu(128), _matmul_relu(64)
+    source = _create_warm_start_source(
+        [(mod_128, "llvm", 1.0), (mod_128, "llvm", 4.0), (mod_64, "cuda", 2.0)]
+    )
+    target = Target("llvm")
+    tasks = [
+        ms.TuneContext(mod=_matmul_relu(n), target=target, task_name=f"matmul_relu_{n}")
+        for n in [32, 16]
+    ]
+    database = ms.database.WarmStartDatabase(ms.database.MemoryDatabase(), source, target=target)
+    cost_model = RecordingCostModel()
+    _pretrain_cost_model(cost_model, tasks, database)
+    # The records of a similar workload are used once for all the tasks, the other targets never
+    ((mod, context_target, run_secs),) = cost_model.updates
+    tvm.ir.assert_structural_equal(mod, mod_128)
+    assert str(context_target) == str(target)
+    assert run_secs == [1.0, 4.0]
+
+
 def MatmulFunc() -> IRModule:
     a = relay.var("a", relay.TensorType((1024, 1024), "float32"))
     b = relay.var("b", relay.TensorType((1024, 1024), "float32"))
@@ -1632,5 +1632,42 @@ def test_negative_extent():
     assert named_features["B0.unique_bytes"] == 0
 
 
+def test_extract_batched():
+    @T.prim_func
+    def full(T_full: T.Buffer((T.int64(2), T.int64(3)), "float32")):
+        for ax0, ax1 in T.grid(T.int64(2), T.int64(3)):
+            with T.block("T_full"):
+                v_ax0, v_ax1 = T.axis.remap("SS", [ax0, ax1])
+                T.reads()
+                T.writes(T_full[v_ax0, v_ax1])
+                T_full[v_ax0, v_ax1] = T.float32(1)
+
+    candidates = [
+        _make_candidate(lambda: tir.Schedule(matmul, debug_mask="all")),
+        _make_candidate(lambda: tir.Schedule(full, debug_mask="all")),
+        _make_candidate(lambda: tir.Schedule(negative_extent, debug_mask="all")),
+    ]
+    context = _make_context(tvm.target.Target("llvm"))
+    extractor = ms.feature_extractor.PerStoreFeature()
+    expected = [x.numpy().astype("float32") for x in extractor.extract_from(context, candidates)]
+    features, offsets = extractor.extract_batched(context, candidates)
+    assert features.dtype == "float32"
+    assert features.shape == (sum(x.shape[0] for x in expected), N_FEATURES)
+    num_rows = [x.shape[0] for x in expected]
+    assert num_rows[1] == 0
+    assert offsets.numpy().tolist() == [0, num_rows[0], num_rows[0], sum(num_rows)]
+    for feature, expected_feature in zip(
+        ms.feature_extractor.split_batched_features(features, offsets), expected
+    ):
+        assert_allclose(feature, expected_feature, rtol=1e-5, atol=1e-5)
+    # The generic path of the base class, e.g. for Python-side extractors
+    base_features, base_offsets = ms.feature_extractor.FeatureExtractor.extract_batched(
+        extractor, context, candidates
+    )
+    assert base_features.shape == features.shape
+    assert base_offsets.numpy().tolist() == offsets.numpy().tolist()
+    assert_allclose(base_features.numpy(), features.numpy(), rtol=1e-5, atol=1e-5)
+
+
 if __name__ == "__main__":
     tvm.testing.main()
@@ -47,6 +47,7 @@ from tvm.meta_schedule.runner.rpc_runner import (
 from tvm.meta_schedule.runner.rpc_runner import (
     default_alloc_argument as rpc_default_alloc_argument,
 )
+from tvm.meta_schedule.runner.utils import ArgumentCache
 from tvm.meta_schedule.testing.local_rpc import LocalRPC
 from tvm.meta_schedule.utils import (
     derived_object,
@@ -243,6 +244,74 @@ def test_meta_schedule_local_single_run():
     _clean_build(builder_result.artifact_path)
 
 
+def test_meta_schedule_local_runner_arg_cache():
+    """Test the argument cache of meta schedule local runner"""
+    num_allocs = [0]
+
+    def f_alloc_argument(device, args_info, alloc_repeat):
+        num_allocs[0] += 1
+        return local_default_alloc_argument(device, args_info, alloc_repeat)
+
+    matmul_args_info = [["TENSOR", "float32", [MATMUL_N, MATMUL_N]]] * 3
+    matmul_bytes = 3 * MATMUL_N * MATMUL_N * 4
+    small_args_info = [["TENSOR", "float32", [MATMUL_N, MATMUL_N]]] * 2
+    other_args_info = [["TENSOR", "float32", [MATMUL_N, MATMUL_M]]]
+    cache = ArgumentCache(max_bytes=matmul_bytes * 2)
+    device = tvm.cpu()
+    args = cache.get_or_alloc(f_alloc_argument, device, matmul_args_info, 2)
+    assert len(args) == 2 and num_allocs[0] == 1
+    # Hits reuse the same buffers, including fewer repeats
+    assert cache.get_or_alloc(f_alloc_argument, device, matmul_args_info, 2)[1][0].same_as(
+        args[1][0]
+    )
+    assert len(cache.get_or_alloc(f_alloc_argument, device, matmul_args_info, 1)) == 1
+    assert num_allocs[0] == 1 and cache.num_bytes == matmul_bytes * 2
+    # More repeats than cached triggers a new allocation
+    assert len(cache.get_or_alloc(f_alloc_argument, device, matmul_args_info, 3)) == 3
+    assert num_allocs[0] == 2 and len(cache) == 0
+    # The least recently used entry is evicted beyond the budget
+    cache.get_or_alloc(f_alloc_argument, device, matmul_args_info, 1)
+    cache.get_or_alloc(f_alloc_argument, device, small_args_info, 1)
+    assert num_allocs[0] == 4 and len(cache) == 2
+    cache.get_or_alloc(f_alloc_argument, device, other_args_info, 1)
+    assert len(cache) == 2
+    cache.get_or_alloc(f_alloc_argument, device, small_args_info, 1)
+    assert num_allocs[0] == 5
+    cache.get_or_alloc(f_alloc_argument, device, matmul_args_info, 1)
+    assert num_allocs[0] == 6
+    assert cache.num_bytes <= cache.max_bytes
+
+    # Run the module with the cache enabled
+    builder = LocalBuilder()
+    builder_results = builder.build([BuilderInput(MatmulModule, Target("llvm"))] * 2)
+    runner_inputs = [
+        RunnerInput(
+            builder_result.artifact_path,
+            "llvm",
+            [TensorInfo("float32", (MATMUL_N, MATMUL_N))] * 3,
+        )
+        for builder_result in builder_results
+    ]
+    evaluator_config = EvaluatorConfig(
+        number=1,
+        repeat=1,
+        min_repeat_ms=0,
+        enable_cpu_cache_flush=False,
+    )
+    runner = LocalRunner(
+        timeout_sec=100,
+        evaluator_config=evaluator_config,
+        alloc_repeat=2,
+        arg_cache_bytes=1 << 20,
+    )
+    for runner_future in runner.run(runner_inputs):
+        runner_result = runner_future.result()
+        assert runner_result.error_msg is None
+        assert len(runner_result.run_secs) == 2
+    for builder_result in builder_results:
+        _clean_build(builder_result.artifact_path)
+
+
 def test_meta_schedule_rpc_multiple_runs():
     """Test meta schedule rpc runner for multiple runs"""
     # Build the module
@@ -16,7 +16,10 @@
 # under the License.
 """ Test Meta Schedule SearchStrategy """
 # pylint: disable=missing-function-docstring
-from typing import List
+import json
+import os
+import tempfile
+from typing import List, Optional
 
 import pytest
 import tvm
@@ -306,9 +309,98 @@ def test_meta_schedule_evolutionary_search_fail_init_population():  # pylint: di
     assert candidates is None
 
 
+def _run_sharded_evolutionary_search(
+    checkpoint_dir: str,
+    max_trials: int,
+    target: str = "llvm",
+    max_iters: Optional[int] = None,
+) -> List[int]:
+    """Run the search, interrupted without post-tuning after `max_iters` iterations if given"""
+
+    def _schedule_matmul_small(sch: Schedule):
+        block = sch.get_block("matmul")
+        _, j, k = sch.get_loops(block=block)
+        _, _ = sch.split(j, sch.sample_perfect_tile(j, n=2))
+        _, _ = sch.split(k, sch.sample_perfect_tile(k, n=2))
+
+    context = ms.TuneContext(
+        mod=Matmul,
+        space_generator=ms.space_generator.ScheduleFn(
+            sch_fn=_schedule_matmul_small,
+            sch_rules=[],
+            postprocs=[],
+            mutator_probs={
+                ms.mutator.MutateTileSize(): 1.0,
+            },
+        ),
+        search_strategy=ms.search_strategy.ShardedEvolutionarySearch(
+            num_shards=2,
+            population_size=8,
+            init_measured_ratio=0.1,
+            init_min_unmeasured=4,
+            genetic_num_iters=2,
+            genetic_mutate_prob=0.5,
+            genetic_max_fail_count=10,
+            eps_greedy=0.5,
+            num_elites=2,
+            checkpoint_dir=checkpoint_dir,
+        ),
+        target=tvm.target.Target(target),
+        num_threads=1,
+    )
+    strategy = context.search_strategy
+    strategy.pre_tuning(
+        max_trials=max_trials,
+        num_trials_per_iter=4,
+        design_spaces=context.space_generator.generate_design_space(context.mod),
+        database=ms.database.MemoryDatabase(),
+        cost_model=ms.cost_model.RandomModel(),
+    )
+    num_trials_each_iter: List[int] = []
+    candidates = strategy.generate_measure_candidates()
+    while candidates is not None:
+        num_trials_each_iter.append(len(candidates))
+        strategy.notify_runner_results(
+            candidates,
+            [ms.runner.RunnerResult(run_secs=[0.1], error_msg=None) for _ in candidates],
+        )
+        if len(num_trials_each_iter) == max_iters:
+            return num_trials_each_iter
+        candidates = strategy.generate_measure_candidates()
+    strategy.post_tuning()
+    return num_trials_each_iter
+
+
+def test_meta_schedule_sharded_evolutionary_search():  # pylint: disable = invalid-name
+    with tempfile.TemporaryDirectory() as work_dir:
+        num_trials_each_iter = _run_sharded_evolutionary_search(work_dir, max_trials=8)
+        assert 0 < sum(num_trials_each_iter) <= 8
+        assert num_trials_each_iter.count(0) < 5
+        # A finished run removes its checkpoint
+        assert os.listdir(work_dir) == []
+        # An interrupted run leaves a checkpoint
+        num_trials_before = sum(_run_sharded_evolutionary_search(work_dir, 8, max_iters=1))
+        (checkpoint,) = os.listdir(work_dir)
+        assert checkpoint.endswith(".json")
+        # The checkpoint keeps the candidates already picked for measurement
+        with open(os.path.join(work_dir, checkpoint), "r", encoding="utf-8") as file:
+            checkpoint = json.load(file)
+        assert checkpoint["module_equality"] == "structural"
+        assert len(checkpoint["measured"]) == num_trials_before
+        # A new run of the same task resumes after the trials already generated
+        num_trials_after = sum(_run_sharded_evolutionary_search(work_dir, max_trials=8))
+        assert 0 < num_trials_after <= 8 - num_trials_before
+        assert os.listdir(work_dir) == []
+        # The checkpoints of different targets are kept apart
+        _run_sharded_evolutionary_search(work_dir, 8, max_iters=1)
+        _run_sharded_evolutionary_search(work_dir, 8, target="llvm -num-cores=2", max_iters=1)
+        assert len(os.listdir(work_dir)) == 2
+
+
 if __name__ == "__main__":
     test_meta_schedule_replay_func(ms.search_strategy.ReplayFunc)
     test_meta_schedule_replay_func(ms.search_strategy.ReplayTrace)
     test_meta_schedule_evolutionary_search()
     test_meta_schedule_evolutionary_search_early_stop()
     test_meta_schedule_evolutionary_search_fail_init_population()
+    test_meta_schedule_sharded_evolutionary_search()
@@ -17,7 +17,7 @@
 """ Test Meta Schedule Task Scheduler """
 import random
 import weakref
-from typing import Set
+from typing import List, Set
 
 import pytest
 
@@ -353,6 +353,101 @@ def test_meta_schedule_task_scheduler_multiple_gradient_based():
         )
 
 
+def test_meta_schedule_task_scheduler_pipelined():
+    max_trials_per_task = 12
+    database = ms.database.MemoryDatabase()
+    round_robin = ms.task_scheduler.RoundRobin(pipeline_chunk_size=2)
+    assert round_robin.pipeline_chunk_size == 2
+    with ms.Profiler() as profiler:
+        round_robin.tune(
+            [
+                ms.TuneContext(
+                    MatmulModule,
+                    target=tvm.target.Target("llvm"),
+                    space_generator=_schedule_matmul,
+                    search_strategy=ms.search_strategy.ReplayTrace(),
+                    task_name="Test",
+                    rand_state=42,
+                )
+            ],
+            [1.0],
+            max_trials_global=max_trials_per_task,
+            max_trials_per_task=max_trials_per_task,
+            num_trials_per_iter=3,
+            builder=DummyBuilder(),
+            runner=DummyRunner(),
+            database=database,
+            measure_callbacks=[ms.measure_callback.AddToDatabase()],
+            cost_model=None,
+        )
+    assert len(database) == max_trials_per_task
+    stats = profiler.get()
+    for stage in ["SendToBuilder", "SendToRunner", "PrefetchNextBatch", "JoinRunnerFutures"]:
+        assert stage in stats
+
+
+def test_meta_schedule_task_scheduler_pipelined_overlap():
+    events: List[str] = []
+
+    @ms.derived_object
+    class RecordingRunnerFuture(ms.runner.PyRunnerFuture):
+        def __init__(self, batch: int) -> None:
+            super().__init__()
+            self.batch = batch
+
+        def done(self) -> bool:
+            return True
+
+        def result(self) -> ms.runner.RunnerResult:
+            events.append(f"result {self.batch}")
+            return ms.runner.RunnerResult([1.0], None)
+
+    @ms.derived_object
+    class RecordingBuilder(ms.builder.PyBuilder):
+        def build(self, build_inputs):
+            events.append("build")
+            return [ms.builder.BuilderResult("test_path", None) for _ in build_inputs]
+
+    @ms.derived_object
+    class RecordingRunner(ms.runner.PyRunner):
+        def __init__(self) -> None:
+            super().__init__()
+            self.num_batches = 0
+
+        def run(self, runner_inputs):
+            batch = self.num_batches
+            self.num_batches += 1
+            events.append(f"run {batch}")
+            return [RecordingRunnerFuture(batch) for _ in runner_inputs]
+
+    max_trials_per_task = 12
+    ms.task_scheduler.RoundRobin(pipeline_chunk_size=3).tune(
+        [
+            ms.TuneContext(
+                MatmulModule,
+                target=tvm.target.Target("llvm"),
+                space_generator=_schedule_matmul,
+                search_strategy=ms.search_strategy.ReplayTrace(),
+                task_name="Test",
+                rand_state=42,
+            )
+        ],
+        [1.0],
+        max_trials_global=max_trials_per_task,
+        max_trials_per_task=max_trials_per_task,
+        num_trials_per_iter=3,
+        builder=RecordingBuilder(),
+        runner=RecordingRunner(),
+        database=ms.database.MemoryDatabase(),
+        measure_callbacks=[ms.measure_callback.AddToDatabase()],
+        cost_model=None,
+    )
+    # The next batch is built after a batch is sent to the runner and before its results are read
+    for batch in range(3):
+        run = events.index(f"run {batch}")
+        assert "build" in events[run : events.index(f"result {batch}")]
+
+
 def test_meta_schedule_task_scheduler_gradient_based_with_null_search_strategy():
     """
     When search strategy of one task returns empty list of candidates or None,
@@ -444,3 +539,4 @@ if __name__ == "__main__":
     test_meta_schedule_task_scheduler_override_next_task_id_only()
     test_meta_schedule_task_scheduler_multiple_gradient_based()
     test_meta_schedule_task_scheduler_gradient_based_with_null_search_strategy()
+    test_meta_schedule_task_scheduler_pipelined()
@@ -32,6 +32,7 @@ from tvm import te
 from tvm import rpc
 from tvm.relay.backend import Runtime
 from tvm.contrib import utils, cc
+from tvm.rpc.artifact_cache import ArtifactCache, sha256_digest
 from tvm.rpc.tracker import Tracker
 from tvm.rpc.proxy import Proxy
 from tvm.script import ir as I, tir as T
@@ -244,6 +245,140 @@ def test_rpc_file_exchange():
     check_remote()
 
 
+@tvm.testing.requires_rpc
+def test_rpc_chunked_file_exchange():
+    server = rpc.Server()
+    remote = rpc.connect("127.0.0.1", server.port)
+    temp = utils.tempdir()
+
+    def check_remote():
+        blob = bytearray(np.random.randint(0, 10, size=(10000,), dtype="uint8"))
+        path = temp.relpath("dat.bin")
+        with open(path, "wb") as f:
+            f.write(blob)
+
+        for compression in [None, "zlib"]:
+            progress = []
+            remote.upload(
+                path,
+                chunk_size=4096,
+                compression=compression,
+                callback=lambda n, total: progress.append((n, total)),
+            )
+            assert progress == [(4096, 10000), (8192, 10000), (10000, 10000)]
+            assert remote.download("dat.bin", chunk_size=3000, compression=compression) == blob
+
+        # Resume an interrupted upload from the chunks already received
+        chunk = rpc.base.encode_chunk(memoryview(blob)[:4096])
+        remote.get_function("tvm.rpc.server.upload_chunk")("resumed.bin", 10000, 0, chunk)
+        offsets = []
+        remote.upload(
+            blob,
+            "resumed.bin",
+            chunk_size=4096,
+            resume=True,
+            callback=lambda n, _: offsets.append(n),
+        )
+        assert offsets == [8192, 10000]
+
+        # Resume an interrupted download into a file
+        out_file = temp.relpath("resumed.download.bin")
+        with open(out_file, "wb") as f:
+            f.write(blob[:5000])
+        offsets = []
+        remote.download(
+            "resumed.bin",
+            out_file,
+            chunk_size=4096,
+            resume=True,
+            callback=lambda n, _: offsets.append(n),
+        )
+        assert offsets == [9096, 10000]
+        with open(out_file, "rb") as f:
+            assert f.read() == blob
+
+        # A corrupted chunk is rejected
+        chunk = rpc.base.encode_chunk(b"0123")
+        chunk[-1:] = b"x"
+        with pytest.raises(tvm.error.TVMError):
+            remote.get_function("tvm.rpc.server.upload_chunk")("corrupted.bin", 4, 0, chunk)
+
+    check_remote()
+
+
+@tvm.testing.requires_rpc
+def test_rpc_upload_resume_after_reconnect():
+    server = rpc.Server()
+    blob = bytearray(np.random.randint(0, 10, size=(10000,), dtype="uint8"))
+
+    # The connection drops after the first chunk
+    remote = rpc.connect("127.0.0.1", server.port)
+    chunk = rpc.base.encode_chunk(memoryview(blob)[:4096])
+    remote.get_function("tvm.rpc.server.upload_chunk")("resumed.bin", len(blob), 0, chunk)
+    del remote
+
+    # A new session resumes the upload from the chunk already received
+    remote = rpc.connect("127.0.0.1", server.port)
+    offsets = []
+    remote.upload(
+        blob,
+        "resumed.bin",
+        chunk_size=4096,
+        resume=True,
+        callback=lambda n, _: offsets.append(n),
+    )
+    assert offsets == [8192, 10000]
+    assert remote.download("resumed.bin") == blob
+
+    # The partial upload of another size is not resumed
+    remote.get_function("tvm.rpc.server.upload_chunk")("other.bin", len(blob), 0, chunk)
+    offsets = []
+    remote.upload(
+        blob[:9000],
+        "other.bin",
+        chunk_size=4096,
+        resume=True,
+        callback=lambda n, _: offsets.append(n),
+    )
+    assert offsets == [4096, 8192, 9000]
+
+
+@tvm.testing.requires_rpc
+def test_rpc_artifact_cache():
+    temp = utils.tempdir()
+    cache_dir = temp.relpath("cache")
+    server = rpc.Server(cache_dir=cache_dir, cache_size_limit=25000)
+    blobs = [bytearray(np.random.randint(0, 255, size=(10000,), dtype="uint8")) for _ in range(3)]
+
+    def check_remote():
+        progress = []
+        remote = rpc.connect("127.0.0.1", server.port)
+        remote.upload(
+            blobs[0], "dat.bin", chunk_size=4096, callback=lambda n, _: progress.append(n)
+        )
+        assert progress == [4096, 8192, 10000]
+
+        # A new session finds the file in the cache without sending it
+        progress = []
+        remote = rpc.connect("127.0.0.1", server.port)
+        remote.upload(
+            blobs[0], "copy.bin", chunk_size=4096, callback=lambda n, _: progress.append(n)
+        )
+        assert progress == [10000]
+        assert remote.download("copy.bin") == blobs[0]
+
+        # The least recently used file is evicted beyond the size limit
+        remote.upload(blobs[1], "dat1.bin")
+        remote.upload(blobs[0], "dat.bin")
+        remote.upload(blobs[2], "dat2.bin")
+        cache = ArtifactCache(cache_dir)
+        assert cache.lookup(sha256_digest(blobs[0])) is not None
+        assert cache.lookup(sha256_digest(blobs[1])) is None
+        assert cache.lookup(sha256_digest(blobs[2])) is not None
+
+    check_remote()
+
+
 @tvm.testing.requires_rpc
 @tvm.testing.requires_llvm
 def test_rpc_remote_module():